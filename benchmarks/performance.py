@@ -141,6 +141,263 @@ def benchmark_template_loading(iterations: int = 10) -> Dict[str, Any]:
     return bench.run(load_template, iterations=iterations)
 
 
+def benchmark_template_rendering(iterations: int = 100) -> Dict[str, Any]:
+    """
+    Benchmark placeholder rendering of a large template.
+
+    Args:
+        iterations: Number of iterations to run
+
+    Returns:
+        Benchmark results
+    """
+    from nuaa_cli.scaffold import _apply_replacements
+
+    mapping = {f"FIELD_{i}": f"value {i}" for i in range(20)}
+    mapping.update({"PROGRAM_NAME": "Test Program", "DATE": "2025-01-01"})
+    section = "## [Name]\n\nStarted [Date].\n" + " ".join(f"{{{{FIELD_{i}}}}}" for i in range(20)) + "\n\n"
+    template = section * 200
+
+    def render():
+        _apply_replacements(template, mapping)
+
+    bench = Benchmark("Template Rendering")
+    return bench.run(render, iterations=iterations)
+
+
+def benchmark_audit_logging(iterations: int = 20, buffered: bool = False) -> Dict[str, Any]:
+    """
+    Benchmark logging 100 audit events, directly or through the buffered writer.
+
+    Args:
+        iterations: Number of iterations to run
+        buffered: Use the background writer (AuditConfig.buffered)
+
+    Returns:
+        Benchmark results
+    """
+    import shutil
+    import tempfile
+
+    from nuaa_cli.audit import AuditConfig, AuditEvent, AuditLogger, EventType
+
+    tmpdir = Path(tempfile.mkdtemp())
+    logger = AuditLogger(AuditConfig(audit_dir=tmpdir, buffered=buffered))
+
+    def log_events():
+        for i in range(100):
+            logger.log(AuditEvent(event_type=EventType.DOCUMENT_READ, action="read", resource_path=f"doc-{i}.md"))
+
+    try:
+        bench = Benchmark(f"Audit Logging ({'buffered' if buffered else 'direct'})")
+        return bench.run(log_events, iterations=iterations)
+    finally:
+        logger.close()
+        shutil.rmtree(tmpdir, ignore_errors=True)
+
+
+def benchmark_audit_query(iterations: int = 20, indexed: bool = False) -> Dict[str, Any]:
+    """
+    Benchmark a filtered query over a 10,000-event audit log.
+
+    Args:
+        iterations: Number of iterations to run
+        indexed: Answer the query from the SQLite index (AuditConfig.index_enabled)
+
+    Returns:
+        Benchmark results
+    """
+    import shutil
+    import tempfile
+
+    from nuaa_cli.audit import AuditConfig, AuditEvent, AuditLogger, AuditQuery, EventType, query_audit_logs
+    from nuaa_cli.audit.config import reset_config, set_config
+
+    tmpdir = Path(tempfile.mkdtemp())
+    config = AuditConfig(audit_dir=tmpdir, index_enabled=indexed, max_file_size=1024**3)
+    logger = AuditLogger(config)
+    for i in range(10000):
+        logger.log(AuditEvent(event_type=EventType.DOCUMENT_READ, action="read", username=f"user-{i % 50}"))
+    set_config(config)
+    query = AuditQuery(username="user-7", limit=20)
+    query_audit_logs(query)  # Build the index outside the timed runs
+
+    try:
+        bench = Benchmark(f"Audit Query ({'indexed' if indexed else 'scan'})")
+        return bench.run(lambda: query_audit_logs(query), iterations=iterations)
+    finally:
+        reset_config()
+        shutil.rmtree(tmpdir, ignore_errors=True)
+
+
+def benchmark_audit_scan(iterations: int = 5, workers: int = 1) -> Dict[str, Any]:
+    """
+    Benchmark query_all_logs over 40,000 events spread across rotated logs.
+
+    Args:
+        iterations: Number of iterations to run
+        workers: Worker processes (1 = serial scan)
+
+    Returns:
+        Benchmark results
+    """
+    import shutil
+    import tempfile
+
+    from nuaa_cli.audit import AuditConfig, AuditEvent, AuditLogger, AuditQuery, EventType, query_all_logs
+    from nuaa_cli.audit.config import reset_config, set_config
+
+    tmpdir = Path(tempfile.mkdtemp())
+    config = AuditConfig(audit_dir=tmpdir, buffered=True, max_file_size=1024**2, max_files=40, parallel_min_bytes=0)
+    logger = AuditLogger(config)
+    for i in range(40000):
+        logger.log(AuditEvent(event_type=EventType.DOCUMENT_READ, action="read", username=f"user-{i % 50}"))
+    logger.close()
+    set_config(config)
+    query = AuditQuery(username="user-7")
+
+    try:
+        bench = Benchmark(f"Audit Scan ({'serial' if workers == 1 else 'parallel'})")
+        return bench.run(lambda: query_all_logs(query, workers=workers), iterations=iterations)
+    finally:
+        reset_config()
+        shutil.rmtree(tmpdir, ignore_errors=True)
+
+
+def benchmark_audit_parse(iterations: int = 5, events: int = 100000) -> Dict[str, Any]:
+    """
+    Benchmark bulk parsing of a JSONL audit log into AuditEvent objects.
+
+    Args:
+        iterations: Number of iterations to run
+        events: Number of log lines to parse per iteration
+
+    Returns:
+        Benchmark results
+    """
+    import json
+    import shutil
+    import tempfile
+    from datetime import datetime, timedelta
+
+    from nuaa_cli.audit import AuditEvent, EventType
+    from nuaa_cli.audit.query import _parse_line
+
+    tmpdir = Path(tempfile.mkdtemp())
+    log_file = tmpdir / "audit.log"
+    base = datetime(2025, 1, 1)
+    with open(log_file, "w", encoding="utf-8") as f:
+        for i in range(events):
+            event = AuditEvent(
+                timestamp=base + timedelta(seconds=i),
+                event_type=EventType.DOCUMENT_READ,
+                action="read",
+                username=f"user-{i % 50}",
+                resource_path=f"doc-{i}.md",
+                metadata={"size": i},
+            )
+            f.write(json.dumps(event.to_dict(), sort_keys=True) + "\n")
+
+    def parse_all() -> int:
+        with open(log_file, "rb") as f:
+            return sum(1 for line in f if _parse_line(line) is not None)
+
+    try:
+        return Benchmark("Audit Parse").run(parse_all, iterations=iterations)
+    finally:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+
+
+def benchmark_mcp_validation(iterations: int = 20, compiled: bool = True, calls: int = 10000) -> Dict[str, Any]:
+    """
+    Benchmark MCP tool input validation at high call rates.
+
+    ``compiled=False`` runs the per-call set arithmetic and schema walk that
+    ``MCPToolDescriptor.validate_inputs`` used before validators were
+    compiled at registration, for comparison.
+
+    Args:
+        iterations: Number of iterations to run
+        compiled: Use the validator compiled by ``compile_validator``
+        calls: Validations per iteration
+
+    Returns:
+        Benchmark results
+    """
+    from nuaa_cli.mcp import MCPToolDescriptor, ToolValidationError
+
+    schema = {"query": str, "limit": int, "tags": list, "include_drafts": bool}
+    inputs = {"query": "naloxone distribution", "limit": 10, "tags": ["harm-reduction"], "include_drafts": False}
+    descriptor = MCPToolDescriptor(name="search", description="Search", input_schema=schema, handler=lambda i: None)
+    descriptor.compile_validator()
+
+    def walk_schema(inputs: Dict[str, Any]) -> None:
+        missing = set(schema.keys()) - set(inputs.keys())
+        if missing:
+            raise ToolValidationError(f"Missing required parameters: {', '.join(missing)}")
+        extra = set(inputs.keys()) - set(schema.keys())
+        if extra:
+            raise ToolValidationError(f"Unexpected parameters: {', '.join(extra)}")
+        for param_name, expected_type in schema.items():
+            if not isinstance(inputs[param_name], expected_type):
+                raise ToolValidationError(f"Parameter '{param_name}' expected {expected_type.__name__}")
+
+    validate = descriptor.validate_inputs if compiled else walk_schema
+
+    def validate_many():
+        for _ in range(calls):
+            validate(inputs)
+
+    bench = Benchmark(f"MCP Validation ({'compiled' if compiled else 'schema walk'})")
+    return bench.run(validate_many, iterations=iterations)
+
+
+def _a2a_echo(message: Any) -> Any:
+    # Module level so spawned worker processes can import it
+    return message.content
+
+
+def benchmark_a2a_throughput(iterations: int = 5, transport: str = "", messages: int = 2000) -> Dict[str, Any]:
+    """
+    Benchmark A2A request/reply throughput.
+
+    Sends ``messages`` requests one after another through
+    ``A2ACoordinator.send`` to an agent handled in this process
+    (``transport=""``) or in a worker process behind a ``SocketTransport``
+    (``"socket"``) or ``QueueTransport`` (``"queue"``). Worker start-up is
+    not timed.
+
+    Args:
+        iterations: Number of iterations to run
+        transport: "", "socket" or "queue"
+        messages: Messages sent per iteration
+
+    Returns:
+        Benchmark results, including ``messages_per_second``
+    """
+    from nuaa_cli.a2a import A2AAgent, A2ACoordinator, A2AMessage, QueueTransport, SocketTransport
+
+    transports = {"socket": SocketTransport, "queue": QueueTransport}
+    remote = transports[transport]() if transport else None
+    agent = A2AAgent(id="echo", name="Echo", capabilities=["echo"], message_handler=_a2a_echo)
+    coordinator = A2ACoordinator()
+    coordinator.register(remote.spawn(agent) if remote else agent)
+    content = {"action": "review", "params": {"section": "outcomes", "round": 1}}
+
+    def send_many():
+        for _ in range(messages):
+            coordinator.send(A2AMessage(from_agent="bench", to_agent="echo", content=content))
+
+    bench = Benchmark(f"A2A Throughput ({transport or 'in-process'})")
+    try:
+        result = bench.run(send_many, iterations=iterations)
+    finally:
+        if remote:
+            remote.close()
+    result["messages_per_second"] = messages / result["mean"]
+    return result
+
+
 def benchmark_slugify(iterations: int = 100) -> Dict[str, Any]:
     """
     Benchmark slugify performance.
@@ -251,6 +508,19 @@ def run_all_benchmarks(iterations: int = 10) -> BenchmarkSuite:
         ("Input Validation", benchmark_input_validation, 100),
         ("JSON Merge", benchmark_json_merge, 50),
         ("Template Loading", benchmark_template_loading, 10),
+        ("Template Rendering", benchmark_template_rendering, 100),
+        ("Audit Logging (direct)", benchmark_audit_logging, 20),
+        ("Audit Logging (buffered)", lambda iterations: benchmark_audit_logging(iterations, buffered=True), 20),
+        ("Audit Query (scan)", benchmark_audit_query, 20),
+        ("Audit Query (indexed)", lambda iterations: benchmark_audit_query(iterations, indexed=True), 20),
+        ("Audit Scan (serial)", benchmark_audit_scan, 5),
+        ("Audit Scan (parallel)", lambda iterations: benchmark_audit_scan(iterations, workers=0), 5),
+        ("Audit Parse", benchmark_audit_parse, 5),
+        ("MCP Validation (schema walk)", lambda iterations: benchmark_mcp_validation(iterations, compiled=False), 20),
+        ("MCP Validation (compiled)", benchmark_mcp_validation, 20),
+        ("A2A Throughput (in-process)", benchmark_a2a_throughput, 5),
+        ("A2A Throughput (socket)", lambda iterations: benchmark_a2a_throughput(iterations, transport="socket"), 5),
+        ("A2A Throughput (queue)", lambda iterations: benchmark_a2a_throughput(iterations, transport="queue"), 5),
     ]
 
     for name, func, iters in benchmarks:
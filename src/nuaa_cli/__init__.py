@@ -27,77 +27,67 @@ Or install globally (via package name):
 Legacy alias: the "specify" command still works for backwards compatibility.
 """
 
-import os
-import subprocess
-import sys
-import zipfile
-import tempfile
-import shutil
-import shlex
 import json
+import sys
+from importlib import import_module
 from pathlib import Path
-from typing import Optional, Tuple
-import re
-from datetime import datetime, timezone
+from typing import Any
 
 import typer
-import httpx
-from rich.console import Console
-from rich.panel import Panel
-from rich.progress import Progress, SpinnerColumn, TextColumn
-from rich.text import Text
-from rich.live import Live
 from rich.align import Align
-from rich.table import Table
-from rich.tree import Tree
-from typer.core import TyperGroup
-
-# For cross-platform keyboard input
-import readchar
-import ssl
-import truststore
-
-ssl_context = truststore.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
-from .utils import StepTracker, check_tool
+from rich.console import Console
 
-# Import from new modularized components
+from .agent_config import AgentConfig, load_agent_config
 from .banner import BannerGroup, show_banner
-from .ui import get_key, select_with_arrows
-from .git_utils import run_command, is_git_repo, init_git_repo
-from .scripts import ensure_executable_scripts
-from .download import (
-    download_template_from_github,
-    download_and_extract_template,
-    handle_vscode_settings,
-    merge_json_files,
-)
-
-
-from .scaffold import (
-    _slugify,
-    _find_templates_root,
-    _ensure_nuaa_root,
-    _next_feature_dir,
-    _find_feature_dir_by_program,
-    _load_template,
-    _apply_replacements,
-    _prepend_metadata,
-    _write_markdown,
-    _stamp,
-)
-
+from .command_registry import COMMAND_MANIFEST, CommandRegistry, lazy_group
 from .logging_config import get_logger
 
 # Get logger for command registration
 _logger = get_logger("cli")
 
-
-def _load_agent_config() -> dict:
-    """Load agent configuration from the agents.json file."""
+# Names historically re-exported from this module. They are resolved on first
+# attribute access so that importing ``nuaa_cli`` does not pull in httpx,
+# truststore, readchar or the template machinery.
+_LAZY_EXPORTS = {
+    "StepTracker": ".utils",
+    "check_tool": ".utils",
+    "get_key": ".ui",
+    "select_with_arrows": ".ui",
+    "run_command": ".git_utils",
+    "is_git_repo": ".git_utils",
+    "init_git_repo": ".git_utils",
+    "ensure_executable_scripts": ".scripts",
+    "download_template_from_github": ".download",
+    "download_and_extract_template": ".download",
+    "handle_vscode_settings": ".download",
+    "merge_json_files": ".download",
+    "ssl_context": ".download.template_downloader",
+    "_slugify": ".scaffold",
+    "_find_templates_root": ".scaffold",
+    "_ensure_nuaa_root": ".scaffold",
+    "_next_feature_dir": ".scaffold",
+    "_find_feature_dir_by_program": ".scaffold",
+    "_load_template": ".scaffold",
+    "_apply_replacements": ".scaffold",
+    "_prepend_metadata": ".scaffold",
+    "_write_markdown": ".scaffold",
+    "_stamp": ".scaffold",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def _load_agent_config() -> AgentConfig:
+    """Load agent configuration from the agents.json file (shared, parsed once per process)."""
     try:
-        config_path = Path(__file__).parent / "agents.json"
-        with open(config_path, "r", encoding="utf-8") as f:
-            return json.load(f)
+        return load_agent_config()
     except (FileNotFoundError, json.JSONDecodeError) as e:
         console.print(f"[red]Error loading agent configuration from agents.json:[/red] {e}")
         # Provide a more helpful error message if the file is missing in a packaged context
@@ -108,20 +98,27 @@ def _load_agent_config() -> dict:
         raise typer.Exit(1)
 
 
+console = Console()
+
 # Agent configuration is now loaded from agents.json
 AGENT_CONFIG = _load_agent_config()
 
 SCRIPT_TYPE_CHOICES = {"sh": "POSIX Shell (bash/zsh)", "ps": "PowerShell"}
 
 
-console = Console()
+# Commands live in nuaa_cli/commands/*.py and are imported only when invoked.
+# `nuaa --help` is rendered from COMMAND_MANIFEST without importing them.
+_command_registry = CommandRegistry(
+    COMMAND_MANIFEST,
+    {"agent_config": AGENT_CONFIG, "show_banner": show_banner, "console": console},
+)
 
 app = typer.Typer(
     name="nuaa",
     help="NUAA Project Kit - AI-assisted NGO program management (built on Spec-Driven Development)",
     add_completion=False,
     invoke_without_command=True,
-    cls=BannerGroup,
+    cls=lazy_group(_command_registry),
 )
 
 
@@ -134,212 +131,6 @@ def callback(ctx: typer.Context):
         console.print()
 
 
-## init command now registered from commands/init.py
-
-
-## check command now registered from commands/check.py
-
-
-## design command now registered from commands/design.py
-
-
-## propose command now registered from commands/propose.py
-
-
-## measure command now registered from commands/measure.py
-
-
-## document command now registered from commands/document.py
-
-
-## report command now registered from commands/report.py
-
-
-## refine command now registered from commands/refine.py
-
-
-# Register externalized commands
-# Each command registration is wrapped in a try-except to allow partial functionality
-# if some commands fail to load. Errors are logged for debugging.
-
-try:
-    from .commands.init import register as _register_init
-
-    _register_init(app, show_banner, console)
-except ImportError as e:
-    _logger.warning(f"Failed to register 'init' command (module not found): {e}")
-except Exception as e:
-    _logger.error(f"Failed to register 'init' command: {e}", exc_info=True)
-    # In debug mode, we might want to see these errors immediately
-    if os.getenv("DEBUG") or os.getenv("NUAA_DEBUG"):
-        raise
-
-try:
-    from .commands.version import register as _register_version
-
-    _register_version(app)
-except ImportError as e:
-    _logger.warning(f"Failed to register 'version' command (module not found): {e}")
-except Exception as e:
-    _logger.error(f"Failed to register 'version' command: {e}", exc_info=True)
-    if os.getenv("DEBUG") or os.getenv("NUAA_DEBUG"):
-        raise
-
-try:
-    from .commands.check import register as _register_check
-
-    _register_check(app, AGENT_CONFIG, show_banner, console)
-except ImportError as e:
-    _logger.warning(f"Failed to register 'check' command (module not found): {e}")
-except Exception as e:
-    _logger.error(f"Failed to register 'check' command: {e}", exc_info=True)
-    if os.getenv("DEBUG") or os.getenv("NUAA_DEBUG"):
-        raise
-
-try:
-    from .commands.design import register as _register_design
-
-    _register_design(app, show_banner, console)
-except ImportError as e:
-    _logger.warning(f"Failed to register 'design' command (module not found): {e}")
-except Exception as e:
-    _logger.error(f"Failed to register 'design' command: {e}", exc_info=True)
-    if os.getenv("DEBUG") or os.getenv("NUAA_DEBUG"):
-        raise
-
-try:
-    from .commands.propose import register as _register_propose
-
-    _register_propose(app, show_banner, console)
-except ImportError as e:
-    _logger.warning(f"Failed to register 'propose' command (module not found): {e}")
-except Exception as e:
-    _logger.error(f"Failed to register 'propose' command: {e}", exc_info=True)
-    if os.getenv("DEBUG") or os.getenv("NUAA_DEBUG"):
-        raise
-
-try:
-    from .commands.measure import register as _register_measure
-
-    _register_measure(app, show_banner, console)
-except ImportError as e:
-    _logger.warning(f"Failed to register 'measure' command (module not found): {e}")
-except Exception as e:
-    _logger.error(f"Failed to register 'measure' command: {e}", exc_info=True)
-    if os.getenv("DEBUG") or os.getenv("NUAA_DEBUG"):
-        raise
-
-try:
-    from .commands.document import register as _register_document
-
-    _register_document(app, show_banner, console)
-except ImportError as e:
-    _logger.warning(f"Failed to register 'document' command (module not found): {e}")
-except Exception as e:
-    _logger.error(f"Failed to register 'document' command: {e}", exc_info=True)
-    if os.getenv("DEBUG") or os.getenv("NUAA_DEBUG"):
-        raise
-
-try:
-    from .commands.report import register as _register_report
-
-    _register_report(app, show_banner, console)
-except ImportError as e:
-    _logger.warning(f"Failed to register 'report' command (module not found): {e}")
-except Exception as e:
-    _logger.error(f"Failed to register 'report' command: {e}", exc_info=True)
-    if os.getenv("DEBUG") or os.getenv("NUAA_DEBUG"):
-        raise
-
-try:
-    from .commands.refine import register as _register_refine
-
-    _register_refine(app, show_banner, console)
-except ImportError as e:
-    _logger.warning(f"Failed to register 'refine' command (module not found): {e}")
-except Exception as e:
-    _logger.error(f"Failed to register 'refine' command: {e}", exc_info=True)
-    if os.getenv("DEBUG") or os.getenv("NUAA_DEBUG"):
-        raise
-
-try:
-    from .commands.engage import register as _register_engage
-
-    _register_engage(app, show_banner, console)
-except ImportError as e:
-    _logger.warning(f"Failed to register 'engage' command (module not found): {e}")
-except Exception as e:
-    _logger.error(f"Failed to register 'engage' command: {e}", exc_info=True)
-    if os.getenv("DEBUG") or os.getenv("NUAA_DEBUG"):
-        raise
-
-try:
-    from .commands.partner import register as _register_partner
-
-    _register_partner(app, show_banner, console)
-except ImportError as e:
-    _logger.warning(f"Failed to register 'partner' command (module not found): {e}")
-except Exception as e:
-    _logger.error(f"Failed to register 'partner' command: {e}", exc_info=True)
-    if os.getenv("DEBUG") or os.getenv("NUAA_DEBUG"):
-        raise
-
-try:
-    from .commands.train import register as _register_train
-
-    _register_train(app, show_banner, console)
-except ImportError as e:
-    _logger.warning(f"Failed to register 'train' command (module not found): {e}")
-except Exception as e:
-    _logger.error(f"Failed to register 'train' command: {e}", exc_info=True)
-    if os.getenv("DEBUG") or os.getenv("NUAA_DEBUG"):
-        raise
-
-try:
-    from .commands.event import register as _register_event
-
-    _register_event(app, show_banner, console)
-except ImportError as e:
-    _logger.warning(f"Failed to register 'event' command (module not found): {e}")
-except Exception as e:
-    _logger.error(f"Failed to register 'event' command: {e}", exc_info=True)
-    if os.getenv("DEBUG") or os.getenv("NUAA_DEBUG"):
-        raise
-
-try:
-    from .commands.risk import register as _register_risk
-
-    _register_risk(app, show_banner, console)
-except ImportError as e:
-    _logger.warning(f"Failed to register 'risk' command (module not found): {e}")
-except Exception as e:
-    _logger.error(f"Failed to register 'risk' command: {e}", exc_info=True)
-    if os.getenv("DEBUG") or os.getenv("NUAA_DEBUG"):
-        raise
-
-try:
-    from .commands.webui import register as _register_webui
-
-    _register_webui(app, show_banner, console)
-except ImportError as e:
-    _logger.warning(f"Failed to register 'webui' command (module not found): {e}")
-except Exception as e:
-    _logger.error(f"Failed to register 'webui' command: {e}", exc_info=True)
-    if os.getenv("DEBUG") or os.getenv("NUAA_DEBUG"):
-        raise
-
-try:
-    from .commands.bundle import register as _register_bundle
-
-    _register_bundle(app, show_banner, console)
-except ImportError as e:
-    _logger.warning(f"Failed to register 'bundle' command (module not found): {e}")
-except Exception as e:
-    _logger.error(f"Failed to register 'bundle' command: {e}", exc_info=True)
-    if os.getenv("DEBUG") or os.getenv("NUAA_DEBUG"):
-        raise
-
-
 def main():
     app()
 
@@ -16,6 +16,7 @@ Public API:
     - A2ACoordinator: Main coordinator for agent communication
     - A2AMessage: Message format for agent communication
     - A2AAgent: Agent representation with capabilities
+    - SocketTransport / QueueTransport: Run agent handlers in worker processes
     - register_agent: Register an agent with the coordinator
     - send_message: Send a message to another agent
 
@@ -24,7 +25,15 @@ License: MIT
 """
 
 from .coordinator import A2ACoordinator, A2AAgent, A2AMessage
-from .exceptions import A2AError, AgentNotFoundError, MessageDeliveryError
+from .exceptions import (
+    A2AError,
+    AgentNotFoundError,
+    MailboxFullError,
+    MessageDeliveryError,
+    MessageTimeoutError,
+    RemoteAgentError,
+)
+from .transport import QueueTransport, SocketTransport, Transport
 
 __all__ = [
     "A2ACoordinator",
@@ -33,4 +42,10 @@ __all__ = [
     "A2AError",
     "AgentNotFoundError",
     "MessageDeliveryError",
+    "MessageTimeoutError",
+    "MailboxFullError",
+    "RemoteAgentError",
+    "Transport",
+    "SocketTransport",
+    "QueueTransport",
 ]
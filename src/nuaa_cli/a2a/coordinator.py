@@ -10,8 +10,13 @@ Key Features:
 - Agent registration and discovery
 - Message routing and delivery
 - Event subscription and notification
-- Capability-based agent matching
-- Message queuing and history
+- Capability-based agent matching (capability index, O(matches) lookups)
+- Message queuing and history (ring buffer with filtered queries and an
+  optional JSONL trace file)
+- Asyncio mode: bounded per-agent mailboxes, concurrent fan-out, requests
+  correlated with responses by ``message_id``, timeouts and backpressure
+- Cross-process agents: handlers can run in worker processes through a
+  pluggable transport (see ``nuaa_cli.a2a.transport``)
 
 Example Usage:
     >>> from nuaa_cli.a2a import A2ACoordinator, A2AAgent, A2AMessage
@@ -35,14 +40,23 @@ Example Usage:
     ...     content={"action": "design_program", "params": {...}}
     ... )
     >>> result = coordinator.send(message)
+    >>>
+    >>> # From asyncio: each agent works through its own mailbox
+    >>> result = await coordinator.asend(message, timeout=5.0)
+    >>> responses = await coordinator.abroadcast(event, capability="review")
 
 Author: NUAA Project
 License: MIT
 """
 
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, Callable, Optional
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional, Union
 from uuid import uuid4
 
 from .exceptions import (
@@ -50,7 +64,12 @@ from .exceptions import (
     AgentRegistrationError,
     InvalidMessageError,
     MessageDeliveryError,
+    MessageTimeoutError,
 )
+from .history import MessageHistory
+from .mailbox import Mailbox
+
+logger = logging.getLogger(__name__)
 
 
 @dataclass
@@ -97,7 +116,8 @@ class A2AAgent:
         id: Unique agent identifier
         name: Human-readable agent name
         capabilities: List of capabilities/actions the agent can perform
-        message_handler: Callable that processes incoming messages
+        message_handler: Callable that processes incoming messages (may be
+            ``async`` when the agent is reached through the coroutine API)
         description: Optional agent description
         metadata: Optional additional metadata
     """
@@ -117,22 +137,65 @@ class A2ACoordinator:
     Manages agent registration, message routing, and event delivery.
     Provides a central message bus for multi-agent coordination.
 
+    An agent's capabilities are indexed when it is registered; unregister
+    and register it again to change them.
+
+    ``send()`` and ``broadcast()`` run handlers inline in the caller's
+    thread. The coroutine API delivers through one bounded mailbox per
+    agent instead: each agent handles its messages in order on its own
+    worker task (sync handlers in a thread of the agent's own, or in a
+    shared pool of ``handler_threads``), so ``abroadcast()`` takes as long
+    as the slowest recipient rather than the sum of all of them.
+    ``arequest()`` waits for the response whose ``reply_to`` matches the
+    request's ``message_id``: the handler's return value, or a ``response``
+    message the recipient posts with ``apost()``. A full mailbox makes
+    senders wait, up to the timeout, then raises MailboxFullError.
+    The coroutine API is meant to be used from a single event loop.
+
     Attributes:
         _agents: Dictionary mapping agent IDs to agent instances
-        _message_history: List of recent messages (configurable max size)
-        _max_history: Maximum number of messages to keep in history
+        _capability_index: Capability -> {agent ID: agent}, in registration order
+        _message_history: Ring buffer of recent messages (see MessageHistory)
     """
 
-    def __init__(self, max_history: int = 100):
+    def __init__(
+        self,
+        max_history: int = 100,
+        mailbox_size: int = 100,
+        timeout: Optional[float] = None,
+        history_sink: Optional[Union[str, Path]] = None,
+        handler_threads: Optional[int] = None,
+    ):
         """
         Initialize the A2A coordinator.
 
         Args:
             max_history: Maximum number of messages to keep in history
+            mailbox_size: Messages that may wait for each agent in asyncio
+                mode before senders are held back (0 = unbounded)
+            timeout: Default seconds the coroutine API waits for mailbox room
+                and a response (None = no limit)
+            history_sink: Optional JSONL file that receives every recorded
+                message, for a full trace beyond ``max_history``
+            handler_threads: Threads shared by the sync handlers of all agents
+                in asyncio mode (default: one thread per agent, so every
+                agent can work at once)
         """
+        if mailbox_size < 0:
+            raise ValueError(f"mailbox_size must not be negative, got {mailbox_size}")
+        if handler_threads is not None and handler_threads < 1:
+            raise ValueError(f"handler_threads must be at least 1, got {handler_threads}")
         self._agents: dict[str, A2AAgent] = {}
-        self._message_history: list[A2AMessage] = []
-        self._max_history = max_history
+        self._capability_index: dict[str, dict[str, A2AAgent]] = {}
+        self._message_history = MessageHistory(max_history, sink=history_sink)
+        self._mailbox_size = mailbox_size
+        self._timeout = timeout
+        # Asyncio mode state, bound to the loop that created it
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._mailboxes: dict[str, Mailbox] = {}
+        self._pending: dict[str, tuple[str, asyncio.Future]] = {}
+        self._handler_threads = handler_threads
+        self._executor: Optional[ThreadPoolExecutor] = None
 
     def register(self, agent: A2AAgent) -> None:
         """
@@ -151,6 +214,8 @@ class A2ACoordinator:
             raise AgentRegistrationError(f"Agent '{agent.id}' is already registered")
 
         self._agents[agent.id] = agent
+        for capability in agent.capabilities:
+            self._capability_index.setdefault(capability, {})[agent.id] = agent
 
     def unregister(self, agent_id: str) -> None:
         """
@@ -165,7 +230,14 @@ class A2ACoordinator:
         if agent_id not in self._agents:
             raise AgentNotFoundError(f"Agent '{agent_id}' is not registered")
 
-        del self._agents[agent_id]
+        agent = self._agents.pop(agent_id)
+        for capability in agent.capabilities:
+            capable = self._capability_index.get(capability)
+            if capable is not None:
+                capable.pop(agent_id, None)
+                if not capable:
+                    del self._capability_index[capability]
+        self._stop_mailboxes([agent_id])
 
     def send(self, message: A2AMessage) -> Any:
         """
@@ -210,21 +282,50 @@ class A2ACoordinator:
             capability: Optional capability filter
 
         Returns:
-            Dictionary mapping agent IDs to their responses
+            Dictionary mapping agent IDs to their responses, or to
+            ``{"error": ...}`` for recipients that failed or, in a worker
+            process, did not answer within their transport's timeout
         """
+        from .transport import RemoteHandler  # transport imports this module
+
         responses = {}
+        submitted = {}
+        # Remote timeouts all count from here, so a broadcast to several
+        # hung workers waits one timeout, not one per worker
+        started = time.monotonic()
+
+        for agent_id, agent_message in self._broadcast_copies(message, capability):
+            handler = self._agents[agent_id].message_handler
+            # Handlers in worker processes take the message now and are
+            # collected below, so remote recipients work in parallel
+            try:
+                if isinstance(handler, RemoteHandler):
+                    submitted[agent_id] = (handler, handler.submit(agent_message), agent_message)
+                    responses[agent_id] = None  # Keeps recipient order
+                else:
+                    responses[agent_id] = handler(agent_message)
+            except Exception as e:
+                responses[agent_id] = {"error": str(e)}
+
+        for agent_id, (handler, future, agent_message) in submitted.items():
+            try:
+                responses[agent_id] = handler.result(future, agent_message, started)
+            except Exception as e:
+                responses[agent_id] = {"error": str(e)}
 
-        for agent_id, agent in self._agents.items():
+        return responses
+
+    def _broadcast_copies(self, message: A2AMessage, capability: Optional[str]) -> Iterator[tuple[str, A2AMessage]]:
+        """Yield a copy of ``message`` for each broadcast recipient."""
+        recipients = self._capability_index.get(capability, {}) if capability else self._agents
+
+        for agent_id in list(recipients):
             # Skip sender
             if agent_id == message.from_agent:
                 continue
 
-            # Filter by capability if specified
-            if capability and capability not in agent.capabilities:
-                continue
-
             # Create copy of message for this recipient
-            agent_message = A2AMessage(
+            yield agent_id, A2AMessage(
                 from_agent=message.from_agent,
                 to_agent=agent_id,
                 content=message.content,
@@ -234,17 +335,229 @@ class A2ACoordinator:
                 metadata=message.metadata,
             )
 
-            try:
-                responses[agent_id] = agent.message_handler(agent_message)
-            except Exception as e:
-                responses[agent_id] = {"error": str(e)}
+    async def asend(self, message: A2AMessage, timeout: Optional[float] = None) -> Any:
+        """
+        Send a message through the recipient's mailbox and return the response.
+
+        The coroutine counterpart of ``send()``.
+
+        Args:
+            message: Message to send
+            timeout: Seconds to wait for mailbox room and the response
+                (default: the coordinator's ``timeout``)
+
+        Returns:
+            Response content (the handler's return value, or the content of
+            the response message the recipient posted)
+
+        Raises:
+            AgentNotFoundError: If recipient agent is not registered
+            MessageDeliveryError: If the handler fails
+            MailboxFullError: If the mailbox stays full for the whole timeout
+            MessageTimeoutError: If no response arrives in time
+        """
+        response = await self.arequest(message, timeout)
+        return response.content
+
+    async def arequest(self, message: A2AMessage, timeout: Optional[float] = None) -> A2AMessage:
+        """
+        Send a message and wait for the response correlated with its ``message_id``.
+
+        Args:
+            message: Message to send
+            timeout: Seconds to wait for mailbox room and the response
+                (default: the coordinator's ``timeout``)
+
+        Returns:
+            Response message with ``reply_to`` set to ``message.message_id``
+
+        Raises:
+            AgentNotFoundError: If recipient agent is not registered
+            InvalidMessageError: If a request with the same ``message_id`` is
+                already waiting for its response
+            MessageDeliveryError: If the handler fails
+            MailboxFullError: If the mailbox stays full for the whole timeout
+            MessageTimeoutError: If no response arrives in time
+        """
+        return await self._request(message, timeout, record=True)
 
+    async def apost(self, message: A2AMessage, timeout: Optional[float] = None) -> None:
+        """
+        Deliver a message without waiting for it to be handled.
+
+        A ``response`` message whose ``reply_to`` matches a pending request
+        to its ``from_agent`` completes that request instead of being queued,
+        so an agent can answer later than its handler returns.
+
+        Args:
+            message: Message to deliver
+            timeout: Seconds to wait for mailbox room (default: the
+                coordinator's ``timeout``)
+
+        Raises:
+            AgentNotFoundError: If recipient agent is not registered
+            MailboxFullError: If the mailbox stays full for the whole timeout
+        """
+        self._bind_loop()
+        pending = self._pending.get(message.reply_to) if message.message_type == "response" else None
+        if pending is not None and pending[0] == message.from_agent:
+            # Only the agent the request went to may answer it
+            del self._pending[message.reply_to]
+            self._add_to_history(message)
+            if not pending[1].done():
+                pending[1].set_result(message)
+            return
+
+        mailbox = self._mailbox(message.to_agent)
+        self._add_to_history(message)
+        await mailbox.put(message, self._timeout if timeout is None else timeout)
+
+    async def abroadcast(
+        self, message: A2AMessage, capability: Optional[str] = None, timeout: Optional[float] = None
+    ) -> dict[str, Any]:
+        """
+        Broadcast a message to all agents (or those with specific capability) concurrently.
+
+        The coroutine counterpart of ``broadcast()``: every recipient works on
+        its copy at the same time.
+
+        Args:
+            message: Message to broadcast
+            capability: Optional capability filter
+            timeout: Seconds each recipient may take (default: the
+                coordinator's ``timeout``)
+
+        Returns:
+            Dictionary mapping agent IDs to their responses, or to
+            ``{"error": ...}`` for recipients that failed or timed out
+        """
+        copies = list(self._broadcast_copies(message, capability))
+        results = await asyncio.gather(
+            *(self._request(copy, timeout, record=False) for _, copy in copies), return_exceptions=True
+        )
+
+        responses = {}
+        for (agent_id, _), result in zip(copies, results):
+            if isinstance(result, A2AMessage):
+                responses[agent_id] = result.content
+            elif isinstance(result, Exception):
+                responses[agent_id] = {"error": str(result.__cause__ or result)}
+            else:
+                raise result  # Cancellation
         return responses
 
+    async def aclose(self) -> None:
+        """Stop every mailbox worker and fail requests still waiting for a response."""
+        loop = asyncio.get_running_loop()
+        mailboxes = list(self._mailboxes.values()) if self._loop is loop else []
+        self._stop_mailboxes(list(self._mailboxes))
+        for mailbox in mailboxes:
+            await mailbox.close()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    async def _request(self, message: A2AMessage, timeout: Optional[float], record: bool) -> A2AMessage:
+        timeout = self._timeout if timeout is None else timeout
+        loop = self._bind_loop()
+        if message.message_id in self._pending:
+            raise InvalidMessageError(f"Message '{message.message_id}' is already waiting for a response")
+
+        mailbox = self._mailbox(message.to_agent)
+        if record:
+            self._add_to_history(message)
+
+        future = loop.create_future()
+        self._pending[message.message_id] = (message.to_agent, future)
+        deadline = None if timeout is None else loop.time() + timeout
+        try:
+            await mailbox.put(message, timeout)
+            remaining = None if deadline is None else max(0.0, deadline - loop.time())
+            return await asyncio.wait_for(future, remaining)
+        except asyncio.TimeoutError:
+            raise MessageTimeoutError(
+                f"Agent '{message.to_agent}' did not answer message '{message.message_id}' within {timeout}s"
+            ) from None
+        finally:
+            entry = self._pending.get(message.message_id)
+            if entry is not None and entry[1] is future:
+                del self._pending[message.message_id]
+
+    def _bind_loop(self) -> asyncio.AbstractEventLoop:
+        """Return the running loop, resetting asyncio state left over from a previous loop."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Workers and futures belong to the loop that created them
+            self._loop, self._mailboxes, self._pending = loop, {}, {}
+        return loop
+
+    def _mailbox(self, agent_id: str) -> Mailbox:
+        """Return (creating if needed) the mailbox of a registered agent."""
+        if agent_id not in self._agents:
+            raise AgentNotFoundError(
+                f"Recipient agent '{agent_id}' not found. " f"Available agents: {', '.join(self._agents.keys())}"
+            )
+        mailbox = self._mailboxes.get(agent_id)
+        if mailbox is None:
+            if self._handler_threads is not None and self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self._handler_threads, thread_name_prefix="a2a")
+            mailbox = Mailbox(self._agents[agent_id], self._mailbox_size, self._complete, self._executor)
+            self._mailboxes[agent_id] = mailbox
+        return mailbox
+
+    def _complete(self, message: A2AMessage, result: Any, error: Optional[BaseException]) -> None:
+        """Answer the request waiting on ``message`` (called by mailbox workers)."""
+        entry = self._pending.pop(message.message_id, None)
+        if entry is None or entry[1].done():
+            if error is not None:
+                logger.warning(f"Agent '{message.to_agent}' failed to handle message '{message.message_id}': {error}")
+            return
+
+        future = entry[1]
+        if error is not None:
+            failure = MessageDeliveryError(f"Failed to deliver message to '{message.to_agent}': {str(error)}")
+            failure.__cause__ = error
+            future.set_exception(failure)
+        else:
+            future.set_result(
+                A2AMessage(
+                    from_agent=message.to_agent,
+                    to_agent=message.from_agent,
+                    content=result,
+                    message_type="response",
+                    reply_to=message.message_id,
+                )
+            )
+
+    def _stop_mailboxes(self, agent_ids: list[str]) -> None:
+        """Cancel the workers of ``agent_ids`` and fail requests still waiting on them."""
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            self._mailboxes.clear()
+            self._pending.clear()
+            return
+
+        agents = set(agent_ids)
+        mailboxes = [self._mailboxes.pop(agent_id) for agent_id in agent_ids if agent_id in self._mailboxes]
+        waiting = [key for key, (agent_id, _) in self._pending.items() if agent_id in agents]
+        futures = [self._pending.pop(key)[1] for key in waiting]
+
+        def stop() -> None:
+            for mailbox in mailboxes:
+                mailbox.cancel()
+            for future in futures:
+                if not future.done():
+                    future.set_exception(MessageDeliveryError("Recipient agent was unregistered or closed"))
+
+        loop.call_soon_threadsafe(stop)
+
     def find_agents(self, capability: str, exclude: Optional[list[str]] = None) -> list[A2AAgent]:
         """
         Find agents with a specific capability.
 
+        Uses the capability index, so the cost depends on the number of
+        matching agents rather than on the number registered.
+
         Args:
             capability: Capability to search for
             exclude: Optional list of agent IDs to exclude
@@ -252,17 +565,14 @@ class A2ACoordinator:
         Returns:
             List of matching agents
         """
-        exclude = exclude or []
-        matching = []
-
-        for agent_id, agent in self._agents.items():
-            if agent_id in exclude:
-                continue
+        capable = self._capability_index.get(capability)
+        if not capable:
+            return []
+        if not exclude:
+            return list(capable.values())
 
-            if capability in agent.capabilities:
-                matching.append(agent)
-
-        return matching
+        excluded = set(exclude)
+        return [agent for agent_id, agent in capable.items() if agent_id not in excluded]
 
     def list_agents(self) -> list[A2AAgent]:
         """
@@ -303,38 +613,66 @@ class A2ACoordinator:
 
         return self._agents[agent_id]
 
-    def get_history(self, limit: Optional[int] = None) -> list[A2AMessage]:
+    def get_history(
+        self,
+        limit: Optional[int] = None,
+        agent: Optional[str] = None,
+        message_type: Optional[str] = None,
+        since: Optional[Union[datetime, str]] = None,
+        until: Optional[Union[datetime, str]] = None,
+    ) -> list[A2AMessage]:
         """
         Get message history.
 
+        Filters are applied while walking the history, so only matching
+        messages are copied into the result.
+
         Args:
             limit: Optional limit on number of messages to return
+            agent: Only messages sent by or to this agent
+            message_type: Only messages of this type
+            since: Only messages with a timestamp at or after this time
+            until: Only messages with a timestamp before this time
 
         Returns:
             List of recent messages (newest first)
         """
-        history = list(reversed(self._message_history))
-        if limit:
-            return history[:limit]
-        return history
+        return self._message_history.query(limit, agent, message_type, since, until)
+
+    def iter_history(
+        self,
+        agent: Optional[str] = None,
+        message_type: Optional[str] = None,
+        since: Optional[Union[datetime, str]] = None,
+        until: Optional[Union[datetime, str]] = None,
+    ) -> Iterator[A2AMessage]:
+        """
+        Iterate over message history (newest first) without copying it.
+
+        Takes the same filters as ``get_history``. Do not send messages
+        while the iterator is in use.
+        """
+        return self._message_history.iter(agent, message_type, since, until)
 
     def clear_history(self) -> None:
-        """Clear message history."""
+        """Clear message history (the history sink file is kept)."""
         self._message_history.clear()
 
+    def close(self) -> None:
+        """Close the history sink file, if any."""
+        self._message_history.close()
+
     def count_agents(self) -> int:
         """Return the number of registered agents."""
         return len(self._agents)
 
     def clear(self) -> None:
         """Clear all agents and message history."""
+        self._stop_mailboxes(list(self._agents))
         self._agents.clear()
+        self._capability_index.clear()
         self._message_history.clear()
 
     def _add_to_history(self, message: A2AMessage) -> None:
-        """Add message to history, maintaining max size."""
+        """Add message to history; the oldest message drops out once it is full."""
         self._message_history.append(message)
-
-        # Trim history if needed
-        if len(self._message_history) > self._max_history:
-            self._message_history = self._message_history[-self._max_history :]
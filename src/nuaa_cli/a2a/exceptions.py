@@ -35,3 +35,21 @@ class InvalidMessageError(A2AError):
     """Raised when message format is invalid."""
 
     pass
+
+
+class MessageTimeoutError(MessageDeliveryError):
+    """Raised when an agent does not answer a request in time."""
+
+    pass
+
+
+class MailboxFullError(MessageDeliveryError):
+    """Raised when a recipient's mailbox stays full for longer than allowed."""
+
+    pass
+
+
+class RemoteAgentError(MessageDeliveryError):
+    """Raised when an agent running in a worker process fails or exits."""
+
+    pass
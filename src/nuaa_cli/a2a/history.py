@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+A2A Message History
+===================
+
+Bounded record of the messages that passed through an ``A2ACoordinator``.
+
+Messages are kept in a ring buffer (``collections.deque(maxlen=...)``):
+appending is O(1) and the oldest message falls out once the buffer is full,
+instead of the whole list being re-sliced on every send. Queries walk the
+buffer from the newest message and stop as soon as ``limit`` matches are
+found, so filtering by agent, message type or time window never copies the
+buffer.
+
+Long runs that need a full trace can name a JSONL sink. Every recorded
+message is also appended to that file, one JSON object per line, so the
+trace is complete while memory stays bounded.
+
+Example:
+    >>> history = MessageHistory(maxlen=1000, sink="a2a-trace.jsonl")
+    >>> history.append(message)
+    >>> recent = history.query(limit=10, agent="design-agent", message_type="request")
+    >>> history.close()
+"""
+
+import json
+import logging
+from collections import deque
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+from typing import IO, Any, Iterator, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+
+class MessageHistory:
+    """
+    Fixed-capacity message history with an optional JSONL sink.
+
+    Args:
+        maxlen: Messages kept in memory
+        sink: Optional JSONL file every message is appended to
+    """
+
+    def __init__(self, maxlen: int, sink: Optional[Union[str, Path]] = None):
+        if maxlen < 0:
+            raise ValueError(f"max_history must not be negative, got {maxlen}")
+        self._messages: deque = deque(maxlen=maxlen)
+        self.sink_path = Path(sink) if sink is not None else None
+        self._sink: Optional[IO[str]] = None
+
+    def __len__(self) -> int:
+        return len(self._messages)
+
+    def append(self, message: Any) -> None:
+        """Record a message, dropping the oldest one if the buffer is full."""
+        self._messages.append(message)
+        if self.sink_path is not None:
+            self._write(message)
+
+    def query(
+        self,
+        limit: Optional[int] = None,
+        agent: Optional[str] = None,
+        message_type: Optional[str] = None,
+        since: Optional[Union[datetime, str]] = None,
+        until: Optional[Union[datetime, str]] = None,
+    ) -> list:
+        """
+        Recorded messages matching every given filter, newest first.
+
+        Args:
+            limit: Return at most this many messages
+            agent: Only messages sent by or to this agent
+            message_type: Only messages of this type
+            since: Only messages with a timestamp at or after this time
+            until: Only messages with a timestamp before this time
+
+        Returns:
+            Matching messages, newest first
+        """
+        return list(islice(self.iter(agent, message_type, since, until), limit or None))
+
+    def iter(
+        self,
+        agent: Optional[str] = None,
+        message_type: Optional[str] = None,
+        since: Optional[Union[datetime, str]] = None,
+        until: Optional[Union[datetime, str]] = None,
+    ) -> Iterator:
+        """
+        Iterate over matching messages, newest first, without copying the buffer.
+
+        Do not record messages while the iterator is in use.
+        """
+        low = _isoformat(since)
+        high = _isoformat(until)
+        for message in reversed(self._messages):
+            if agent is not None and message.from_agent != agent and message.to_agent != agent:
+                continue
+            if message_type is not None and message.message_type != message_type:
+                continue
+            if low is not None and message.timestamp < low:
+                continue
+            if high is not None and message.timestamp >= high:
+                continue
+            yield message
+
+    def clear(self) -> None:
+        """Forget the messages held in memory (the sink file is kept)."""
+        self._messages.clear()
+
+    def close(self) -> None:
+        """Close the sink file; it is reopened if another message is recorded."""
+        if self._sink is not None:
+            self._sink.close()
+            self._sink = None
+
+    def _write(self, message: Any) -> None:
+        """Append a message to the sink; a failing sink never stops delivery."""
+        record = {
+            "message_id": message.message_id,
+            "timestamp": message.timestamp,
+            "message_type": message.message_type,
+            "from_agent": message.from_agent,
+            "to_agent": message.to_agent,
+            "reply_to": message.reply_to,
+            "content": message.content,
+            "metadata": message.metadata,
+        }
+        try:
+            if self._sink is None:
+                self.sink_path.parent.mkdir(parents=True, exist_ok=True)
+                # Line buffered: each message reaches the file as it is recorded
+                self._sink = open(self.sink_path, "a", encoding="utf-8", buffering=1)
+            self._sink.write(json.dumps(record, default=str) + "\n")
+        except (OSError, TypeError, ValueError) as e:
+            # TypeError/ValueError: content json cannot encode (tuple keys, cycles)
+            logger.warning(f"Failed to write A2A message history to {self.sink_path}: {e}")
+
+
+def _isoformat(value: Optional[Union[datetime, str]]) -> Optional[str]:
+    """Message timestamps are ISO 8601 strings, which sort chronologically."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
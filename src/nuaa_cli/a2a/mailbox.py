@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+A2A Agent Mailboxes
+===================
+
+Asyncio delivery for ``A2ACoordinator``'s coroutine API (``asend``,
+``arequest``, ``apost``, ``abroadcast``).
+
+Each agent gets a ``Mailbox``: a bounded ``asyncio.Queue`` drained by one
+worker task, so an agent handles its messages one at a time and in order
+while different agents work concurrently. Async handlers are awaited on the
+event loop; plain handlers run in a thread so a slow handler never blocks
+the loop. By default each mailbox has a thread of its own (an agent only
+runs one handler at a time, so it never needs more), rather than sharing
+the loop's default executor, whose few threads would serialise a broadcast
+to many sync agents. A full mailbox makes senders wait (backpressure)
+instead of queueing without bound.
+
+The worker reports each outcome to a callback, which the coordinator uses to
+answer the request waiting on that ``message_id``.
+
+Example:
+    >>> mailbox = Mailbox(agent, size=100, on_done=coordinator._complete)
+    >>> await mailbox.put(message, timeout=1.0)
+    >>> await mailbox.close()
+"""
+
+import asyncio
+import inspect
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from .exceptions import MailboxFullError
+
+# on_done(message, result, error)
+DoneCallback = Callable[[Any, Any, Optional[BaseException]], None]
+
+
+class Mailbox:
+    """
+    Bounded message queue and worker task for one agent.
+
+    Must be created and used from the event loop that runs it.
+
+    Args:
+        agent: The A2AAgent whose handler processes the messages
+        size: Messages that may wait in the mailbox (0 = unbounded)
+        on_done: Called with ``(message, result, error)`` after each message
+        executor: Runs a sync handler (default: a one-thread executor owned
+            by this mailbox and shut down with it)
+    """
+
+    def __init__(self, agent: Any, size: int, on_done: DoneCallback, executor: Optional[Executor] = None):
+        self.agent = agent
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=size)
+        self._on_done = on_done
+        self._owns_executor = executor is None
+        self._executor = executor or ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"a2a-{agent.id}")
+        self._task = asyncio.get_running_loop().create_task(self._run(), name=f"a2a-mailbox-{agent.id}")
+
+    async def put(self, message: Any, timeout: Optional[float] = None) -> None:
+        """
+        Queue a message, waiting while the mailbox is full.
+
+        Args:
+            message: A2AMessage for this agent
+            timeout: Seconds to wait for room (None = no limit, 0 = fail at once)
+
+        Raises:
+            MailboxFullError: If there is no room in time
+        """
+        if timeout is not None and timeout <= 0:
+            try:
+                self.queue.put_nowait(message)
+            except asyncio.QueueFull:
+                raise MailboxFullError(f"Mailbox of agent '{self.agent.id}' is full") from None
+            return
+        try:
+            await asyncio.wait_for(self.queue.put(message), timeout)
+        except asyncio.TimeoutError:
+            raise MailboxFullError(f"Mailbox of agent '{self.agent.id}' stayed full for {timeout}s") from None
+
+    async def close(self) -> None:
+        """Stop the worker; queued messages are dropped."""
+        self.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+    def cancel(self) -> None:
+        """Stop the worker without waiting (for use outside a coroutine)."""
+        self._task.cancel()
+        if self._owns_executor:
+            # A handler already running in the thread still finishes
+            self._executor.shutdown(wait=False)
+
+    async def _run(self) -> None:
+        handler = self.agent.message_handler
+        loop = asyncio.get_running_loop()
+        while True:
+            message = await self.queue.get()
+            try:
+                if inspect.iscoroutinefunction(handler):
+                    result = await handler(message)
+                else:
+                    result = await loop.run_in_executor(self._executor, handler, message)
+                    if inspect.isawaitable(result):
+                        result = await result
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._on_done(message, None, e)
+            else:
+                self._on_done(message, result, None)
+            finally:
+                self.queue.task_done()
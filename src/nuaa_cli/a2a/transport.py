@@ -0,0 +1,509 @@
+#!/usr/bin/env python3
+"""
+A2A Cross-Process Transport
+===========================
+
+Runs agent handlers in worker processes, so CPU-bound agents can use every
+core, while the coordinator API stays the same.
+
+``Transport.spawn(agent)`` starts a worker process that runs the agent's
+handler and returns a copy of the agent whose ``message_handler`` is a
+``RemoteHandler``: a callable that forwards each message to the worker and
+returns the worker's reply. The copy is registered with an
+``A2ACoordinator`` like any other agent, and ``send``, ``broadcast`` and the
+coroutine API work unchanged. ``broadcast`` hands a message to every worker
+before waiting for any reply, so remote recipients work in parallel.
+
+Two transports are provided:
+
+- ``SocketTransport``: workers connect to a Unix domain socket owned by the
+  transport (POSIX only).
+- ``QueueTransport``: a pair of ``multiprocessing`` queues per worker
+  (portable).
+
+Frames are length-prefixed (4-byte big-endian length, then the payload).
+Payloads are compact JSON arrays with positional fields rather than keyed
+objects, so message content and handler results must be JSON-serialisable.
+A worker handles one message at a time; requests from several threads are
+pipelined over its connection and matched to replies by sequence number.
+
+Workers are started with the ``spawn`` method by default, so handlers must
+be importable, module-level functions (not lambdas or closures).
+
+Example:
+    >>> from myagents import review_handler  # module-level function
+    >>> with SocketTransport() as transport:
+    ...     coordinator = A2ACoordinator()
+    ...     coordinator.register(transport.spawn(A2AAgent(
+    ...         id="review-agent",
+    ...         name="Review Agent",
+    ...         capabilities=["review"],
+    ...         message_handler=review_handler,
+    ...     )))
+    ...     coordinator.send(message)
+"""
+
+import asyncio
+import dataclasses
+import inspect
+import json
+import multiprocessing
+import os
+import queue
+import shutil
+import socket
+import struct
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Optional
+
+from .coordinator import A2AAgent, A2AMessage
+from .exceptions import AgentRegistrationError, InvalidMessageError, MessageTimeoutError, RemoteAgentError
+
+# Frame header: payload length
+_HEADER = struct.Struct(">I")
+
+# Frame kinds (first element of every payload)
+_HELLO = 0  # worker -> coordinator: [_HELLO, agent_id]
+_REQUEST = 1  # [_REQUEST, seq, message_id, from, to, type, timestamp, reply_to, content, metadata]
+_REPLY = 2  # [_REPLY, seq, result]
+_ERROR = 3  # [_ERROR, seq, "ExceptionType: message"]
+_CLOSE = 4  # [_CLOSE]
+
+# Seconds to wait for a new worker to connect
+CONNECT_TIMEOUT = 30.0
+
+
+def _dumps(frame: list) -> bytes:
+    return json.dumps(frame, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def encode_request(seq: int, message: A2AMessage) -> bytes:
+    """
+    Encode a message as a request frame payload.
+
+    Raises:
+        InvalidMessageError: If content or metadata is not JSON-serialisable
+    """
+    try:
+        return _dumps(
+            [
+                _REQUEST,
+                seq,
+                message.message_id,
+                message.from_agent,
+                message.to_agent,
+                message.message_type,
+                message.timestamp,
+                message.reply_to,
+                message.content,
+                message.metadata,
+            ]
+        )
+    except (TypeError, ValueError) as e:
+        raise InvalidMessageError(f"Message '{message.message_id}' cannot be sent to another process: {e}") from e
+
+
+def decode_request(frame: list) -> tuple[int, A2AMessage]:
+    """Rebuild ``(seq, message)`` from a decoded request frame."""
+    _, seq, message_id, from_agent, to_agent, message_type, timestamp, reply_to, content, metadata = frame
+    message = A2AMessage(
+        from_agent=from_agent,
+        to_agent=to_agent,
+        content=content,
+        message_type=message_type,
+        message_id=message_id,
+        timestamp=timestamp,
+        reply_to=reply_to,
+        metadata=metadata,
+    )
+    return seq, message
+
+
+class _Channel(ABC):
+    """Ordered, framed byte channel between the coordinator and one worker."""
+
+    @abstractmethod
+    def send(self, payload: bytes) -> None:
+        """Send one frame."""
+
+    @abstractmethod
+    def recv(self) -> bytes:
+        """Receive one frame; raises EOFError once the peer is gone."""
+
+    @abstractmethod
+    def close(self) -> None:
+        """Release the channel."""
+
+
+class _SocketChannel(_Channel):
+    def __init__(self, sock: socket.socket):
+        self._sock = sock
+        self._reader = sock.makefile("rb")
+
+    def send(self, payload: bytes) -> None:
+        self._sock.sendall(_HEADER.pack(len(payload)) + payload)
+
+    def recv(self) -> bytes:
+        header = self._reader.read(_HEADER.size)
+        if len(header) < _HEADER.size:
+            raise EOFError("connection closed")
+        (size,) = _HEADER.unpack(header)
+        payload = self._reader.read(size)
+        if len(payload) < size:
+            raise EOFError("connection closed mid-frame")
+        return payload
+
+    def close(self) -> None:
+        try:
+            self._sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self._reader.close()
+        self._sock.close()
+
+
+class _QueueChannel(_Channel):
+    def __init__(self, outbox: Any, inbox: Any, peer: Optional[multiprocessing.process.BaseProcess] = None):
+        self._outbox = outbox
+        self._inbox = inbox
+        self._peer = peer
+
+    def send(self, payload: bytes) -> None:
+        # Queues frame their items themselves; no length prefix needed
+        self._outbox.put(payload)
+
+    def recv(self) -> bytes:
+        while True:
+            try:
+                frame = self._inbox.get(timeout=0.5) if self._peer is not None else self._inbox.get()
+            except queue.Empty:
+                if not self._peer.is_alive():
+                    raise EOFError("worker process exited") from None
+                continue
+            if frame is None:
+                raise EOFError("channel closed")
+            return frame
+
+    def close(self) -> None:
+        try:
+            self._outbox.put(None)
+        except (OSError, ValueError):
+            pass
+
+
+class RemoteHandler:
+    """
+    Message handler that forwards messages to an agent in a worker process.
+
+    Created by ``Transport.spawn``. Safe to call from several threads; calls
+    are pipelined to the worker, which handles them in order.
+
+    Args:
+        agent_id: ID of the remote agent
+        channel: Connection to the worker
+        process: The worker process
+        timeout: Seconds to wait for a reply (None = no limit)
+    """
+
+    def __init__(
+        self,
+        agent_id: str,
+        channel: _Channel,
+        process: multiprocessing.process.BaseProcess,
+        timeout: Optional[float] = None,
+    ):
+        self.agent_id = agent_id
+        self.process = process
+        self.timeout = timeout
+        self._channel = channel
+        self._lock = threading.Lock()
+        self._waiting: dict[int, Future] = {}
+        self._seq = 0
+        self._closed = False
+        self._reader = threading.Thread(target=self._read, name=f"nuaa-a2a-{agent_id}", daemon=True)
+        self._reader.start()
+
+    def __call__(self, message: A2AMessage) -> Any:
+        """Send ``message`` to the worker and return the handler's result."""
+        return self.result(self.submit(message), message)
+
+    def result(self, future: Future, message: A2AMessage, started: Optional[float] = None) -> Any:
+        """
+        Wait for the reply to a message sent with ``submit``.
+
+        Args:
+            future: Future returned by ``submit``
+            message: The message it answers
+            started: ``time.monotonic()`` value the timeout counts from
+                (default: now), so several replies can share one deadline
+
+        Returns:
+            The handler's result
+
+        Raises:
+            MessageTimeoutError: If the reply does not arrive within ``timeout``
+            RemoteAgentError: If the handler failed or the worker died
+        """
+        remaining = None
+        if self.timeout is not None:
+            elapsed = 0.0 if started is None else time.monotonic() - started
+            remaining = max(0.0, self.timeout - elapsed)
+        try:
+            return future.result(remaining)
+        except FutureTimeoutError:
+            raise MessageTimeoutError(
+                f"Agent '{self.agent_id}' did not answer message '{message.message_id}' within {self.timeout}s"
+            ) from None
+
+    def submit(self, message: A2AMessage) -> Future:
+        """
+        Send ``message`` to the worker without waiting.
+
+        Returns:
+            Future resolved with the handler's result, or failed with
+            RemoteAgentError
+
+        Raises:
+            InvalidMessageError: If the message is not JSON-serialisable
+            RemoteAgentError: If the worker is no longer running
+        """
+        future: Future = Future()
+        with self._lock:
+            if self._closed:
+                raise RemoteAgentError(f"Worker process for agent '{self.agent_id}' is not running")
+            self._seq += 1
+            seq = self._seq
+            payload = encode_request(seq, message)
+            self._waiting[seq] = future
+            try:
+                self._channel.send(payload)
+            except (OSError, ValueError) as e:
+                del self._waiting[seq]
+                raise RemoteAgentError(f"Cannot reach worker process for agent '{self.agent_id}': {e}") from e
+        return future
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Ask the worker to finish its current message and exit, then wait for it."""
+        with self._lock:
+            if not self._closed:
+                try:
+                    self._channel.send(_dumps([_CLOSE]))
+                except (OSError, ValueError):
+                    pass
+        self.process.join(timeout)
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join(timeout)
+        self._channel.close()
+        self._reader.join(timeout)
+
+    def _read(self) -> None:
+        try:
+            while True:
+                frame = json.loads(self._channel.recv())
+                with self._lock:
+                    future = self._waiting.pop(frame[1], None)
+                if future is None:
+                    continue
+                if frame[0] == _REPLY:
+                    future.set_result(frame[2])
+                else:
+                    future.set_exception(RemoteAgentError(frame[2]))
+        except (EOFError, OSError, ValueError):
+            pass
+        with self._lock:
+            self._closed = True
+            waiting, self._waiting = list(self._waiting.values()), {}
+        for future in waiting:
+            future.set_exception(RemoteAgentError(f"Worker process for agent '{self.agent_id}' exited"))
+
+
+def _serve(channel: _Channel, agent_id: str, handler: Callable[[A2AMessage], Any]) -> None:
+    """Worker main loop: answer request frames until told to close."""
+    loop: Optional[asyncio.AbstractEventLoop] = None
+    channel.send(_dumps([_HELLO, agent_id]))
+    try:
+        while True:
+            try:
+                frame = json.loads(channel.recv())
+            except EOFError:
+                break
+            if frame[0] == _CLOSE:
+                break
+            seq, message = decode_request(frame)
+            try:
+                result = handler(message)
+                if inspect.isawaitable(result):
+                    loop = loop or asyncio.new_event_loop()
+                    result = loop.run_until_complete(result)
+                payload = _dumps([_REPLY, seq, result])
+            except Exception as e:
+                payload = _dumps([_ERROR, seq, f"{type(e).__name__}: {e}"])
+            channel.send(payload)
+    finally:
+        if loop is not None:
+            loop.close()
+        channel.close()
+
+
+def _serve_socket(path: str, agent_id: str, handler: Callable[[A2AMessage], Any]) -> None:
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.connect(path)
+    _serve(_SocketChannel(sock), agent_id, handler)
+
+
+def _serve_queue(requests: Any, replies: Any, agent_id: str, handler: Callable[[A2AMessage], Any]) -> None:
+    _serve(_QueueChannel(replies, requests), agent_id, handler)
+
+
+class Transport(ABC):
+    """
+    Starts agents in worker processes and connects them to this process.
+
+    Args:
+        timeout: Seconds a remote handler call waits for its reply
+            (None = no limit)
+        start_method: ``multiprocessing`` start method for workers
+    """
+
+    def __init__(self, timeout: Optional[float] = None, start_method: str = "spawn"):
+        self.timeout = timeout
+        self._context = multiprocessing.get_context(start_method)
+        self._handlers: list[RemoteHandler] = []
+        self._lock = threading.Lock()
+
+    def spawn(self, agent: A2AAgent) -> A2AAgent:
+        """
+        Start ``agent``'s handler in a new worker process.
+
+        Args:
+            agent: Agent whose ``message_handler`` is a module-level function
+
+        Returns:
+            Copy of the agent, with a RemoteHandler as ``message_handler`` and
+            the worker's ``process_id`` in its metadata, ready to register
+
+        Raises:
+            AgentRegistrationError: If the worker cannot be started
+        """
+        with self._lock:
+            try:
+                channel, process = self._start(agent)
+            except AgentRegistrationError:
+                raise
+            except Exception as e:
+                raise AgentRegistrationError(
+                    f"Cannot start agent '{agent.id}' in a worker process "
+                    f"(its handler must be a module-level function): {e}"
+                ) from e
+            handler = RemoteHandler(agent.id, channel, process, self.timeout)
+            self._handlers.append(handler)
+        return dataclasses.replace(
+            agent, message_handler=handler, metadata={**agent.metadata, "process_id": process.pid}
+        )
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Stop every worker started by this transport."""
+        with self._lock:
+            handlers, self._handlers = self._handlers, []
+        for handler in handlers:
+            handler.close(timeout)
+
+    def __enter__(self) -> "Transport":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    @abstractmethod
+    def _start(self, agent: A2AAgent) -> tuple[_Channel, multiprocessing.process.BaseProcess]:
+        """Start a worker for ``agent`` and return the connected channel and process."""
+
+    @staticmethod
+    def _handshake(channel: _Channel, agent: A2AAgent, process: multiprocessing.process.BaseProcess) -> None:
+        try:
+            hello = json.loads(channel.recv())
+        except EOFError:
+            hello = None
+        if hello != [_HELLO, agent.id]:
+            process.terminate()
+            channel.close()
+            raise AgentRegistrationError(f"Worker process for agent '{agent.id}' failed to start")
+
+
+class SocketTransport(Transport):
+    """
+    Transport over a Unix domain socket in a private temporary directory.
+
+    Raises:
+        OSError: If Unix domain sockets are not available on this platform
+    """
+
+    def __init__(self, timeout: Optional[float] = None, start_method: str = "spawn"):
+        if not hasattr(socket, "AF_UNIX"):
+            raise OSError("Unix domain sockets are not available on this platform; use QueueTransport")
+        super().__init__(timeout, start_method)
+        self._directory = tempfile.mkdtemp(prefix="nuaa-a2a-")
+        self.path = os.path.join(self._directory, "a2a.sock")
+        self._listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._listener.bind(self.path)
+        self._listener.listen()
+        self._listener.settimeout(0.5)
+
+    def _start(self, agent: A2AAgent) -> tuple[_Channel, multiprocessing.process.BaseProcess]:
+        process = self._context.Process(
+            target=_serve_socket,
+            args=(self.path, agent.id, agent.message_handler),
+            name=f"nuaa-a2a-{agent.id}",
+            daemon=True,
+        )
+        process.start()
+        deadline = time.monotonic() + CONNECT_TIMEOUT
+        while True:
+            try:
+                connection, _ = self._listener.accept()
+                break
+            except socket.timeout:
+                if not process.is_alive() or time.monotonic() > deadline:
+                    process.terminate()
+                    raise AgentRegistrationError(f"Worker process for agent '{agent.id}' did not connect") from None
+        connection.settimeout(None)
+        channel = _SocketChannel(connection)
+        self._handshake(channel, agent, process)
+        return channel, process
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Stop every worker and remove the socket."""
+        super().close(timeout)
+        self._listener.close()
+        shutil.rmtree(self._directory, ignore_errors=True)
+
+
+class QueueTransport(Transport):
+    """Transport over a pair of ``multiprocessing`` queues per worker."""
+
+    def _start(self, agent: A2AAgent) -> tuple[_Channel, multiprocessing.process.BaseProcess]:
+        requests = self._context.Queue()
+        replies = self._context.Queue()
+        process = self._context.Process(
+            target=_serve_queue,
+            args=(requests, replies, agent.id, agent.message_handler),
+            name=f"nuaa-a2a-{agent.id}",
+            daemon=True,
+        )
+        process.start()
+        channel = _QueueChannel(requests, replies, process)
+        self._handshake(channel, agent, process)
+        return channel, process
+
+
+def default_transport(timeout: Optional[float] = None) -> Transport:
+    """Return a SocketTransport where Unix domain sockets exist, else a QueueTransport."""
+    if hasattr(socket, "AF_UNIX"):
+        return SocketTransport(timeout)
+    return QueueTransport(timeout)
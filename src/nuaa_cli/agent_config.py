@@ -0,0 +1,198 @@
+"""
+Shared agent configuration service.
+
+``agents.json`` describes every supported AI assistant. It used to be parsed
+independently by the CLI entry point, ``nuaa init`` and ``nuaa bundle``.
+This module parses it once per process and exposes an immutable, indexed view
+that all callers share.
+
+An optional on-disk cache stores the parsed configuration in ``marshal``
+format under the user cache directory, keyed on the source file's mtime and
+size. Enable it with ``disk_cache=True`` or ``NUAA_AGENT_CONFIG_CACHE=1``.
+
+Example:
+    >>> agents = load_agent_config()
+    >>> agents["claude"]["name"]
+    'Claude Code'
+    >>> agents.by_cli_tool("claude")
+    'claude'
+    >>> agents.mcp_capable()
+    ('claude', ...)
+"""
+
+import hashlib
+import json
+import marshal
+import os
+import threading
+from collections.abc import Iterator, Mapping
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Dict, Optional, Tuple
+
+from platformdirs import user_cache_dir
+
+from .logging_config import get_logger
+
+logger = get_logger("agent_config")
+
+AGENTS_JSON_PATH = Path(__file__).parent / "agents.json"
+
+# Bump when the on-disk cache layout changes
+_DISK_CACHE_VERSION = 1
+
+
+class AgentConfig(Mapping):
+    """
+    Immutable, indexed view over the parsed ``agents.json``.
+
+    Behaves like a read-only ``dict`` of agent key to configuration so existing
+    callers (``.items()``, ``.keys()``, ``.get()``, ``in``) keep working. Each
+    configuration is itself a read-only mapping.
+
+    Indexes are built once at construction:
+
+    - ``by_cli_tool(tool)``: agent key for a CLI executable name
+    - ``mcp_capable()``: agent keys with ``supports_mcp`` set
+    - ``by_protocol(protocol)``: agent keys using a given protocol
+    """
+
+    def __init__(self, data: Dict[str, Dict[str, Any]]):
+        self._agents: Mapping[str, Mapping[str, Any]] = MappingProxyType(
+            {key: MappingProxyType(dict(cfg)) for key, cfg in data.items()}
+        )
+
+        cli_tools: Dict[str, str] = {}
+        protocols: Dict[str, list[str]] = {}
+        mcp: list[str] = []
+        for key, cfg in self._agents.items():
+            tool = cfg.get("cli_tool")
+            if tool:
+                cli_tools.setdefault(tool, key)
+            if cfg.get("supports_mcp"):
+                mcp.append(key)
+            protocols.setdefault(cfg.get("protocol") or "native", []).append(key)
+
+        self._by_cli_tool: Mapping[str, str] = MappingProxyType(cli_tools)
+        self._by_protocol: Mapping[str, Tuple[str, ...]] = MappingProxyType(
+            {protocol: tuple(keys) for protocol, keys in protocols.items()}
+        )
+        self._mcp_capable: Tuple[str, ...] = tuple(mcp)
+
+    def __getitem__(self, key: str) -> Mapping[str, Any]:
+        return self._agents[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._agents)
+
+    def __len__(self) -> int:
+        return len(self._agents)
+
+    def __repr__(self) -> str:
+        return f"AgentConfig({list(self._agents)!r})"
+
+    def by_cli_tool(self, tool: str) -> Optional[str]:
+        """Return the agent key whose ``cli_tool`` is ``tool``, if any."""
+        return self._by_cli_tool.get(tool)
+
+    def mcp_capable(self) -> Tuple[str, ...]:
+        """Return agent keys that support MCP tools, in file order."""
+        return self._mcp_capable
+
+    def by_protocol(self, protocol: str) -> Tuple[str, ...]:
+        """Return agent keys using ``protocol`` (``native``, ``mcp`` or ``a2a``)."""
+        return self._by_protocol.get(protocol, ())
+
+    def to_dict(self) -> Dict[str, Dict[str, Any]]:
+        """Return a mutable deep copy of the configuration."""
+        return {key: dict(cfg) for key, cfg in self._agents.items()}
+
+
+_cache: Dict[Path, Tuple[int, int, AgentConfig]] = {}
+_cache_lock = threading.Lock()
+
+
+def _disk_cache_enabled(disk_cache: Optional[bool]) -> bool:
+    if disk_cache is not None:
+        return disk_cache
+    return os.getenv("NUAA_AGENT_CONFIG_CACHE", "").lower() in ("true", "1", "yes")
+
+
+def _disk_cache_path(source: Path) -> Path:
+    digest = hashlib.sha256(str(source).encode("utf-8")).hexdigest()[:16]
+    return Path(user_cache_dir("nuaa-cli", "NUAA")) / f"agents-{digest}.marshal"
+
+
+def _read_disk_cache(source: Path, mtime_ns: int, size: int) -> Optional[Dict[str, Any]]:
+    cache_path = _disk_cache_path(source)
+    try:
+        with open(cache_path, "rb") as f:
+            payload = marshal.load(f)
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    if not isinstance(payload, tuple) or len(payload) != 4:
+        return None
+    version, cached_mtime, cached_size, data = payload
+    if version != _DISK_CACHE_VERSION or cached_mtime != mtime_ns or cached_size != size:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def _write_disk_cache(source: Path, mtime_ns: int, size: int, data: Dict[str, Any]) -> None:
+    cache_path = _disk_cache_path(source)
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as f:
+            marshal.dump((_DISK_CACHE_VERSION, mtime_ns, size, data), f)
+        os.replace(tmp_path, cache_path)
+    except (OSError, ValueError) as e:
+        # The disk cache is an optimisation only
+        logger.debug(f"Could not write agent config cache {cache_path}: {e}")
+
+
+def load_agent_config(path: Optional[Path] = None, disk_cache: Optional[bool] = None) -> AgentConfig:
+    """
+    Return the shared, parsed agent configuration.
+
+    The file is parsed at most once per process. If it changes on disk
+    (different mtime or size) it is parsed again on the next call.
+
+    Args:
+        path: Path to ``agents.json`` (default: the packaged file)
+        disk_cache: Use the on-disk marshal cache. ``None`` reads
+            ``NUAA_AGENT_CONFIG_CACHE`` from the environment.
+
+    Returns:
+        Immutable ``AgentConfig`` view
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+        json.JSONDecodeError: If the file is not valid JSON
+    """
+    source = Path(path or AGENTS_JSON_PATH).resolve()
+    stat = source.stat()
+    mtime_ns, size = stat.st_mtime_ns, stat.st_size
+
+    with _cache_lock:
+        cached = _cache.get(source)
+        if cached and cached[0] == mtime_ns and cached[1] == size:
+            return cached[2]
+
+        use_disk = _disk_cache_enabled(disk_cache)
+        data = _read_disk_cache(source, mtime_ns, size) if use_disk else None
+        if data is None:
+            with open(source, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if use_disk:
+                _write_disk_cache(source, mtime_ns, size, data)
+
+        config = AgentConfig(data)
+        _cache[source] = (mtime_ns, size, config)
+        return config
+
+
+def clear_agent_config_cache() -> None:
+    """Forget the in-process cache (mainly for tests)."""
+    with _cache_lock:
+        _cache.clear()
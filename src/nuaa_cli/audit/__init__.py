@@ -13,8 +13,28 @@ Features:
 """
 
 from .logger import AuditLogger, get_audit_logger
-from .events import AuditEvent, EventType
-from .query import AuditQuery, query_audit_logs
+from .events import (
+    AuditEvent,
+    EventType,
+    Severity,
+    create_document_event,
+    create_security_event,
+    create_system_event,
+)
+from .query import (
+    AuditQuery,
+    export_to_csv,
+    export_to_json,
+    export_to_jsonl,
+    generate_compliance_report,
+    iter_audit_events,
+    query_all_logs,
+    query_audit_logs,
+)
+from .delivery import AuditDelivery
+from .index import AuditIndex
+from .retention import CompactionReport, compact_logs
+from .report import ComplianceAggregator
 from .config import AuditConfig
 
 __all__ = [
@@ -22,7 +42,22 @@ __all__ = [
     "get_audit_logger",
     "AuditEvent",
     "EventType",
+    "Severity",
+    "create_document_event",
+    "create_system_event",
+    "create_security_event",
     "AuditQuery",
     "query_audit_logs",
+    "query_all_logs",
+    "iter_audit_events",
+    "export_to_json",
+    "export_to_jsonl",
+    "export_to_csv",
+    "generate_compliance_report",
+    "ComplianceAggregator",
+    "AuditIndex",
+    "AuditDelivery",
+    "CompactionReport",
+    "compact_logs",
     "AuditConfig",
 ]
@@ -0,0 +1,99 @@
+"""
+JSON decoding backend for reading audit logs.
+
+Parsing JSONL dominates the cost of scanning, indexing and exporting audit
+logs. ``loads`` uses ``orjson`` or ``msgspec`` when one is installed (both
+are several times faster than the standard library) and falls back to
+``json`` otherwise. The backend can be pinned with ``NUAA_AUDIT_JSON_BACKEND``
+(``auto``, ``json``, ``orjson`` or ``msgspec``); an unavailable or unknown
+choice falls back to ``auto``.
+
+Only reading goes through this module. Log lines are still written with
+``json.dumps(sort_keys=True)``, because their integrity hashes are computed
+over exactly that serialisation. That output is not always strict JSON: it
+may contain ``NaN``/``Infinity`` and integers beyond 64 bits, which the fast
+backends reject or turn into floats. Such lines are decoded with ``json``
+instead, so every backend returns the same events.
+
+Example:
+    >>> from nuaa_cli.audit import codec
+    >>> codec.loads(b'{"event_id": "abc"}')
+    {'event_id': 'abc'}
+"""
+
+import json
+import os
+import re
+from typing import Any, Callable, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+BACKENDS = ("auto", "json", "orjson", "msgspec")
+
+# Exceptions any backend raises for malformed input (orjson's is a ValueError)
+DecodeError: tuple = (ValueError,) if msgspec is None else (ValueError, msgspec.DecodeError)
+
+
+# 20 or more digits in a row: possibly an integer beyond 64 bits
+_LONG_DIGITS = re.compile(r"\d{20}")
+_LONG_DIGITS_BYTES = re.compile(rb"\d{20}")
+
+
+def _with_fallback(fast: Callable[[Union[str, bytes]], Any]) -> Callable[[Union[str, bytes]], Any]:
+    """Wrap a fast decoder so lines it cannot decode exactly go through ``json.loads``."""
+
+    def loads(data: Union[str, bytes]) -> Any:
+        digits = _LONG_DIGITS_BYTES if isinstance(data, (bytes, bytearray)) else _LONG_DIGITS
+        if digits.search(data):
+            return json.loads(data)
+        try:
+            return fast(data)
+        except DecodeError:
+            # NaN/Infinity written by json.dumps; malformed lines raise again here
+            return json.loads(data)
+
+    return loads
+
+
+def _select(name: str) -> tuple[str, Callable[[Union[str, bytes]], Any]]:
+    """Return (backend name, loads function) for a requested backend."""
+    if name in ("auto", "orjson") and orjson is not None:
+        return "orjson", _with_fallback(orjson.loads)
+    if name in ("auto", "msgspec") and msgspec is not None:
+        return "msgspec", _with_fallback(msgspec.json.Decoder().decode)
+    if name in ("orjson", "msgspec"):
+        # Requested backend is not installed
+        return _select("auto")
+    return "json", json.loads
+
+
+def set_backend(name: str = "auto") -> str:
+    """
+    Select the JSON backend used by ``loads``.
+
+    Args:
+        name: One of ``auto``, ``json``, ``orjson`` or ``msgspec``
+
+    Returns:
+        Name of the backend actually in use
+
+    Raises:
+        ValueError: If ``name`` is not a known backend
+    """
+    global backend, loads
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown JSON backend {name!r}; expected one of {', '.join(BACKENDS)}")
+    backend, loads = _select(name)
+    return backend
+
+
+_requested = os.getenv("NUAA_AUDIT_JSON_BACKEND", "auto").lower()
+backend, loads = _select(_requested if _requested in BACKENDS else "auto")
@@ -5,12 +5,26 @@ Manages configuration for the audit logging system including
 storage location, rotation, and retention policies.
 """
 
+import logging
 import os
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Optional, List
 from platformdirs import user_data_dir
 
+# Accepted values for the string options
+_CHOICES = {
+    "fsync_policy": ("never", "batch", "close"),
+    "compression": ("none", "gzip", "zstd"),
+    "syslog_protocol": ("udp", "tcp"),
+    "delivery_policy": ("drop_oldest", "block", "spill"),
+}
+
+
+def _expected(choices: tuple) -> str:
+    quoted = [f"'{choice}'" for choice in choices]
+    return ", ".join(quoted[:-1]) + f" or {quoted[-1]}"
+
 
 @dataclass
 class AuditConfig:
@@ -29,10 +43,34 @@ class AuditConfig:
         syslog_enabled: Whether to send logs to syslog (default: False)
         syslog_host: Syslog server host
         syslog_port: Syslog server port
+        syslog_protocol: Syslog transport, "udp" (default) or "tcp"
         alert_on_critical: Send alerts for critical events (default: True)
         alert_email: Email address for alerts
         compliance_mode: Enable strict compliance mode (default: False)
         allowed_event_types: Filter to only log specific event types (None = all)
+        buffered: Write events from a background thread through a persistent
+            file handle instead of reopening the log per event (default: False)
+        flush_interval: Seconds between background flushes in buffered mode
+        flush_max_events: Queued events that trigger an early flush in buffered mode
+        fsync_policy: "never" (default), "batch" (fsync every write; every event
+            when unbuffered) or "close" (fsync on rotation and close only)
+        compression: Compress rotated logs in the background: "none"
+            (default), "gzip" or "zstd" (needs the zstandard package; falls
+            back to gzip)
+        checkpoint_interval: Events between signed checkpoint records (0 = none)
+        checkpoint_key: HMAC key for checkpoint signatures (default: a random
+            key generated once and stored in the audit directory)
+        index_enabled: Answer queries from a SQLite index kept next to the
+            JSONL logs instead of scanning every line (default: False)
+        query_workers: Processes used to scan rotated logs in parallel
+            (0 = one per CPU, 1 = always serial)
+        parallel_min_bytes: Total log size below which scans stay serial
+        delivery_queue_size: Syslog messages and alerts waiting for the
+            background sender before ``delivery_policy`` applies
+        delivery_batch_size: Messages sent per batch
+        delivery_policy: What to do when the delivery queue is full:
+            "drop_oldest" (default), "block" (wait for room) or "spill"
+            (append to ``delivery-spill.jsonl`` and send later)
     """
 
     # Storage configuration
@@ -55,6 +93,7 @@ class AuditConfig:
     # Syslog configuration
     syslog_host: Optional[str] = None
     syslog_port: int = 514
+    syslog_protocol: str = "udp"
 
     # Alerting configuration
     alert_on_critical: bool = True
@@ -64,8 +103,40 @@ class AuditConfig:
     compliance_mode: bool = False
     allowed_event_types: Optional[List[str]] = None
 
+    # Write path
+    buffered: bool = False
+    flush_interval: float = 1.0
+    flush_max_events: int = 256
+    fsync_policy: str = "never"
+    compression: str = "none"
+
+    # Integrity
+    checkpoint_interval: int = 1000
+    checkpoint_key: Optional[str] = field(default=None, repr=False)
+
+    # Query path
+    index_enabled: bool = False
+    query_workers: int = 0
+    parallel_min_bytes: int = 8 * 1024 * 1024  # 8MB
+
+    # Syslog and alert delivery
+    delivery_queue_size: int = 10000
+    delivery_batch_size: int = 100
+    delivery_policy: str = "drop_oldest"
+
     def __post_init__(self):
-        """Initialize configuration from environment variables."""
+        """
+        Initialize configuration from environment variables.
+
+        Raises:
+            ValueError: If a string option passed to the constructor is not
+                one of its accepted values (invalid environment values are
+                ignored with a warning, like other malformed settings)
+        """
+        for name, choices in _CHOICES.items():
+            if getattr(self, name) not in choices:
+                raise ValueError(f"Invalid {name} {getattr(self, name)!r} (expected {_expected(choices)})")
+
         # Override from environment variables
         if env_dir := os.getenv("NUAA_AUDIT_DIR"):
             self.audit_dir = Path(env_dir)
@@ -97,13 +168,75 @@ class AuditConfig:
         if env_syslog_host := os.getenv("NUAA_AUDIT_SYSLOG_HOST"):
             self.syslog_host = env_syslog_host
 
+        if env_syslog_port := os.getenv("NUAA_AUDIT_SYSLOG_PORT"):
+            try:
+                self.syslog_port = int(env_syslog_port)
+            except ValueError:
+                pass
+
+        if env_syslog_protocol := os.getenv("NUAA_AUDIT_SYSLOG_PROTOCOL"):
+            self._set_choice("syslog_protocol", "NUAA_AUDIT_SYSLOG_PROTOCOL", env_syslog_protocol)
+
         if env_alert_email := os.getenv("NUAA_AUDIT_ALERT_EMAIL"):
             self.alert_email = env_alert_email
 
+        if env_buffered := os.getenv("NUAA_AUDIT_BUFFERED"):
+            self.buffered = env_buffered.lower() in ("true", "1", "yes")
+
+        if env_flush_interval := os.getenv("NUAA_AUDIT_FLUSH_INTERVAL"):
+            try:
+                self.flush_interval = float(env_flush_interval)
+            except ValueError:
+                pass
+
+        if env_flush_events := os.getenv("NUAA_AUDIT_FLUSH_EVENTS"):
+            try:
+                self.flush_max_events = int(env_flush_events)
+            except ValueError:
+                pass
+
+        if env_fsync := os.getenv("NUAA_AUDIT_FSYNC"):
+            self._set_choice("fsync_policy", "NUAA_AUDIT_FSYNC", env_fsync)
+
+        if env_compression := os.getenv("NUAA_AUDIT_COMPRESSION"):
+            self._set_choice("compression", "NUAA_AUDIT_COMPRESSION", env_compression)
+
+        if env_checkpoint := os.getenv("NUAA_AUDIT_CHECKPOINT_INTERVAL"):
+            try:
+                self.checkpoint_interval = int(env_checkpoint)
+            except ValueError:
+                pass
+
+        if env_checkpoint_key := os.getenv("NUAA_AUDIT_CHECKPOINT_KEY"):
+            self.checkpoint_key = env_checkpoint_key
+
+        if env_index := os.getenv("NUAA_AUDIT_INDEX"):
+            self.index_enabled = env_index.lower() in ("true", "1", "yes")
+
+        if env_workers := os.getenv("NUAA_AUDIT_QUERY_WORKERS"):
+            try:
+                self.query_workers = int(env_workers)
+            except ValueError:
+                pass
+
+        if env_delivery_policy := os.getenv("NUAA_AUDIT_DELIVERY_POLICY"):
+            self._set_choice("delivery_policy", "NUAA_AUDIT_DELIVERY_POLICY", env_delivery_policy)
+
         # Ensure audit directory exists
         if self.enabled:
             self.audit_dir.mkdir(parents=True, exist_ok=True)
 
+    def _set_choice(self, name: str, env_var: str, value: str) -> None:
+        """Apply an environment value for a string option, keeping the current one if invalid."""
+        choices = _CHOICES[name]
+        if value.lower() in choices:
+            setattr(self, name, value.lower())
+        else:
+            logging.warning(
+                f"Ignoring invalid {env_var}={value!r} (expected {_expected(choices)}); "
+                f"using {getattr(self, name)!r}"
+            )
+
     @property
     def log_path(self) -> Path:
         """Get the full path to the audit log file."""
@@ -145,10 +278,23 @@ class AuditConfig:
             "syslog_enabled": self.syslog_enabled,
             "syslog_host": self.syslog_host,
             "syslog_port": self.syslog_port,
+            "syslog_protocol": self.syslog_protocol,
             "alert_on_critical": self.alert_on_critical,
             "alert_email": self.alert_email,
             "compliance_mode": self.compliance_mode,
             "allowed_event_types": self.allowed_event_types,
+            "buffered": self.buffered,
+            "flush_interval": self.flush_interval,
+            "flush_max_events": self.flush_max_events,
+            "fsync_policy": self.fsync_policy,
+            "compression": self.compression,
+            "checkpoint_interval": self.checkpoint_interval,
+            "index_enabled": self.index_enabled,
+            "query_workers": self.query_workers,
+            "parallel_min_bytes": self.parallel_min_bytes,
+            "delivery_queue_size": self.delivery_queue_size,
+            "delivery_batch_size": self.delivery_batch_size,
+            "delivery_policy": self.delivery_policy,
         }
 
 
@@ -0,0 +1,372 @@
+"""
+Background delivery of audit events to syslog and alert channels.
+
+``AuditLogger.log`` used to open a new syslog connection and print alerts
+inline, while holding the logger lock, so a slow or unreachable syslog host
+stalled every caller. Instead, the logger formats the messages and hands
+them to an ``AuditDelivery``, which keeps a bounded queue and sends from a
+background thread:
+
+- Syslog messages are sent in batches over one reused socket: one datagram
+  per message over UDP, or a single write per batch over TCP
+  (newline-framed, RFC 6587).
+- After a failed send the socket is dropped and reconnected after a delay
+  that doubles up to ``MAX_RETRY_DELAY``, so an unreachable host is not
+  retried on every event.
+- When the queue is full, ``AuditConfig.delivery_policy`` decides:
+  ``drop_oldest`` (default) discards the oldest queued message, ``block``
+  makes the caller wait for room, and ``spill`` appends the message to
+  ``delivery-spill.jsonl`` in the audit directory. Spilled messages (and
+  messages whose send failed, under ``spill``) are sent once the queue has
+  drained, including by a later process.
+
+The audit log file remains the record of truth; delivery is best effort and
+``stats()`` reports how many messages were sent, dropped, spilled or failed.
+
+Example:
+    >>> delivery = AuditDelivery(config)
+    >>> delivery.submit(KIND_SYSLOG, syslog_message(event))
+    True
+    >>> delivery.flush()
+    True
+    >>> delivery.stats()["sent"]
+    1
+"""
+
+import atexit
+import json
+import logging
+import socket
+import sys
+import threading
+import time
+from collections import deque
+from itertools import islice
+from typing import Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .config import AuditConfig
+from .events import AuditEvent
+
+# Queue-full policies
+POLICY_DROP_OLDEST = "drop_oldest"
+POLICY_BLOCK = "block"
+POLICY_SPILL = "spill"
+DELIVERY_POLICIES = (POLICY_DROP_OLDEST, POLICY_BLOCK, POLICY_SPILL)
+
+# Syslog transports
+PROTOCOL_UDP = "udp"
+PROTOCOL_TCP = "tcp"
+SYSLOG_PROTOCOLS = (PROTOCOL_UDP, PROTOCOL_TCP)
+
+# Message kinds
+KIND_SYSLOG = "syslog"
+KIND_ALERT = "alert"
+
+SPILL_FILENAME = "delivery-spill.jsonl"
+
+# Facility "user", severity "info" (what logging.handlers.SysLogHandler sent)
+SYSLOG_PRIORITY = "<14>"
+
+# Seconds before a connect or send to the syslog host gives up
+SOCKET_TIMEOUT = 5.0
+
+# Reconnect delay after a failed send, doubled up to the maximum
+RETRY_DELAY = 0.5
+MAX_RETRY_DELAY = 30.0
+
+Message = Tuple[str, str]
+
+
+def syslog_message(event: AuditEvent) -> str:
+    """Format an event for syslog."""
+    return f"NUAA_AUDIT: {event.event_type.value} - {event.action or event.description}"
+
+
+def alert_message(event: AuditEvent) -> str:
+    """Format an alert line for an event that requires immediate attention."""
+    return f"[AUDIT ALERT] {event.severity.value.upper()}: {event.event_type.value}"
+
+
+class AuditDelivery:
+    """
+    Bounded queue and background sender for syslog messages and alerts.
+
+    Args:
+        config: Audit configuration (syslog host/port/protocol, queue size,
+            batch size and queue-full policy)
+    """
+
+    def __init__(self, config: AuditConfig):
+        self.config = config
+        self.spill_path = config.audit_dir / SPILL_FILENAME
+        self._cond = threading.Condition()
+        self._queue: Deque[Message] = deque()
+        self._in_flight = 0
+        self._closed = False
+        self._socket: Optional[socket.socket] = None
+        self._retry_delay = RETRY_DELAY
+        self._retry_at = 0.0
+        self._spill_lock = threading.Lock()
+        self._spill_pending = self.spill_path.exists()
+        self._stats = {
+            "queued": 0,
+            "sent": 0,
+            "alerts": 0,
+            "batches": 0,
+            "connects": 0,
+            "failed": 0,
+            "dropped": 0,
+            "spilled": 0,
+        }
+        self._thread = threading.Thread(target=self._run, name="nuaa-audit-delivery", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def submit(self, kind: str, message: str) -> bool:
+        """
+        Queue one message (``KIND_SYSLOG`` or ``KIND_ALERT``) for delivery.
+
+        Never raises. With the ``block`` policy this waits for room in the
+        queue; the other policies return immediately.
+
+        Returns:
+            True if the message was queued or spilled, False if it was
+            dropped because delivery is closed or the spill file failed
+        """
+        with self._cond:
+            if self._closed:
+                self._stats["dropped"] += 1
+                return False
+            if len(self._queue) >= self.config.delivery_queue_size:
+                policy = self.config.delivery_policy
+                if policy == POLICY_SPILL:
+                    spill = True
+                elif policy == POLICY_BLOCK:
+                    self._cond.wait_for(lambda: self._closed or len(self._queue) < self.config.delivery_queue_size)
+                    if self._closed:
+                        self._stats["dropped"] += 1
+                        return False
+                    spill = False
+                else:
+                    self._queue.popleft()
+                    self._stats["dropped"] += 1
+                    spill = False
+            else:
+                spill = False
+            if not spill:
+                self._queue.append((kind, message))
+                self._stats["queued"] += 1
+                self._cond.notify_all()
+                return True
+        return self._spill([(kind, message)])
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every queued message has been handed to its channel.
+
+        Skips any reconnect delay. Messages that fail to send count as
+        handled (see ``stats()``); spilled messages are not waited for.
+
+        Args:
+            timeout: Maximum seconds to wait (None = no limit)
+
+        Returns:
+            True if the queue drained in time
+        """
+        with self._cond:
+            self._retry_at = 0.0
+            self._cond.notify_all()
+            return self._cond.wait_for(lambda: not self._queue and not self._in_flight, timeout=timeout)
+
+    def close(self, timeout: Optional[float] = 10.0) -> None:
+        """Send what is queued (one attempt), stop the sender and close the socket."""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+        atexit.unregister(self.close)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Delivery counters since the sender started.
+
+        Returns:
+            ``queued``, ``sent`` (syslog messages), ``alerts``, ``batches``,
+            ``connects``, ``failed``, ``dropped``, ``spilled`` and the current
+            ``queue_depth``
+        """
+        with self._cond:
+            stats = dict(self._stats)
+            stats["queue_depth"] = len(self._queue)
+        return stats
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._closed or self._queue or self._spill_pending)
+                backing_off = self._retry_at > time.monotonic()
+                if backing_off and not self._closed:
+                    # The queue policy applies while waiting to reconnect
+                    self._cond.wait(self._retry_at - time.monotonic())
+                    continue
+                closing = self._closed
+                if closing and backing_off:
+                    # The host was just unreachable: keep what can be kept and stop
+                    batch, self._queue = list(self._queue), deque()
+                else:
+                    size = min(len(self._queue), self.config.delivery_batch_size)
+                    batch = [self._queue.popleft() for _ in range(size)]
+                self._in_flight = len(batch)
+                # Wake callers blocked on a full queue
+                self._cond.notify_all()
+
+            if closing and backing_off:
+                self._abandon(batch)
+            elif batch:
+                self._deliver(batch)
+            elif self._spill_pending and not closing:
+                self._drain_spill()
+
+            with self._cond:
+                self._in_flight = 0
+                self._cond.notify_all()
+                if closing and not self._queue:
+                    break
+        self._close_socket()
+
+    def _abandon(self, batch: List[Message]) -> None:
+        """Spill (or count as failed) messages that cannot be sent before closing."""
+        if self.config.delivery_policy == POLICY_SPILL:
+            self._spill(batch)
+        else:
+            with self._cond:
+                self._stats["failed"] += len(batch)
+
+    def _deliver(self, batch: List[Message]) -> bool:
+        """Send one batch; failed syslog messages are spilled or counted as failed."""
+        lines = [message for kind, message in batch if kind == KIND_SYSLOG]
+        for kind, message in batch:
+            if kind == KIND_ALERT:
+                # In a production system, this would send email/SMS/etc.
+                # For now, just log to stderr
+                print(message, file=sys.stderr)
+        with self._cond:
+            self._stats["alerts"] += len(batch) - len(lines)
+        if not lines:
+            return True
+
+        try:
+            self._send_syslog(lines)
+        except OSError as e:
+            logging.warning(f"Failed to send audit events to syslog: {e}")
+            self._close_socket()
+            with self._cond:
+                self._retry_at = time.monotonic() + self._retry_delay
+                self._retry_delay = min(self._retry_delay * 2, MAX_RETRY_DELAY)
+                if self.config.delivery_policy != POLICY_SPILL:
+                    self._stats["failed"] += len(lines)
+            if self.config.delivery_policy == POLICY_SPILL:
+                self._spill([(KIND_SYSLOG, line) for line in lines])
+            return False
+
+        with self._cond:
+            self._retry_delay = RETRY_DELAY
+            self._stats["sent"] += len(lines)
+            self._stats["batches"] += 1
+        return True
+
+    def _send_syslog(self, lines: List[str]) -> None:
+        sock = self._socket or self._connect()
+        if self.config.syslog_protocol == PROTOCOL_TCP:
+            sock.sendall("".join(f"{SYSLOG_PRIORITY}{line}\n" for line in lines).encode("utf-8"))
+        else:
+            for line in lines:
+                sock.send(f"{SYSLOG_PRIORITY}{line}\000".encode("utf-8"))
+
+    def _connect(self) -> socket.socket:
+        address = (self.config.syslog_host, self.config.syslog_port)
+        if self.config.syslog_protocol == PROTOCOL_TCP:
+            sock = socket.create_connection(address, timeout=SOCKET_TIMEOUT)
+        else:
+            family, socktype, proto, _, sockaddr = socket.getaddrinfo(*address, type=socket.SOCK_DGRAM)[0]
+            sock = socket.socket(family, socktype, proto)
+            sock.settimeout(SOCKET_TIMEOUT)
+            try:
+                sock.connect(sockaddr)
+            except OSError:
+                sock.close()
+                raise
+        self._socket = sock
+        with self._cond:
+            self._stats["connects"] += 1
+        return sock
+
+    def _close_socket(self) -> None:
+        if self._socket is not None:
+            try:
+                self._socket.close()
+            except OSError:
+                pass
+            self._socket = None
+
+    def _spill(self, messages: Iterable[Message]) -> bool:
+        """Append messages to the spill file; False if that fails too."""
+        messages = list(messages)
+        try:
+            with self._spill_lock:
+                with open(self.spill_path, "a", encoding="utf-8") as f:
+                    f.writelines(json.dumps({"kind": kind, "message": message}) + "\n" for kind, message in messages)
+        except OSError as e:
+            logging.error(f"Failed to spill audit delivery queue: {e}")
+            with self._cond:
+                self._stats["dropped"] += len(messages)
+            return False
+        with self._cond:
+            self._stats["spilled"] += len(messages)
+            self._spill_pending = True
+            self._cond.notify_all()
+        return True
+
+    def _drain_spill(self) -> None:
+        """Send spilled messages (the queue is empty); re-spill whatever is left after a failure."""
+        sending = self.spill_path.with_name(self.spill_path.name + ".sending")
+        with self._spill_lock:
+            with self._cond:
+                self._spill_pending = False
+            try:
+                if not sending.exists():
+                    self.spill_path.replace(sending)
+            except FileNotFoundError:
+                return
+
+        remaining: List[Message] = []
+        with open(sending, encoding="utf-8") as f:
+            records = _read_spill(f)
+            while batch := list(islice(records, self.config.delivery_batch_size)):
+                if not self._deliver(batch):
+                    remaining = list(records)
+                    break
+        sending.unlink(missing_ok=True)
+        if remaining:
+            self._spill(remaining)
+
+
+def _read_spill(lines: Iterable[str]) -> Iterator[Message]:
+    """Decode spill records, skipping damaged lines."""
+    for raw in lines:
+        try:
+            entry = json.loads(raw)
+            yield entry["kind"], entry["message"]
+        except (ValueError, KeyError, TypeError):
+            continue
+
+
+__all__ = [
+    "AuditDelivery",
+    "DELIVERY_POLICIES",
+    "SYSLOG_PROTOCOLS",
+    "alert_message",
+    "syslog_message",
+]
@@ -2,10 +2,15 @@
 Audit event types and structures.
 
 Defines all auditable events in NUAA CLI for compliance tracking.
+
+``AuditEvent`` is a slotted dataclass, so large result sets and streaming
+reports carry no per-instance ``__dict__``. ``to_dict`` builds the
+dictionary directly instead of going through ``dataclasses.asdict``, and
+``from_dict`` resolves enum values through precomputed lookup tables.
 """
 
 from enum import Enum
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Optional, Any, Dict
 import uuid
@@ -79,7 +84,25 @@ class Severity(str, Enum):
     CRITICAL = "critical"
 
 
-@dataclass
+# Value -> member lookup tables (faster than calling the Enum per event)
+_EVENT_TYPES: Dict[str, EventType] = {member.value: member for member in EventType}
+_SEVERITIES: Dict[str, Severity] = {member.value: member for member in Severity}
+
+SECURITY_EVENT_TYPES = frozenset(
+    {
+        EventType.AUTH_SUCCESS,
+        EventType.AUTH_FAILURE,
+        EventType.AUTH_DENIED,
+        EventType.PERMISSION_DENIED,
+    }
+)
+
+# Event types that alert at WARNING severity (ERROR and CRITICAL always alert)
+_ALERT_EVENT_TYPES = frozenset({EventType.AUTH_FAILURE, EventType.PERMISSION_DENIED, EventType.SYSTEM_ERROR})
+_ALERT_SEVERITIES = frozenset({Severity.ERROR, Severity.CRITICAL})
+
+
+@dataclass(slots=True)
 class AuditEvent:
     """
     Represents a single auditable event.
@@ -126,16 +149,34 @@ class AuditEvent:
         """
         Convert event to dictionary for serialization.
 
+        ``metadata`` is copied one level deep; nested values are shared with
+        the event.
+
         Returns:
             Dictionary representation of the event
         """
-        data = asdict(self)
-        # Convert datetime to ISO format
-        data["timestamp"] = self.timestamp.isoformat()
-        # Convert enums to strings
-        data["event_type"] = self.event_type.value
-        data["severity"] = self.severity.value
-        return data
+        return {
+            "event_id": self.event_id,
+            "timestamp": self.timestamp.isoformat(),
+            "event_type": self.event_type.value,
+            "severity": self.severity.value,
+            "user_id": self.user_id,
+            "username": self.username,
+            "session_id": self.session_id,
+            "resource_type": self.resource_type,
+            "resource_id": self.resource_id,
+            "resource_path": self.resource_path,
+            "action": self.action,
+            "description": self.description,
+            "status": self.status,
+            "metadata": dict(self.metadata),
+            "hostname": self.hostname,
+            "ip_address": self.ip_address,
+            "process_id": self.process_id,
+            "is_sensitive": self.is_sensitive,
+            "contains_pii": self.contains_pii,
+            "retention_days": self.retention_days,
+        }
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "AuditEvent":
@@ -147,29 +188,29 @@ class AuditEvent:
 
         Returns:
             AuditEvent instance
+
+        Raises:
+            ValueError: If ``event_type`` or ``severity`` is not a known value
         """
         # Convert timestamp string to datetime
-        if "timestamp" in data and isinstance(data["timestamp"], str):
-            data["timestamp"] = datetime.fromisoformat(data["timestamp"])
+        timestamp = data.get("timestamp")
+        if isinstance(timestamp, str):
+            data["timestamp"] = datetime.fromisoformat(timestamp)
 
         # Convert enum strings to enums
-        if "event_type" in data and isinstance(data["event_type"], str):
-            data["event_type"] = EventType(data["event_type"])
+        event_type = data.get("event_type")
+        if isinstance(event_type, str):
+            data["event_type"] = _EVENT_TYPES.get(event_type) or EventType(event_type)
 
-        if "severity" in data and isinstance(data["severity"], str):
-            data["severity"] = Severity(data["severity"])
+        severity = data.get("severity")
+        if isinstance(severity, str):
+            data["severity"] = _SEVERITIES.get(severity) or Severity(severity)
 
         return cls(**data)
 
     def is_security_event(self) -> bool:
         """Check if this is a security-related event."""
-        security_types = [
-            EventType.AUTH_SUCCESS,
-            EventType.AUTH_FAILURE,
-            EventType.AUTH_DENIED,
-            EventType.PERMISSION_DENIED,
-        ]
-        return self.event_type in security_types
+        return self.event_type in SECURITY_EVENT_TYPES
 
     def is_compliance_event(self) -> bool:
         """Check if this is a compliance-related event."""
@@ -181,14 +222,8 @@ class AuditEvent:
 
     def requires_immediate_alert(self) -> bool:
         """Check if this event requires immediate alerting."""
-        return self.severity in [Severity.ERROR, Severity.CRITICAL] or (
-            self.event_type
-            in [
-                EventType.AUTH_FAILURE,
-                EventType.PERMISSION_DENIED,
-                EventType.SYSTEM_ERROR,
-            ]
-            and self.severity == Severity.WARNING
+        return self.severity in _ALERT_SEVERITIES or (
+            self.event_type in _ALERT_EVENT_TYPES and self.severity == Severity.WARNING
         )
 
 
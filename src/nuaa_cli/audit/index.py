@@ -0,0 +1,306 @@
+"""
+SQLite index over the JSONL audit logs.
+
+``query_audit_logs`` and the helpers built on it parse every line of a log
+file and only then apply the query. With ``AuditConfig.index_enabled`` the
+query functions go through ``AuditIndex`` instead: a SQLite database in the
+audit directory (``audit-index.sqlite3``) with one row per event and indexes
+on timestamp, event type, username, severity and status. Filters, ordering
+and ``limit``/``offset`` are pushed down to SQLite, and only matching events
+are decoded. ``iter_query`` streams results straight from the SQLite cursor.
+
+The JSONL files stay the source of truth. The index records, for every log
+file (identified by the ``created`` value in its header, which survives
+rotation renames), how many bytes have been indexed. Each query first reads
+whatever was appended since, so the index never needs the logger's
+cooperation and picks up events written by other processes. Files dropped by
+rotation are removed from the index, and a file that shrank or changed is
+re-indexed from scratch. A segment indexed before it was compressed is only
+read again if its footer shows bytes beyond the indexed offset.
+
+Example:
+    >>> index = AuditIndex(config)
+    >>> events = index.query(AuditQuery(username="alice", limit=20))
+"""
+
+import json
+import sqlite3
+from contextlib import closing
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+from typing import Any, Iterable, Iterator, List, Optional
+
+from . import codec
+from .config import AuditConfig
+from .events import AuditEvent
+from .integrity import CHECKPOINT_TYPE, FOOTER_TYPE, HEADER_TYPE, INTEGRITY_FIELDS
+from .segments import COMPRESSION_NONE, compression_of, iter_segment_lines, log_files, read_footer, segment_id
+
+INDEX_FILENAME = "audit-index.sqlite3"
+
+# Bump when the schema changes; older indexes are rebuilt
+SCHEMA_VERSION = 1
+
+# Seconds to wait for another process updating the index
+LOCK_TIMEOUT = 30.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS segments (
+    id TEXT PRIMARY KEY,
+    path TEXT NOT NULL,
+    indexed_bytes INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS events (
+    segment TEXT NOT NULL,
+    event_id TEXT,
+    timestamp TEXT NOT NULL,
+    event_type TEXT,
+    severity TEXT,
+    username TEXT,
+    status TEXT,
+    action TEXT,
+    contains_pii INTEGER,
+    is_sensitive INTEGER,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS events_timestamp ON events (timestamp);
+CREATE INDEX IF NOT EXISTS events_type ON events (event_type, timestamp);
+CREATE INDEX IF NOT EXISTS events_username ON events (username, timestamp);
+CREATE INDEX IF NOT EXISTS events_severity ON events (severity, timestamp);
+CREATE INDEX IF NOT EXISTS events_status ON events (status, timestamp);
+CREATE INDEX IF NOT EXISTS events_segment ON events (segment);
+"""
+
+
+def _normalise_timestamp(value: Any) -> str:
+    """Fixed-width ISO timestamp so text order matches time order."""
+    if isinstance(value, datetime):
+        return value.isoformat(timespec="microseconds")
+    return datetime.fromisoformat(str(value)).isoformat(timespec="microseconds")
+
+
+class AuditIndex:
+    """
+    SQLite-backed index of audit events.
+
+    Args:
+        config: Audit configuration (log locations)
+        index_path: Override the database location (default:
+            ``<audit_dir>/audit-index.sqlite3``)
+    """
+
+    def __init__(self, config: AuditConfig, index_path: Optional[Path] = None):
+        self.config = config
+        self.index_path = index_path or config.audit_dir / INDEX_FILENAME
+
+    def _connect(self) -> sqlite3.Connection:
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        # isolation_level=None: transactions are managed explicitly below
+        conn = sqlite3.connect(self.index_path, timeout=LOCK_TIMEOUT, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(_SCHEMA)
+        row = conn.execute("SELECT value FROM meta WHERE key = 'schema_version'").fetchone()
+        if row is None or row[0] != str(SCHEMA_VERSION):
+            conn.executescript("DELETE FROM events; DELETE FROM segments;")
+            conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('schema_version', ?)", (str(SCHEMA_VERSION),)
+            )
+        return conn
+
+    def sync(self) -> int:
+        """
+        Index everything appended to the log files since the last sync.
+
+        Returns:
+            Number of events added
+        """
+        with closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                added = self._sync(conn)
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        return added
+
+    def _sync(self, conn: sqlite3.Connection) -> int:
+        indexed = {row[0]: row[1] for row in conn.execute("SELECT id, indexed_bytes FROM segments")}
+        present = set()
+        added = 0
+        for path in log_files(self.config):
+            seg = segment_id(path)
+            if seg is None:
+                continue
+            present.add(seg)
+            start = indexed.get(seg, 0)
+            if compression_of(path) != COMPRESSION_NONE:
+                # Compressed segments never change; their footer records the
+                # raw size, so one indexed before compression is not re-read
+                size = (read_footer(path) or {}).get("size", start)
+            else:
+                size = path.stat().st_size
+                if start > size:
+                    # File was rewritten: index it again from the top
+                    conn.execute("DELETE FROM events WHERE segment = ?", (seg,))
+                    start = 0
+            if seg in indexed and start >= size:
+                conn.execute("UPDATE segments SET path = ? WHERE id = ?", (str(path), seg))
+                continue
+            end, rows = self._read_rows(path, seg, start)
+            conn.executemany(
+                "INSERT INTO events (segment, event_id, timestamp, event_type, severity, username, status, "
+                "action, contains_pii, is_sensitive, data) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO segments (id, path, indexed_bytes) VALUES (?, ?, ?)", (seg, str(path), end)
+            )
+            added += len(rows)
+
+        for seg in set(indexed) - present:
+            # Dropped by rotation
+            conn.execute("DELETE FROM events WHERE segment = ?", (seg,))
+            conn.execute("DELETE FROM segments WHERE id = ?", (seg,))
+        return added
+
+    @staticmethod
+    def _read_rows(path: Path, seg: str, start: int) -> tuple[int, List[tuple]]:
+        """Parse complete lines from byte ``start``; returns (end offset, rows)."""
+        rows = []
+        offset = start
+        if compression_of(path) == COMPRESSION_NONE:
+            f = open(path, "rb")
+            f.seek(start)
+            lines = f
+            position = start
+        else:
+            # Compressed streams cannot seek; skip lines up to ``start``
+            f = None
+            lines = iter_segment_lines(path)
+            position = 0
+        try:
+            for raw in lines:
+                if not raw.endswith(b"\n"):
+                    break  # Line still being written
+                position += len(raw)
+                if position <= start:
+                    continue
+                offset = position
+                try:
+                    entry = codec.loads(raw)
+                    if entry.get("type") in (HEADER_TYPE, CHECKPOINT_TYPE, FOOTER_TYPE):
+                        continue
+                    for key in INTEGRITY_FIELDS:
+                        entry.pop(key, None)
+                    rows.append(
+                        (
+                            seg,
+                            entry.get("event_id"),
+                            _normalise_timestamp(entry["timestamp"]),
+                            entry.get("event_type"),
+                            entry.get("severity"),
+                            entry.get("username"),
+                            entry.get("status"),
+                            entry.get("action"),
+                            int(bool(entry.get("contains_pii"))),
+                            int(bool(entry.get("is_sensitive"))),
+                            json.dumps(entry),
+                        )
+                    )
+                except (KeyError, TypeError, *codec.DecodeError):
+                    # Skip invalid entries, as the scanning reader does
+                    continue
+        finally:
+            if f is not None:
+                f.close()
+        return offset, rows
+
+    def query(self, query: Any, log_files: Optional[Iterable[Path]] = None) -> List[AuditEvent]:
+        """
+        Return events matching an ``AuditQuery``.
+
+        Args:
+            query: AuditQuery with search criteria
+            log_files: Restrict results to these log files (default: all)
+
+        Returns:
+            Matching events, ordered and paginated as the query requests
+        """
+        return list(self.iter_query(query, log_files))
+
+    def iter_query(self, query: Any, log_files: Optional[Iterable[Path]] = None) -> Iterator[AuditEvent]:
+        """
+        Like ``query()``, but yield events one at a time from the SQLite cursor.
+
+        The index is synced and the query executed before this returns, so
+        index errors are raised here rather than part-way through iteration.
+        """
+        where: List[str] = []
+        params: List[Any] = []
+
+        if log_files is not None:
+            segments = [seg for seg in (segment_id(p) for p in log_files) if seg is not None]
+            if not segments:
+                return iter(())
+            where.append(f"segment IN ({', '.join('?' * len(segments))})")
+            params.extend(segments)
+        if query.start_time:
+            where.append("timestamp >= ?")
+            params.append(_normalise_timestamp(query.start_time))
+        if query.end_time:
+            where.append("timestamp <= ?")
+            params.append(_normalise_timestamp(query.end_time))
+        for column, values in (("event_type", query.event_types), ("severity", query.severities)):
+            if values:
+                where.append(f"{column} IN ({', '.join('?' * len(values))})")
+                params.extend(getattr(v, "value", v) for v in values)
+        for column in ("username", "action", "status"):
+            value = getattr(query, column)
+            if value:
+                where.append(f"{column} = ?")
+                params.append(value)
+        for column in ("contains_pii", "is_sensitive"):
+            value = getattr(query, column)
+            if value is not None:
+                where.append(f"{column} = ?")
+                params.append(int(value))
+
+        sql = "SELECT data FROM events"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += f" ORDER BY timestamp {'DESC' if query.sort_desc else 'ASC'}, rowid ASC"
+
+        # Wildcard resource paths are matched in Python, so paginate afterwards
+        paginate_in_sql = not query.resource_path
+        if paginate_in_sql and (query.limit or query.offset):
+            sql += " LIMIT ? OFFSET ?"
+            params.extend([query.limit or -1, query.offset])
+
+        self.sync()
+        conn = self._connect()
+        try:
+            cursor = conn.execute(sql, params)
+        except BaseException:
+            conn.close()
+            raise
+        events = self._decode(conn, cursor)
+        if paginate_in_sql:
+            return events
+        matching = (event for event in events if query.matches(event))
+        stop = query.offset + query.limit if query.limit else None
+        return islice(matching, query.offset, stop)
+
+    @staticmethod
+    def _decode(conn: sqlite3.Connection, cursor: sqlite3.Cursor) -> Iterator[AuditEvent]:
+        with closing(conn):
+            for (data,) in cursor:
+                yield AuditEvent.from_dict(codec.loads(data))
+
+    def rebuild(self) -> int:
+        """Drop the index and re-read every log file. Returns the number of events indexed."""
+        with closing(self._connect()) as conn:
+            conn.executescript("DELETE FROM events; DELETE FROM segments;")
+        return self.sync()
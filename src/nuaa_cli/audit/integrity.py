@@ -0,0 +1,460 @@
+"""
+Hash chain, checkpoints and incremental verification for audit logs.
+
+Every event line carries three integrity fields:
+
+- ``_checksum``: SHA-256 of the event's sorted-key JSON
+- ``_prev_checksum``: checksum of the previous event in the file
+- ``_hash``: chain hash, ``sha256(previous _hash + _checksum)``
+
+Changing, removing or reordering any event therefore changes every later
+``_hash``. Every ``AuditConfig.checkpoint_interval`` events the logger also
+writes a checkpoint record holding the current chain hash, signed with an
+HMAC key (``AuditConfig.checkpoint_key``, or a key generated once and kept in
+the audit directory). Rotated segments end with a signed footer recording
+their size, event count, timestamp range and final chain hash (written by
+``segments.SegmentFinalizer``).
+
+Since the chain fields alone can be recomputed by anyone, verification also
+requires the signed records to be there: once an entry with a ``_hash`` has
+been seen every later entry must have one, no more than
+``checkpoint_interval`` events may follow a checkpoint without the next one,
+and nothing may follow a footer. Logs must therefore be verified with the
+``checkpoint_interval`` they were written with.
+
+Verification remembers how far each log file has been verified in a sidecar
+state file (``verify-state.json`` in the audit directory): the byte offset,
+the chain state at that offset, a digest of the file header and a digest of
+the last verified line. The next run checks that the header and last line
+are unchanged, then verifies only the bytes appended since. ``full=True``
+ignores the saved state and re-verifies the whole file. Compressed segments
+are always verified in full.
+
+Example:
+    >>> ok = verify_log_file(config.log_path, config)
+    >>> ok_again = verify_log_file(config.log_path, config)  # only new lines
+    >>> verify_log_file(config.log_path, config, full=True)
+    True
+"""
+
+import hashlib
+import hmac
+import json
+import os
+import secrets
+from dataclasses import asdict, dataclass, fields
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+
+from .config import AuditConfig
+
+HEADER_TYPE = "audit_log_header"
+CHECKPOINT_TYPE = "audit_checkpoint"
+FOOTER_TYPE = "audit_segment_footer"
+
+STATE_FILENAME = "verify-state.json"
+KEY_FILENAME = ".checkpoint-key"
+
+# File suffixes of compressed rotated segments
+COMPRESSED_SUFFIXES = (".gz", ".zst")
+
+# Integrity fields added to every event line
+INTEGRITY_FIELDS = ("_checksum", "_prev_checksum", "_hash")
+
+# Bytes read per step when reading a log backwards
+_TAIL_BLOCK = 64 * 1024
+
+
+def chain_hash(prev_hash: Optional[str], checksum: str) -> str:
+    """Return the chain hash linking an event checksum to the previous entry."""
+    return hashlib.sha256(f"{prev_hash or ''}{checksum}".encode()).hexdigest()
+
+
+def seal_event(event_json: str, prev_checksum: Optional[str], prev_hash: Optional[str]) -> tuple[str, str, str]:
+    """
+    Append the integrity fields to an event's sorted-key JSON.
+
+    The checksum and chain fields are spliced onto the end of the object
+    rather than serialising the event a second time.
+
+    Returns:
+        Tuple of (log line with newline, checksum, chain hash)
+    """
+    checksum = hashlib.sha256(event_json.encode()).hexdigest()
+    chain = chain_hash(prev_hash, checksum)
+    line = (
+        f'{event_json[:-1]}, "_checksum": "{checksum}", '
+        f'"_prev_checksum": {json.dumps(prev_checksum)}, "_hash": "{chain}"}}\n'
+    )
+    return line, checksum, chain
+
+
+def load_checkpoint_key(config: AuditConfig) -> bytes:
+    """
+    Return the HMAC key used to sign checkpoints.
+
+    Uses ``config.checkpoint_key`` when set; otherwise reads (or creates) a
+    random key in ``<audit_dir>/.checkpoint-key`` readable only by the owner.
+    """
+    if config.checkpoint_key:
+        return config.checkpoint_key.encode()
+    key_path = config.audit_dir / KEY_FILENAME
+    try:
+        return key_path.read_bytes().strip()
+    except FileNotFoundError:
+        pass
+    key = secrets.token_hex(32).encode()
+    key_path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        fd = os.open(key_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:
+        # Another process created it first
+        return key_path.read_bytes().strip()
+    with os.fdopen(fd, "wb") as f:
+        f.write(key)
+    return key
+
+
+def _signature(key: bytes, chain: Optional[str], created: str) -> str:
+    return hmac.new(key, f"{chain or ''}|{created}".encode(), hashlib.sha256).hexdigest()
+
+
+def checkpoint_line(key: bytes, chain: Optional[str]) -> str:
+    """Return a signed checkpoint record for chain hash ``chain`` (with newline)."""
+    created = datetime.utcnow().isoformat()
+    record = {
+        "type": CHECKPOINT_TYPE,
+        "created": created,
+        "hash": chain,
+        "signature": _signature(key, chain, created),
+    }
+    return json.dumps(record) + "\n"
+
+
+def footer_record(
+    key: bytes,
+    segment: str,
+    size: int,
+    events: int,
+    min_timestamp: Optional[str],
+    max_timestamp: Optional[str],
+    chain: Optional[str],
+) -> Dict[str, Any]:
+    """
+    Return a signed footer record for a rotated log segment.
+
+    The footer summarises the segment (byte size before the footer, event
+    count, timestamp range and final chain hash) so readers can skip it
+    without parsing its events. The signature covers every other field.
+    """
+    record = {
+        "type": FOOTER_TYPE,
+        "created": datetime.utcnow().isoformat(),
+        "segment": segment,
+        "size": size,
+        "events": events,
+        "min_timestamp": min_timestamp,
+        "max_timestamp": max_timestamp,
+        "hash": chain,
+    }
+    record["signature"] = _footer_signature(key, record)
+    return record
+
+
+def _footer_signature(key: bytes, record: Dict[str, Any]) -> str:
+    fields = {k: v for k, v in record.items() if k != "signature"}
+    return hmac.new(key, json.dumps(fields, sort_keys=True).encode(), hashlib.sha256).hexdigest()
+
+
+def footer_is_valid(key: bytes, record: Dict[str, Any]) -> bool:
+    """Whether a footer record carries a valid signature."""
+    return hmac.compare_digest(_footer_signature(key, record), str(record.get("signature")))
+
+
+def iter_lines_reversed(path: Path) -> Iterator[bytes]:
+    """
+    Yield the lines of a file last to first, without their newlines.
+
+    Reads the file backwards in blocks, so memory use does not depend on the
+    file size. A trailing newline yields an empty first line.
+    """
+    with open(path, "rb") as f:
+        end = f.seek(0, os.SEEK_END)
+        remainder = b""
+        while end > 0:
+            start = max(0, end - _TAIL_BLOCK)
+            f.seek(start)
+            block = f.read(end - start) + remainder
+            lines = block.split(b"\n")
+            # The first piece may be a partial line unless we reached the start
+            remainder = lines.pop(0) if start > 0 else b""
+            yield from reversed(lines)
+            end = start
+
+
+def read_chain_tail(log_path: Path) -> tuple[Optional[str], Optional[str], int]:
+    """
+    Return ``(checksum, chain hash, events since the last checkpoint)`` of a log file.
+
+    Reads the file backwards, and only as far as the last checkpoint, so
+    reopening a large log to append to it stays cheap. Returns
+    ``(None, None, 0)`` if the file has no events.
+    """
+    tail: tuple[Optional[str], Optional[str]] = (None, None)
+    since_checkpoint = 0
+    if not log_path.exists():
+        return None, None, 0
+    for raw in iter_lines_reversed(log_path):
+        if b'"_checksum"' not in raw and CHECKPOINT_TYPE.encode() not in raw:
+            continue
+        try:
+            entry = json.loads(raw)
+        except json.JSONDecodeError:
+            continue
+        if entry.get("type") == CHECKPOINT_TYPE:
+            break
+        if "_checksum" in entry:
+            if since_checkpoint == 0:
+                tail = entry.get("_checksum"), entry.get("_hash")
+            since_checkpoint += 1
+    return tail[0], tail[1], since_checkpoint
+
+
+@dataclass
+class VerifyState:
+    """
+    How far a log file has been verified.
+
+    Attributes:
+        offset: Byte offset just past the last verified line
+        lines: Number of lines verified (for error messages)
+        header: SHA-256 of the file's first line (detects a replaced file)
+        tail_offset: Byte offset where the last verified line starts
+        tail: SHA-256 of the last verified line (detects rewrites)
+        prev_checksum: ``_checksum`` of the last verified event
+        chain: ``_hash`` of the last verified event
+        chained: Whether an event with a ``_hash`` has been seen
+        since_checkpoint: Events verified since the last checkpoint
+        footer: Whether the segment footer has been seen
+    """
+
+    offset: int = 0
+    lines: int = 0
+    header: Optional[str] = None
+    tail_offset: int = 0
+    tail: Optional[str] = None
+    prev_checksum: Optional[str] = None
+    chain: Optional[str] = None
+    chained: bool = False
+    since_checkpoint: int = 0
+    footer: bool = False
+
+
+def _state_path(config: AuditConfig) -> Path:
+    return config.audit_dir / STATE_FILENAME
+
+
+def _load_states(config: AuditConfig) -> Dict[str, Any]:
+    try:
+        with open(_state_path(config), "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else {}
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def _save_state(config: AuditConfig, log_path: Path, state: VerifyState) -> None:
+    states = _load_states(config)
+    states[str(log_path.resolve())] = asdict(state)
+    path = _state_path(config)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(states, f, indent=2)
+    os.replace(tmp, path)
+
+
+def _resume_state(f, config: AuditConfig, log_path: Path, header: str, size: int) -> Optional[VerifyState]:
+    """Return the saved state if the already-verified part is unchanged."""
+    saved = _load_states(config).get(str(log_path.resolve()))
+    # State saved by an older version lacks fields; verify from the start
+    if not isinstance(saved, dict) or set(saved) != {f.name for f in fields(VerifyState)}:
+        return None
+    state = VerifyState(**saved)
+    if state.header != header or state.offset > size:
+        return None
+    if state.tail is not None:
+        f.seek(state.tail_offset)
+        line = f.read(state.offset - state.tail_offset)
+        if hashlib.sha256(line).hexdigest() != state.tail:
+            return None
+    return state
+
+
+def _check_line(raw: bytes, line_num: int, state: VerifyState, key: bytes, interval: int) -> bool:
+    """
+    Verify one log line against the chain state, advancing the state.
+
+    ``interval`` is the configured ``checkpoint_interval``: an event that
+    would leave more than that many events without a checkpoint fails.
+    """
+    try:
+        entry = json.loads(raw)
+    except json.JSONDecodeError:
+        print(f"Invalid JSON at line {line_num}")
+        return False
+
+    entry_type = entry.get("type")
+    if state.footer:
+        print(f"Integrity violation at line {line_num}: entry after the segment footer")
+        return False
+    if entry_type == HEADER_TYPE:
+        pass
+    elif entry_type == CHECKPOINT_TYPE:
+        expected = _signature(key, entry.get("hash"), str(entry.get("created")))
+        if entry.get("hash") != state.chain:
+            print(f"Integrity violation at line {line_num}: checkpoint does not match hash chain")
+            return False
+        if not hmac.compare_digest(expected, str(entry.get("signature"))):
+            print(f"Integrity violation at line {line_num}: invalid checkpoint signature")
+            return False
+        state.since_checkpoint = 0
+    elif entry_type == FOOTER_TYPE:
+        if entry.get("hash") != state.chain:
+            print(f"Integrity violation at line {line_num}: segment footer does not match hash chain")
+            return False
+        if not footer_is_valid(key, entry):
+            print(f"Integrity violation at line {line_num}: invalid segment footer signature")
+            return False
+        state.since_checkpoint = 0
+        state.footer = True
+    elif "_checksum" in entry:
+        stored_checksum = entry.pop("_checksum")
+        stored_prev = entry.pop("_prev_checksum", None)
+        stored_hash = entry.pop("_hash", None)
+
+        # Verify previous checksum chain
+        if stored_prev != state.prev_checksum:
+            print(f"Integrity violation at line {line_num}: broken checksum chain")
+            return False
+
+        # Verify current checksum
+        event_json = json.dumps(entry, sort_keys=True)
+        if hashlib.sha256(event_json.encode()).hexdigest() != stored_checksum:
+            print(f"Integrity violation at line {line_num}: checksum mismatch")
+            return False
+
+        # Verify hash chain (entries written before chaining have no _hash,
+        # but once the chain has started every entry must carry it)
+        if stored_hash is None and state.chained:
+            print(f"Integrity violation at line {line_num}: entry is missing its chain hash")
+            return False
+        if stored_hash is not None and stored_hash != chain_hash(state.chain, stored_checksum):
+            print(f"Integrity violation at line {line_num}: broken hash chain")
+            return False
+
+        # Checkpoints must not go missing
+        if interval and state.since_checkpoint >= interval:
+            print(f"Integrity violation at line {line_num}: missing checkpoint")
+            return False
+
+        state.prev_checksum = stored_checksum
+        state.chain = stored_hash
+        state.chained = state.chained or stored_hash is not None
+        state.since_checkpoint += 1
+    return True
+
+
+def _check_tail(state: VerifyState, interval: int) -> bool:
+    """Verify the events after the last checkpoint are at most a partial interval."""
+    if interval and state.since_checkpoint >= interval:
+        print(f"Integrity violation: {state.since_checkpoint} events after the last checkpoint")
+        return False
+    return True
+
+
+def _verify_compressed(log_path: Path, key: bytes, interval: int) -> bool:
+    """
+    Verify a compressed segment from start to end.
+
+    Compressed segments never change once written, so no progress is saved.
+    The footer copy in the container header, which queries use to skip the
+    segment, must match the footer record inside the stream.
+    """
+    # Imported here: segments.py builds on this module
+    from .segments import iter_segment_lines, read_footer
+
+    state = VerifyState()
+    footer = None
+    line_num = 0
+    for raw in iter_segment_lines(log_path):
+        if not raw.endswith(b"\n"):
+            print(f"Truncated compressed segment after line {line_num}")
+            return False
+        line_num += 1
+        if not raw.strip():
+            continue
+        if not _check_line(raw, line_num, state, key, interval):
+            return False
+        if FOOTER_TYPE.encode() in raw:
+            footer = json.loads(raw)
+
+    if footer is None or read_footer(log_path) != footer:
+        print("Integrity violation: segment footer missing or does not match the compressed header")
+        return False
+    return True
+
+
+def verify_log_file(log_path: Path, config: AuditConfig, full: bool = False) -> bool:
+    """
+    Verify the checksums, hash chain, checkpoints and footer of one log file.
+
+    Compressed segments (``.gz``/``.zst``) are decompressed on the fly and
+    always verified in full.
+
+    Args:
+        log_path: Log file to verify
+        config: Audit configuration (state file location, checkpoint key)
+        full: Ignore the saved state and verify from the first line
+
+    Returns:
+        True if every line verified so far is intact
+    """
+    if not log_path.exists():
+        return True  # Empty log is valid
+
+    key = load_checkpoint_key(config)
+    if log_path.suffix in COMPRESSED_SUFFIXES:
+        return _verify_compressed(log_path, key, config.checkpoint_interval)
+
+    size = log_path.stat().st_size
+
+    with open(log_path, "rb") as f:
+        header = hashlib.sha256(f.readline()).hexdigest()
+        state = None if full else _resume_state(f, config, log_path, header, size)
+        if state is None:
+            state = VerifyState(header=header)
+
+        f.seek(state.offset)
+        offset = state.offset
+        line_num = state.lines
+        for raw in f:
+            if not raw.endswith(b"\n"):
+                break  # Line still being written; verify it next time
+            line_num += 1
+            line_start, offset = offset, offset + len(raw)
+            if not raw.strip():
+                continue
+
+            if not _check_line(raw, line_num, state, key, config.checkpoint_interval):
+                return False
+
+            state.lines = line_num
+            state.tail_offset = line_start
+            state.tail = hashlib.sha256(raw).hexdigest()
+            state.offset = offset
+
+    if not _check_tail(state, config.checkpoint_interval):
+        return False
+    _save_state(config, log_path, state)
+    return True
@@ -2,17 +2,37 @@
 Core audit logging implementation.
 
 Provides thread-safe, append-only audit logging with automatic rotation.
+Entries form a hash chain with periodic signed checkpoints (see
+``integrity.py``), and integrity checks resume where the last one stopped.
+
+Each event is serialised once (with sorted keys) and sealed with a SHA-256
+checksum of that serialisation. With ``AuditConfig.buffered`` enabled, sealed
+lines are handed to a ``BufferedAuditWriter`` that keeps the log file open
+and appends them in batches from a background thread; call ``flush()`` or
+``close()`` to force them to disk (``close()`` also runs at interpreter exit).
+
+Rotated files are handed to a ``SegmentFinalizer`` thread (see
+``segments.py``) that appends a summary footer and, with
+``AuditConfig.compression``, compresses them without blocking ``log()``.
+
+Syslog messages and alerts are queued on an ``AuditDelivery`` (see
+``delivery.py``) and sent by a background thread, outside the logger lock.
 """
 
 import json
+import os
 import threading
 from pathlib import Path
 from typing import Optional
 from datetime import datetime
-import hashlib
 
 from .events import AuditEvent
 from .config import AuditConfig, get_config
+from .delivery import KIND_ALERT, KIND_SYSLOG, AuditDelivery, alert_message, syslog_message
+from .integrity import checkpoint_line, load_checkpoint_key, read_chain_tail, seal_event, verify_log_file
+from .retention import CompactionReport, compact_logs
+from .segments import SegmentFinalizer, rotation_lock, segment_id, slot_paths, unfinished_segments
+from .writer import FSYNC_BATCH, BufferedAuditWriter
 
 
 class AuditLogger:
@@ -37,10 +57,30 @@ class AuditLogger:
         self.config = config or get_config()
         self._lock = threading.Lock()
         self._last_checksum: Optional[str] = None
+        self._last_hash: Optional[str] = None
+        self._since_checkpoint = 0
+        self._checkpoint_key: Optional[bytes] = None
+        self._writer: Optional[BufferedAuditWriter] = None
+        # Held while rotated files are renamed (by rotation or the finalizer)
+        self._rotation_lock = threading.Lock()
+        self._finalizer: Optional[SegmentFinalizer] = None
+        # Created on the first syslog message or alert
+        self._delivery: Optional[AuditDelivery] = None
+        self._delivery_lock = threading.Lock()
+        # Bytes in the current log file including queued events (buffered mode)
+        self._size = 0
 
         # Initialize log file
         if self.config.enabled:
             self._init_log_file()
+            # Continue the existing chain when appending to a log from an earlier run
+            self._last_checksum, self._last_hash, self._since_checkpoint = read_chain_tail(self.config.log_path)
+            # Finish segments an earlier process rotated but did not finalise
+            for segment in unfinished_segments(self.config):
+                self._finalize_segment(segment)
+            if self.config.buffered:
+                self._size = self.config.log_path.stat().st_size
+                self._writer = BufferedAuditWriter(self.config, self._rotate_files)
 
     def _init_log_file(self) -> None:
         """Initialize the audit log file and directory."""
@@ -51,8 +91,8 @@ class AuditLogger:
         if not self.config.log_path.exists():
             self._write_header()
 
-    def _write_header(self) -> None:
-        """Write log file header."""
+    def _header_line(self) -> str:
+        """Return the serialised log file header."""
         header = {
             "type": "audit_log_header",
             "version": "1.0",
@@ -60,8 +100,35 @@ class AuditLogger:
             "description": "NUAA CLI Audit Log",
             "format": "JSON Lines (JSONL)",
         }
+        return json.dumps(header) + "\n"
+
+    def _write_header(self) -> None:
+        """Write log file header."""
         with open(self.config.log_path, "w", encoding="utf-8") as f:
-            f.write(json.dumps(header) + "\n")
+            f.write(self._header_line())
+
+    def _seal(self, event_dict: dict) -> tuple[str, str, str]:
+        """
+        Serialise an event once and append its integrity fields.
+
+        The checksum covers the sorted-key JSON of the event, which is also
+        the text written to the log; the checksum and chain fields are
+        spliced onto the end of that object rather than serialising the
+        event a second time. A signed checkpoint line follows every
+        ``checkpoint_interval`` events.
+
+        Returns:
+            Tuple of (text to append, checksum, chain hash)
+        """
+        event_json = json.dumps(event_dict, sort_keys=True)
+        text, checksum, chain = seal_event(event_json, self._last_checksum, self._last_hash)
+        self._since_checkpoint += 1
+        if self.config.checkpoint_interval and self._since_checkpoint >= self.config.checkpoint_interval:
+            if self._checkpoint_key is None:
+                self._checkpoint_key = load_checkpoint_key(self.config)
+            text += checkpoint_line(self._checkpoint_key, chain)
+            self._since_checkpoint = 0
+        return text, checksum, chain
 
     def log(self, event: AuditEvent) -> bool:
         """
@@ -86,34 +153,33 @@ class AuditLogger:
 
         with self._lock:
             try:
-                # Check for rotation
-                self._check_rotation()
-
                 # Convert event to dict
                 event_dict = event.to_dict()
 
-                # Add checksum for integrity
-                event_json = json.dumps(event_dict, sort_keys=True)
-                checksum = hashlib.sha256(event_json.encode()).hexdigest()
-                event_dict["_checksum"] = checksum
-                event_dict["_prev_checksum"] = self._last_checksum
-
-                # Write to log file (append-only)
-                with open(self.config.log_path, "a", encoding="utf-8") as f:
-                    f.write(json.dumps(event_dict) + "\n")
-                    f.flush()  # Ensure immediate write
+                if self._writer is not None:
+                    # Rotation is decided here, in submission order, so the
+                    # checksum chain restarts exactly where the file does
+                    if self._size >= self.config.max_file_size:
+                        self._writer.rotate()
+                        self._reset_chain()
+                        self._size = len(self._header_line())
+                    line, checksum, chain = self._seal(event_dict)
+                    self._writer.submit(line)
+                    self._size += len(line)
+                else:
+                    # Check for rotation
+                    self._check_rotation()
+                    line, checksum, chain = self._seal(event_dict)
+
+                    # Write to log file (append-only)
+                    with open(self.config.log_path, "a", encoding="utf-8") as f:
+                        f.write(line)
+                        f.flush()  # Ensure immediate write
+                        if self.config.fsync_policy == FSYNC_BATCH:
+                            os.fsync(f.fileno())
 
                 self._last_checksum = checksum
-
-                # Send to syslog if enabled
-                if self.config.syslog_enabled:
-                    self._send_to_syslog(event)
-
-                # Check for alerts
-                if event.requires_immediate_alert() and self.config.alert_on_critical:
-                    self._send_alert(event)
-
-                return True
+                self._last_hash = chain
 
             except Exception as e:
                 # Log to standard logging but don't raise
@@ -123,6 +189,16 @@ class AuditLogger:
                 logging.error(f"Failed to write audit log: {e}")
                 return False
 
+        # Send to syslog if enabled
+        if self.config.syslog_enabled:
+            self._send_to_syslog(event)
+
+        # Check for alerts
+        if event.requires_immediate_alert() and self.config.alert_on_critical:
+            self._send_alert(event)
+
+        return True
+
     def _check_rotation(self) -> None:
         """Check if log rotation is needed and perform it."""
         if not self.config.log_path.exists():
@@ -134,31 +210,95 @@ class AuditLogger:
         if file_size >= self.config.max_file_size:
             self._rotate_logs()
 
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Write any buffered events to the log file.
+
+        Also waits until rotated segments have their footer and are
+        compressed, and until queued syslog messages and alerts have been
+        sent. Otherwise a no-op unless the logger runs in buffered mode.
+
+        Args:
+            timeout: Maximum seconds to wait (None = no limit)
+
+        Returns:
+            True if every event logged before the call has been written
+        """
+        flushed = self._writer.flush(timeout) if self._writer is not None else True
+        if self._finalizer is not None:
+            self._finalizer.wait()
+        if self._delivery is not None:
+            flushed = self._delivery.flush(timeout) and flushed
+        return flushed
+
+    def close(self) -> None:
+        """
+        Flush buffered events and stop the background writer.
+
+        Events logged after ``close()`` are written directly, as in
+        unbuffered mode.
+        """
+        with self._lock:
+            writer, self._writer = self._writer, None
+        if writer is not None:
+            writer.close()
+        if self._finalizer is not None:
+            self._finalizer.close()
+            self._finalizer = None
+        with self._delivery_lock:
+            delivery, self._delivery = self._delivery, None
+        if delivery is not None:
+            delivery.close()
+
     def _rotate_logs(self) -> None:
         """Rotate audit logs."""
-        # Rotate existing logs
-        for i in range(self.config.max_files - 1, 0, -1):
-            old_file = self.config.audit_dir / f"{self.config.log_file}.{i}"
-            new_file = self.config.audit_dir / f"{self.config.log_file}.{i + 1}"
-
-            if old_file.exists():
-                if new_file.exists():
-                    new_file.unlink()  # Delete oldest log
-                old_file.rename(new_file)
-
-        # Rotate current log to .1
-        rotated_file = self.config.audit_dir / f"{self.config.log_file}.1"
-        if rotated_file.exists():
-            rotated_file.unlink()
-        self.config.log_path.rename(rotated_file)
-
-        # Create new log file
-        self._write_header()
+        self._rotate_files()
+        self._reset_chain()
+
+    def _reset_chain(self) -> None:
+        """Start a new checksum/hash chain (each log file has its own)."""
         self._last_checksum = None
+        self._last_hash = None
+        self._since_checkpoint = 0
+
+    def _rotate_files(self) -> None:
+        """Shift rotated files up by one and start a new log file with a header."""
+        with rotation_lock(self.config, self._rotation_lock):
+            segment = segment_id(self.config.log_path)
+
+            # Rotate existing logs (raw or compressed)
+            for i in range(self.config.max_files - 1, 0, -1):
+                old_files = slot_paths(self.config, i)
+                new_files = slot_paths(self.config, i + 1)
+
+                if any(old_file.exists() for old_file in old_files):
+                    for new_file in new_files:
+                        new_file.unlink(missing_ok=True)  # Delete oldest log
+                    for old_file, new_file in zip(old_files, new_files):
+                        if old_file.exists():
+                            old_file.rename(new_file)
+
+            # Rotate current log to .1
+            rotated_files = slot_paths(self.config, 1)
+            for rotated_file in rotated_files:
+                rotated_file.unlink(missing_ok=True)
+            self.config.log_path.rename(rotated_files[0])
+
+            # Create new log file
+            self._write_header()
+
+        if segment is not None:
+            self._finalize_segment(segment)
+
+    def _finalize_segment(self, segment: str) -> None:
+        """Queue a rotated segment for its footer (and compression)."""
+        if self._finalizer is None:
+            self._finalizer = SegmentFinalizer(self.config, self._rotation_lock)
+        self._finalizer.submit(segment)
 
     def _send_to_syslog(self, event: AuditEvent) -> None:
         """
-        Send audit event to syslog.
+        Queue audit event for syslog.
 
         Args:
             event: AuditEvent to send
@@ -166,103 +306,73 @@ class AuditLogger:
         if not self.config.syslog_host:
             return
 
-        try:
-            import logging.handlers
-
-            syslog = logging.handlers.SysLogHandler(
-                address=(self.config.syslog_host, self.config.syslog_port)
-            )
-
-            # Format as syslog message
-            message = f"NUAA_AUDIT: {event.event_type.value} - {event.action or event.description}"
-            syslog.emit(
-                logging.LogRecord(
-                    name="nuaa_audit",
-                    level=logging.INFO,
-                    pathname="",
-                    lineno=0,
-                    msg=message,
-                    args=(),
-                    exc_info=None,
-                )
-            )
-        except Exception:
-            pass  # Fail silently if syslog is unavailable
+        self._get_delivery().submit(KIND_SYSLOG, syslog_message(event))
 
     def _send_alert(self, event: AuditEvent) -> None:
         """
-        Send alert for critical event.
+        Queue alert for critical event.
 
         Args:
             event: AuditEvent that triggered the alert
         """
-        # In a production system, this would send email/SMS/etc.
-        # For now, just log to stderr
-        import sys
+        self._get_delivery().submit(KIND_ALERT, alert_message(event))
 
-        print(
-            f"[AUDIT ALERT] {event.severity.value.upper()}: {event.event_type.value}",
-            file=sys.stderr,
-        )
+    def _get_delivery(self) -> AuditDelivery:
+        """Return the background sender, starting it on first use."""
+        if self._delivery is None:
+            with self._delivery_lock:
+                if self._delivery is None:
+                    self._delivery = AuditDelivery(self.config)
+        return self._delivery
 
-    def verify_integrity(self, log_file: Optional[Path] = None) -> bool:
+    def delivery_stats(self) -> Optional[dict]:
         """
-        Verify integrity of audit log using checksums.
-
-        Args:
-            log_file: Path to log file (uses current log if None)
+        Syslog and alert delivery counters (see ``AuditDelivery.stats``).
 
         Returns:
-            True if integrity is verified, False otherwise
+            Counters, or None if nothing has been queued for delivery yet
         """
-        log_path = log_file or self.config.log_path
-
-        if not log_path.exists():
-            return True  # Empty log is valid
-
-        try:
-            prev_checksum = None
-
-            with open(log_path, "r", encoding="utf-8") as f:
-                for line_num, line in enumerate(f, 1):
-                    if not line.strip():
-                        continue
+        delivery = self._delivery
+        return delivery.stats() if delivery is not None else None
 
-                    try:
-                        entry = json.loads(line)
-
-                        # Skip header
-                        if entry.get("type") == "audit_log_header":
-                            continue
+    def compact(self, now: Optional[datetime] = None, dry_run: bool = False) -> CompactionReport:
+        """
+        Drop expired events from rotated segments (see ``retention.compact_logs``).
 
-                        # Verify checksum chain
-                        if "_checksum" in entry:
-                            stored_checksum = entry.pop("_checksum")
-                            stored_prev = entry.pop("_prev_checksum", None)
+        Waits for pending segment finalisation first and holds the rotation
+        lock while each segment is replaced, so it is safe to call while
+        this logger is in use.
 
-                            # Verify previous checksum chain
-                            if stored_prev != prev_checksum:
-                                print(
-                                    f"Integrity violation at line {line_num}: broken checksum chain"
-                                )
-                                return False
+        Args:
+            now: Reference time for expiry (default: current UTC time)
+            dry_run: Report what would be reclaimed without changing files
 
-                            # Verify current checksum
-                            event_json = json.dumps(entry, sort_keys=True)
-                            calculated = hashlib.sha256(event_json.encode()).hexdigest()
+        Returns:
+            CompactionReport with bytes reclaimed and events removed
+        """
+        self.flush()
+        return compact_logs(self.config, now=now, dry_run=dry_run, lock=self._rotation_lock)
 
-                            if calculated != stored_checksum:
-                                print(f"Integrity violation at line {line_num}: checksum mismatch")
-                                return False
+    def verify_integrity(self, log_file: Optional[Path] = None, full: bool = False) -> bool:
+        """
+        Verify integrity of audit log using checksums, the hash chain and checkpoints.
 
-                            prev_checksum = stored_checksum
+        By default verification resumes from where the previous call on the
+        same file stopped and only checks lines appended since then; the
+        progress is kept in ``verify-state.json`` in the audit directory.
 
-                    except json.JSONDecodeError:
-                        print(f"Invalid JSON at line {line_num}")
-                        return False
+        Args:
+            log_file: Path to log file (uses current log if None)
+            full: Re-verify the whole file, ignoring saved progress
 
-            return True
+        Returns:
+            True if integrity is verified, False otherwise
+        """
+        log_path = log_file or self.config.log_path
+        self.flush()
 
+        try:
+            return verify_log_file(log_path, self.config, full=full)
         except Exception as e:
             print(f"Error verifying integrity: {e}")
             return False
@@ -0,0 +1,89 @@
+"""
+Process-pool fan-out over audit log files.
+
+Scanning the current log and every rotated log (``audit.log.1`` ...
+``audit.log.N``) is CPU-bound JSON parsing, so it scales with cores when each
+file is handled by its own process. ``map_log_files`` runs a picklable
+per-file function (such as ``query._query_file`` or
+``query.aggregate_log_file``) over a list of files and returns the results in
+file order. Callers merge them: sorted event lists with ``heapq.merge``,
+compliance aggregates with ``ComplianceAggregator.merge``.
+
+Starting worker processes costs more than scanning a few megabytes, so the
+pool is only used when there is more than one file, more than one worker and
+at least ``AuditConfig.parallel_min_bytes`` to read. Otherwise, and if the
+pool cannot be started, the files are processed serially in this process.
+
+Workers are started with the ``spawn`` method on every platform. Forking
+would copy the locks held by the audit writer, segment finaliser and
+delivery threads into the child in whatever state they are in.
+
+Example:
+    >>> results = map_log_files(_query_file, files, query, config=config)
+"""
+
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Any, Callable, List, Optional, Sequence, TypeVar
+
+from .config import AuditConfig
+
+T = TypeVar("T")
+
+
+def resolve_workers(config: AuditConfig, workers: Optional[int] = None) -> int:
+    """Return the worker count to use: ``workers``, the config value, or the CPU count."""
+    if workers is None:
+        workers = config.query_workers
+    if workers <= 0:
+        workers = os.cpu_count() or 1
+    return workers
+
+
+def should_parallelize(files: Sequence[Path], workers: int, min_bytes: int) -> bool:
+    """Whether fanning out to processes is worth the start-up cost."""
+    if workers <= 1 or len(files) <= 1:
+        return False
+    total = 0
+    for path in files:
+        try:
+            total += path.stat().st_size
+        except OSError:
+            continue
+    return total >= min_bytes
+
+
+def map_log_files(
+    func: Callable[..., T],
+    files: Sequence[Path],
+    *args: Any,
+    config: AuditConfig,
+    workers: Optional[int] = None,
+) -> List[T]:
+    """
+    Apply ``func(path, *args)`` to every log file, in parallel when worthwhile.
+
+    Args:
+        func: Module-level (picklable) function taking a log file path first
+        files: Log files to process
+        *args: Extra picklable arguments passed to every call
+        config: Audit configuration (worker count and size threshold)
+        workers: Override ``config.query_workers`` (0 = one per CPU)
+
+    Returns:
+        One result per file, in the order of ``files``
+    """
+    workers = resolve_workers(config, workers)
+    if should_parallelize(files, workers, config.parallel_min_bytes):
+        try:
+            with ProcessPoolExecutor(
+                max_workers=min(workers, len(files)), mp_context=multiprocessing.get_context("spawn")
+            ) as pool:
+                return list(pool.map(func, files, *([arg] * len(files) for arg in args)))
+        except (BrokenProcessPool, NotImplementedError, OSError) as e:
+            logging.warning(f"Parallel audit scan failed, scanning serially: {e}")
+    return [func(path, *args) for path in files]
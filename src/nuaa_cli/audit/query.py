@@ -3,17 +3,41 @@ Audit log querying and reporting.
 
 Provides capabilities to search, filter, and analyze audit logs
 for compliance reporting and forensic analysis.
+
+With ``AuditConfig.index_enabled`` queries are answered from the SQLite
+index in ``index.py``; if the index cannot be used the functions fall back
+to scanning the JSONL files.
+
+``iter_audit_events`` yields matching events one at a time, and the
+``export_to_*`` writers consume any iterable of events, so large exports run
+in constant memory:
+
+Example:
+    >>> events = iter_audit_events(AuditQuery(username="alice"))
+    >>> export_to_jsonl(events, Path("alice.jsonl"))
+    1234
 """
 
+import heapq
 import json
-from dataclasses import dataclass
+import logging
+import sqlite3
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
 from datetime import datetime
+from itertools import chain, islice
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import Iterable, Iterator, List, Optional, Dict, Any, TextIO, Union
 import re
 
-from .events import AuditEvent, EventType, Severity
+from . import codec
+from .events import SECURITY_EVENT_TYPES, AuditEvent, EventType, Severity
 from .config import get_config
+from .index import AuditIndex
+from .integrity import CHECKPOINT_TYPE, FOOTER_TYPE, HEADER_TYPE, INTEGRITY_FIELDS, iter_lines_reversed
+from .parallel import map_log_files
+from .report import ComplianceAggregator
+from .segments import COMPRESSION_NONE, compression_of, iter_segment_lines, log_files, segment_in_range
 
 
 @dataclass
@@ -103,6 +127,25 @@ class AuditQuery:
         return True
 
 
+def _parse_line(line: Union[str, bytes]) -> Optional[AuditEvent]:
+    """Decode one log line; None for header/checkpoint records and invalid entries."""
+    try:
+        entry = codec.loads(line)
+
+        # Skip header, checkpoint and footer records
+        if entry.get("type") in (HEADER_TYPE, CHECKPOINT_TYPE, FOOTER_TYPE):
+            return None
+
+        # Remove audit-specific fields
+        for key in INTEGRITY_FIELDS:
+            entry.pop(key, None)
+
+        return AuditEvent.from_dict(entry)
+    except Exception:
+        # Skip invalid entries
+        return None
+
+
 def query_audit_logs(
     query: Optional[AuditQuery] = None,
     log_file: Optional[Path] = None,
@@ -126,35 +169,25 @@ def query_audit_logs(
     if not log_path.exists():
         return []
 
+    if config.index_enabled and log_path in log_files(config):
+        try:
+            return AuditIndex(config).query(query, log_files=[log_path])
+        except (sqlite3.Error, OSError) as e:
+            logging.warning(f"Audit index unavailable, scanning log instead: {e}")
+
     results = []
 
     try:
-        with open(log_path, "r", encoding="utf-8") as f:
-            for line in f:
+        if segment_in_range(log_path, query.start_time, query.end_time):
+            for line in iter_segment_lines(log_path):
                 if not line.strip():
                     continue
 
-                try:
-                    entry = json.loads(line)
+                event = _parse_line(line)
 
-                    # Skip header
-                    if entry.get("type") == "audit_log_header":
-                        continue
-
-                    # Convert to AuditEvent
-                    # Remove audit-specific fields
-                    entry.pop("_checksum", None)
-                    entry.pop("_prev_checksum", None)
-
-                    event = AuditEvent.from_dict(entry)
-
-                    # Check if event matches query
-                    if query.matches(event):
-                        results.append(event)
-
-                except (json.JSONDecodeError, Exception):
-                    # Skip invalid entries
-                    continue
+                # Check if event matches query
+                if event is not None and query.matches(event):
+                    results.append(event)
 
         # Sort results
         results.sort(key=lambda e: e.timestamp, reverse=query.sort_desc)
@@ -169,35 +202,125 @@ def query_audit_logs(
         return results
 
     except Exception as e:
-        import logging
-
         logging.error(f"Error querying audit logs: {e}")
         return []
 
 
-def query_all_logs() -> List[AuditEvent]:
+def _query_file(log_file: Path, query: AuditQuery) -> List[AuditEvent]:
+    """
+    Return the events of one log file matching ``query``, sorted but not paginated.
+
+    Runs in worker processes, so it reads the file directly and uses no
+    global state.
+    """
+    if not segment_in_range(log_file, query.start_time, query.end_time):
+        return []
+    events = [event for event in _scan_file(log_file, newest_first=False) if query.matches(event)]
+    events.sort(key=lambda e: e.timestamp, reverse=query.sort_desc)
+    return events
+
+
+def query_all_logs(query: Optional[AuditQuery] = None, workers: Optional[int] = None) -> List[AuditEvent]:
     """
     Query all audit logs (including rotated logs).
 
+    Without the index, each log file is parsed and filtered separately - in
+    a process pool when there are several large files (see ``parallel.py``) -
+    and the sorted per-file results are merged by timestamp.
+
+    Args:
+        query: AuditQuery with search criteria (None = all events, newest first)
+        workers: Worker processes for scanning (default: ``config.query_workers``;
+            1 = serial)
+
     Returns:
-        List of all AuditEvents across all log files
+        List of matching AuditEvents across all log files
     """
     config = get_config()
-    all_events = []
+    if query is None:
+        query = AuditQuery()
 
-    # Query current log
-    all_events.extend(query_audit_logs())
+    if config.index_enabled:
+        try:
+            return AuditIndex(config).query(query)
+        except (sqlite3.Error, OSError) as e:
+            logging.warning(f"Audit index unavailable, scanning logs instead: {e}")
+
+    # Paginate once across all files, not per file
+    per_file = replace(query, limit=None, offset=0)
+    results = map_log_files(_query_file, log_files(config), per_file, config=config, workers=workers)
+    merged = heapq.merge(*results, key=lambda e: e.timestamp, reverse=query.sort_desc)
+
+    stop = query.offset + query.limit if query.limit else None
+    return list(islice(merged, query.offset, stop))
+
+
+def _scan_file(path: Path, newest_first: bool) -> Iterator[AuditEvent]:
+    """Yield the events of one log file in file order (or reversed)."""
+    if not newest_first:
+        lines: Iterable[bytes] = iter_segment_lines(path)
+    elif compression_of(path) == COMPRESSION_NONE:
+        lines = iter_lines_reversed(path)
+    else:
+        # Compressed streams can only be read forwards; rotated segments
+        # are bounded by max_file_size
+        lines = reversed(list(iter_segment_lines(path)))
+    for line in lines:
+        if line.strip():
+            event = _parse_line(line)
+            if event is not None:
+                yield event
+
+
+def iter_audit_events(
+    query: Optional[AuditQuery] = None,
+    log_file: Optional[Path] = None,
+) -> Iterator[AuditEvent]:
+    """
+    Yield matching audit events one at a time.
 
-    # Query rotated logs
-    for i in range(1, config.max_files + 1):
-        log_file = config.audit_dir / f"{config.log_file}.{i}"
-        if log_file.exists():
-            all_events.extend(query_audit_logs(log_file=log_file))
+    Unlike ``query_audit_logs`` this never holds the whole result in memory,
+    so it suits exports and reports over large logs. ``query.offset`` and
+    ``query.limit`` select a window of the stream; to page through results,
+    advance ``offset`` by ``limit`` on each call.
 
-    # Sort by timestamp
-    all_events.sort(key=lambda e: e.timestamp, reverse=True)
+    Without the index, events are yielded in log order - newest first when
+    ``query.sort_desc`` is set - which matches timestamp order for events
+    logged with their default timestamp. With ``AuditConfig.index_enabled``
+    they are streamed from SQLite sorted by timestamp.
 
-    return all_events
+    Args:
+        query: AuditQuery with search criteria (None = all events)
+        log_file: Only read this log file (default: current and rotated logs)
+
+    Yields:
+        Matching AuditEvents
+    """
+    if query is None:
+        query = AuditQuery()
+
+    config = get_config()
+    files = [log_file] if log_file is not None else log_files(config)
+    files = [f for f in files if f.exists()]
+    if not files:
+        return
+
+    if config.index_enabled and all(f in log_files(config) for f in files):
+        try:
+            events = AuditIndex(config).iter_query(query, log_files=files if log_file is not None else None)
+        except (sqlite3.Error, OSError) as e:
+            logging.warning(f"Audit index unavailable, scanning logs instead: {e}")
+        else:
+            yield from events
+            return
+
+    # log_files() lists the newest file first
+    ordered = files if query.sort_desc else list(reversed(files))
+    in_range = [path for path in ordered if segment_in_range(path, query.start_time, query.end_time)]
+    scanned = (event for path in in_range for event in _scan_file(path, query.sort_desc))
+    matching = (event for event in scanned if query.matches(event))
+    stop = query.offset + query.limit if query.limit else None
+    yield from islice(matching, query.offset, stop)
 
 
 def get_events_by_date_range(start_date: datetime, end_date: datetime) -> List[AuditEvent]:
@@ -236,13 +359,7 @@ def get_security_events() -> List[AuditEvent]:
     Returns:
         List of security AuditEvents
     """
-    security_types = [
-        EventType.AUTH_SUCCESS,
-        EventType.AUTH_FAILURE,
-        EventType.AUTH_DENIED,
-        EventType.PERMISSION_DENIED,
-    ]
-    query = AuditQuery(event_types=security_types)
+    query = AuditQuery(event_types=list(SECURITY_EVENT_TYPES))
     return query_audit_logs(query)
 
 
@@ -268,111 +385,153 @@ def get_events_with_pii() -> List[AuditEvent]:
     return query_audit_logs(query)
 
 
-def generate_compliance_report(start_date: datetime, end_date: datetime) -> Dict[str, Any]:
+def aggregate_log_file(log_file: Path, query: Optional[AuditQuery] = None) -> ComplianceAggregator:
+    """
+    Build a partial compliance aggregate over one log file.
+
+    Reads the file directly (not through the index) and depends on no global
+    state, so it can run in a worker process; merge the partial results with
+    ``ComplianceAggregator.merge``.
+
+    Args:
+        log_file: Log file to read
+        query: AuditQuery selecting the events to count (None = all events)
+
+    Returns:
+        Aggregate over the matching events of ``log_file``
+    """
+    query = query or AuditQuery()
+    aggregator = ComplianceAggregator()
+    if log_file.exists() and segment_in_range(log_file, query.start_time, query.end_time):
+        aggregator.update(event for event in _scan_file(log_file, newest_first=False) if query.matches(event))
+    return aggregator
+
+
+def generate_compliance_report(
+    start_date: datetime,
+    end_date: datetime,
+    include_rotated: bool = False,
+    workers: Optional[int] = None,
+) -> Dict[str, Any]:
     """
     Generate a compliance report for a date range.
 
+    Events are streamed through a ``ComplianceAggregator`` in a single pass,
+    so memory use does not grow with the number of events in the range.
+
     Args:
         start_date: Start of reporting period
         end_date: End of reporting period
+        include_rotated: Also count events in rotated log files (aggregated
+            per file, in parallel when worthwhile, and merged)
+        workers: Worker processes for ``include_rotated`` (default:
+            ``config.query_workers``; 1 = serial)
 
     Returns:
         Dictionary containing compliance report data
     """
-    query = AuditQuery(start_time=start_date, end_time=end_date)
-    events = query_audit_logs(query)
-
-    # Aggregate statistics
-    event_counts = {}
-    severity_counts = {}
-    user_activity = {}
-    failed_actions = []
-
-    for event in events:
-        # Count by event type
-        event_type = event.event_type.value
-        event_counts[event_type] = event_counts.get(event_type, 0) + 1
-
-        # Count by severity
-        severity = event.severity.value
-        severity_counts[severity] = severity_counts.get(severity, 0) + 1
-
-        # Track user activity
-        if event.username:
-            if event.username not in user_activity:
-                user_activity[event.username] = {"total": 0, "failed": 0}
-            user_activity[event.username]["total"] += 1
-            if event.status == "failure":
-                user_activity[event.username]["failed"] += 1
-
-        # Track failures
-        if event.status == "failure":
-            failed_actions.append(
-                {
-                    "timestamp": event.timestamp.isoformat(),
-                    "event_type": event.event_type.value,
-                    "user": event.username,
-                    "action": event.action,
-                }
-            )
-
-    return {
-        "report_period": {
-            "start": start_date.isoformat(),
-            "end": end_date.isoformat(),
-        },
-        "summary": {
-            "total_events": len(events),
-            "unique_users": len(user_activity),
-            "failed_actions": len(failed_actions),
-        },
-        "event_counts": event_counts,
-        "severity_counts": severity_counts,
-        "user_activity": user_activity,
-        "failed_actions": failed_actions[:100],  # Limit to 100 most recent
-        "compliance_flags": {
-            "pii_access_count": len([e for e in events if e.contains_pii]),
-            "sensitive_operations": len([e for e in events if e.is_sensitive]),
-            "security_events": len([e for e in events if e.is_security_event()]),
-        },
-    }
-
-
-def export_to_json(events: List[AuditEvent], output_file: Path) -> None:
+    config = get_config()
+    query = AuditQuery(start_time=start_date, end_time=end_date, sort_desc=False)
+
+    if include_rotated:
+        aggregator = ComplianceAggregator()
+        # Oldest file first, so ties between failures keep log order
+        files = list(reversed(log_files(config)))
+        for partial in map_log_files(aggregate_log_file, files, query, config=config, workers=workers):
+            aggregator.merge(partial)
+    else:
+        aggregator = ComplianceAggregator().update(iter_audit_events(query, log_file=config.log_path))
+
+    return aggregator.to_report(start_date, end_date)
+
+
+@contextmanager
+def _open_output(output: Union[Path, TextIO], newline: Optional[str] = None) -> Iterator[TextIO]:
+    """Open a path for writing, or pass through an already open text stream."""
+    if isinstance(output, (str, Path)):
+        with open(output, "w", newline=newline, encoding="utf-8") as f:
+            yield f
+    else:
+        yield output
+
+
+def export_to_json(events: Iterable[AuditEvent], output_file: Union[Path, TextIO]) -> int:
     """
-    Export audit events to JSON file.
+    Export audit events to a JSON array file.
+
+    Events are written one at a time, producing the same output as
+    ``json.dump(..., indent=2)`` without building the list in memory.
+
+    Args:
+        events: AuditEvents to export (any iterable, e.g. ``iter_audit_events()``)
+        output_file: Path to output file, or an open text stream
+
+    Returns:
+        Number of events written
+    """
+    count = 0
+    with _open_output(output_file) as f:
+        for event in events:
+            element = json.dumps(event.to_dict(), indent=2).replace("\n", "\n  ")
+            f.write(("[\n  " if count == 0 else ",\n  ") + element)
+            count += 1
+        f.write("\n]" if count else "[]")
+    return count
+
+
+def export_to_jsonl(events: Iterable[AuditEvent], output_file: Union[Path, TextIO]) -> int:
+    """
+    Export audit events as JSON Lines, one event per line.
 
     Args:
-        events: List of AuditEvents to export
-        output_file: Path to output file
+        events: AuditEvents to export (any iterable, e.g. ``iter_audit_events()``)
+        output_file: Path to output file, or an open text stream
+
+    Returns:
+        Number of events written
     """
-    with open(output_file, "w", encoding="utf-8") as f:
-        json.dump([e.to_dict() for e in events], f, indent=2)
+    count = 0
+    with _open_output(output_file) as f:
+        for event in events:
+            f.write(json.dumps(event.to_dict()) + "\n")
+            count += 1
+    return count
 
 
-def export_to_csv(events: List[AuditEvent], output_file: Path) -> None:
+def export_to_csv(events: Iterable[AuditEvent], output_file: Union[Path, TextIO]) -> int:
     """
     Export audit events to CSV file.
 
+    Columns are taken from the first event. No file is written if there are
+    no events.
+
     Args:
-        events: List of AuditEvents to export
-        output_file: Path to output file
+        events: AuditEvents to export (any iterable, e.g. ``iter_audit_events()``)
+        output_file: Path to output file, or an open text stream
+
+    Returns:
+        Number of events written
     """
     import csv
 
-    if not events:
-        return
+    events = iter(events)
+    first = next(events, None)
+    if first is None:
+        return 0
 
     # Get all field names
-    fieldnames = list(events[0].to_dict().keys())
+    fieldnames = list(first.to_dict().keys())
 
-    with open(output_file, "w", newline="", encoding="utf-8") as f:
+    count = 0
+    with _open_output(output_file, newline="") as f:
         writer = csv.DictWriter(f, fieldnames=fieldnames)
         writer.writeheader()
 
-        for event in events:
+        for event in chain([first], events):
             # Convert nested dicts to JSON strings for CSV
             row = event.to_dict()
             if "metadata" in row and isinstance(row["metadata"], dict):
                 row["metadata"] = json.dumps(row["metadata"])
             writer.writerow(row)
+            count += 1
+    return count
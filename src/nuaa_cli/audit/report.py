@@ -0,0 +1,170 @@
+"""
+Single-pass compliance report aggregation.
+
+``ComplianceAggregator`` computes every metric of a compliance report while
+consuming an event iterator once. Memory grows with the number of distinct
+event types, severities and users, not with the number of events: only the
+100 most recent failures are kept, in a bounded heap.
+
+Aggregators are plain picklable objects and can be merged, so a report over
+several log files can be built from one partial aggregate per file, computed
+independently (for example in separate processes) and combined.
+
+Example:
+    >>> agg = ComplianceAggregator().update(iter_audit_events(query))
+    >>> other = ComplianceAggregator().update(events_from_another_file)
+    >>> report = agg.merge(other).to_report(start_date, end_date)
+"""
+
+import heapq
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Tuple
+
+from .events import AuditEvent
+
+# Failures listed in full in the report (most recent first)
+MAX_FAILED_ACTIONS = 100
+
+
+class ComplianceAggregator:
+    """
+    Streaming accumulator for compliance report metrics.
+
+    Args:
+        max_failed_actions: Number of most recent failures to keep
+    """
+
+    def __init__(self, max_failed_actions: int = MAX_FAILED_ACTIONS):
+        self.max_failed_actions = max_failed_actions
+        self.total_events = 0
+        self.failed_count = 0
+        self.pii_access_count = 0
+        self.sensitive_operations = 0
+        self.security_events = 0
+        self.event_counts: Dict[str, int] = {}
+        self.severity_counts: Dict[str, int] = {}
+        self.user_activity: Dict[str, Dict[str, int]] = {}
+        # Min-heap of (timestamp, -sequence, failure): the oldest kept failure is on top
+        self._failed: List[Tuple[datetime, int, Dict[str, Any]]] = []
+        self._sequence = 0
+
+    def add(self, event: AuditEvent) -> None:
+        """Account for one event."""
+        self.total_events += 1
+
+        event_type = event.event_type.value
+        self.event_counts[event_type] = self.event_counts.get(event_type, 0) + 1
+        severity = event.severity.value
+        self.severity_counts[severity] = self.severity_counts.get(severity, 0) + 1
+
+        failed = event.status == "failure"
+        if event.username:
+            activity = self.user_activity.get(event.username)
+            if activity is None:
+                activity = self.user_activity[event.username] = {"total": 0, "failed": 0}
+            activity["total"] += 1
+            if failed:
+                activity["failed"] += 1
+
+        if event.contains_pii:
+            self.pii_access_count += 1
+        if event.is_sensitive:
+            self.sensitive_operations += 1
+        if event.is_security_event():
+            self.security_events += 1
+
+        if failed:
+            self.failed_count += 1
+            self._sequence += 1
+            # Among equal timestamps, earlier events rank as more recent,
+            # matching a stable newest-first sort
+            self._keep_failure(
+                (
+                    event.timestamp,
+                    -self._sequence,
+                    {
+                        "timestamp": event.timestamp.isoformat(),
+                        "event_type": event_type,
+                        "user": event.username,
+                        "action": event.action,
+                    },
+                )
+            )
+
+    def _keep_failure(self, item: Tuple[datetime, int, Dict[str, Any]]) -> None:
+        if len(self._failed) < self.max_failed_actions:
+            heapq.heappush(self._failed, item)
+        elif self.max_failed_actions and item[:2] > self._failed[0][:2]:
+            heapq.heapreplace(self._failed, item)
+
+    def update(self, events: Iterable[AuditEvent]) -> "ComplianceAggregator":
+        """Account for every event in ``events``; returns self for chaining."""
+        for event in events:
+            self.add(event)
+        return self
+
+    def merge(self, other: "ComplianceAggregator") -> "ComplianceAggregator":
+        """
+        Fold another partial aggregate into this one.
+
+        Args:
+            other: Aggregate over a disjoint set of events (e.g. another log file)
+
+        Returns:
+            self, for chaining
+        """
+        self.total_events += other.total_events
+        self.failed_count += other.failed_count
+        self.pii_access_count += other.pii_access_count
+        self.sensitive_operations += other.sensitive_operations
+        self.security_events += other.security_events
+        for key, count in other.event_counts.items():
+            self.event_counts[key] = self.event_counts.get(key, 0) + count
+        for key, count in other.severity_counts.items():
+            self.severity_counts[key] = self.severity_counts.get(key, 0) + count
+        for user, activity in other.user_activity.items():
+            mine = self.user_activity.setdefault(user, {"total": 0, "failed": 0})
+            mine["total"] += activity["total"]
+            mine["failed"] += activity["failed"]
+        # Renumber so sequences from both sides stay unique
+        offset = self._sequence
+        for timestamp, sequence, failure in other._failed:
+            self._keep_failure((timestamp, sequence - offset, failure))
+        self._sequence += other._sequence
+        return self
+
+    def failed_actions(self) -> List[Dict[str, Any]]:
+        """Return the kept failures, most recent first."""
+        return [item[2] for item in sorted(self._failed, key=lambda item: item[:2], reverse=True)]
+
+    def to_report(self, start_date: datetime, end_date: datetime) -> Dict[str, Any]:
+        """
+        Build the compliance report dictionary.
+
+        Args:
+            start_date: Start of reporting period
+            end_date: End of reporting period
+
+        Returns:
+            Report in the format of ``generate_compliance_report``
+        """
+        return {
+            "report_period": {
+                "start": start_date.isoformat(),
+                "end": end_date.isoformat(),
+            },
+            "summary": {
+                "total_events": self.total_events,
+                "unique_users": len(self.user_activity),
+                "failed_actions": self.failed_count,
+            },
+            "event_counts": dict(self.event_counts),
+            "severity_counts": dict(self.severity_counts),
+            "user_activity": {user: dict(activity) for user, activity in self.user_activity.items()},
+            "failed_actions": self.failed_actions(),
+            "compliance_flags": {
+                "pii_access_count": self.pii_access_count,
+                "sensitive_operations": self.sensitive_operations,
+                "security_events": self.security_events,
+            },
+        }
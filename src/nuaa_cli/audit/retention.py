@@ -0,0 +1,345 @@
+"""
+Retention enforcement for rotated audit log segments.
+
+Events carry ``retention_days`` and ``AuditConfig`` has a default retention
+period, but rotation alone only drops whole files once ``max_files`` is
+exceeded. ``compact_logs`` removes expired events from rotated segments:
+
+- An event expires once it is older than ``AuditConfig.retention_days``
+  (or ``nuaa audit compact --retention-days``). The configured period is
+  the policy and applies to every event; the ``retention_days`` an event
+  carries is not consulted.
+- Segments are checked using the timestamp range in their signed footer. A
+  segment whose oldest event is newer than the cutoff cannot hold expired
+  events and is not read, so repeated runs only touch segments that have
+  aged.
+- Other segments are streamed once. Every line is verified against the hash
+  chain while the kept events are re-sealed (new ``_prev_checksum``,
+  ``_hash``, checkpoints and footer) into a temporary file. That file
+  replaces the segment, compressed as before. A segment that fails
+  verification is left alone, so compaction never launders tampering.
+- A rewritten segment gets a ``compacted`` timestamp in its header and thus
+  a new segment id, so the query index and saved verification progress for
+  the old contents are discarded. Segments with no events left are deleted.
+
+Segments are located and replaced inside ``segments.rotation_lock``, a file
+lock that rotation also takes, so a logger in another process cannot rotate
+a segment between the two steps. The current log file is never rewritten;
+its events are compacted once it rotates. Raw segments still waiting for their footer or compression are left
+to the logger's finalizer and reported as pending.
+
+Example:
+    >>> report = compact_logs(config)
+    >>> report.bytes_reclaimed, report.events_removed
+    (1048576, 5120)
+"""
+
+import json
+import os
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, ContextManager, Dict, List, Optional
+
+from .config import AuditConfig, get_config
+from .integrity import (
+    CHECKPOINT_TYPE,
+    FOOTER_TYPE,
+    HEADER_TYPE,
+    INTEGRITY_FIELDS,
+    VerifyState,
+    _check_line,
+    checkpoint_line,
+    footer_is_valid,
+    footer_record,
+    load_checkpoint_key,
+    seal_event,
+)
+from .segments import (
+    COMPRESSION_GZIP,
+    COMPRESSION_NONE,
+    compression_of,
+    footer_bounds,
+    iter_segment_lines,
+    log_files,
+    read_footer,
+    rotation_lock,
+    segment_id,
+    slot_paths,
+    _write_gzip,
+    _write_zstd,
+)
+
+# Segment outcomes
+SKIPPED = "skipped"  # footer shows nothing old enough to expire
+UNCHANGED = "unchanged"  # read, but every event is still retained
+REWRITTEN = "rewritten"
+REMOVED = "removed"  # every event expired
+PENDING = "pending"  # not finalised yet
+FAILED = "failed"
+
+
+class _CompactionError(Exception):
+    """A segment cannot be compacted (reason in the message)."""
+
+
+@dataclass
+class SegmentCompaction:
+    """
+    Outcome of compacting one rotated segment.
+
+    Attributes:
+        path: Segment file
+        action: One of skipped, unchanged, rewritten, removed, pending, failed
+        reason: Why the segment was skipped, pending or failed
+        events_before: Events in the segment before compaction
+        events_after: Events kept
+        bytes_before: File size before compaction
+        bytes_after: File size after compaction (0 when removed)
+    """
+
+    path: Path
+    action: str
+    reason: str = ""
+    events_before: int = 0
+    events_after: int = 0
+    bytes_before: int = 0
+    bytes_after: int = 0
+
+    @property
+    def bytes_reclaimed(self) -> int:
+        """Bytes freed on disk."""
+        return self.bytes_before - self.bytes_after
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a JSON-serialisable dictionary."""
+        return {
+            "path": str(self.path),
+            "action": self.action,
+            "reason": self.reason,
+            "events_before": self.events_before,
+            "events_after": self.events_after,
+            "bytes_before": self.bytes_before,
+            "bytes_after": self.bytes_after,
+            "bytes_reclaimed": self.bytes_reclaimed,
+        }
+
+
+@dataclass
+class CompactionReport:
+    """
+    Summary of a ``compact_logs`` run.
+
+    Attributes:
+        cutoff: Events older than this expire
+        dry_run: Whether segments were left untouched
+        segments: One entry per rotated segment, newest first
+    """
+
+    cutoff: datetime
+    dry_run: bool = False
+    segments: List[SegmentCompaction] = field(default_factory=list)
+
+    @property
+    def bytes_reclaimed(self) -> int:
+        """Bytes freed (or that would be freed, for a dry run)."""
+        return sum(s.bytes_reclaimed for s in self.segments)
+
+    @property
+    def events_removed(self) -> int:
+        """Expired events dropped."""
+        return sum(s.events_before - s.events_after for s in self.segments)
+
+    @property
+    def failed(self) -> List[SegmentCompaction]:
+        """Segments that could not be compacted."""
+        return [s for s in self.segments if s.action == FAILED]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a JSON-serialisable dictionary."""
+        return {
+            "cutoff": self.cutoff.isoformat(),
+            "dry_run": self.dry_run,
+            "bytes_reclaimed": self.bytes_reclaimed,
+            "events_removed": self.events_removed,
+            "segments": [s.to_dict() for s in self.segments],
+        }
+
+
+def compact_logs(
+    config: Optional[AuditConfig] = None,
+    now: Optional[datetime] = None,
+    dry_run: bool = False,
+    lock: Optional[ContextManager[Any]] = None,
+) -> CompactionReport:
+    """
+    Drop expired events from every rotated segment.
+
+    Args:
+        config: Audit configuration (uses global config if None)
+        now: Reference time for expiry (default: current UTC time)
+        dry_run: Compute what would be reclaimed without replacing any file
+        lock: In-process lock held, together with the audit directory's
+            ``rotation_lock`` file lock, while a segment is located and
+            replaced; pass the rotation lock of an ``AuditLogger`` running
+            in this process
+
+    Returns:
+        CompactionReport with one entry per rotated segment
+    """
+    config = config or get_config()
+    now = now or datetime.utcnow()
+    report = CompactionReport(cutoff=now - timedelta(days=config.retention_days), dry_run=dry_run)
+    key = load_checkpoint_key(config)
+
+    for path in log_files(config):
+        if path == config.log_path:
+            continue  # Still being written
+        try:
+            result = _compact_segment(path, config, key, now, report.cutoff, dry_run, lock)
+        except (_CompactionError, OSError, TypeError, ValueError) as e:
+            result = SegmentCompaction(path, FAILED, reason=str(e))
+        report.segments.append(result)
+    return report
+
+
+def _compact_segment(
+    path: Path,
+    config: AuditConfig,
+    key: bytes,
+    now: datetime,
+    cutoff: datetime,
+    dry_run: bool,
+    lock: Optional[ContextManager[Any]],
+) -> SegmentCompaction:
+    size = path.stat().st_size
+    result = SegmentCompaction(path, SKIPPED, bytes_before=size, bytes_after=size)
+
+    footer = read_footer(path)
+    kind = compression_of(path)
+    if footer is None:
+        result.action, result.reason = PENDING, "segment has no footer yet"
+        return result
+    if kind == COMPRESSION_NONE and config.compression != COMPRESSION_NONE:
+        result.action, result.reason = PENDING, "segment is waiting for compression"
+        return result
+    if not footer_is_valid(key, footer):
+        raise _CompactionError("invalid segment footer signature")
+
+    result.events_before = result.events_after = int(footer.get("events") or 0)
+    oldest, _ = footer_bounds(footer)
+    if oldest is None or oldest >= cutoff:
+        result.reason = "no events old enough to expire"
+        return result
+
+    tmp = config.audit_dir / f".{config.log_file}.{os.getpid()}.compact.tmp"
+    packed = tmp.with_name(tmp.name + ".packed")
+    try:
+        kept = _rewrite(path, tmp, config, key, now, cutoff)
+        result.events_after = kept
+        if kept == result.events_before:
+            result.action, result.reason = UNCHANGED, "no expired events"
+            return result
+
+        if kept == 0:
+            result.action, result.bytes_after = REMOVED, 0
+            if not dry_run:
+                with rotation_lock(config, lock):
+                    target = _locate(config, str(footer.get("segment")), kind)
+                    if target is not None:
+                        target.unlink()
+            return result
+
+        final = tmp
+        if kind != COMPRESSION_NONE:
+            with open(tmp, "rb") as source:
+                write = _write_gzip if kind == COMPRESSION_GZIP else _write_zstd
+                write(source, packed, json.dumps(read_footer(tmp)).encode())
+            final = packed
+        result.action, result.bytes_after = REWRITTEN, final.stat().st_size
+        if not dry_run:
+            with rotation_lock(config, lock):
+                # Rotation may have renamed the segment meanwhile
+                target = _locate(config, str(footer.get("segment")), kind)
+                if target is None:
+                    result.action, result.reason = SKIPPED, "segment was dropped by rotation"
+                    result.events_after, result.bytes_after = result.events_before, result.bytes_before
+                    return result
+                os.replace(final, target)
+        return result
+    finally:
+        tmp.unlink(missing_ok=True)
+        packed.unlink(missing_ok=True)
+
+
+def _rewrite(path: Path, tmp: Path, config: AuditConfig, key: bytes, now: datetime, cutoff: datetime) -> int:
+    """
+    Verify ``path`` and write its events from ``cutoff`` on, re-sealed, to ``tmp``.
+
+    Returns:
+        Number of events kept
+    """
+    state = VerifyState()
+    segment: Optional[str] = None
+    prev_checksum: Optional[str] = None
+    chain: Optional[str] = None
+    since_checkpoint = 0
+    kept = 0
+    size = 0
+    low: Optional[str] = None
+    high: Optional[str] = None
+
+    with open(tmp, "wb") as out:
+        for line_num, raw in enumerate(iter_segment_lines(path), start=1):
+            if not raw.endswith(b"\n"):
+                raise _CompactionError(f"truncated segment after line {line_num - 1}")
+            if not raw.strip():
+                continue
+            if not _check_line(raw, line_num, state, key, config.checkpoint_interval):
+                raise _CompactionError(f"integrity check failed at line {line_num}")
+
+            entry = json.loads(raw)
+            entry_type = entry.get("type")
+            if entry_type == HEADER_TYPE:
+                entry["compacted"] = now.isoformat()
+                segment = f"{entry.get('created')}+{entry['compacted']}"
+                text = json.dumps(entry) + "\n"
+            elif entry_type in (CHECKPOINT_TYPE, FOOTER_TYPE):
+                continue  # They sign the old chain; new ones are written below
+            else:
+                for name in INTEGRITY_FIELDS:
+                    entry.pop(name, None)
+                timestamp = datetime.fromisoformat(entry["timestamp"])
+                if timestamp < cutoff:
+                    continue
+                text, prev_checksum, chain = seal_event(json.dumps(entry, sort_keys=True), prev_checksum, chain)
+                kept += 1
+                since_checkpoint += 1
+                if config.checkpoint_interval and since_checkpoint >= config.checkpoint_interval:
+                    text += checkpoint_line(key, chain)
+                    since_checkpoint = 0
+                stamp = timestamp.isoformat(timespec="microseconds")
+                low = stamp if low is None or stamp < low else low
+                high = stamp if high is None or stamp > high else high
+            data = text.encode()
+            out.write(data)
+            size += len(data)
+
+        if segment is None:
+            raise _CompactionError("segment has no header")
+        if not state.footer:
+            raise _CompactionError("segment footer is missing from the stream")
+        footer = footer_record(key, segment, size, kept, low, high, chain)
+        out.write((json.dumps(footer) + "\n").encode())
+        out.flush()
+        os.fsync(out.fileno())
+    return kept
+
+
+def _locate(config: AuditConfig, segment: str, kind: str) -> Optional[Path]:
+    """Return the rotated file holding ``segment`` with compression ``kind``, if any."""
+    for number in range(1, config.max_files + 1):
+        for path in slot_paths(config, number):
+            if path.exists() and compression_of(path) == kind and segment_id(path) == segment:
+                return path
+    return None
@@ -0,0 +1,504 @@
+"""
+Rotated audit log segments: footers, compression and transparent reading.
+
+When the current log is rotated to ``audit.log.1`` a ``SegmentFinalizer``
+thread takes over the finished segment, so ``log()`` never waits for it:
+
+1. It reads the segment once and builds a signed footer record (see
+   ``integrity.footer_record``) with the event count, the min/max event
+   timestamp and the final chain hash.
+2. Without compression the footer is appended to the segment as its last
+   line. With ``AuditConfig.compression`` set to ``"gzip"`` or ``"zstd"``
+   (zstd needs the optional ``zstandard`` package; gzip is used when it is
+   missing) the segment plus footer is compressed to ``audit.log.N.gz`` /
+   ``audit.log.N.zst`` and the raw file removed. A copy of the footer is
+   stored in the container header - the gzip comment field, or a zstd
+   skippable frame - where it can be read without decompressing anything.
+
+Readers go through ``iter_segment_lines``, which streams raw and compressed
+segments alike, and ``read_footer``, which lets queries skip segments outside
+the requested time range. Segments are identified by the ``created`` value
+of their header, which survives the renames done by rotation.
+
+Rotation, the finalizer and compaction (``retention.compact_logs``) rename
+and replace rotated files, possibly from different processes sharing one
+audit directory. Each of them does so inside ``rotation_lock``, which takes
+an advisory lock on ``<audit_dir>/.rotation.lock``.
+
+Example:
+    >>> for path in log_files(config):
+    ...     footer = read_footer(path)
+    ...     for line in iter_segment_lines(path):
+    ...         ...
+"""
+
+import atexit
+import gzip
+import json
+import logging
+import os
+import queue
+import struct
+import threading
+import time
+import zlib
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+from pathlib import Path
+from typing import Any, BinaryIO, ContextManager, Dict, Iterator, List, Optional
+
+from .config import AuditConfig
+from .integrity import (
+    CHECKPOINT_TYPE,
+    FOOTER_TYPE,
+    HEADER_TYPE,
+    footer_record,
+    iter_lines_reversed,
+    load_checkpoint_key,
+)
+
+try:
+    import zstandard
+except ImportError:  # Optional dependency
+    zstandard = None
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+COMPRESSION_NONE = "none"
+COMPRESSION_GZIP = "gzip"
+COMPRESSION_ZSTD = "zstd"
+COMPRESSIONS = (COMPRESSION_NONE, COMPRESSION_GZIP, COMPRESSION_ZSTD)
+
+SUFFIXES = {COMPRESSION_GZIP: ".gz", COMPRESSION_ZSTD: ".zst"}
+
+ROTATION_LOCK_FILENAME = ".rotation.lock"
+
+# Bytes read per step when streaming a segment
+_CHUNK = 64 * 1024
+
+# gzip header: magic, deflate, FCOMMENT flag, mtime, extra flags, OS (unknown)
+_GZIP_MAGIC = b"\x1f\x8b\x08"
+_GZIP_FCOMMENT = 0x10
+_ZSTD_SKIPPABLE_MAGIC = 0x184D2A50
+
+# Largest container-header footer accepted when reading
+_MAX_FOOTER = 64 * 1024
+
+
+@contextmanager
+def rotation_lock(config: AuditConfig, lock: Optional[ContextManager[Any]] = None) -> Iterator[None]:
+    """
+    Hold the lock that guards renaming and replacing rotated segments.
+
+    Takes ``lock`` (an in-process lock, e.g. the logger's rotation lock)
+    first, then an exclusive advisory lock on ``<audit_dir>/.rotation.lock``
+    that other processes using the same audit directory also take.
+
+    Args:
+        config: Audit configuration (audit directory)
+        lock: Optional in-process lock to hold as well
+    """
+    with lock or nullcontext():
+        config.audit_dir.mkdir(parents=True, exist_ok=True)
+        with open(config.audit_dir / ROTATION_LOCK_FILENAME, "a+b") as f:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            else:
+                f.seek(0)
+                while True:
+                    try:
+                        # Gives up after about 10 seconds; keep waiting
+                        msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                        break
+                    except OSError:
+                        continue
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+                else:
+                    f.seek(0)
+                    msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def compression_of(path: Path) -> str:
+    """Return the compression of a segment, judged by its file suffix."""
+    for kind, suffix in SUFFIXES.items():
+        if path.name.endswith(suffix):
+            return kind
+    return COMPRESSION_NONE
+
+
+def slot_paths(config: AuditConfig, number: int) -> List[Path]:
+    """Return every name rotated segment ``number`` may have (raw first)."""
+    base = config.audit_dir / f"{config.log_file}.{number}"
+    return [base] + [base.with_name(base.name + suffix) for suffix in SUFFIXES.values()]
+
+
+def log_files(config: AuditConfig) -> List[Path]:
+    """Return the current log followed by existing rotated segments, newest first."""
+    files = [config.log_path] if config.log_path.exists() else []
+    for number in range(1, config.max_files + 1):
+        # The raw file wins while a compressed copy is being swapped in
+        path = next((p for p in slot_paths(config, number) if p.exists()), None)
+        if path is not None:
+            files.append(path)
+    return files
+
+
+def _open_zstd(path: Path) -> BinaryIO:
+    if zstandard is None:
+        raise RuntimeError(f"Reading {path.name} requires the zstandard package")
+    f = open(path, "rb")
+    try:
+        magic, size = struct.unpack("<II", f.read(8).ljust(8, b"\0"))
+        # Step over the footer frame; the decompressor gets the data frame
+        f.seek(8 + size if magic == _ZSTD_SKIPPABLE_MAGIC else 0)
+        return zstandard.ZstdDecompressor().stream_reader(f, closefd=True)
+    except BaseException:
+        f.close()
+        raise
+
+
+def open_segment(path: Path) -> BinaryIO:
+    """Open a raw or compressed segment for reading its decompressed bytes."""
+    kind = compression_of(path)
+    if kind == COMPRESSION_GZIP:
+        return gzip.open(path, "rb")
+    if kind == COMPRESSION_ZSTD:
+        return _open_zstd(path)
+    return open(path, "rb")
+
+
+def iter_segment_lines(path: Path) -> Iterator[bytes]:
+    """
+    Yield the lines of a segment (with their newlines), decompressing as needed.
+
+    Memory use is bounded by the read chunk size and the longest line.
+    """
+    with open_segment(path) as f:
+        if compression_of(path) == COMPRESSION_NONE:
+            yield from f
+            return
+        pending = b""
+        while chunk := f.read(_CHUNK):
+            lines = (pending + chunk).split(b"\n")
+            pending = lines.pop()
+            for line in lines:
+                yield line + b"\n"
+        if pending:
+            yield pending
+
+
+def segment_id(path: Path) -> Optional[str]:
+    """
+    Return the identifier of a segment: the ``created`` value of its header.
+
+    A segment rewritten by retention compaction gets a new identifier
+    (``created+compacted``), so indexes built on the old contents are
+    discarded. Returns None if the file is missing or has no header.
+    """
+    try:
+        lines = iter_segment_lines(path)
+        first = next(lines, b"")
+        lines.close()
+        header = json.loads(first)
+    except (OSError, EOFError, RuntimeError, ValueError, zlib.error):
+        return None
+    if isinstance(header, dict) and header.get("type") == HEADER_TYPE:
+        if header.get("compacted"):
+            return f"{header.get('created')}+{header['compacted']}"
+        return str(header.get("created"))
+    return None
+
+
+def _read_gzip_comment(f: BinaryIO) -> Optional[bytes]:
+    head = f.read(10)
+    if len(head) < 10 or head[:3] != _GZIP_MAGIC:
+        return None
+    flags = head[3]
+    if flags & 0x04:  # FEXTRA
+        (extra_len,) = struct.unpack("<H", f.read(2))
+        f.read(extra_len)
+    if flags & 0x08:  # FNAME
+        while f.read(1) not in (b"\0", b""):
+            pass
+    if not flags & _GZIP_FCOMMENT:
+        return None
+    comment = bytearray()
+    while (byte := f.read(1)) not in (b"\0", b""):
+        comment += byte
+        if len(comment) > _MAX_FOOTER:
+            return None
+    return bytes(comment)
+
+
+def read_footer(path: Path) -> Optional[Dict[str, Any]]:
+    """
+    Return the footer record of a rotated segment, or None if it has none.
+
+    Compressed segments are not decompressed: the footer is read from the
+    container header. For raw segments only the last line is read.
+    """
+    kind = compression_of(path)
+    try:
+        if kind == COMPRESSION_NONE:
+            for raw in iter_lines_reversed(path):
+                if raw.strip():
+                    record = json.loads(raw)
+                    break
+            else:
+                return None
+        else:
+            with open(path, "rb") as f:
+                if kind == COMPRESSION_GZIP:
+                    payload = _read_gzip_comment(f)
+                else:
+                    magic, size = struct.unpack("<II", f.read(8).ljust(8, b"\0"))
+                    payload = f.read(size) if magic == _ZSTD_SKIPPABLE_MAGIC and size <= _MAX_FOOTER else None
+            if payload is None:
+                return None
+            record = json.loads(payload)
+    except (OSError, ValueError, struct.error):
+        return None
+    return record if isinstance(record, dict) and record.get("type") == FOOTER_TYPE else None
+
+
+def footer_bounds(footer: Optional[Dict[str, Any]]) -> tuple[Optional[datetime], Optional[datetime]]:
+    """Return the (min, max) event timestamps recorded in a footer."""
+    if not footer:
+        return None, None
+    try:
+        low = footer.get("min_timestamp")
+        high = footer.get("max_timestamp")
+        return (
+            datetime.fromisoformat(low) if low else None,
+            datetime.fromisoformat(high) if high else None,
+        )
+    except (TypeError, ValueError):
+        return None, None
+
+
+def segment_in_range(path: Path, start: Optional[datetime], end: Optional[datetime]) -> bool:
+    """
+    Whether a segment may hold events between ``start`` and ``end``.
+
+    Only segments with a footer can be ruled out; the current log and
+    segments not finalised yet always return True.
+    """
+    if start is None and end is None:
+        return True
+    footer = read_footer(path)
+    if footer is None:
+        return True
+    if footer.get("events") == 0:
+        return False
+    low, high = footer_bounds(footer)
+    if start is not None and high is not None and high < start:
+        return False
+    if end is not None and low is not None and low > end:
+        return False
+    return True
+
+
+def _write_gzip(source: BinaryIO, dest: Path, footer_json: bytes) -> None:
+    compressor = zlib.compressobj(6, zlib.DEFLATED, -zlib.MAX_WBITS)
+    crc = 0
+    size = 0
+    with open(dest, "wb") as out:
+        header = _GZIP_MAGIC + bytes([_GZIP_FCOMMENT]) + struct.pack("<I", int(time.time())) + b"\x00\xff"
+        out.write(header + footer_json + b"\0")
+        for chunk in iter(lambda: source.read(_CHUNK), b""):
+            crc = zlib.crc32(chunk, crc)
+            size += len(chunk)
+            out.write(compressor.compress(chunk))
+        out.write(compressor.flush())
+        out.write(struct.pack("<II", crc & 0xFFFFFFFF, size & 0xFFFFFFFF))
+        out.flush()
+        os.fsync(out.fileno())
+
+
+def _write_zstd(source: BinaryIO, dest: Path, footer_json: bytes) -> None:
+    with open(dest, "wb") as out:
+        out.write(struct.pack("<II", _ZSTD_SKIPPABLE_MAGIC, len(footer_json)) + footer_json)
+        with zstandard.ZstdCompressor().stream_writer(out, closefd=False) as writer:
+            for chunk in iter(lambda: source.read(_CHUNK), b""):
+                writer.write(chunk)
+        out.flush()
+        os.fsync(out.fileno())
+
+
+class _ConcatReader:
+    """Concatenate a file's remaining bytes and a trailing bytes value."""
+
+    def __init__(self, f: BinaryIO, tail: bytes):
+        self._f = f
+        self._tail = tail
+
+    def read(self, size: int) -> bytes:
+        data = self._f.read(size)
+        if data:
+            return data
+        data, self._tail = self._tail, b""
+        return data
+
+
+class SegmentFinalizer:
+    """
+    Background thread that writes footers for, and compresses, rotated segments.
+
+    Args:
+        config: Audit configuration (audit directory, compression)
+        lock: Lock also held by the logger while it renames segments; held,
+            with ``rotation_lock``, only while a segment is located and its
+            final file renamed
+    """
+
+    def __init__(self, config: AuditConfig, lock: threading.Lock):
+        self.config = config
+        self._lock = lock
+        self._queue: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="nuaa-audit-segments", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def submit(self, segment: str) -> None:
+        """Queue a rotated segment (by its header id) for finalisation."""
+        self._queue.put(segment)
+
+    def wait(self) -> None:
+        """Block until every queued segment has been finalised."""
+        self._queue.join()
+
+    def close(self, timeout: Optional[float] = 30.0) -> None:
+        """Finish queued segments and stop the thread."""
+        if not self._thread.is_alive():
+            return
+        self._queue.put(None)
+        self._thread.join(timeout)
+        atexit.unregister(self.close)
+
+    def _run(self) -> None:
+        while True:
+            segment = self._queue.get()
+            try:
+                if segment is None:
+                    return
+                self.finalize(segment)
+            except Exception as e:
+                # Audit failures shouldn't break the application; the raw
+                # segment stays readable and is retried by the next logger
+                logging.error(f"Failed to finalize audit segment: {e}")
+            finally:
+                self._queue.task_done()
+
+    def _locate(self, segment: str) -> Optional[Path]:
+        """Return the raw rotated file holding ``segment``, if any."""
+        for number in range(1, self.config.max_files + 1):
+            path = slot_paths(self.config, number)[0]
+            if path.exists() and segment_id(path) == segment:
+                return path
+        return None
+
+    def finalize(self, segment: str) -> None:
+        """Write the footer for one segment and compress it if configured."""
+        with rotation_lock(self.config, self._lock):
+            path = self._locate(segment)
+            if path is None:
+                return  # Already finalised, or dropped by rotation
+            f = open(path, "rb")
+
+        # Rotation may rename the file from here on; the open handle still
+        # reads the right data
+        with f:
+            existing = read_footer(path)
+            if existing is None:
+                footer = self._build_footer(segment, f)
+                footer_line = (json.dumps(footer) + "\n").encode()
+            else:
+                footer, footer_line = existing, b""
+
+            kind = self.config.compression
+            if kind == COMPRESSION_ZSTD and zstandard is None:
+                logging.warning("zstandard is not installed; compressing audit segments with gzip")
+                kind = COMPRESSION_GZIP
+
+            if kind == COMPRESSION_NONE:
+                if footer_line:
+                    with rotation_lock(self.config, self._lock):
+                        path = self._locate(segment)
+                        if path is not None and read_footer(path) is None:
+                            with open(path, "ab") as out:
+                                out.write(footer_line)
+                return
+
+            f.seek(0)
+            tmp = self.config.audit_dir / f".{self.config.log_file}.{os.getpid()}.{threading.get_ident()}.tmp"
+            try:
+                write = _write_gzip if kind == COMPRESSION_GZIP else _write_zstd
+                write(_ConcatReader(f, footer_line), tmp, json.dumps(footer).encode())
+                with rotation_lock(self.config, self._lock):
+                    path = self._locate(segment)
+                    if path is not None:
+                        os.replace(tmp, path.with_name(path.name + SUFFIXES[kind]))
+                        path.unlink()
+            finally:
+                tmp.unlink(missing_ok=True)
+
+    def _build_footer(self, segment: str, f: BinaryIO) -> Dict[str, Any]:
+        size = 0
+        events = 0
+        low: Optional[datetime] = None
+        high: Optional[datetime] = None
+        chain: Optional[str] = None
+        for raw in f:
+            size += len(raw)
+            if not raw.endswith(b"\n") or not raw.strip():
+                continue
+            try:
+                entry = json.loads(raw)
+            except json.JSONDecodeError:
+                continue
+            if entry.get("type") in (HEADER_TYPE, CHECKPOINT_TYPE, FOOTER_TYPE):
+                continue
+            try:
+                timestamp = datetime.fromisoformat(entry["timestamp"])
+            except (KeyError, TypeError, ValueError):
+                continue
+            events += 1
+            low = timestamp if low is None or timestamp < low else low
+            high = timestamp if high is None or timestamp > high else high
+            chain = entry.get("_hash")
+        return footer_record(
+            load_checkpoint_key(self.config),
+            segment,
+            size,
+            events,
+            low.isoformat(timespec="microseconds") if low else None,
+            high.isoformat(timespec="microseconds") if high else None,
+            chain,
+        )
+
+
+def unfinished_segments(config: AuditConfig) -> List[str]:
+    """
+    Return ids of raw rotated segments still waiting for their footer or compression.
+
+    A process that exits right after rotating may leave these behind; the
+    next logger picks them up.
+    """
+    pending = []
+    for number in range(1, config.max_files + 1):
+        path = slot_paths(config, number)[0]
+        if not path.exists():
+            continue
+        if config.compression != COMPRESSION_NONE or read_footer(path) is None:
+            segment = segment_id(path)
+            if segment is not None:
+                pending.append(segment)
+    return pending
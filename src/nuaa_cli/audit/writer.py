@@ -0,0 +1,216 @@
+"""
+Buffered audit log writer.
+
+By default ``AuditLogger.log`` opens the log file, appends one line and
+closes it again for every event. In buffered mode (``AuditConfig.buffered``)
+events are serialised by the caller and handed to a ``BufferedAuditWriter``,
+which keeps the log file open and appends them in batches from a background
+thread.
+
+A batch is written when ``flush_max_events`` events are waiting, every
+``flush_interval`` seconds while events are waiting, and when ``flush()`` is
+called. Rotation requests are queued in order with the events, so every
+event lands in the same file (and checksum chain) it was sealed for.
+
+Example:
+    >>> writer = BufferedAuditWriter(config, rotate_files=logger._rotate_files)
+    >>> writer.submit('{"action": "create"}\\n')
+    >>> writer.flush()
+    True
+    >>> writer.close()
+"""
+
+import atexit
+import logging
+import os
+import threading
+from typing import Callable, List, Optional, TextIO, Union
+
+from .config import AuditConfig
+
+# fsync policies
+FSYNC_NEVER = "never"  # leave durability to the OS
+FSYNC_BATCH = "batch"  # fsync after every batch (every event when unbuffered)
+FSYNC_CLOSE = "close"  # fsync when the file is rotated or closed
+FSYNC_POLICIES = (FSYNC_NEVER, FSYNC_BATCH, FSYNC_CLOSE)
+
+# Callers block once this many multiples of flush_max_events are waiting
+_BACKLOG_FACTOR = 10
+
+
+class _Rotate:
+    """Queue marker: rotate the log before writing the following events."""
+
+
+_ROTATE = _Rotate()
+
+
+class BufferedAuditWriter:
+    """
+    Background writer that appends pre-serialised audit lines in batches.
+
+    Args:
+        config: Audit configuration (log path, flush and fsync settings)
+        rotate_files: Callable that rotates the log files and writes a fresh
+            header; called on the writer thread with the log file closed
+    """
+
+    def __init__(self, config: AuditConfig, rotate_files: Callable[[], None]):
+        self.config = config
+        self._rotate_files = rotate_files
+        self._cond = threading.Condition()
+        self._pending: List[Union[str, _Rotate]] = []
+        self._submitted = 0
+        self._written = 0
+        self._failed = 0
+        self._failed_reported = 0
+        self._flush_requested = False
+        self._closed = False
+        self._handle: Optional[TextIO] = None
+        self._max_backlog = max(1, config.flush_max_events) * _BACKLOG_FACTOR
+        self._thread = threading.Thread(target=self._run, name="nuaa-audit-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def submit(self, line: str) -> None:
+        """
+        Queue one serialised log line (including the trailing newline).
+
+        Blocks while the backlog is full, so a stalled disk slows callers
+        down instead of growing memory without bound.
+
+        Raises:
+            RuntimeError: If the writer has been closed
+        """
+        self._enqueue(line)
+
+    def rotate(self) -> None:
+        """Queue a rotation; events submitted afterwards go to the new file."""
+        self._enqueue(_ROTATE)
+
+    def _enqueue(self, item: Union[str, _Rotate]) -> None:
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Audit writer is closed")
+            while len(self._pending) >= self._max_backlog and not self._closed:
+                self._cond.wait()
+            self._pending.append(item)
+            self._submitted += 1
+            if len(self._pending) >= self.config.flush_max_events:
+                self._cond.notify_all()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Write every queued event and wait until it reaches the file.
+
+        Args:
+            timeout: Maximum seconds to wait (None = no limit)
+
+        Returns:
+            True if all events submitted before the call were written; False
+            on timeout or if any event failed to be written since the last
+            flush
+        """
+        with self._cond:
+            target = self._submitted
+            if self._written < target:
+                self._flush_requested = True
+                self._cond.notify_all()
+                if not self._cond.wait_for(lambda: self._written >= target, timeout=timeout):
+                    return False
+            failed, self._failed_reported = self._failed > self._failed_reported, self._failed
+            return not failed
+
+    def close(self, timeout: Optional[float] = 10.0) -> None:
+        """Flush remaining events, stop the writer thread and close the file."""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+        atexit.unregister(self.close)
+
+    @property
+    def failed(self) -> int:
+        """Number of events that could not be written since the writer started."""
+        with self._cond:
+            return self._failed
+
+    @property
+    def pending(self) -> int:
+        """Number of queued items not yet written."""
+        with self._cond:
+            return self._submitted - self._written
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                self._cond.wait_for(
+                    lambda: self._closed or self._flush_requested or len(self._pending) >= self.config.flush_max_events,
+                    timeout=self.config.flush_interval,
+                )
+                batch, self._pending = self._pending, []
+                self._flush_requested = False
+                closing = self._closed
+                # Wake callers blocked on a full backlog
+                self._cond.notify_all()
+
+            if batch:
+                failed = self._write_batch(batch)
+                with self._cond:
+                    self._written += len(batch)
+                    self._failed += failed
+                    self._cond.notify_all()
+
+            if closing:
+                with self._cond:
+                    if self._pending:
+                        continue
+                self._close_handle()
+                return
+
+    def _write_batch(self, batch: List[Union[str, _Rotate]]) -> int:
+        """Write a batch; returns the number of events that did not reach the file."""
+        chunk: List[str] = []
+        written = 0
+        try:
+            for item in batch:
+                if item is _ROTATE:
+                    self._write_chunk(chunk)
+                    written += len(chunk)
+                    chunk = []
+                    self._close_handle()
+                    self._rotate_files()
+                else:
+                    chunk.append(item)
+            self._write_chunk(chunk)
+            written += len(chunk)
+        except Exception as e:
+            # Audit failures shouldn't break the application
+            logging.error(f"Failed to write audit log: {e}")
+            self._close_handle()
+        return sum(1 for item in batch if item is not _ROTATE) - written
+
+    def _write_chunk(self, chunk: List[str]) -> None:
+        if not chunk:
+            return
+        if self._handle is None:
+            self._handle = open(self.config.log_path, "a", encoding="utf-8")
+        self._handle.write("".join(chunk))
+        self._handle.flush()
+        if self.config.fsync_policy == FSYNC_BATCH:
+            os.fsync(self._handle.fileno())
+
+    def _close_handle(self) -> None:
+        if self._handle is None:
+            return
+        try:
+            if self.config.fsync_policy != FSYNC_NEVER:
+                self._handle.flush()
+                os.fsync(self._handle.fileno())
+            self._handle.close()
+        except OSError as e:
+            logging.error(f"Failed to close audit log: {e}")
+        finally:
+            self._handle = None
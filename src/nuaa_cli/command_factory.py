@@ -40,27 +40,33 @@ License: MIT
 """
 
 import re
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Callable, Optional
+from typing import Any, Callable, Optional, Sequence, TypeVar
 
 import typer
 from rich.console import Console
 from rich.panel import Panel
 
 from .scaffold import (
-    _apply_replacements,
     _ensure_nuaa_root,
-    _load_template,
+    _metadata_header,
     _next_feature_dir,
-    _prepend_metadata,
+    _render_template,
     _slugify,
     _stamp,
     write_markdown_if_needed,
 )
 from .utils import validate_program_name, validate_text_field
 
+# Upper bound on threads used to render and write one command's documents
+MAX_OUTPUT_WORKERS = 4
+
+_T = TypeVar("_T")
+_R = TypeVar("_R")
+
 
 @dataclass
 class FieldConfig:
@@ -127,6 +133,31 @@ class TemplateCommandConfig:
     primary_field_name: str = "PROGRAM_NAME"
 
 
+@dataclass
+class FeatureContext:
+    """
+    Validated inputs and allocated feature directory for one command run.
+
+    Produced by ``TemplateCommandHandler.prepare()`` and consumed by
+    ``TemplateCommandHandler.write_outputs()``. Splitting the two lets callers
+    such as ``nuaa batch`` allocate feature numbers in order and write the
+    documents concurrently.
+
+    Attributes:
+        program_name: Validated program name
+        mapping: Placeholder values for the templates
+        feature_dir: Feature directory (already created)
+        num_str: Feature number string (e.g., "001")
+        slug: Feature slug string
+    """
+
+    program_name: str
+    mapping: dict[str, str]
+    feature_dir: Path
+    num_str: str
+    slug: str
+
+
 class TemplateCommandHandler:
     """
     Handler class that processes template-based commands.
@@ -153,7 +184,7 @@ class TemplateCommandHandler:
         force: bool = False,
         show_banner_fn: Optional[Callable] = None,
         console: Optional[Console] = None,
-    ) -> None:
+    ) -> Path:
         """
         Execute the template command with given parameters.
 
@@ -165,6 +196,9 @@ class TemplateCommandHandler:
             show_banner_fn: Optional banner display function
             console: Optional Rich console
 
+        Returns:
+            The feature directory the documents were written to
+
         Raises:
             typer.Exit: If validation or processing fails
         """
@@ -173,6 +207,43 @@ class TemplateCommandHandler:
         if show_banner_fn:
             show_banner_fn()
 
+        context = self.prepare(program_name, *field_values, feature=feature, console=console)
+        self.write_outputs(context, force=force, console=console)
+
+        # Print success message
+        console.print(
+            Panel(
+                f"Feature ready: [cyan]{context.feature_dir}[/cyan]",
+                title=f"{self.config.command_name.title()} Created",
+                border_style="green",
+            )
+        )
+        return context.feature_dir
+
+    def prepare(
+        self,
+        program_name: str,
+        *field_values: str,
+        feature: Optional[str] = None,
+        console: Optional[Console] = None,
+    ) -> FeatureContext:
+        """
+        Validate inputs and allocate the feature directory, without writing documents.
+
+        Args:
+            program_name: Program name
+            *field_values: Variable length field values matching config.fields order
+            feature: Optional custom feature slug (e.g., '001-custom-slug' or 'custom-slug')
+            console: Optional Rich console for validation messages
+
+        Returns:
+            FeatureContext to pass to ``write_outputs()``
+
+        Raises:
+            typer.Exit: If validation fails
+        """
+        console = console or Console()
+
         # Validate program name
         validated_program = validate_program_name(program_name, console)
 
@@ -190,34 +261,68 @@ class TemplateCommandHandler:
         mapping["FEATURE_ID"] = num_str
         mapping["SLUG"] = slug
 
-        # Process main template
-        _process_template(
-            config=self.config,
-            feature_dir=feature_dir,
-            mapping=mapping,
+        return FeatureContext(
             program_name=validated_program,
+            mapping=mapping,
+            feature_dir=feature_dir,
             num_str=num_str,
             slug=slug,
-            force=force,
-            console=console,
         )
 
-        # Process additional outputs if configured
-        for template_name, output_name in self.config.additional_outputs:
-            try:
-                template = _load_template(template_name)
-                filled = _apply_replacements(template, mapping)
-                meta = {
-                    "title": f"{validated_program} - {output_name}",
-                    "feature": f"{num_str}-{slug}",
-                }
-                text = _prepend_metadata(filled, meta)
-                dest = feature_dir / output_name
-                write_markdown_if_needed(dest, text, force=force, console=console)
-            except FileNotFoundError:
-                console.print(f"[yellow]Optional template not found:[/yellow] {template_name}")
-            except (PermissionError, OSError) as e:
-                console.print(f"[yellow]Could not create {output_name}:[/yellow] {e}")
+    def write_outputs(
+        self,
+        context: FeatureContext,
+        force: bool = False,
+        console: Optional[Console] = None,
+    ) -> None:
+        """
+        Render and write every document for a prepared feature.
+
+        Args:
+            context: Result of ``prepare()``
+            force: Whether to overwrite existing files
+            console: Optional Rich console
+
+        Raises:
+            typer.Exit: If the main template cannot be processed
+        """
+        console = console or Console()
+        feature_dir = context.feature_dir
+        num_str = context.num_str
+        slug = context.slug
+
+        plan = self._render_plan(context)
+
+        # Stage 1: load and render every template concurrently
+        rendered = _run_concurrently(lambda out: _render_template(out.template_name, context.mapping).text, plan)
+
+        main_error = rendered[0][1]
+        if isinstance(main_error, FileNotFoundError):
+            console.print(f"[red]Template not found:[/red] {self.config.template_name}")
+            console.print("[dim]Run 'nuaa init' to set up templates[/dim]")
+            raise typer.Exit(1)
+        _raise_for_main_error(main_error, console)
+
+        # Stage 2: write the rendered documents concurrently
+        to_write = [(out, body) for out, (body, error) in zip(plan, rendered) if error is None]
+        written = iter(
+            _run_concurrently(lambda item: _write_document(item[0].dest, item[0].header, item[1], force), to_write)
+        )
+
+        # Report in plan order so console output does not depend on thread timing
+        for out, (_, render_error) in zip(plan, rendered):
+            if render_error is not None:
+                _report_optional_error(out, render_error, console)
+                continue
+            was_written, write_error = next(written)
+            if write_error is not None:
+                if out.required:
+                    _raise_for_main_error(write_error, console)
+                _report_optional_error(out, write_error, console)
+            elif was_written:
+                console.print(f"[green]Created:[/green] {out.dest}")
+            else:
+                console.print(f"[yellow]File exists, skipping:[/yellow] {out.dest}")
 
         # Create CHANGELOG if configured and doesn't exist
         if self.config.create_changelog:
@@ -226,14 +331,37 @@ class TemplateCommandHandler:
                 content = f"# Changelog for {num_str}-{slug}\n\n- {_stamp()} - Initialized {self.config.command_name}\n"
                 write_markdown_if_needed(changelog, content, force=True, console=console)
 
-        # Print success message
-        console.print(
-            Panel(
-                f"Feature ready: [cyan]{feature_dir}[/cyan]",
-                title=f"{self.config.command_name.title()} Created",
-                border_style="green",
+    def _render_plan(self, context: FeatureContext) -> list["_PlannedOutput"]:
+        """List every templated document for a feature, main template first."""
+        program_name = context.program_name
+        feature_id = f"{context.num_str}-{context.slug}"
+        if self.config.metadata_generator:
+            metadata = self.config.metadata_generator(program_name, context.mapping)
+        else:
+            metadata = {
+                "title": f"{program_name} - {self.config.command_name.title()}",
+                "created": context.mapping["DATE"],
+                "feature": feature_id,
+                "status": "draft",
+            }
+        plan = [
+            _PlannedOutput(
+                template_name=self.config.template_name,
+                dest=context.feature_dir / self.config.output_filename,
+                header=_metadata_header(metadata),
+                required=True,
             )
-        )
+        ]
+        for template_name, output_name in self.config.additional_outputs:
+            plan.append(
+                _PlannedOutput(
+                    template_name=template_name,
+                    dest=context.feature_dir / output_name,
+                    header=_metadata_header({"title": f"{program_name} - {output_name}", "feature": feature_id}),
+                    required=False,
+                )
+            )
+        return plan
 
     def _get_feature_dir(
         self,
@@ -283,17 +411,12 @@ class TemplateCommandHandler:
         }
 
         if len(field_values) != len(self.config.fields):
-            console.print(
-                f"[red]Error:[/red] Expected {len(self.config.fields)} field(s), "
-                f"got {len(field_values)}"
-            )
+            console.print(f"[red]Error:[/red] Expected {len(self.config.fields)} field(s), got {len(field_values)}")
             raise typer.Exit(1)
 
         for field_cfg, value in zip(self.config.fields, field_values):
             # Validate field
-            validated_value = validate_text_field(
-                value, field_cfg.name, field_cfg.max_length, console
-            )
+            validated_value = validate_text_field(value, field_cfg.name, field_cfg.max_length, console)
 
             # Add to mapping (uppercase for template placeholders)
             mapping[field_cfg.name.upper()] = validated_value
@@ -301,66 +424,65 @@ class TemplateCommandHandler:
         return mapping
 
 
-def _process_template(
-    config: TemplateCommandConfig,
-    feature_dir: Path,
-    mapping: dict[str, str],
-    program_name: str,
-    num_str: str,
-    slug: str,
-    force: bool,
-    console: Console,
-) -> None:
-    """
-    Load template, apply replacements, and write output file.
+@dataclass(frozen=True)
+class _PlannedOutput:
+    """One document in a command's render plan."""
 
-    Centralizes all error handling for template processing pipeline.
+    template_name: str
+    dest: Path
+    header: str
+    required: bool
 
-    Args:
-        config: Command configuration
-        feature_dir: Feature directory path
-        mapping: Field mapping for replacements
-        program_name: Program name
-        num_str: Feature number string (e.g., "001")
-        slug: Feature slug string
-        force: Whether to overwrite existing files
-        console: Rich console for output
 
-    Raises:
-        typer.Exit: If template processing fails
+def _run_concurrently(func: Callable[[_T], _R], items: Sequence[_T]) -> list[tuple[Optional[_R], Optional[Exception]]]:
     """
-    try:
-        # Load template
-        template_content = _load_template(config.template_name)
-
-        # Apply variable replacements
-        filled_content = _apply_replacements(template_content, mapping)
-
-        # Generate metadata
-        if config.metadata_generator:
-            metadata = config.metadata_generator(program_name, mapping)
-        else:
-            metadata = {
-                "title": f"{program_name} - {config.command_name.title()}",
-                "created": mapping["DATE"],
-                "feature": f"{num_str}-{slug}",
-                "status": "draft",
-            }
-
-        # Prepend YAML frontmatter
-        final_content = _prepend_metadata(filled_content, metadata)
+    Apply ``func`` to every item on a bounded thread pool.
 
-        # Write file
-        output_path = feature_dir / config.output_filename
-        write_markdown_if_needed(output_path, final_content, force=force, console=console)
+    Returns ``(result, error)`` pairs in input order. A single item runs
+    inline without starting a pool.
+    """
 
-    except FileNotFoundError:
-        console.print(f"[red]Template not found:[/red] {config.template_name}")
-        console.print("[dim]Run 'nuaa init' to set up templates[/dim]")
-        raise typer.Exit(1)
-    except PermissionError:
+    def call(item: _T) -> tuple[Optional[_R], Optional[Exception]]:
+        try:
+            return func(item), None
+        except Exception as e:
+            return None, e
+
+    if len(items) <= 1:
+        return [call(item) for item in items]
+    with ThreadPoolExecutor(max_workers=min(len(items), MAX_OUTPUT_WORKERS)) as pool:
+        return list(pool.map(call, items))
+
+
+def _write_document(path: Path, header: str, body: str, force: bool) -> bool:
+    """Write frontmatter and body to ``path`` unless it exists. Returns True if written."""
+    if path.exists() and not force:
+        return False
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8") as fh:
+        fh.write(header)
+        fh.write(body)
+    return True
+
+
+def _raise_for_main_error(error: Optional[Exception], console: Console) -> None:
+    """Report a failure of the main document and exit; re-raise unexpected errors."""
+    if error is None:
+        return
+    if isinstance(error, PermissionError):
         console.print("[red]Permission denied:[/red] Cannot read template or write output file")
         raise typer.Exit(1)
-    except OSError as e:
-        console.print(f"[red]File system error:[/red] {e}")
+    if isinstance(error, OSError):
+        console.print(f"[red]File system error:[/red] {error}")
         raise typer.Exit(1)
+    raise error
+
+
+def _report_optional_error(out: _PlannedOutput, error: Exception, console: Console) -> None:
+    """Warn about an additional output that could not be created."""
+    if isinstance(error, FileNotFoundError):
+        console.print(f"[yellow]Optional template not found:[/yellow] {out.template_name}")
+    elif isinstance(error, OSError):
+        console.print(f"[yellow]Could not create {out.dest.name}:[/yellow] {error}")
+    else:
+        raise error
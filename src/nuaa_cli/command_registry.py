@@ -0,0 +1,222 @@
+"""
+Lazy command registry for NUAA CLI.
+
+Command modules under ``nuaa_cli.commands`` pull in heavy dependencies
+(httpx, truststore, readchar, rich.live, the template machinery). Importing
+all of them on every invocation made ``nuaa version`` and ``nuaa --help``
+pay for commands they never run.
+
+This module keeps a static manifest of the available commands. The root
+Typer group only imports a command module when that command is actually
+invoked, and ``nuaa --help`` is rendered from the manifest without importing
+any command module.
+
+Example:
+    >>> registry = CommandRegistry(COMMAND_MANIFEST, {"console": console})
+    >>> app = typer.Typer(cls=lazy_group(registry))
+"""
+
+import importlib
+import os
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
+import click
+import typer
+
+from .banner import BannerGroup
+from .logging_config import get_logger
+
+logger = get_logger("cli")
+
+
+@dataclass(frozen=True)
+class CommandSpec:
+    """
+    Manifest entry describing a lazily registered command.
+
+    Attributes:
+        name: Command name as typed on the command line
+        module: Fully qualified module exposing a ``register()`` function
+        help: Short help shown in ``nuaa --help`` (first docstring paragraph)
+        register_args: Names of shared objects passed to ``register()`` after the app
+    """
+
+    name: str
+    module: str
+    help: str
+    register_args: tuple[str, ...] = ("show_banner", "console")
+
+
+# Precomputed command manifest. Order matches the order shown in ``nuaa --help``.
+# Keep ``help`` in sync with the command docstrings (enforced by tests).
+COMMAND_MANIFEST: tuple[CommandSpec, ...] = (
+    CommandSpec(
+        "init", "nuaa_cli.commands.init", "Initialize a new NUAA Project Kit workspace from the latest template."
+    ),
+    CommandSpec("version", "nuaa_cli.commands.version", "Display version and system information.", ()),
+    CommandSpec(
+        "check",
+        "nuaa_cli.commands.check",
+        "Check that all required tools are installed.",
+        ("agent_config", "show_banner", "console"),
+    ),
+    CommandSpec(
+        "design", "nuaa_cli.commands.design", "Create a new NUAA program design with logic model and framework."
+    ),
+    CommandSpec(
+        "propose", "nuaa_cli.commands.propose", "Create a funding proposal from the template, linked to design."
+    ),
+    CommandSpec(
+        "measure", "nuaa_cli.commands.measure", "Create or update the impact framework document from the template."
+    ),
+    CommandSpec("document", "nuaa_cli.commands.document", "Create an existing program analysis document."),
+    CommandSpec(
+        "report", "nuaa_cli.commands.report", "Generate a simple report scaffold referencing program artifacts."
+    ),
+    CommandSpec("refine", "nuaa_cli.commands.refine", "Record a refinement entry in the feature CHANGELOG.md."),
+    CommandSpec("engage", "nuaa_cli.commands.engage", "Create a stakeholder engagement plan for a NUAA program."),
+    CommandSpec(
+        "partner",
+        "nuaa_cli.commands.partner",
+        "Create a partnership agreement (MOU) template for a NUAA collaboration.",
+    ),
+    CommandSpec("train", "nuaa_cli.commands.train", "Create a training curriculum for peer workforce development."),
+    CommandSpec(
+        "event",
+        "nuaa_cli.commands.event",
+        "Create an event plan for workshops, forums, launches, or celebrations.",
+    ),
+    CommandSpec("risk", "nuaa_cli.commands.risk", "Create a risk register for proactive risk management."),
+    CommandSpec("batch", "nuaa_cli.commands.batch", "Scaffold many programs from a CSV or JSONL manifest in one run."),
+    CommandSpec("webui", "nuaa_cli.commands.webui", "Start the NUAA Simple Web Interface."),
+    CommandSpec(
+        "bundle",
+        "nuaa_cli.commands.bundle",
+        "Package agent configurations and templates into a distributable bundle.",
+    ),
+    CommandSpec(
+        "audit",
+        "nuaa_cli.commands.audit",
+        "Maintain the audit trail: enforce retention by compacting rotated logs.",
+    ),
+)
+
+
+class CommandRegistry:
+    """
+    Resolve manifest entries into Click commands on first use.
+
+    Args:
+        specs: Command manifest entries
+        shared: Objects passed to ``register()`` functions, keyed by the names
+            used in ``CommandSpec.register_args``
+    """
+
+    def __init__(self, specs: Sequence[CommandSpec], shared: Optional[Dict[str, Any]] = None):
+        self._specs: Dict[str, CommandSpec] = {spec.name: spec for spec in specs}
+        self._shared: Dict[str, Any] = dict(shared or {})
+        self._loaded: Dict[str, Optional[click.Command]] = {}
+
+    def names(self) -> List[str]:
+        """Return command names in manifest order."""
+        return list(self._specs)
+
+    def spec(self, name: str) -> Optional[CommandSpec]:
+        """Return the manifest entry for ``name``, if any."""
+        return self._specs.get(name)
+
+    def is_loaded(self, name: str) -> bool:
+        """Return True if the command's module has already been imported and registered."""
+        return name in self._loaded
+
+    def placeholder(self, name: str) -> Optional[click.Command]:
+        """
+        Build a lightweight stand-in command used only for rendering help.
+
+        The placeholder carries the manifest help text and never imports the
+        command module.
+        """
+        spec = self._specs.get(name)
+        if spec is None:
+            return None
+        return click.Command(name=spec.name, help=spec.help)
+
+    def load(self, name: str) -> Optional[click.Command]:
+        """
+        Import the command module and return the registered Click command.
+
+        Import failures are logged and result in ``None`` so the rest of the
+        CLI keeps working; set ``DEBUG`` or ``NUAA_DEBUG`` to raise instead.
+        """
+        if name in self._loaded:
+            return self._loaded[name]
+        spec = self._specs.get(name)
+        if spec is None:
+            return None
+
+        command: Optional[click.Command] = None
+        try:
+            module = importlib.import_module(spec.module)
+            staging = typer.Typer()
+            args = [self._shared[arg] for arg in spec.register_args]
+            module.register(staging, *args)
+            command = typer.main.get_group(staging).commands.get(name)
+        except ImportError as e:
+            logger.warning(f"Failed to register '{name}' command (module not found): {e}")
+        except Exception as e:
+            logger.error(f"Failed to register '{name}' command: {e}", exc_info=True)
+            if os.getenv("DEBUG") or os.getenv("NUAA_DEBUG"):
+                raise
+
+        self._loaded[name] = command
+        return command
+
+
+class LazyCommandGroup(BannerGroup):
+    """
+    Root command group that loads subcommands from a ``CommandRegistry`` on demand.
+
+    Subclasses set ``registry``; see ``lazy_group()``.
+    """
+
+    registry: Optional[CommandRegistry] = None
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._rendering_help = False
+
+    def list_commands(self, ctx: click.Context) -> List[str]:
+        names = super().list_commands(ctx)
+        if self.registry is None:
+            return names
+        manifest = self.registry.names()
+        return manifest + [name for name in names if name not in manifest]
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> Optional[click.Command]:
+        command = super().get_command(ctx, cmd_name)
+        if command is not None or self.registry is None:
+            return command
+        if self._rendering_help and not self.registry.is_loaded(cmd_name):
+            return self.registry.placeholder(cmd_name)
+        command = self.registry.load(cmd_name)
+        if command is not None:
+            self.add_command(command, cmd_name)
+        return command
+
+    def format_help(self, ctx: click.Context, formatter: click.HelpFormatter) -> None:
+        self._rendering_help = True
+        try:
+            super().format_help(ctx, formatter)
+        finally:
+            self._rendering_help = False
+
+
+def lazy_group(registry: CommandRegistry) -> type[LazyCommandGroup]:
+    """
+    Create a ``LazyCommandGroup`` subclass bound to ``registry``.
+
+    Typer instantiates the group class itself, so the registry is attached
+    to the class rather than passed to the constructor.
+    """
+    return type("NuaaCommandGroup", (LazyCommandGroup,), {"registry": registry})
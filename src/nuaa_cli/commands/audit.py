@@ -0,0 +1,113 @@
+"""
+Audit Command - Maintain the Audit Trail
+========================================
+
+Maintenance jobs for the audit logs written by ``nuaa_cli.audit``.
+
+``nuaa audit compact`` enforces the retention policy. It streams every
+rotated log segment whose footer shows events older than ``retention_days``
+and rewrites it without the expired events, re-sealing the hash chain,
+checkpoints and footer. Segments with nothing to expire are not read, so
+regular runs stay cheap. The current log file is left alone until it
+rotates.
+
+Example:
+    $ nuaa audit compact
+    $ nuaa audit compact --dry-run
+    $ nuaa audit compact --retention-days 90 --json
+"""
+
+import copy
+import json
+from typing import Optional
+
+import typer
+from rich.console import Console
+from rich.markup import escape
+from rich.table import Table
+
+
+def _format_bytes(size: int) -> str:
+    """Human-readable byte count (e.g. ``1.5 MB``)."""
+    value = float(size)
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(value) < 1024 or unit == "GB":
+            return f"{value:.0f} {unit}" if unit == "B" else f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{value:.1f} GB"
+
+
+def register(app, show_banner_fn=None, console: Console | None = None):
+    """Register the audit command group with the Typer app."""
+    console = console or Console()
+    audit_app = typer.Typer(
+        help="Maintain the audit trail: enforce retention by compacting rotated logs.",
+        no_args_is_help=True,
+    )
+
+    @audit_app.command("compact")
+    def compact(
+        dry_run: bool = typer.Option(False, "--dry-run", help="Report what would be reclaimed without changing files"),
+        retention_days: Optional[int] = typer.Option(
+            None, "--retention-days", min=0, help="Override the configured retention period for this run"
+        ),
+        json_output: bool = typer.Option(False, "--json", help="Print the report as JSON"),
+    ):
+        """
+        Drop expired events from rotated audit logs.
+
+        An event expires once it is older than the retention period given
+        here or configured (NUAA_AUDIT_RETENTION_DAYS); the period applies to
+        every event, whatever its own retention_days. Affected segments
+        are verified and rewritten with a fresh hash chain; segments whose
+        footer shows nothing old enough are skipped without being read.
+
+        Exits with code 1 if a segment fails verification or cannot be
+        rewritten; it is left unchanged.
+
+        Examples:
+            $ nuaa audit compact
+            $ nuaa audit compact --dry-run --retention-days 90
+        """
+        from ..audit.config import get_config
+        from ..audit.retention import FAILED, compact_logs
+
+        if show_banner_fn and not json_output:
+            show_banner_fn()
+
+        config = get_config()
+        if retention_days is not None:
+            config = copy.copy(config)
+            config.retention_days = retention_days
+
+        report = compact_logs(config, dry_run=dry_run)
+
+        if json_output:
+            console.print_json(json.dumps(report.to_dict()))
+        else:
+            table = Table(title="Audit compaction (dry run)" if dry_run else "Audit compaction")
+            table.add_column("Segment", style="cyan")
+            table.add_column("Result")
+            table.add_column("Events", justify="right")
+            table.add_column("Reclaimed", justify="right")
+            table.add_column("Note", overflow="fold", style="dim")
+            for segment in report.segments:
+                status = f"[red]{segment.action}[/red]" if segment.action == FAILED else segment.action
+                table.add_row(
+                    escape(segment.path.name),
+                    status,
+                    f"{segment.events_before} → {segment.events_after}",
+                    _format_bytes(segment.bytes_reclaimed),
+                    escape(segment.reason),
+                )
+            console.print(table)
+            verb = "Would reclaim" if dry_run else "Reclaimed"
+            console.print(
+                f"{verb} {_format_bytes(report.bytes_reclaimed)} "
+                f"({report.events_removed} expired events older than {report.cutoff:%Y-%m-%d})"
+            )
+
+        if report.failed:
+            raise typer.Exit(1)
+
+    app.add_typer(audit_app, name="audit")
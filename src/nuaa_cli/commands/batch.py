@@ -0,0 +1,357 @@
+"""
+Batch Command - Scaffold Many Programs at Once
+==============================================
+
+Reads a CSV or JSONL manifest in which every row names a template command
+(``design``, ``propose``, ``event``, ...), a program name and that command's
+field values, and scaffolds all rows in a single process.
+
+Running the individual commands in a shell loop starts a new interpreter,
+rediscovers the templates directory and re-reads every template for each
+program. Here the process-wide template registry, the compiled placeholder
+engine and the feature index are shared by all rows. Feature directories are
+allocated in manifest order, so numbering is deterministic, and documents are
+rendered and written by a pool of worker threads.
+
+Manifest formats:
+    CSV: a header row with ``command`` and ``program_name`` columns, one
+    column per field (named as in the command, e.g. ``target_population``)
+    and optional ``feature`` and ``force`` columns. Empty cells are ignored,
+    so rows for different commands can share one file.
+
+    JSONL: one object per line with ``command`` and ``program_name`` keys,
+    field values either at the top level or under ``fields``, and optional
+    ``feature`` and ``force`` keys.
+
+Example:
+    $ nuaa batch programs.csv
+    $ nuaa batch programs.jsonl --workers 8 --force
+"""
+
+import csv
+import importlib
+import io
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Optional
+
+import typer
+from rich.console import Console
+from rich.markup import escape
+from rich.table import Table
+
+from ..command_factory import FeatureContext, TemplateCommandHandler
+from ..command_registry import COMMAND_MANIFEST
+
+# Manifest keys that are not template fields
+RESERVED_KEYS = ("command", "program_name", "feature", "force")
+
+DEFAULT_WORKERS = min(8, (os.cpu_count() or 1) * 2)
+
+_FORMATS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl"}
+
+
+@dataclass
+class BatchRow:
+    """
+    One manifest entry.
+
+    Attributes:
+        line: Line number in the manifest (for error reporting)
+        command: Template command name (e.g., "design")
+        program_name: Program name passed to the command
+        fields: Field values keyed by field name (e.g., "target_population")
+        feature: Optional feature slug override, as for ``--feature``
+        force: Overwrite existing files for this row
+        error: Set when the row could not be parsed
+    """
+
+    line: int
+    command: str = ""
+    program_name: str = ""
+    fields: dict[str, str] = field(default_factory=dict)
+    feature: Optional[str] = None
+    force: bool = False
+    error: Optional[str] = None
+
+
+@dataclass
+class BatchResult:
+    """
+    Outcome of scaffolding one manifest row.
+
+    Attributes:
+        row: The manifest row
+        ok: Whether all documents were written
+        message: Feature directory on success, error description on failure
+        feature_dir: Feature directory, if one was allocated
+    """
+
+    row: BatchRow
+    ok: bool
+    message: str
+    feature_dir: Optional[Path] = None
+
+
+def _parse_bool(value: Any) -> bool:
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in ("1", "true", "yes", "y")
+
+
+def _make_row(line: int, record: dict[str, Any]) -> BatchRow:
+    """Build a BatchRow from a CSV or JSON record."""
+    values = {str(k).strip().lower(): v for k, v in record.items() if k is not None}
+    fields = values.pop("fields", None) or {}
+    if not isinstance(fields, dict):
+        return BatchRow(line=line, error="'fields' must be an object")
+    fields = {str(k).strip().lower(): v for k, v in fields.items()}
+    for key, value in values.items():
+        if key not in RESERVED_KEYS:
+            fields[key] = value
+
+    row = BatchRow(
+        line=line,
+        command=str(values.get("command") or "").strip(),
+        program_name=str(values.get("program_name") or ""),
+        fields={k: str(v) for k, v in fields.items() if v not in (None, "")},
+        feature=str(values["feature"]).strip() if values.get("feature") else None,
+        force=_parse_bool(values.get("force") or False),
+    )
+    if not row.command:
+        row.error = "Missing 'command'"
+    return row
+
+
+def read_manifest(path: Path, fmt: Optional[str] = None) -> list[BatchRow]:
+    """
+    Parse a batch manifest.
+
+    Rows that cannot be parsed are returned with ``error`` set so they show
+    up in the summary instead of aborting the whole batch.
+
+    Args:
+        path: Manifest file
+        fmt: "csv" or "jsonl" (default: inferred from the file extension)
+
+    Returns:
+        Manifest rows in file order
+
+    Raises:
+        ValueError: If the format is unknown or required CSV columns are missing
+    """
+    fmt = (fmt or _FORMATS.get(path.suffix.lower(), "")).lower()
+    rows: list[BatchRow] = []
+
+    if fmt == "csv":
+        with path.open(newline="", encoding="utf-8-sig") as fh:
+            reader = csv.DictReader(fh)
+            columns = {c.strip().lower() for c in reader.fieldnames or []}
+            missing = {"command", "program_name"} - columns
+            if missing:
+                raise ValueError(f"Manifest is missing column(s): {', '.join(sorted(missing))}")
+            for record in reader:
+                rows.append(_make_row(reader.line_num, record))
+    elif fmt == "jsonl":
+        with path.open(encoding="utf-8") as fh:
+            for line_num, line in enumerate(fh, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError as e:
+                    rows.append(BatchRow(line=line_num, error=f"Invalid JSON: {e.msg}"))
+                    continue
+                if not isinstance(record, dict):
+                    rows.append(BatchRow(line=line_num, error="Expected a JSON object"))
+                    continue
+                rows.append(_make_row(line_num, record))
+    else:
+        raise ValueError(f"Unknown manifest format for {path.name}; use --format csv or --format jsonl")
+
+    return rows
+
+
+def _template_handler(command: str) -> TemplateCommandHandler:
+    """
+    Return the handler behind a template command.
+
+    Raises:
+        ValueError: If the command does not exist or is not template-based
+    """
+    spec = next((s for s in COMMAND_MANIFEST if s.name == command), None)
+    if spec is None:
+        raise ValueError(f"Unknown command '{command}'")
+    handler = getattr(importlib.import_module(spec.module), "_handler", None)
+    if not isinstance(handler, TemplateCommandHandler):
+        raise ValueError(f"'{command}' is not a template command and cannot be batched")
+    return handler
+
+
+def _field_values(handler: TemplateCommandHandler, row: BatchRow) -> list[str]:
+    """
+    Order a row's field values as the command expects them.
+
+    Raises:
+        ValueError: On missing required fields or unknown field names
+    """
+    known = {f.name for f in handler.config.fields}
+    unknown = sorted(set(row.fields) - known)
+    if unknown:
+        raise ValueError(f"Unknown field(s) for {row.command}: {', '.join(unknown)}")
+    values = []
+    for field_cfg in handler.config.fields:
+        value = row.fields.get(field_cfg.name, field_cfg.default)
+        if value is None:
+            raise ValueError(f"Missing field '{field_cfg.name}'")
+        values.append(value)
+    return values
+
+
+def _quiet_console() -> Console:
+    """Console that captures a row's messages instead of printing them."""
+    return Console(file=io.StringIO(), width=200, highlight=False)
+
+
+def _last_message(console: Console) -> str:
+    lines = [line.strip() for line in console.file.getvalue().splitlines() if line.strip()]
+    return lines[-1] if lines else "Failed"
+
+
+def _prepare(
+    row: BatchRow, handlers: dict[str, TemplateCommandHandler]
+) -> "BatchResult | tuple[TemplateCommandHandler, FeatureContext]":
+    """Validate a row and allocate its feature directory."""
+    if row.error:
+        return BatchResult(row, False, row.error)
+    console = _quiet_console()
+    try:
+        if row.command not in handlers:
+            handlers[row.command] = _template_handler(row.command)
+        handler = handlers[row.command]
+        values = _field_values(handler, row)
+        return handler, handler.prepare(row.program_name, *values, feature=row.feature, console=console)
+    except typer.Exit:
+        return BatchResult(row, False, _last_message(console))
+    except (ImportError, ValueError, RuntimeError, OSError) as e:
+        return BatchResult(row, False, str(e))
+
+
+def _write(row: BatchRow, handler: TemplateCommandHandler, context: FeatureContext, force: bool) -> BatchResult:
+    """Render and write one row's documents (runs on a worker thread)."""
+    console = _quiet_console()
+    try:
+        handler.write_outputs(context, force=force or row.force, console=console)
+    except typer.Exit:
+        return BatchResult(row, False, _last_message(console), context.feature_dir)
+    except Exception as e:
+        return BatchResult(row, False, str(e), context.feature_dir)
+    return BatchResult(row, True, str(context.feature_dir), context.feature_dir)
+
+
+def run_batch(rows: list[BatchRow], workers: int = DEFAULT_WORKERS, force: bool = False) -> list[BatchResult]:
+    """
+    Scaffold every manifest row.
+
+    Validation and feature allocation run in manifest order; rendering and
+    writing run on a thread pool of ``workers`` threads. Failures are
+    recorded per row and never stop the batch.
+
+    Args:
+        rows: Rows from ``read_manifest()``
+        workers: Number of writer threads
+        force: Overwrite existing files for every row
+
+    Returns:
+        One BatchResult per row, in manifest order
+    """
+    handlers: dict[str, TemplateCommandHandler] = {}
+    prepared = [_prepare(row, handlers) for row in rows]
+
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="nuaa-batch") as pool:
+        pending = [
+            item if isinstance(item, BatchResult) else pool.submit(_write, row, item[0], item[1], force)
+            for row, item in zip(rows, prepared)
+        ]
+        return [item if isinstance(item, BatchResult) else item.result() for item in pending]
+
+
+def register(app, show_banner_fn=None, console: Console | None = None):
+    """Register the batch command with the Typer app."""
+    console = console or Console()
+
+    @app.command()
+    def batch(
+        manifest: Path = typer.Argument(..., help="CSV or JSONL manifest of programs to scaffold"),
+        format: Optional[str] = typer.Option(
+            None, "--format", help="Manifest format: csv or jsonl (default: from file extension)"
+        ),
+        workers: int = typer.Option(DEFAULT_WORKERS, "--workers", "-w", min=1, help="Number of writer threads"),
+        force: bool = typer.Option(False, "--force", help="Overwrite existing files for every row"),
+    ):
+        """
+        Scaffold many programs from a CSV or JSONL manifest in one run.
+
+        Each manifest row names a template command (design, propose, measure,
+        document, engage, partner, train, event or risk), a program name and
+        the command's field values. All rows share the template cache and
+        feature index; feature directories are numbered in manifest order and
+        documents are written concurrently.
+
+        A summary table lists every row with its feature directory or the
+        reason it failed, followed by the overall throughput. The command exits
+        with code 1 if any row failed.
+
+        Examples:
+            $ nuaa batch programs.csv
+            $ nuaa batch programs.jsonl --workers 8
+        """
+        if show_banner_fn:
+            show_banner_fn()
+
+        if not manifest.is_file():
+            console.print(f"[red]Manifest not found:[/red] {manifest}")
+            raise typer.Exit(1)
+
+        try:
+            rows = read_manifest(manifest, format)
+        except (ValueError, OSError, csv.Error) as e:
+            console.print(f"[red]Could not read manifest:[/red] {e}")
+            raise typer.Exit(1)
+
+        start = time.perf_counter()
+        results = run_batch(rows, workers=workers, force=force)
+        elapsed = time.perf_counter() - start
+
+        table = Table(title=f"Batch: {manifest.name}")
+        table.add_column("Line", justify="right", style="dim")
+        table.add_column("Command", style="cyan")
+        table.add_column("Program")
+        table.add_column("Status")
+        table.add_column("Result", overflow="fold")
+        for result in results:
+            status = "[green]ok[/green]" if result.ok else "[red]failed[/red]"
+            table.add_row(
+                str(result.row.line),
+                escape(result.row.command),
+                escape(result.row.program_name),
+                status,
+                escape(result.message),
+            )
+        console.print(table)
+
+        succeeded = sum(1 for r in results if r.ok)
+        failed = len(results) - succeeded
+        rate = len(results) / elapsed if elapsed > 0 else 0.0
+        console.print(
+            f"[green]{succeeded} succeeded[/green], "
+            f"{'[red]' if failed else '[dim]'}{failed} failed{'[/red]' if failed else '[/dim]'} "
+            f"- {len(results)} row(s) in {elapsed:.2f}s ({rate:.1f} rows/s)"
+        )
+
+        if failed:
+            raise typer.Exit(1)
@@ -24,6 +24,8 @@ from rich.console import Console
 from rich.panel import Panel
 from rich.progress import Progress, SpinnerColumn, TextColumn
 
+from ..agent_config import load_agent_config
+
 
 def register(app, show_banner_fn=None, console: Console | None = None):
     """Register the bundle command with the Typer app."""
@@ -194,13 +196,7 @@ def register(app, show_banner_fn=None, console: Console | None = None):
 
 def _collect_agent_files(work_dir: Path, agent: Optional[str], console: Console) -> None:
     """Collect agent command files from the project."""
-    # Load agent config
-    import json
-    from pathlib import Path as _Path
-
-    agents_json_path = _Path(__file__).parent.parent / "agents.json"
-    with open(agents_json_path, "r") as f:
-        AGENT_CONFIG = json.load(f)
+    AGENT_CONFIG = load_agent_config()
 
     agents_to_collect = [agent] if agent else list(AGENT_CONFIG.keys())
 
@@ -66,7 +66,9 @@ from rich.live import Live
 from rich.panel import Panel
 
 # Import from parent modules
+from ..agent_config import AgentConfig, load_agent_config
 from ..download import download_and_extract_template
+from ..download.release_cache import ReleaseCache
 from ..git_utils import init_git_repo, is_git_repo
 from ..scripts import ensure_executable_scripts
 from ..ui import select_with_arrows
@@ -77,14 +79,16 @@ from ..error_handler import display_debug_environment, handle_network_error
 ssl_context = truststore.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
 
 
-def _load_agent_config() -> dict:
+def _load_agent_config() -> AgentConfig:
     """
     Load agent configuration from the agents.json file.
 
+    The file is parsed once per process by ``nuaa_cli.agent_config`` and shared
+    with the other commands.
+
     Returns:
-        Dictionary containing agent configurations with keys as agent identifiers
-        and values as configuration dictionaries containing name, folder, format,
-        cli_tool, description, requires_cli, and install_url.
+        Read-only mapping of agent identifiers to configuration mappings containing
+        name, folder, format, cli_tool, description, requires_cli, and install_url.
 
     Raises:
         typer.Exit: If agents.json file is not found or contains invalid JSON.
@@ -95,9 +99,7 @@ def _load_agent_config() -> dict:
         'Claude Code'
     """
     try:
-        config_path = Path(__file__).parent.parent / "agents.json"
-        with open(config_path, "r", encoding="utf-8") as f:
-            return json.load(f)
+        return load_agent_config()
     except FileNotFoundError as e:
         console = Console()
         console.print(f"[red]Error loading agent configuration from agents.json:[/red] {e}")
@@ -183,6 +185,16 @@ def register(app, show_banner_fn=None, console: Optional[Console] = None):
             "--github-token",
             help="GitHub token to use for API requests (or set GH_TOKEN or GITHUB_TOKEN environment variable)",
         ),
+        offline: bool = typer.Option(
+            False,
+            "--offline",
+            help="Use the locally cached template without contacting GitHub",
+        ),
+        no_cache: bool = typer.Option(
+            False,
+            "--no-cache",
+            help="Always download the template instead of using the local template cache",
+        ),
     ):
         """
         Initialize a new NUAA Project Kit workspace from the latest template.
@@ -244,6 +256,12 @@ def register(app, show_banner_fn=None, console: Optional[Console] = None):
             github_token: GitHub personal access token for API requests. Increases
                 rate limit from 60/hour (anonymous) to 5,000/hour (authenticated).
                 Can also be set via GH_TOKEN or GITHUB_TOKEN environment variables.
+            offline: If True, uses the release information and template ZIP cached
+                by an earlier run and never contacts GitHub. Fails if the template
+                for the selected assistant and script type has not been cached.
+            no_cache: If True, bypasses the local template cache. By default
+                release information is revalidated with its ETag and a template
+                ZIP already downloaded for the latest release is reused.
 
         Raises:
             typer.Exit: Exits with code 1 in the following scenarios:
@@ -255,6 +273,7 @@ def register(app, show_banner_fn=None, console: Optional[Console] = None):
                 - Target directory already exists (when creating new directory)
                 - User cancels confirmation prompt (when initializing in non-empty directory)
                 - Network errors during template download
+                - Template not cached when --offline is used
                 - File system errors during extraction
                 - ZIP file corruption or security issues
                 - Git initialization fails (warning only, does not stop initialization)
@@ -288,8 +307,13 @@ def register(app, show_banner_fn=None, console: Optional[Console] = None):
             Initialize behind corporate proxy (skip TLS verification):
                 $ nuaa init my-project --skip-tls
 
+            Initialize from the local template cache without network access:
+                $ nuaa init my-project --ai claude --offline
+
         Notes:
             - Template is downloaded from the latest GitHub release of zophiezlan/nuaa-cli
+            - Downloaded templates are cached under the user cache directory (override
+              with NUAA_TEMPLATE_CACHE_DIR, size limit NUAA_TEMPLATE_CACHE_MAX_MB)
             - Git initialization is automatic unless --no-git is specified or git is not installed
             - Agent folder (e.g., .claude/commands/) may contain credentials - add to .gitignore
             - Some AI assistants require CLI installation (checked unless --ignore-agent-tools)
@@ -315,6 +339,10 @@ def register(app, show_banner_fn=None, console: Optional[Console] = None):
             console.print("[red]Error:[/red] Cannot specify both project name and --here flag")
             raise typer.Exit(1)
 
+        if offline and no_cache:
+            console.print("[red]Error:[/red] Cannot use --offline with --no-cache")
+            raise typer.Exit(1)
+
         # Ensure either project name or --here is provided
         if not here and not project_name:
             console.print(
@@ -495,6 +523,8 @@ def register(app, show_banner_fn=None, console: Optional[Console] = None):
                         client=local_client,
                         debug=debug,
                         github_token=github_token,
+                        cache=None if no_cache else ReleaseCache(),
+                        offline=offline,
                     )
 
                 # Ensure shell scripts are executable
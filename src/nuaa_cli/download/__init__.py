@@ -12,6 +12,7 @@ This module has been refactored into focused submodules:
 - json_merger: Deep JSON configuration merging
 - vscode_settings: VSCode settings.json special handling
 - template_downloader: Main download orchestration
+- release_cache: Local cache of template release ZIPs
 
 Public API:
     - download_template_from_github: Fetch template from GitHub
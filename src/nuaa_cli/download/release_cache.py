@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Template Release Cache
+======================
+
+Local cache for template release ZIPs, so initialising many projects (for
+example in CI) downloads each release asset once.
+
+The cache lives under the platformdirs user cache directory (override with
+``NUAA_TEMPLATE_CACHE_DIR``) and holds:
+
+- ``blobs/<sha256>.zip``: asset ZIPs, stored under the SHA-256 of their
+  content. Identical assets published under several tags share one file.
+- ``index.json``: release metadata with its ``ETag`` per API URL, and the
+  blob, size and last use of each ``<tag>/<asset name>``.
+
+Assets are verified against their SHA-256 whenever they are read from the
+cache; a corrupt or missing blob is dropped and downloaded again. Release
+metadata is revalidated with ``If-None-Match``, so an unchanged release
+costs a ``304 Not Modified`` (which GitHub does not count against the rate
+limit). Once the blobs exceed ``max_bytes`` (``NUAA_TEMPLATE_CACHE_MAX_MB``,
+default 256) the least recently used assets are evicted.
+
+The cache is an optimisation only: failures to read or write it are logged
+and the download goes ahead as if it were empty. Concurrent processes share
+it without locking, so one process may evict a blob another has just looked
+up (the downloader then downloads the asset instead), and an index update
+lost to another process can leave a blob the index does not list. Such
+orphaned blobs still count toward ``max_bytes``, by their file size and
+modification time, and are evicted like any other.
+
+Example:
+    >>> cache = ReleaseCache()
+    >>> etag, release = cache.get_release(api_url) or (None, None)
+    >>> cached = cache.get_asset("v1.2.0", "nuaa-template-claude-sh-v1.2.0.zip")
+    >>> if cached is None:
+    ...     cached = cache.put_asset("v1.2.0", "nuaa-template-claude-sh-v1.2.0.zip", downloaded_zip)
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Optional, Tuple, Union
+
+from platformdirs import user_cache_dir
+
+from ..logging_config import get_logger
+
+logger = get_logger("release_cache")
+
+# Bump when the on-disk layout changes
+_INDEX_VERSION = 1
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def default_cache_dir() -> Path:
+    """Cache directory: ``NUAA_TEMPLATE_CACHE_DIR`` or ``<user cache dir>/templates``."""
+    if env_dir := os.getenv("NUAA_TEMPLATE_CACHE_DIR"):
+        return Path(env_dir).expanduser()
+    return Path(user_cache_dir("nuaa-cli", "NUAA")) / "templates"
+
+
+def _default_max_bytes() -> int:
+    if env_max := os.getenv("NUAA_TEMPLATE_CACHE_MAX_MB"):
+        try:
+            return int(float(env_max) * 1024 * 1024)
+        except ValueError:
+            logger.warning(f"Ignoring invalid NUAA_TEMPLATE_CACHE_MAX_MB: {env_max}")
+    return DEFAULT_MAX_BYTES
+
+
+def file_sha256(path: Path) -> str:
+    """Hex SHA-256 of a file's content."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ReleaseCache:
+    """
+    Content-addressed, size-bounded cache of release assets and metadata.
+
+    Args:
+        root: Cache directory (default: ``default_cache_dir()``)
+        max_bytes: Total size of cached assets before the least recently
+            used are evicted (default: ``NUAA_TEMPLATE_CACHE_MAX_MB`` or 256 MB)
+    """
+
+    def __init__(self, root: Optional[Union[str, Path]] = None, max_bytes: Optional[int] = None):
+        self.root = Path(root) if root is not None else default_cache_dir()
+        self.max_bytes = max_bytes if max_bytes is not None else _default_max_bytes()
+        self._blobs = self.root / "blobs"
+        self._index_path = self.root / "index.json"
+
+    # Release metadata
+
+    def get_release(self, url: str) -> Optional[Tuple[Optional[str], dict]]:
+        """
+        Cached release metadata for an API URL.
+
+        Returns:
+            ``(etag, release_data)``, or None if nothing is cached
+        """
+        entry = self._load_index()["releases"].get(url)
+        if not entry or not isinstance(entry.get("data"), dict):
+            return None
+        return entry.get("etag"), entry["data"]
+
+    def put_release(self, url: str, etag: Optional[str], data: dict) -> None:
+        """Remember release metadata and its ETag for an API URL."""
+        index = self._load_index()
+        index["releases"][url] = {"etag": etag, "data": data}
+        self._save_index(index)
+
+    # Assets
+
+    def get_asset(self, tag: str, name: str) -> Optional[Path]:
+        """
+        Path of a cached asset, verified against its SHA-256.
+
+        Marks the asset as recently used. Do not modify the returned file;
+        copy it with ``copy_asset`` instead.
+
+        Returns:
+            Path to the cached ZIP, or None if it is not cached (or was corrupt)
+        """
+        index = self._load_index()
+        key = f"{tag}/{name}"
+        entry = index["assets"].get(key)
+        if not entry:
+            return None
+        blob = self._blob_path(entry["sha256"])
+        try:
+            valid = file_sha256(blob) == entry["sha256"]
+        except OSError:
+            valid = False
+        if not valid:
+            logger.warning(f"Dropping corrupt or missing cached template {key}")
+            del index["assets"][key]
+            self._remove_unreferenced(index, entry["sha256"])
+            self._save_index(index)
+            return None
+        entry["last_used"] = time.time()
+        self._save_index(index)
+        return blob
+
+    def put_asset(self, tag: str, name: str, source: Path, sha256: Optional[str] = None) -> Optional[Path]:
+        """
+        Copy a downloaded asset into the cache.
+
+        Args:
+            tag: Release tag
+            name: Asset file name
+            source: Downloaded ZIP (left in place)
+            sha256: Expected hex digest, e.g. from the release's ``digest``
+                field; a mismatch rejects the file
+
+        Returns:
+            Path to the cached copy, or None if it could not be cached
+
+        Raises:
+            ValueError: If the file does not match ``sha256``
+        """
+        actual = file_sha256(source)
+        if sha256 is not None and actual != sha256.lower():
+            raise ValueError(f"SHA-256 mismatch for {name}: expected {sha256}, got {actual}")
+        blob = self._blob_path(actual)
+        try:
+            if not blob.exists():
+                self._blobs.mkdir(parents=True, exist_ok=True)
+                fd, tmp_name = tempfile.mkstemp(dir=self._blobs, suffix=".tmp")
+                os.close(fd)
+                shutil.copyfile(source, tmp_name)
+                os.replace(tmp_name, blob)
+        except OSError as e:
+            logger.warning(f"Could not cache template {name}: {e}")
+            return None
+        index = self._load_index()
+        index["assets"][f"{tag}/{name}"] = {
+            "sha256": actual,
+            "size": blob.stat().st_size,
+            "last_used": time.time(),
+        }
+        self._evict(index, keep=actual)
+        self._save_index(index)
+        return blob
+
+    def copy_asset(self, blob: Path, destination: Path) -> Path:
+        """Copy a cached asset out of the cache (callers may delete the copy)."""
+        shutil.copyfile(blob, destination)
+        return destination
+
+    def size(self) -> int:
+        """Total bytes of cached assets, including blobs missing from the index."""
+        index = self._load_index()
+        return sum(size for size, _ in self._stored_blobs(index).values())
+
+    def clear(self) -> None:
+        """Remove every cached asset and release."""
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    # Internals
+
+    def _blob_path(self, sha256: str) -> Path:
+        return self._blobs / f"{sha256}.zip"
+
+    @staticmethod
+    def _unique_blobs(index: dict[str, Any]) -> dict[str, dict]:
+        """Most recent index entry per blob (several tags may share one)."""
+        blobs: dict[str, dict] = {}
+        for entry in index["assets"].values():
+            current = blobs.get(entry["sha256"])
+            if current is None or entry["last_used"] > current["last_used"]:
+                blobs[entry["sha256"]] = entry
+        return blobs
+
+    def _stored_blobs(self, index: dict[str, Any]) -> dict[str, tuple[int, float]]:
+        """``(size, last use)`` per blob: indexed ones, plus orphans found on disk."""
+        blobs = {sha256: (entry["size"], entry["last_used"]) for sha256, entry in self._unique_blobs(index).items()}
+        try:
+            paths = list(self._blobs.glob("*.zip"))
+        except OSError:
+            paths = []
+        for path in paths:
+            if path.stem in blobs:
+                continue
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            blobs[path.stem] = (stat.st_size, stat.st_mtime)
+        return blobs
+
+    def _evict(self, index: dict[str, Any], keep: str) -> None:
+        """Drop least recently used blobs until the cache fits in ``max_bytes``."""
+        blobs = self._stored_blobs(index)
+        total = sum(size for size, _ in blobs.values())
+        for sha256, (size, _) in sorted(blobs.items(), key=lambda item: item[1][1]):
+            if total <= self.max_bytes:
+                break
+            if sha256 == keep:
+                continue
+            index["assets"] = {k: v for k, v in index["assets"].items() if v["sha256"] != sha256}
+            self._remove_unreferenced(index, sha256)
+            total -= size
+
+    def _remove_unreferenced(self, index: dict[str, Any], sha256: str) -> None:
+        if any(entry["sha256"] == sha256 for entry in index["assets"].values()):
+            return
+        try:
+            self._blob_path(sha256).unlink()
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.debug(f"Could not remove cached template blob {sha256}: {e}")
+
+    def _load_index(self) -> dict[str, Any]:
+        try:
+            with open(self._index_path, "r", encoding="utf-8") as f:
+                index = json.load(f)
+            if index.get("version") == _INDEX_VERSION:
+                return index
+        except (OSError, ValueError, AttributeError):
+            pass
+        return {"version": _INDEX_VERSION, "releases": {}, "assets": {}}
+
+    def _save_index(self, index: dict[str, Any]) -> None:
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            tmp_path = self._index_path.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(index, f)
+            os.replace(tmp_path, self._index_path)
+        except OSError as e:
+            # The cache is an optimisation only
+            logger.debug(f"Could not write template cache index {self._index_path}: {e}")
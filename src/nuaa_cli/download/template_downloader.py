@@ -12,6 +12,7 @@ Functions:
 
 Features:
     - GitHub release fetching
+    - Local release cache (ETag revalidation, SHA-256 verified assets, offline mode)
     - Secure ZIP extraction
     - Directory flattening
     - Merge with existing directories
@@ -38,6 +39,7 @@ from rich.progress import Progress, SpinnerColumn, TextColumn
 
 from ..github_client import get_auth_headers, format_rate_limit_error
 from ..error_handler import print_error, display_debug_environment
+from .release_cache import ReleaseCache
 from .vscode_settings import handle_vscode_settings
 from .zip_handler import safe_extract_zip
 from ..utils import StepTracker
@@ -57,6 +59,8 @@ def download_template_from_github(
     debug: bool = False,
     github_token: Optional[str] = None,
     console: Console = Console(),
+    cache: Optional[ReleaseCache] = None,
+    offline: bool = False,
 ) -> Tuple[Path, dict]:
     """
     Download NUAA template from GitHub releases.
@@ -74,14 +78,19 @@ def download_template_from_github(
         debug: Whether to print debug information on errors
         github_token: Optional GitHub token for authentication (increases rate limits)
         console: Rich console for output (defaults to new Console instance)
+        cache: Optional ReleaseCache; release metadata is revalidated with its
+            ETag and an asset already cached for the release is not downloaded
+        offline: Use only the cache (a default ReleaseCache if none is given)
+            and never contact GitHub
 
     Returns:
         Tuple of (zip_path, metadata) where:
         - zip_path: Path to downloaded ZIP file
-        - metadata: Dict with 'filename', 'size', 'release', 'asset_url'
+        - metadata: Dict with 'filename', 'size', 'release', 'asset_url', 'cached'
 
     Raises:
-        typer.Exit: On network errors, rate limiting, or missing assets
+        typer.Exit: On network errors, rate limiting, or missing assets, or in
+            offline mode when the release or asset is not cached
         RuntimeError: On API errors or invalid responses
 
     Examples:
@@ -98,56 +107,82 @@ def download_template_from_github(
     # NUAA templates are published as release assets in this repository
     repo_owner = "zophiezlan"
     repo_name = "nuaa-cli"
+    api_url = f"https://api.github.com/repos/{repo_owner}/{repo_name}/releases/latest"
+    if offline and cache is None:
+        cache = ReleaseCache()
+    cached_release = cache.get_release(api_url) if cache is not None else None
+
     close_client = False
     http_client = client
-    if http_client is None:
+    if http_client is None and not offline:
         http_client = httpx.Client(verify=ssl_context)
         close_client = True
 
-    if verbose:
-        console.print("[cyan]Fetching latest release information...[/cyan]")
-    api_url = f"https://api.github.com/repos/{repo_owner}/{repo_name}/releases/latest"
-
-    try:
-        response = http_client.get(
-            api_url,
-            timeout=30,
-            follow_redirects=True,
-            headers=get_auth_headers(github_token),
-        )
-        status = response.status_code
-        if status != 200:
-            # Format detailed error message with rate-limit info
-            error_msg = format_rate_limit_error(status, response.headers, api_url)
-            if debug:
-                error_msg += f"\n\n[dim]Response body (truncated 500):[/dim]\n{response.text[:500]}"
-            raise RuntimeError(error_msg)
-        try:
-            release_data = response.json()
-        except ValueError as je:
-            raise RuntimeError(
-                f"Failed to parse release JSON: {je}\nRaw (truncated 400): {response.text[:400]}"
+    if offline:
+        if cached_release is None:
+            print_error(
+                console,
+                "Offline Error",
+                "No cached release information. Run once without --offline to fill the template cache.",
             )
-    except (httpx.TimeoutException, httpx.ConnectError, httpx.HTTPError) as e:
-        error_type = type(e).__name__
-        if isinstance(e, httpx.TimeoutException):
-            title, message = "Fetch Error", "Request timed out connecting to GitHub API"
-        elif isinstance(e, httpx.ConnectError):
-            title, message = (
-                "Fetch Error",
-                "Could not connect to GitHub API. Check your internet connection.",
+            raise typer.Exit(1)
+        release_data = cached_release[1]
+        if verbose:
+            console.print("[cyan]Using cached release information (offline)[/cyan]")
+    else:
+        if verbose:
+            console.print("[cyan]Fetching latest release information...[/cyan]")
+        headers = get_auth_headers(github_token)
+        if cached_release is not None and cached_release[0]:
+            # An unchanged release comes back as 304 Not Modified
+            headers = {**headers, "If-None-Match": cached_release[0]}
+        try:
+            response = http_client.get(
+                api_url,
+                timeout=30,
+                follow_redirects=True,
+                headers=headers,
             )
-        else:
-            title, message = "Fetch Error", f"HTTP error occurred: {e}"
-        print_error(console, title, message)
-        if debug:
-            display_debug_environment(console)
-        raise typer.Exit(1)
-    except RuntimeError as e:
-        print_error(console, "Fetch Error", str(e))
-        if debug:
-            display_debug_environment(console)
-        raise typer.Exit(1)
+            status = response.status_code
+            if status == 304 and cached_release is not None:
+                release_data = cached_release[1]
+            else:
+                if status != 200:
+                    # Format detailed error message with rate-limit info
+                    error_msg = format_rate_limit_error(status, response.headers, api_url)
+                    if debug:
+                        error_msg += (
+                            f"\n\n[dim]Response body (truncated 500):[/dim]\n{response.text[:500]}"
+                        )
+                    raise RuntimeError(error_msg)
+                try:
+                    release_data = response.json()
+                except ValueError as je:
+                    raise RuntimeError(
+                        f"Failed to parse release JSON: {je}\nRaw (truncated 400): {response.text[:400]}"
+                    )
+                if cache is not None:
+                    cache.put_release(api_url, response.headers.get("etag"), release_data)
+        except (httpx.TimeoutException, httpx.ConnectError, httpx.HTTPError) as e:
+            error_type = type(e).__name__
+            if isinstance(e, httpx.TimeoutException):
+                title, message = "Fetch Error", "Request timed out connecting to GitHub API"
+            elif isinstance(e, httpx.ConnectError):
+                title, message = (
+                    "Fetch Error",
+                    "Could not connect to GitHub API. Check your internet connection.",
+                )
+            else:
+                title, message = "Fetch Error", f"HTTP error occurred: {e}"
+            print_error(console, title, message)
+            if debug:
+                display_debug_environment(console)
+            raise typer.Exit(1)
+        except RuntimeError as e:
+            print_error(console, "Fetch Error", str(e))
+            if debug:
+                display_debug_environment(console)
+            raise typer.Exit(1)
 
     assets = release_data.get("assets", [])
     # Expected asset name pattern: nuaa-template-<agent>-<script>-<version>.zip
@@ -183,6 +218,45 @@ def download_template_from_github(
         console.print(f"[cyan]Release:[/cyan] {release_data['tag_name']}")
 
     zip_path = download_dir / filename
+    tag = release_data["tag_name"]
+    if cache is not None:
+        cached_asset = cache.get_asset(tag, filename)
+        if cached_asset is not None:
+            try:
+                cache.copy_asset(cached_asset, zip_path)
+            except OSError as e:
+                # E.g. another process evicted the blob after get_asset()
+                if offline:
+                    print_error(
+                        console,
+                        "Offline Error",
+                        f"Could not copy cached template to {zip_path}: {e}",
+                    )
+                    raise typer.Exit(1)
+                if verbose:
+                    console.print(f"[yellow]Cached template unavailable, downloading:[/yellow] {e}")
+                cached_asset = None
+        if cached_asset is not None:
+            if close_client:
+                http_client.close()
+            if verbose:
+                console.print(f"Using cached template: {filename}")
+            metadata = {
+                "filename": filename,
+                "size": file_size,
+                "release": tag,
+                "asset_url": download_url,
+                "cached": True,
+            }
+            return zip_path, metadata
+        if offline:
+            print_error(
+                console,
+                "Offline Error",
+                f"Template {filename} ({tag}) is not in the local cache. Run once without --offline to download it.",
+            )
+            raise typer.Exit(1)
+
     if verbose:
         console.print("[cyan]Downloading template...[/cyan]")
 
@@ -228,11 +302,20 @@ def download_template_from_github(
                             f.write(chunk)
         if verbose:
             console.print(f"Downloaded: {filename}")
+        if cache is not None:
+            # Newer releases publish the asset's digest; verify it before caching
+            digest = asset.get("digest") or ""
+            expected = digest[len("sha256:") :] if digest.startswith("sha256:") else None
+            try:
+                cache.put_asset(tag, filename, zip_path, sha256=expected)
+            except ValueError as e:
+                raise RuntimeError(f"Downloaded template failed verification: {e}")
         metadata = {
             "filename": filename,
             "size": file_size,
-            "release": release_data["tag_name"],
+            "release": tag,
             "asset_url": download_url,
+            "cached": False,
         }
         return zip_path, metadata
     except (httpx.TimeoutException, httpx.ConnectError, httpx.HTTPError) as e:
@@ -286,6 +369,8 @@ def download_and_extract_template(
     debug: bool = False,
     github_token: Optional[str] = None,
     console: Console = Console(),
+    cache: Optional[ReleaseCache] = None,
+    offline: bool = False,
 ) -> Path:
     """
     Download the latest release and extract it to create a new project.
@@ -309,6 +394,8 @@ def download_and_extract_template(
         debug: Whether to print debug information on errors
         github_token: Optional GitHub token for authentication
         console: Rich console for output (defaults to new Console instance)
+        cache: Optional ReleaseCache for release metadata and template ZIPs
+        offline: Use only cached templates (see download_template_from_github)
 
     Returns:
         Path to the created/updated project directory
@@ -349,11 +436,16 @@ def download_and_extract_template(
             debug=debug,
             github_token=github_token,
             console=console,
+            cache=cache,
+            offline=offline,
         )
         if tracker:
             tracker.complete("fetch", f"release {meta['release']} ({meta['size']:,} bytes)")
             tracker.add("download", "Download template")
-            tracker.complete("download", meta["filename"])
+            tracker.complete(
+                "download",
+                f"{meta['filename']} (cached)" if meta.get("cached") else meta["filename"],
+            )
     except (
         httpx.TimeoutException,
         httpx.ConnectError,
@@ -0,0 +1,231 @@
+"""
+On-disk index of feature directories.
+
+Feature directories live under ``<project>/nuaa/`` and are named
+``NNN-slug``. Allocating the next number and finding a program's directory
+used to list and regex-match the whole ``nuaa/`` folder on every call (and on
+every retry), which is slow in workspaces with thousands of features.
+
+``FeatureIndex`` keeps a small SQLite database at
+``<project>/.nuaa/feature-index.sqlite3`` with one row per feature directory
+(name, number, slug). SQLite transactions provide the cross-process lock, so
+allocation stays safe when several processes or threads create features at
+the same time.
+
+The index records the ``nuaa/`` directory's mtime (and link count where the
+filesystem reports subdirectories in it). Any directory created, removed or
+renamed outside the index changes that signature, and the index rebuilds
+itself from a single directory scan on next use.
+
+Example:
+    >>> index = FeatureIndex(Path("nuaa"))
+    >>> feature_dir, num_str = index.allocate("peer-support")
+    >>> index.find("peer-support") == feature_dir
+    True
+"""
+
+import re
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+from typing import Optional
+
+from .logging_config import get_logger
+
+logger = get_logger("feature_index")
+
+INDEX_DIRNAME = ".nuaa"
+INDEX_FILENAME = "feature-index.sqlite3"
+
+# Bump when the schema changes; older indexes are rebuilt
+SCHEMA_VERSION = 1
+
+# Seconds to wait for another writer to release the index
+LOCK_TIMEOUT = 30.0
+
+_FEATURE_RE = re.compile(r"^(\d{3,})-(.*)$")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS features (
+    name TEXT PRIMARY KEY,
+    number INTEGER,
+    slug TEXT
+);
+CREATE INDEX IF NOT EXISTS features_number ON features (number);
+CREATE INDEX IF NOT EXISTS features_slug ON features (slug);
+"""
+
+
+def _signature(nuaa_root: Path) -> tuple[int, int]:
+    """Cheap change detector for the nuaa/ directory: (mtime_ns, link count)."""
+    st = nuaa_root.stat()
+    # st_nlink counts subdirectories on most POSIX filesystems; 0 means "not tracked"
+    nlink = st.st_nlink if st.st_nlink >= 2 else 0
+    return st.st_mtime_ns, nlink
+
+
+def _format_signature(signature: tuple[int, int]) -> str:
+    return f"{signature[0]}:{signature[1]}"
+
+
+def _parse_name(name: str) -> tuple[Optional[int], Optional[str]]:
+    m = _FEATURE_RE.match(name)
+    if not m:
+        return None, None
+    return int(m.group(1)), m.group(2)
+
+
+class FeatureIndex:
+    """
+    SQLite-backed index of the feature directories under a ``nuaa/`` folder.
+
+    Args:
+        nuaa_root: The ``nuaa/`` directory (must exist)
+        index_path: Override the database location (default:
+            ``<nuaa_root>/../.nuaa/feature-index.sqlite3``)
+    """
+
+    def __init__(self, nuaa_root: Path, index_path: Optional[Path] = None):
+        self.nuaa_root = nuaa_root
+        self.index_path = index_path or nuaa_root.parent / INDEX_DIRNAME / INDEX_FILENAME
+        self._schema_ready = False
+
+    def _connect(self) -> sqlite3.Connection:
+        if not self._schema_ready:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        # isolation_level=None: transactions are managed explicitly below
+        conn = sqlite3.connect(self.index_path, timeout=LOCK_TIMEOUT, isolation_level=None)
+        if not self._schema_ready:
+            conn.executescript(_SCHEMA)
+            self._schema_ready = True
+        return conn
+
+    def _meta(self, conn: sqlite3.Connection, key: str) -> Optional[str]:
+        row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, conn: sqlite3.Connection, key: str, value: str) -> None:
+        conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def _is_fresh(self, conn: sqlite3.Connection) -> bool:
+        return self._meta(conn, "schema_version") == str(SCHEMA_VERSION) and self._meta(
+            conn, "signature"
+        ) == _format_signature(_signature(self.nuaa_root))
+
+    def _rebuild(self, conn: sqlite3.Connection) -> None:
+        """Replace the index contents with a fresh scan (caller holds the write lock)."""
+        signature = _signature(self.nuaa_root)
+        rows = []
+        for child in self.nuaa_root.iterdir():
+            if child.is_dir():
+                number, slug = _parse_name(child.name)
+                rows.append((child.name, number, slug))
+        conn.execute("DELETE FROM features")
+        conn.executemany("INSERT INTO features (name, number, slug) VALUES (?, ?, ?)", rows)
+        self._set_meta(conn, "schema_version", str(SCHEMA_VERSION))
+        self._set_meta(conn, "signature", _format_signature(signature))
+        logger.debug(f"Rebuilt feature index for {self.nuaa_root} ({len(rows)} entries)")
+
+    def _ensure_fresh(self, conn: sqlite3.Connection) -> None:
+        if self._is_fresh(conn):
+            return
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if not self._is_fresh(conn):
+                self._rebuild(conn)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def rebuild(self) -> None:
+        """Force a full rebuild from the directory contents."""
+        with closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._rebuild(conn)
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+    def allocate(self, slug: str, max_retries: int = 100) -> tuple[Path, str]:
+        """
+        Create the next numbered feature directory for ``slug``.
+
+        Runs inside an exclusive SQLite transaction, so concurrent callers
+        (threads or processes) receive distinct numbers.
+
+        Returns:
+            Tuple of (feature_dir, num_str)
+
+        Raises:
+            RuntimeError: If no free number is found after ``max_retries`` attempts
+        """
+        with closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                if not self._is_fresh(conn):
+                    self._rebuild(conn)
+                highest = conn.execute("SELECT COALESCE(MAX(number), 0) FROM features").fetchone()[0]
+                for _ in range(max_retries):
+                    highest += 1
+                    num_str = f"{highest:03d}"
+                    feature_dir = self.nuaa_root / f"{num_str}-{slug}"
+                    before = _signature(self.nuaa_root)
+                    try:
+                        feature_dir.mkdir(parents=True, exist_ok=False)
+                    except FileExistsError:
+                        # Created outside the index; skip the number and mark index stale
+                        self._set_meta(conn, "signature", "")
+                        continue
+                    conn.execute(
+                        "INSERT OR REPLACE INTO features (name, number, slug) VALUES (?, ?, ?)",
+                        (feature_dir.name, highest, slug),
+                    )
+                    after = _signature(self.nuaa_root)
+                    # Only trust the new signature if nothing else changed the directory
+                    consistent = self._meta(conn, "signature") == _format_signature(before) and (
+                        before[1] == 0 or after[1] == before[1] + 1
+                    )
+                    self._set_meta(conn, "signature", _format_signature(after) if consistent else "")
+                    conn.execute("COMMIT")
+                    return feature_dir, num_str
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+        raise RuntimeError(
+            f"Failed to create unique feature directory after {max_retries} attempts. "
+            f"This may indicate a problem with concurrent directory creation."
+        )
+
+    def find(self, slug: str) -> Optional[Path]:
+        """
+        Return the feature directory for ``slug``.
+
+        Directories named ``NNN-<slug>`` are looked up through the slug
+        index (first in name order). Only if there is none does the lookup
+        fall back to the original scan: the first name, in name order,
+        containing ``-<slug>`` on word boundaries.
+        """
+        with closing(self._connect()) as conn:
+            self._ensure_fresh(conn)
+            rows = conn.execute("SELECT name FROM features WHERE slug = ? ORDER BY name", (slug,))
+            for (name,) in rows.fetchall():
+                path = self.nuaa_root / name
+                if path.is_dir():
+                    return path
+            pattern = re.compile(rf"-\b{re.escape(slug)}\b")
+            rows = conn.execute(
+                "SELECT name FROM features WHERE instr(name, ?) > 0 ORDER BY name",
+                (f"-{slug}",),
+            )
+            for (name,) in rows:
+                if pattern.search(name):
+                    path = self.nuaa_root / name
+                    if path.is_dir():
+                        return path
+        return None
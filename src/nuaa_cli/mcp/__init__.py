@@ -24,6 +24,7 @@ Author: NUAA Project
 License: MIT
 """
 
+from .cache import CachePolicy
 from .registry import MCPRegistry, MCPTool, MCPToolDescriptor
 from .exceptions import (
     MCPError,
@@ -31,15 +32,18 @@ from .exceptions import (
     ToolValidationError,
     ToolExecutionError,
     ToolRegistrationError,
+    ToolTimeoutError,
 )
 
 __all__ = [
     "MCPRegistry",
     "MCPTool",
     "MCPToolDescriptor",
+    "CachePolicy",
     "MCPError",
     "ToolNotFoundError",
     "ToolValidationError",
     "ToolExecutionError",
     "ToolRegistrationError",
+    "ToolTimeoutError",
 ]
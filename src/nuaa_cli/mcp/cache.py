@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+MCP Tool Result Cache
+=====================
+
+Memoisation for idempotent tools. Many registered tools are pure lookups
+(template search, glossary search) that agents call again and again with the
+same inputs. A tool that declares a ``CachePolicy`` gets a ``ToolResultCache``
+in the registry, so a repeated call costs a dictionary lookup instead of a
+handler run.
+
+- Keys are built from the validated inputs: nested dicts, lists and sets are
+  frozen into hashable tuples, so ``{"a": 1, "b": 2}`` and
+  ``{"b": 2, "a": 1}`` share an entry. Numbers and booleans are tagged
+  with their type, so ``True``, ``1`` and ``1.0`` (equal in Python) get
+  separate entries. A policy can supply its own ``key`` function instead,
+  e.g. to ignore a parameter or normalise case.
+- Entries expire ``ttl`` seconds after they were stored (None = never) and
+  the least recently used entry is evicted beyond ``max_entries``.
+- Only successful results are cached. Cached values are returned as-is, so
+  callers must treat them as read-only.
+- Invalidation bumps a generation counter. A call that started before the
+  invalidation does not store its (possibly stale) result afterwards.
+
+Example:
+    >>> cache = ToolResultCache(CachePolicy(ttl=60, max_entries=256))
+    >>> key = cache.key_for({"query": "harm reduction"})
+    >>> cache.get(key)
+    (False, None)
+    >>> cache.put(key, ["glossary/harm-reduction.md"], cache.generation)
+    >>> cache.get(key)
+    (True, ['glossary/harm-reduction.md'])
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable, Optional
+
+# Returned by ToolResultCache.key_for when inputs cannot be keyed
+UNCACHEABLE = object()
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    """
+    Declares that a tool's results may be reused for identical inputs.
+
+    Attributes:
+        ttl: Seconds a result stays valid (None = until evicted or invalidated)
+        max_entries: Results kept per tool; the least recently used is evicted
+        key: Optional function mapping validated inputs to a hashable cache
+            key (default: the canonicalised inputs)
+    """
+
+    ttl: Optional[float] = None
+    max_entries: int = 128
+    key: Optional[Callable[[dict[str, Any]], Hashable]] = None
+
+    def __post_init__(self):
+        if self.ttl is not None and self.ttl <= 0:
+            raise ValueError(f"Cache ttl must be positive, got {self.ttl}")
+        if self.max_entries < 1:
+            raise ValueError(f"Cache max_entries must be at least 1, got {self.max_entries}")
+
+
+def canonical_key(value: Any) -> Hashable:
+    """
+    Freeze a JSON-like value into a hashable key independent of dict order.
+
+    Args:
+        value: Tool inputs (or any nested dict/list/set structure)
+
+    Returns:
+        Hashable equivalent of ``value``
+    """
+    if isinstance(value, dict):
+        return tuple(sorted((k, canonical_key(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return (type(value).__name__, tuple(canonical_key(v) for v in value))
+    if isinstance(value, (set, frozenset)):
+        return frozenset(canonical_key(v) for v in value)
+    if isinstance(value, (bool, int, float)):
+        # True == 1 == 1.0 would otherwise share one entry
+        return (type(value).__name__, value)
+    try:
+        hash(value)
+    except TypeError:
+        return (type(value).__name__, repr(value))
+    return value
+
+
+class ToolResultCache:
+    """
+    Thread-safe LRU cache with per-entry expiry for one tool's results.
+
+    Args:
+        policy: TTL, size and key function for this tool
+    """
+
+    def __init__(self, policy: CachePolicy):
+        self.policy = policy
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._invalidations = 0
+        self._bypassed = 0
+        self._generation = 0
+
+    @property
+    def generation(self) -> int:
+        """Invalidation counter; read it before running the handler and pass it to ``put``."""
+        with self._lock:
+            return self._generation
+
+    def key_for(self, inputs: dict[str, Any]) -> Hashable:
+        """
+        Cache key for validated inputs.
+
+        Returns:
+            The key, or ``UNCACHEABLE`` if the key function failed or
+            returned an unhashable value (the call then bypasses the cache)
+        """
+        try:
+            key = self.policy.key(inputs) if self.policy.key else canonical_key(inputs)
+            hash(key)
+        except Exception:
+            with self._lock:
+                self._bypassed += 1
+            return UNCACHEABLE
+        return key
+
+    def get(self, key: Hashable) -> tuple[bool, Any]:
+        """
+        Look up a result.
+
+        Returns:
+            ``(True, result)`` on a hit, ``(False, None)`` on a miss
+        """
+        if key is UNCACHEABLE:
+            return False, None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return False, None
+            expires, result = entry
+            if expires and expires <= time.monotonic():
+                del self._entries[key]
+                self._expirations += 1
+                self._misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return True, result
+
+    def put(self, key: Hashable, result: Any, generation: int) -> None:
+        """
+        Store a result, evicting the least recently used entry if full.
+
+        Args:
+            key: Key from ``key_for``
+            result: Handler result
+            generation: ``generation`` read before the handler ran; the
+                result is discarded if the cache was invalidated since
+        """
+        if key is UNCACHEABLE:
+            return
+        expires = time.monotonic() + self.policy.ttl if self.policy.ttl else 0.0
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._entries[key] = (expires, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.policy.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def invalidate(self, key: Hashable) -> bool:
+        """
+        Drop the entry for ``key``.
+
+        Returns:
+            True if an entry was removed
+        """
+        if key is UNCACHEABLE:
+            return False
+        with self._lock:
+            self._generation += 1
+            if self._entries.pop(key, None) is None:
+                return False
+            self._invalidations += 1
+            return True
+
+    def clear(self) -> int:
+        """
+        Drop every entry.
+
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            self._generation += 1
+            removed = len(self._entries)
+            self._entries.clear()
+            self._invalidations += removed
+            return removed
+
+    def stats(self) -> dict[str, int]:
+        """
+        Counters since the cache was created.
+
+        Returns:
+            ``hits``, ``misses``, ``evictions`` (LRU), ``expirations`` (TTL),
+            ``invalidations``, ``bypassed`` (unkeyable inputs), the current
+            ``size`` and ``max_entries``
+        """
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+                "invalidations": self._invalidations,
+                "bypassed": self._bypassed,
+                "size": len(self._entries),
+                "max_entries": self.policy.max_entries,
+            }
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+MCP Concurrency Limits
+======================
+
+Per-tool concurrency limit shared by synchronous and asynchronous callers.
+
+``MCPRegistry.call`` runs in the caller's thread and ``MCPRegistry.acall``
+runs on an event loop, possibly several loops in different threads. A
+``threading.Semaphore`` would block an event loop while waiting and an
+``asyncio.Semaphore`` belongs to one loop, so ``ToolLimiter`` keeps a single
+count under a thread lock. Threads wait on a condition, and coroutines
+wait on a future that the releasing thread resolves on the waiter's own
+loop.
+
+Example:
+    >>> limiter = ToolLimiter(2)
+    >>> if limiter.acquire(timeout=1.0):
+    ...     try:
+    ...         run_tool()
+    ...     finally:
+    ...         limiter.release()
+    >>> await limiter.acquire_async()
+"""
+
+import asyncio
+import threading
+from collections import deque
+from typing import Optional
+
+
+class ToolLimiter:
+    """
+    Counting limit on concurrent executions of one tool.
+
+    Args:
+        limit: Maximum number of executions in flight at once
+    """
+
+    def __init__(self, limit: int):
+        if limit < 1:
+            raise ValueError(f"Concurrency limit must be at least 1, got {limit}")
+        self.limit = limit
+        self._active = 0
+        self._cond = threading.Condition()
+        self._async_waiters: deque[tuple[asyncio.AbstractEventLoop, asyncio.Future]] = deque()
+
+    @property
+    def active(self) -> int:
+        """Executions currently holding a slot."""
+        with self._cond:
+            return self._active
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """
+        Take a slot, waiting up to ``timeout`` seconds (None = no limit).
+
+        Returns:
+            True if a slot was taken
+        """
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._active < self.limit and not self._async_waiters, timeout):
+                return False
+            self._active += 1
+            return True
+
+    async def acquire_async(self) -> None:
+        """Take a slot without blocking the event loop (cancel or time out the await to give up)."""
+        loop = asyncio.get_running_loop()
+        with self._cond:
+            if self._active < self.limit and not self._async_waiters:
+                self._active += 1
+                return
+            waiter = loop.create_future()
+            self._async_waiters.append((loop, waiter))
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            with self._cond:
+                try:
+                    self._async_waiters.remove((loop, waiter))
+                    granted = False
+                except ValueError:
+                    granted = True  # A slot was handed over as we were cancelled
+            if granted:
+                self.release()
+            raise
+
+    def release(self) -> None:
+        """Give a slot back, handing it straight to a waiting coroutine if there is one."""
+        with self._cond:
+            while self._async_waiters:
+                loop, waiter = self._async_waiters.popleft()
+                try:
+                    # The slot stays taken; it now belongs to the waiter
+                    loop.call_soon_threadsafe(self._grant, waiter)
+                    return
+                except RuntimeError:
+                    continue  # The waiter's event loop is closed
+            self._active -= 1
+            self._cond.notify()
+
+    @staticmethod
+    def _grant(waiter: asyncio.Future) -> None:
+        # A cancelled waiter gives the slot back in acquire_async()
+        if not waiter.cancelled():
+            waiter.set_result(None)
@@ -35,3 +35,9 @@ class ToolRegistrationError(MCPError):
     """Raised when tool registration fails due to invalid descriptor or duplicate name."""
 
     pass
+
+
+class ToolTimeoutError(ToolExecutionError):
+    """Raised when a tool call exceeds its timeout (including waiting for a concurrency slot)."""
+
+    pass
@@ -8,10 +8,17 @@ Supports registration, validation, invocation, and discovery of tools
 that can be called by AI agents through standardized interfaces.
 
 Key Features:
-- Tool registration with schema validation
+- Tool registration with schema validation (flat Python types or nested
+  JSON-Schema-style definitions, compiled once at registration)
 - Safe tool invocation with input validation
-- Tool discovery and enumeration
+- Tool discovery and enumeration (tag index and cached read-only views,
+  so discovery costs O(results) rather than O(registered tools))
 - Allowlist-based security controls
+- Thread-safe registration and lookup
+- Async invocation (``acall``, ``call_many``): async handlers are awaited
+  natively, sync handlers run on the registry's thread pool
+- Per-tool concurrency limits and timeouts
+- Result caching for idempotent tools (per-tool LRU with TTL)
 - Optional sandboxing (future enhancement)
 
 Example Usage:
@@ -37,19 +44,36 @@ Example Usage:
     >>> tools = registry.list_tools()
     >>> for tool in tools:
     ...     print(f"{tool.name}: {tool.description}")
+    >>>
+    >>> # From asyncio: run independent calls concurrently
+    >>> results = await registry.call_many([
+    ...     ("get_weather", {"location": "Sydney"}),
+    ...     ("get_weather", {"location": "Newcastle"}),
+    ... ])
 
 Author: NUAA Project
 License: MIT
 """
 
+import asyncio
+import copy
+import dataclasses
+import inspect
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from dataclasses import dataclass, field
-from typing import Any, Callable, Optional
+from typing import Any, Awaitable, Callable, Hashable, Iterable, Optional
 
+from .cache import CachePolicy, ToolResultCache
+from .concurrency import ToolLimiter
+from .schema import Validator, compile_schema
 from .exceptions import (
     ToolNotFoundError,
     ToolRegistrationError,
-    ToolValidationError,
     ToolExecutionError,
+    ToolTimeoutError,
 )
 
 
@@ -61,11 +85,22 @@ class MCPToolDescriptor:
     Attributes:
         name: Unique tool identifier (e.g., "get_weather", "search_docs")
         description: Human-readable description of what the tool does
-        input_schema: Dictionary describing expected input parameters and their types
-        handler: Callable that implements the tool's logic
+        input_schema: Dictionary describing expected input parameters: either
+            ``{name: type}`` (all required, checked with ``isinstance``) or a
+            JSON-Schema-style object schema (see ``nuaa_cli.mcp.schema``)
+        handler: Callable that implements the tool's logic (may be ``async``)
         output_schema: Optional dictionary describing output structure
         requires_confirmation: Whether tool execution requires user confirmation
         tags: Optional list of tags for categorization
+        max_concurrency: Maximum executions of this tool in flight at once
+            (None = unlimited)
+        timeout: Seconds a call may take, including the wait for a
+            concurrency slot (None = no limit)
+        cache: Optional CachePolicy; set it only for idempotent tools whose
+            results may be reused for identical inputs
+        invalidates: Names of cached tools whose results are discarded after
+            each successful call of this tool (e.g. an "add_term" tool
+            invalidating "search_glossary")
 
     Example:
         >>> descriptor = MCPToolDescriptor(
@@ -75,15 +110,50 @@ class MCPToolDescriptor:
         ...     handler=lambda inputs: search_docs(inputs["query"], inputs["limit"]),
         ...     tags=["search", "docs"]
         ... )
+        >>> descriptor = MCPToolDescriptor(
+        ...     name="search",
+        ...     description="Search documentation",
+        ...     input_schema={
+        ...         "type": "object",
+        ...         "properties": {
+        ...             "query": {"type": "string", "minLength": 1},
+        ...             "limit": {"type": "integer", "minimum": 1, "maximum": 50},
+        ...         },
+        ...         "required": ["query"],
+        ...     },
+        ...     handler=lambda inputs: search_docs(inputs["query"], inputs.get("limit", 10)),
+        ... )
     """
 
     name: str
     description: str
-    input_schema: dict[str, type]
+    input_schema: dict[str, Any]
     handler: Callable[[dict[str, Any]], Any]
     output_schema: Optional[dict[str, type]] = None
     requires_confirmation: bool = False
     tags: list[str] = field(default_factory=list)
+    max_concurrency: Optional[int] = None
+    timeout: Optional[float] = None
+    cache: Optional[CachePolicy] = None
+    invalidates: list[str] = field(default_factory=list)
+
+    _validator: Optional[Validator] = field(default=None, init=False, repr=False, compare=False)
+
+    def compile_validator(self) -> Validator:
+        """
+        Compile ``input_schema`` into the validator used by ``validate_inputs``.
+
+        Called by ``MCPRegistry.register()``; call it again after changing
+        ``input_schema`` on a descriptor that is not registered.
+
+        Returns:
+            The compiled validator
+
+        Raises:
+            ToolRegistrationError: If the schema is malformed
+        """
+        self._validator = compile_schema(self.input_schema, self.name)
+        return self._validator
 
     def validate_inputs(self, inputs: dict[str, Any]) -> None:
         """
@@ -95,45 +165,80 @@ class MCPToolDescriptor:
         Raises:
             ToolValidationError: If validation fails
         """
-        # Check for missing required parameters
-        missing = set(self.input_schema.keys()) - set(inputs.keys())
-        if missing:
-            raise ToolValidationError(
-                f"Missing required parameters for tool '{self.name}': {', '.join(missing)}"
-            )
-
-        # Check for extra parameters
-        extra = set(inputs.keys()) - set(self.input_schema.keys())
-        if extra:
-            raise ToolValidationError(
-                f"Unexpected parameters for tool '{self.name}': {', '.join(extra)}"
-            )
-
-        # Type validation
-        for param_name, expected_type in self.input_schema.items():
-            value = inputs[param_name]
-            if not isinstance(value, expected_type):
-                raise ToolValidationError(
-                    f"Parameter '{param_name}' for tool '{self.name}' "
-                    f"expected {expected_type.__name__}, got {type(value).__name__}"
-                )
+        validator = self._validator or self.compile_validator()
+        validator(inputs)
 
 
-@dataclass
+def _read_only(self: Any, *args: Any, **kwargs: Any) -> None:
+    raise TypeError("MCPTool views are read-only")
+
+
+class _ReadOnlyList(list):
+    """
+    List that refuses modification; compares equal to an ordinary list.
+
+    Copies (``copy``, ``deepcopy``, pickle) are ordinary, mutable lists.
+    """
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+    append = extend = insert = pop = remove = clear = sort = reverse = _read_only
+
+    def __reduce__(self) -> tuple:
+        return list, (list(self),)
+
+    def __copy__(self) -> list:
+        return list(self)
+
+    def __deepcopy__(self, memo: dict) -> list:
+        return copy.deepcopy(list(self), memo)
+
+
+class _ReadOnlyDict(dict):
+    """
+    Dict that refuses modification; serialises and compares like an ordinary dict.
+
+    Copies (``copy``, ``deepcopy``, pickle) are ordinary, mutable dicts.
+    """
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __reduce__(self) -> tuple:
+        return dict, (dict(self),)
+
+    def __copy__(self) -> dict:
+        return dict(self)
+
+    def __deepcopy__(self, memo: dict) -> dict:
+        return copy.deepcopy(dict(self), memo)
+
+
+@dataclass(frozen=True)
 class MCPTool:
     """
     Representation of a registered tool (read-only view).
 
     This is what gets returned by list_tools() - it doesn't include
-    the handler function for security reasons.
+    the handler function for security reasons. ``cache_stats`` holds the
+    result cache counters of a cacheable tool (see ``ToolResultCache.stats``)
+    and is None otherwise.
+
+    Views are built once at registration and shared between callers, so
+    they are immutable: fields cannot be reassigned and the schemas and
+    ``tags`` are dict and list subclasses that refuse modification. They
+    still serialise like plain containers (``json.dumps``,
+    ``dataclasses.asdict``), and copies of them are ordinary, mutable
+    dicts and lists. Views returned by
+    ``list_tools`` omit ``cache_stats``; ask ``get_tool_info`` for them.
     """
 
     name: str
     description: str
-    input_schema: dict[str, type]
+    input_schema: dict[str, Any]
     output_schema: Optional[dict[str, type]]
     requires_confirmation: bool
     tags: list[str]
+    cache_stats: Optional[dict[str, int]] = None
 
 
 class MCPRegistry:
@@ -143,6 +248,25 @@ class MCPRegistry:
     Provides centralized tool registration, validation, and invocation.
     Implements basic security controls through allowlists and validation.
 
+    The registry may be shared by many threads and event loops: the tool
+    table is guarded by a lock, and handlers run outside it. ``call()``
+    runs a handler in the calling thread, or on the thread pool when a
+    timeout applies. ``acall()`` awaits async handlers on the running loop and
+    runs sync handlers on the thread pool (``max_workers`` threads), so a
+    blocking tool never stalls the event loop.
+
+    A sync handler that times out cannot be interrupted. It keeps its
+    concurrency slot until it returns, so a hung tool stays within its
+    ``max_concurrency`` instead of tying up more pool threads.
+
+    Tools with a ``cache`` policy return a stored result for inputs they
+    have already seen, without taking a concurrency slot. ``invalidate()``
+    discards stored results, e.g. after the data behind a lookup changed.
+
+    A descriptor's schema and tags are captured when it is registered
+    (compiled validator, tag index, public view); unregister and register
+    the tool again to change them.
+
     Attributes:
         _tools: Internal dictionary mapping tool names to descriptors
         _allowlist: Optional set of allowed tool names (None = all allowed)
@@ -151,18 +275,29 @@ class MCPRegistry:
         >>> registry = MCPRegistry()
         >>> registry.register(tool_descriptor)
         >>> result = registry.call("tool_name", {"param": "value"})
+        >>> result = await registry.acall("tool_name", {"param": "value"})
     """
 
-    def __init__(self, allowlist: Optional[list[str]] = None):
+    def __init__(self, allowlist: Optional[list[str]] = None, max_workers: Optional[int] = None):
         """
         Initialize the MCP registry.
 
         Args:
             allowlist: Optional list of allowed tool names. If provided,
                 only tools in this list can be registered and called.
+            max_workers: Threads for sync handlers called through ``acall``
+                or with a timeout (default: ``ThreadPoolExecutor``'s default)
         """
         self._tools: dict[str, MCPToolDescriptor] = {}
+        self._limiters: dict[str, ToolLimiter] = {}
+        self._caches: dict[str, ToolResultCache] = {}
+        # Public views in registration order, and tag -> {tool name: view}
+        self._views: dict[str, MCPTool] = {}
+        self._tag_index: dict[str, dict[str, MCPTool]] = {}
         self._allowlist: Optional[set[str]] = set(allowlist) if allowlist else None
+        self._lock = threading.RLock()
+        self._max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
 
     def register(self, descriptor: MCPToolDescriptor) -> None:
         """
@@ -173,45 +308,117 @@ class MCPRegistry:
 
         Raises:
             ToolRegistrationError: If tool name is invalid, already registered,
-                or not in allowlist
+                not in allowlist, its input schema is malformed, or its
+                concurrency limit or timeout is not positive
         """
         # Validate tool name
         if not descriptor.name or not descriptor.name.strip():
             raise ToolRegistrationError("Tool name cannot be empty")
 
-        # Check if already registered
-        if descriptor.name in self._tools:
-            raise ToolRegistrationError(f"Tool '{descriptor.name}' is already registered")
-
-        # Check allowlist
-        if self._allowlist is not None and descriptor.name not in self._allowlist:
-            raise ToolRegistrationError(f"Tool '{descriptor.name}' is not in the allowlist")
-
-        # Register the tool
-        self._tools[descriptor.name] = descriptor
+        if descriptor.max_concurrency is not None and descriptor.max_concurrency < 1:
+            raise ToolRegistrationError(f"Tool '{descriptor.name}' max_concurrency must be at least 1")
+        if descriptor.timeout is not None and descriptor.timeout <= 0:
+            raise ToolRegistrationError(f"Tool '{descriptor.name}' timeout must be positive")
+        descriptor.compile_validator()
+
+        with self._lock:
+            # Check if already registered
+            if descriptor.name in self._tools:
+                raise ToolRegistrationError(f"Tool '{descriptor.name}' is already registered")
+
+            # Check allowlist
+            if self._allowlist is not None and descriptor.name not in self._allowlist:
+                raise ToolRegistrationError(f"Tool '{descriptor.name}' is not in the allowlist")
+
+            # Register the tool
+            self._tools[descriptor.name] = descriptor
+            if descriptor.max_concurrency is not None:
+                self._limiters[descriptor.name] = ToolLimiter(descriptor.max_concurrency)
+            if descriptor.cache is not None:
+                self._caches[descriptor.name] = ToolResultCache(descriptor.cache)
+            view = _public_view(descriptor)
+            self._views[descriptor.name] = view
+            for tag in view.tags:
+                self._tag_index.setdefault(tag, {})[descriptor.name] = view
 
     def unregister(self, tool_name: str) -> None:
         """
         Unregister a tool from the registry.
 
+        Calls already in progress finish normally.
+
         Args:
             tool_name: Name of tool to unregister
 
         Raises:
             ToolNotFoundError: If tool is not registered
         """
-        if tool_name not in self._tools:
-            raise ToolNotFoundError(f"Tool '{tool_name}' is not registered")
-
-        del self._tools[tool_name]
+        with self._lock:
+            if tool_name not in self._tools:
+                raise ToolNotFoundError(f"Tool '{tool_name}' is not registered")
+
+            del self._tools[tool_name]
+            self._limiters.pop(tool_name, None)
+            self._caches.pop(tool_name, None)
+            for tag in self._views.pop(tool_name).tags:
+                tagged = self._tag_index[tag]
+                del tagged[tool_name]
+                if not tagged:
+                    del self._tag_index[tag]
+
+    def _resolve(self, tool_name: str) -> tuple[MCPToolDescriptor, Optional[ToolLimiter], Optional[ToolResultCache]]:
+        """Return a tool's descriptor, concurrency limiter and result cache, or raise ToolNotFoundError."""
+        with self._lock:
+            descriptor = self._tools.get(tool_name)
+            if descriptor is None:
+                raise ToolNotFoundError(
+                    f"Tool '{tool_name}' not found. " f"Available tools: {', '.join(self._tools.keys())}"
+                )
+            return descriptor, self._limiters.get(tool_name), self._caches.get(tool_name)
+
+    def _completed(
+        self,
+        descriptor: MCPToolDescriptor,
+        cache: Optional[ToolResultCache],
+        key: Hashable,
+        generation: int,
+        result: Any,
+    ) -> None:
+        """Store a successful result and run the tool's invalidation hooks."""
+        if cache is not None:
+            cache.put(key, result, generation)
+        for name in descriptor.invalidates:
+            with self._lock:
+                target = self._caches.get(name)
+            if target is not None:
+                target.clear()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix="nuaa-mcp")
+            return self._executor
+
+    @staticmethod
+    def _run_handler(descriptor: MCPToolDescriptor, inputs: dict[str, Any]) -> Any:
+        """Run a handler to completion in the current thread."""
+        try:
+            result = descriptor.handler(inputs)
+            if inspect.isawaitable(result):
+                # Async handler called from sync code: run it on a private loop
+                result = asyncio.run(_await(result))
+            return result
+        except Exception as e:
+            raise ToolExecutionError(f"Tool '{descriptor.name}' execution failed: {str(e)}") from e
 
-    def call(self, tool_name: str, inputs: dict[str, Any]) -> Any:
+    def call(self, tool_name: str, inputs: dict[str, Any], timeout: Optional[float] = None) -> Any:
         """
         Call a registered tool with the provided inputs.
 
         Args:
             tool_name: Name of tool to call
             inputs: Dictionary of input parameters
+            timeout: Override the tool's ``timeout`` for this call
 
         Returns:
             Tool execution result
@@ -220,27 +427,145 @@ class MCPRegistry:
             ToolNotFoundError: If tool is not registered
             ToolValidationError: If input validation fails
             ToolExecutionError: If tool execution fails
+            ToolTimeoutError: If the call exceeds its timeout
         """
-        # Check if tool exists
-        if tool_name not in self._tools:
-            raise ToolNotFoundError(
-                f"Tool '{tool_name}' not found. "
-                f"Available tools: {', '.join(self._tools.keys())}"
-            )
-
-        descriptor = self._tools[tool_name]
+        descriptor, limiter, cache = self._resolve(tool_name)
 
         # Validate inputs
+        descriptor.validate_inputs(inputs)
+
+        key, generation = None, 0
+        if cache is not None:
+            key, generation = cache.key_for(inputs), cache.generation
+            hit, result = cache.get(key)
+            if hit:
+                return result
+
+        timeout = descriptor.timeout if timeout is None else timeout
+        result = self._call_handler(descriptor, limiter, inputs, timeout)
+        self._completed(descriptor, cache, key, generation, result)
+        return result
+
+    def _call_handler(
+        self,
+        descriptor: MCPToolDescriptor,
+        limiter: Optional[ToolLimiter],
+        inputs: dict[str, Any],
+        timeout: Optional[float],
+    ) -> Any:
+        """Run a handler for ``call()``, honouring its concurrency limit and timeout."""
+        tool_name = descriptor.name
+        if timeout is None:
+            # Execute tool in the calling thread
+            if limiter is not None:
+                limiter.acquire()
+            try:
+                return self._run_handler(descriptor, inputs)
+            finally:
+                if limiter is not None:
+                    limiter.release()
+
+        deadline = time.monotonic() + timeout
+        if limiter is not None and not limiter.acquire(timeout):
+            raise ToolTimeoutError(f"Tool '{tool_name}' timed out after {timeout}s waiting for a free slot")
+        try:
+            future = self._get_executor().submit(self._run_handler, descriptor, inputs)
+        except BaseException:
+            if limiter is not None:
+                limiter.release()
+            raise
+        if limiter is not None:
+            # Released when the handler actually returns, even after a timeout
+            future.add_done_callback(lambda _: limiter.release())
         try:
-            descriptor.validate_inputs(inputs)
-        except ToolValidationError:
-            raise  # Re-raise validation errors as-is
+            return future.result(timeout=max(0.0, deadline - time.monotonic()))
+        except FutureTimeoutError:
+            raise ToolTimeoutError(f"Tool '{tool_name}' timed out after {timeout}s") from None
+
+    async def acall(self, tool_name: str, inputs: dict[str, Any], timeout: Optional[float] = None) -> Any:
+        """
+        Call a registered tool from asyncio without blocking the event loop.
+
+        Async handlers are awaited on the running loop; sync handlers run on
+        the registry's thread pool.
+
+        Args:
+            tool_name: Name of tool to call
+            inputs: Dictionary of input parameters
+            timeout: Override the tool's ``timeout`` for this call
+
+        Returns:
+            Tool execution result
+
+        Raises:
+            ToolNotFoundError: If tool is not registered
+            ToolValidationError: If input validation fails
+            ToolExecutionError: If tool execution fails
+            ToolTimeoutError: If the call exceeds its timeout
+        """
+        descriptor, limiter, cache = self._resolve(tool_name)
+        descriptor.validate_inputs(inputs)
+
+        key, generation = None, 0
+        if cache is not None:
+            key, generation = cache.key_for(inputs), cache.generation
+            hit, result = cache.get(key)
+            if hit:
+                return result
 
-        # Execute tool
+        timeout = descriptor.timeout if timeout is None else timeout
         try:
-            return descriptor.handler(inputs)
-        except Exception as e:
-            raise ToolExecutionError(f"Tool '{tool_name}' execution failed: {str(e)}") from e
+            result = await asyncio.wait_for(self._execute_async(descriptor, limiter, inputs), timeout)
+        except asyncio.TimeoutError:
+            raise ToolTimeoutError(f"Tool '{tool_name}' timed out after {timeout}s") from None
+        self._completed(descriptor, cache, key, generation, result)
+        return result
+
+    async def _execute_async(
+        self, descriptor: MCPToolDescriptor, limiter: Optional[ToolLimiter], inputs: dict[str, Any]
+    ) -> Any:
+        if limiter is not None:
+            await limiter.acquire_async()
+        handed_off = False
+        try:
+            if inspect.iscoroutinefunction(descriptor.handler):
+                try:
+                    return await descriptor.handler(inputs)
+                except Exception as e:
+                    raise ToolExecutionError(f"Tool '{descriptor.name}' execution failed: {str(e)}") from e
+
+            future = self._get_executor().submit(self._run_handler, descriptor, inputs)
+            if limiter is not None:
+                # Released when the handler actually returns, even after a timeout
+                future.add_done_callback(lambda _: limiter.release())
+                handed_off = True
+            return await asyncio.wrap_future(future)
+        finally:
+            if limiter is not None and not handed_off:
+                limiter.release()
+
+    async def call_many(
+        self,
+        calls: Iterable[tuple[str, dict[str, Any]]],
+        return_exceptions: bool = False,
+        timeout: Optional[float] = None,
+    ) -> list[Any]:
+        """
+        Run independent tool calls concurrently.
+
+        Args:
+            calls: ``(tool_name, inputs)`` pairs
+            return_exceptions: Put exceptions in the result list instead of
+                raising the first one
+            timeout: Per-call timeout overriding each tool's ``timeout``
+
+        Returns:
+            Results in the order of ``calls``
+        """
+        return await asyncio.gather(
+            *(self.acall(tool_name, inputs, timeout=timeout) for tool_name, inputs in calls),
+            return_exceptions=return_exceptions,
+        )
 
     def validate(self, tool_name: str, inputs: dict[str, Any]) -> bool:
         """
@@ -257,10 +582,11 @@ class MCPRegistry:
             ToolNotFoundError: If tool is not registered
             ToolValidationError: If validation fails
         """
-        if tool_name not in self._tools:
+        with self._lock:
+            descriptor = self._tools.get(tool_name)
+        if descriptor is None:
             raise ToolNotFoundError(f"Tool '{tool_name}' is not registered")
 
-        descriptor = self._tools[tool_name]
         descriptor.validate_inputs(inputs)
         return True
 
@@ -272,25 +598,13 @@ class MCPRegistry:
             tag: Optional tag to filter tools by
 
         Returns:
-            List of MCPTool objects (read-only views without handlers)
+            List of MCPTool objects (read-only views without handlers), in
+            registration order
         """
-        tools = []
-        for descriptor in self._tools.values():
-            # Filter by tag if specified
-            if tag and tag not in descriptor.tags:
-                continue
-
-            tools.append(
-                MCPTool(
-                    name=descriptor.name,
-                    description=descriptor.description,
-                    input_schema=descriptor.input_schema,
-                    output_schema=descriptor.output_schema,
-                    requires_confirmation=descriptor.requires_confirmation,
-                    tags=descriptor.tags,
-                )
-            )
-        return tools
+        with self._lock:
+            if not tag:
+                return list(self._views.values())
+            return list(self._tag_index.get(tag, {}).values())
 
     def has_tool(self, tool_name: str) -> bool:
         """
@@ -302,7 +616,8 @@ class MCPRegistry:
         Returns:
             True if tool is registered, False otherwise
         """
-        return tool_name in self._tools
+        with self._lock:
+            return tool_name in self._tools
 
     def get_tool_info(self, tool_name: str) -> MCPTool:
         """
@@ -317,23 +632,83 @@ class MCPRegistry:
         Raises:
             ToolNotFoundError: If tool is not registered
         """
-        if tool_name not in self._tools:
+        with self._lock:
+            view = self._views.get(tool_name)
+            cache = self._caches.get(tool_name)
+        if view is None:
             raise ToolNotFoundError(f"Tool '{tool_name}' is not registered")
 
-        descriptor = self._tools[tool_name]
-        return MCPTool(
-            name=descriptor.name,
-            description=descriptor.description,
-            input_schema=descriptor.input_schema,
-            output_schema=descriptor.output_schema,
-            requires_confirmation=descriptor.requires_confirmation,
-            tags=descriptor.tags,
-        )
+        if cache is not None:
+            return dataclasses.replace(view, cache_stats=cache.stats())
+        return view
+
+    def invalidate(self, tool_name: Optional[str] = None, inputs: Optional[dict[str, Any]] = None) -> int:
+        """
+        Discard cached results.
+
+        Args:
+            tool_name: Tool whose results to discard (None = every cached tool)
+            inputs: Discard only the result for these inputs
+
+        Returns:
+            Number of cached results removed
+
+        Raises:
+            ToolNotFoundError: If tool is not registered
+        """
+        with self._lock:
+            if tool_name is None:
+                caches = list(self._caches.values())
+            elif tool_name not in self._tools:
+                raise ToolNotFoundError(f"Tool '{tool_name}' is not registered")
+            else:
+                caches = [self._caches[tool_name]] if tool_name in self._caches else []
+
+        if inputs is None:
+            return sum(cache.clear() for cache in caches)
+        return sum(cache.invalidate(cache.key_for(inputs)) for cache in caches)
 
     def clear(self) -> None:
         """Clear all registered tools from the registry."""
-        self._tools.clear()
+        with self._lock:
+            self._tools.clear()
+            self._limiters.clear()
+            self._caches.clear()
+            self._views.clear()
+            self._tag_index.clear()
 
     def count(self) -> int:
         """Return the number of registered tools."""
-        return len(self._tools)
+        with self._lock:
+            return len(self._tools)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Stop the thread pool used for sync handlers.
+
+        The registry stays usable; a new pool is started when needed.
+
+        Args:
+            wait: Wait for running handlers to finish
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+
+def _public_view(descriptor: MCPToolDescriptor) -> MCPTool:
+    """Build the immutable, handler-free view of a descriptor."""
+    output_schema = descriptor.output_schema
+    return MCPTool(
+        name=descriptor.name,
+        description=descriptor.description,
+        input_schema=_ReadOnlyDict(descriptor.input_schema),
+        output_schema=_ReadOnlyDict(output_schema) if output_schema is not None else None,
+        requires_confirmation=descriptor.requires_confirmation,
+        tags=_ReadOnlyList(descriptor.tags),
+    )
+
+
+async def _await(awaitable: Awaitable[Any]) -> Any:
+    return await awaitable
@@ -0,0 +1,406 @@
+#!/usr/bin/env python3
+"""
+MCP Input Schema Compiler
+=========================
+
+Turns a tool's ``input_schema`` into a validator function once, when the
+tool is registered, so a call only runs the checks the schema needs: no
+per-call set arithmetic over parameter names and no schema walking.
+
+Two schema styles are accepted, and may be mixed:
+
+- Flat Python types, as before: ``{"query": str, "limit": int}``. Every
+  parameter is required, no others are allowed and values are checked with
+  ``isinstance``.
+- JSON-Schema-style definitions, in the draft-07 subset used by
+  ``nuaa-kit/commands/schema.json``: ``type`` (a name or list of names),
+  ``properties``, ``required``, ``additionalProperties``, ``items``,
+  ``minItems``/``maxItems``/``uniqueItems``, ``enum``, ``const``,
+  ``minimum``/``maximum``/``exclusiveMinimum``/``exclusiveMaximum`` and
+  ``minLength``/``maxLength``/``pattern``. Annotations such as ``title``,
+  ``description`` and ``default`` are ignored. A whole ``input_schema`` in
+  this style must be ``"type": "object"``; a flat schema may also use a
+  JSON-style definition for an individual parameter.
+
+As in JSON Schema, ``integer`` and ``number`` do not accept booleans, and
+objects allow properties not listed in ``properties`` unless
+``additionalProperties`` is false.
+
+Example:
+    >>> validate = compile_schema(
+    ...     {
+    ...         "type": "object",
+    ...         "properties": {
+    ...             "format": {"enum": ["professional", "peer-friendly"]},
+    ...             "limit": {"type": "integer", "minimum": 1, "maximum": 50},
+    ...             "tags": {"type": "array", "items": {"type": "string"}},
+    ...         },
+    ...         "required": ["format"],
+    ...         "additionalProperties": False,
+    ...     },
+    ...     tool_name="search",
+    ... )
+    >>> validate({"format": "professional", "limit": 10})
+    >>> validate({"format": "casual"})
+    Traceback (most recent call last):
+    ...
+    ToolValidationError: Parameter 'format' for tool 'search' must be one of: professional, peer-friendly
+"""
+
+import re
+from typing import Any, Callable, Optional
+
+from .exceptions import ToolRegistrationError, ToolValidationError
+
+Validator = Callable[[Any], None]
+
+# JSON Schema type names and the Python types that satisfy them
+JSON_TYPES: dict[str, tuple[type, ...]] = {
+    "string": (str,),
+    "integer": (int,),
+    "number": (int, float),
+    "boolean": (bool,),
+    "array": (list, tuple),
+    "object": (dict,),
+    "null": (type(None),),
+}
+
+# Failure kinds carried by _Invalid
+_TYPE = "type"
+_MISSING = "missing"
+_EXTRA = "extra"
+_CONSTRAINT = "constraint"
+
+
+class _Invalid(Exception):
+    """
+    Raised inside compiled validators; turned into a ToolValidationError.
+
+    ``path`` collects property names and array indexes innermost first as
+    the exception propagates, so successful calls never build paths.
+    """
+
+    def __init__(self, kind: str, detail: Any, *path: Any):
+        self.kind = kind
+        self.detail = detail
+        self.path = list(path)
+
+
+class _Node:
+    """A compiled schema: a type test plus an optional check for everything else."""
+
+    __slots__ = ("types", "reject_bool", "expected", "check")
+
+    def __init__(
+        self,
+        types: Optional[tuple[type, ...]],
+        reject_bool: bool,
+        expected: str,
+        check: Optional[Validator],
+    ):
+        self.types = types
+        self.reject_bool = reject_bool
+        self.expected = expected
+        self.check = check
+
+
+def compile_schema(schema: Any, tool_name: str) -> Validator:
+    """
+    Compile a tool's input schema into a validator.
+
+    Args:
+        schema: Flat ``{name: type}`` mapping or JSON-Schema-style object schema
+        tool_name: Tool name used in error messages
+
+    Returns:
+        Function that takes the call inputs and raises ToolValidationError
+        if they do not match
+
+    Raises:
+        ToolRegistrationError: If the schema is malformed
+    """
+    if not isinstance(schema, dict):
+        raise ToolRegistrationError(f"Tool '{tool_name}' input_schema must be a dict, got {type(schema).__name__}")
+    try:
+        if isinstance(schema.get("type"), (str, list)):
+            node = _compile(schema, "input_schema")
+            if node.types != JSON_TYPES["object"]:
+                raise ValueError('input_schema: top-level "type" must be "object"')
+        else:
+            node = _compile(
+                {"properties": schema, "required": list(schema), "additionalProperties": False},
+                "input_schema",
+            )
+    except (ValueError, TypeError, re.error) as e:
+        raise ToolRegistrationError(f"Tool '{tool_name}' has an invalid {e}") from e
+
+    check = node.check
+
+    def validate(inputs: Any) -> None:
+        if not isinstance(inputs, dict):
+            raise ToolValidationError(f"Inputs for tool '{tool_name}' must be a dict, got {type(inputs).__name__}")
+        if check is None:
+            return
+        try:
+            check(inputs)
+        except _Invalid as e:
+            raise ToolValidationError(_message(e, tool_name)) from None
+
+    return validate
+
+
+def _message(error: _Invalid, tool_name: str) -> str:
+    path = ""
+    for part in reversed(error.path):
+        if isinstance(part, int):
+            path += f"[{part}]"
+        else:
+            path += f".{part}" if path else part
+    if error.kind in (_MISSING, _EXTRA):
+        names = ", ".join(f"{path}.{name}" if path else name for name in error.detail)
+        label = "Missing required" if error.kind == _MISSING else "Unexpected"
+        return f"{label} parameters for tool '{tool_name}': {names}"
+    subject = f"Parameter '{path}' for tool '{tool_name}'" if path else f"Inputs for tool '{tool_name}'"
+    if error.kind == _TYPE:
+        expected, got = error.detail
+        return f"{subject} expected {expected}, got {got}"
+    return f"{subject} {error.detail}"
+
+
+def _compile(schema: Any, where: str) -> _Node:
+    """Compile one schema (a Python type, tuple of types or JSON-style dict)."""
+    if isinstance(schema, type):
+        return _Node((schema,), False, schema.__name__, None)
+    if isinstance(schema, tuple) and schema and all(isinstance(t, type) for t in schema):
+        return _Node(schema, False, " or ".join(t.__name__ for t in schema), None)
+    if not isinstance(schema, dict):
+        raise ValueError(f"{where}: expected a type or a schema object, got {type(schema).__name__}")
+
+    types: Optional[tuple[type, ...]] = None
+    reject_bool = False
+    expected = ""
+    declared = schema.get("type")
+    if declared is not None:
+        names = [declared] if isinstance(declared, str) else declared
+        if not isinstance(names, list) or not names or any(name not in JSON_TYPES for name in names):
+            raise ValueError(f"{where}: unsupported type {declared!r}")
+        types = tuple(dict.fromkeys(t for name in names for t in JSON_TYPES[name]))
+        reject_bool = "boolean" not in names
+        expected = " or ".join(names)
+
+    checks = [
+        check
+        for check in (
+            _enum_check(schema, where),
+            _number_check(schema, where),
+            _string_check(schema, where),
+            _array_check(schema, where),
+            _object_check(schema, where),
+        )
+        if check is not None
+    ]
+    if not checks:
+        check = None
+    elif len(checks) == 1:
+        check = checks[0]
+    else:
+
+        def check(value: Any, checks: tuple[Validator, ...] = tuple(checks)) -> None:
+            for each in checks:
+                each(value)
+
+    return _Node(types, reject_bool, expected, check)
+
+
+def _run(node: _Node, value: Any, part: Any) -> None:
+    """Validate ``value`` against ``node``, labelling failures with ``part``."""
+    if node.types is not None and (not isinstance(value, node.types) or (node.reject_bool and isinstance(value, bool))):
+        raise _Invalid(_TYPE, (node.expected, type(value).__name__), part)
+    if node.check is not None:
+        try:
+            node.check(value)
+        except _Invalid as e:
+            e.path.append(part)
+            raise
+
+
+def _enum_check(schema: dict, where: str) -> Optional[Validator]:
+    if "const" in schema:
+        options = [schema["const"]]
+    elif "enum" in schema:
+        options = schema["enum"]
+        if not isinstance(options, list) or not options:
+            raise ValueError(f"{where}: enum must be a non-empty list")
+    else:
+        return None
+
+    message = f"must be one of: {', '.join(str(option) for option in options)}"
+    if len(options) == 1:
+        message = f"must be {options[0]}"
+    try:
+        allowed: Any = frozenset(options)
+    except TypeError:
+        allowed = options  # Unhashable options (lists, dicts): compare one by one
+
+    def check(value: Any) -> None:
+        try:
+            if value in allowed:
+                return
+        except TypeError:
+            pass  # Unhashable value: cannot be in a set of hashable options
+        raise _Invalid(_CONSTRAINT, message)
+
+    return check
+
+
+def _number_check(schema: dict, where: str) -> Optional[Validator]:
+    bounds = []
+    for keyword, test, text in (
+        ("minimum", lambda v, b: v >= b, ">="),
+        ("maximum", lambda v, b: v <= b, "<="),
+        ("exclusiveMinimum", lambda v, b: v > b, ">"),
+        ("exclusiveMaximum", lambda v, b: v < b, "<"),
+    ):
+        if keyword in schema:
+            bound = schema[keyword]
+            if isinstance(bound, bool) or not isinstance(bound, (int, float)):
+                raise ValueError(f"{where}: {keyword} must be a number")
+            bounds.append((test, bound, f"must be {text} {bound}"))
+    if not bounds:
+        return None
+
+    def check(value: Any) -> None:
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            for test, bound, message in bounds:
+                if not test(value, bound):
+                    raise _Invalid(_CONSTRAINT, message)
+
+    return check
+
+
+def _string_check(schema: dict, where: str) -> Optional[Validator]:
+    min_length = _count(schema, "minLength", where)
+    max_length = _count(schema, "maxLength", where)
+    pattern = re.compile(schema["pattern"]) if "pattern" in schema else None
+    if min_length is None and max_length is None and pattern is None:
+        return None
+
+    def check(value: Any) -> None:
+        if not isinstance(value, str):
+            return
+        if min_length is not None and len(value) < min_length:
+            raise _Invalid(_CONSTRAINT, f"must be at least {min_length} characters")
+        if max_length is not None and len(value) > max_length:
+            raise _Invalid(_CONSTRAINT, f"must be at most {max_length} characters")
+        if pattern is not None and not pattern.search(value):
+            raise _Invalid(_CONSTRAINT, f"must match pattern {pattern.pattern!r}")
+
+    return check
+
+
+def _array_check(schema: dict, where: str) -> Optional[Validator]:
+    items = schema.get("items")
+    if items is not None and not isinstance(items, (dict, type)):
+        raise ValueError(f"{where}: items must be a single schema")
+    node = _compile(items, f"{where}.items") if items is not None else None
+    min_items = _count(schema, "minItems", where)
+    max_items = _count(schema, "maxItems", where)
+    unique = bool(schema.get("uniqueItems"))
+    if node is None and min_items is None and max_items is None and not unique:
+        return None
+
+    def check(value: Any) -> None:
+        if not isinstance(value, (list, tuple)):
+            return
+        if min_items is not None and len(value) < min_items:
+            raise _Invalid(_CONSTRAINT, f"must have at least {min_items} items")
+        if max_items is not None and len(value) > max_items:
+            raise _Invalid(_CONSTRAINT, f"must have at most {max_items} items")
+        if unique and not _all_unique(value):
+            raise _Invalid(_CONSTRAINT, "must not contain duplicate items")
+        if node is not None:
+            for index, item in enumerate(value):
+                _run(node, item, index)
+
+    return check
+
+
+def _object_check(schema: dict, where: str) -> Optional[Validator]:
+    properties = schema.get("properties", {})
+    required = schema.get("required", [])
+    additional = schema.get("additionalProperties", True)
+    if not isinstance(properties, dict):
+        raise ValueError(f"{where}: properties must be an object")
+    if not isinstance(required, list) or not all(isinstance(name, str) for name in required):
+        raise ValueError(f"{where}: required must be a list of names")
+    if not isinstance(additional, (bool, dict)):
+        raise ValueError(f"{where}: additionalProperties must be a boolean or a schema")
+    if not properties and not required and additional is True:
+        return None
+
+    nodes = {name: _compile(sub, f"{where}.{name}") for name, sub in properties.items()}
+    required_names = frozenset(required)
+    known = frozenset(properties)
+    closed = additional is False
+    extra_node = _compile(additional, f"{where}.additionalProperties") if isinstance(additional, dict) else None
+    # Required properties are known to be present once the key check passes.
+    # Those needing only an isinstance test (every flat schema parameter) are
+    # checked inline, without a call per property.
+    present = [(name, nodes[name]) for name in dict.fromkeys(required) if name in nodes]
+    simple = tuple((name, node.types) for name, node in present if _is_simple(node) and node.types is not None)
+    present = tuple((name, node) for name, node in present if not _is_simple(node))
+    optional = tuple((name, node) for name, node in nodes.items() if name not in required_names)
+    exact = closed and required_names == known
+
+    def key_error(keys: Any) -> _Invalid:
+        missing = [name for name in dict.fromkeys(required) if name not in keys]
+        if missing:
+            return _Invalid(_MISSING, missing)
+        return _Invalid(_EXTRA, [str(name) for name in keys if name not in known])
+
+    def check(value: Any) -> None:
+        if not isinstance(value, dict):
+            return
+        keys = value.keys()
+        if exact:
+            if keys != known:
+                raise key_error(keys)
+        elif not keys >= required_names or (closed and not keys <= known):
+            raise key_error(keys)
+        for name, types in simple:
+            if not isinstance(value[name], types):
+                _run(nodes[name], value[name], name)  # Raises the type error
+        for name, node in present:
+            _run(node, value[name], name)
+        for name, node in optional:
+            if name in value:
+                _run(node, value[name], name)
+        if extra_node is not None:
+            for name in keys - known:
+                _run(extra_node, value[name], name)
+
+    return check
+
+
+def _is_simple(node: _Node) -> bool:
+    """True if ``node`` is at most a plain isinstance test."""
+    return node.check is None and not node.reject_bool
+
+
+def _count(schema: dict, keyword: str, where: str) -> Optional[int]:
+    value = schema.get(keyword)
+    if value is not None and (isinstance(value, bool) or not isinstance(value, int) or value < 0):
+        raise ValueError(f"{where}: {keyword} must be a non-negative integer")
+    return value
+
+
+def _all_unique(values: Any) -> bool:
+    try:
+        return len(set(values)) == len(values)
+    except TypeError:
+        seen: list[Any] = []
+        for value in values:
+            if value in seen:
+                return False
+            seen.append(value)
+        return True
@@ -11,6 +11,7 @@ Functions:
     _next_feature_dir: Generate next feature directory
     _find_feature_dir_by_program: Find existing feature directory
     _load_template: Load template file
+    _render_template: Load a template and fill its placeholders
     _apply_replacements: Apply template variable replacements
     _prepend_metadata: Add YAML metadata to documents
     _write_markdown: Write markdown file
@@ -20,9 +21,14 @@ Functions:
 """
 
 import re
+import sqlite3
 from datetime import datetime
 from pathlib import Path
 
+from .feature_index import FeatureIndex
+from .template_engine import RenderResult, render_template
+from .template_registry import get_template_registry
+
 
 def _slugify(text: str) -> str:
     """
@@ -107,9 +113,11 @@ def _next_feature_dir(program_name: str, root: Path | None = None) -> tuple[Path
     """
     Compute next feature directory and return (path, num_str, slug).
 
-    This function implements atomic directory creation to prevent race conditions
-    when multiple processes try to create directories simultaneously. It will retry
-    up to 100 times if a directory already exists.
+    Numbers are allocated through the on-disk ``FeatureIndex`` under an
+    exclusive lock, so concurrent processes receive distinct directories
+    without rescanning ``nuaa/``. If the index cannot be used (e.g. read-only
+    project), this falls back to scanning the directory with atomic ``mkdir``
+    retries (up to 100 attempts).
 
     Args:
         program_name: Name of the program for slugification
@@ -124,6 +132,13 @@ def _next_feature_dir(program_name: str, root: Path | None = None) -> tuple[Path
     nuaa_root = _ensure_nuaa_root(root)
     slug = _slugify(program_name)
 
+    try:
+        feature_dir, num_str = FeatureIndex(nuaa_root).allocate(slug)
+        return feature_dir, num_str, slug
+    except (sqlite3.Error, OSError):
+        # Index unavailable (locked too long, read-only, corrupt); scan instead
+        pass
+
     # Maximum retries to prevent infinite loops
     max_retries = 100
 
@@ -132,7 +147,7 @@ def _next_feature_dir(program_name: str, root: Path | None = None) -> tuple[Path
         highest = 0
         for child in nuaa_root.iterdir() if nuaa_root.exists() else []:
             if child.is_dir():
-                m = re.match(r"^(\d{3})-", child.name)
+                m = re.match(r"^(\d{3,})-", child.name)
                 if m:
                     try:
                         highest = max(highest, int(m.group(1)))
@@ -159,50 +174,74 @@ def _next_feature_dir(program_name: str, root: Path | None = None) -> tuple[Path
 
 
 def _find_feature_dir_by_program(program_name: str, root: Path | None = None) -> Path | None:
-    """Find an existing feature dir whose slug starts with the program slug."""
+    """
+    Find an existing feature dir for the program slug.
+
+    Prefers a directory named ``NNN-<slug>``, then any whose name contains
+    ``-<slug>`` on word boundaries. Looks the slug up in the
+    ``FeatureIndex``; falls back to scanning ``nuaa/`` if the index cannot
+    be used.
+    """
     nuaa_root = _ensure_nuaa_root(root)
     slug = _slugify(program_name)
-    for child in sorted(nuaa_root.iterdir()) if nuaa_root.exists() else []:
-        pattern = rf"-\b{re.escape(slug)}\b"
-        if child.is_dir() and re.search(pattern, child.name):
+    try:
+        return FeatureIndex(nuaa_root).find(slug)
+    except (sqlite3.Error, OSError):
+        pass
+    children = [child for child in sorted(nuaa_root.iterdir()) if child.is_dir()] if nuaa_root.exists() else []
+    for child in children:
+        m = re.match(r"^\d{3,}-(.*)$", child.name)
+        if m and m.group(1) == slug:
+            return child
+    pattern = re.compile(rf"-\b{re.escape(slug)}\b")
+    for child in children:
+        if pattern.search(child.name):
             return child
     return None
 
 
 def _load_template(name: str) -> str:
-    """Load a template file from the discovered NUAA templates directory."""
-    templates_root = _find_templates_root()
-    path = templates_root / name
-    if not path.exists():
-        raise FileNotFoundError(f"Template not found: {name}")
-    return path.read_text(encoding="utf-8")
+    """
+    Load a template file from the discovered NUAA templates directory.
+
+    Templates are served from the process-wide ``TemplateRegistry``, which
+    remembers the templates root and re-reads a file only when it changes.
+    """
+    return get_template_registry().load(name)
+
+
+def _render_template(name: str, mapping: dict[str, str]) -> RenderResult:
+    """
+    Load template ``name`` and fill its placeholders.
+
+    Uses the compiled form cached alongside the template in the registry.
+    The result also lists placeholders with no value and unused mapping keys.
+    """
+    return render_template(get_template_registry().get(name).compiled, mapping)
 
 
 def _apply_replacements(text: str, mapping: dict[str, str]) -> str:
-    """Apply placeholder replacements for [Placeholders] and {{TOKENS}}."""
-    out = text
-    # Bracket placeholders used in templates
-    bracket_map = {
-        "[Name]": mapping.get("PROGRAM_NAME", ""),
-        "[Description]": mapping.get("TARGET_POPULATION", ""),
-        "[Timeframe]": mapping.get("DURATION", ""),
-        "[Date]": mapping.get("DATE", datetime.now().strftime("%Y-%m-%d")),
-    }
-    for k, v in bracket_map.items():
-        out = out.replace(k, v)
-    # Curly token replacements
-    for k, v in mapping.items():
-        out = out.replace(f"{{{{{k}}}}}", v)
-    return out
+    """
+    Apply placeholder replacements for [Placeholders] and {{TOKENS}}.
 
+    The template is compiled once (see ``template_engine.compile_template``)
+    and rendered in a single pass.
+    """
+    return render_template(text, mapping).text
 
-def _prepend_metadata(text: str, metadata: dict[str, str]) -> str:
-    """Prepend a YAML-style metadata block to markdown text."""
+
+def _metadata_header(metadata: dict[str, str]) -> str:
+    """Return the YAML-style metadata block that ``_prepend_metadata`` adds."""
     lines = ["---"]
     for k, v in metadata.items():
         lines.append(f"{k}: {v}")
     lines.append("---\n")
-    return "\n".join(lines) + text
+    return "\n".join(lines)
+
+
+def _prepend_metadata(text: str, metadata: dict[str, str]) -> str:
+    """Prepend a YAML-style metadata block to markdown text."""
+    return _metadata_header(metadata) + text
 
 
 def _write_markdown(path: Path, content: str) -> None:
@@ -0,0 +1,182 @@
+"""
+Compiled placeholder engine for NUAA templates.
+
+Templates use two kinds of placeholders:
+
+- Bracket placeholders: ``[Name]``, ``[Description]``, ``[Timeframe]``, ``[Date]``
+- Curly tokens: ``{{PROGRAM_NAME}}``, ``{{FUNDER}}``, ...
+
+The original implementation ran one ``str.replace`` over the whole document
+per placeholder. Here a template is tokenised once into literal and
+placeholder segments (``compile_template``, cached), and rendering fills the
+slots and joins the parts in a single pass. Placeholders with no value and
+mapping keys the template never uses are reported with the rendered text.
+
+Example:
+    >>> result = render_template("# [Name] ({{FUNDER}})", {"PROGRAM_NAME": "Peer Support"})
+    >>> result.text
+    '# Peer Support ({{FUNDER}})'
+    >>> result.missing
+    frozenset({'{{FUNDER}}'})
+"""
+
+import re
+from dataclasses import dataclass
+from datetime import datetime
+from functools import lru_cache
+from typing import Mapping
+
+# Bracket placeholder -> mapping key that fills it
+BRACKET_PLACEHOLDERS: dict[str, str] = {
+    "[Name]": "PROGRAM_NAME",
+    "[Description]": "TARGET_POPULATION",
+    "[Timeframe]": "DURATION",
+    "[Date]": "DATE",
+}
+_BRACKET_BY_KEY = {key: placeholder for placeholder, key in BRACKET_PLACEHOLDERS.items()}
+
+_TOKEN_RE = re.compile(r"\[(?:Name|Description|Timeframe|Date)\]|\{\{([^{}\[\]]+)\}\}")
+
+# A bracket placeholder inside a {{...}} span: the sequential replace order matters.
+# Runs of three or more braces around a token can likewise form new tokens.
+_NESTED_RE = re.compile(r"\{\{[^{}]*\[(?:Name|Description|Timeframe|Date)\][^{}]*\}\}")
+
+# A bracket placeholder inside an unclosed [...] span: its value can complete a later
+# bracket placeholder (``[[Name]]`` with PROGRAM_NAME="Date" becomes today's date)
+_BRACKETED_RE = re.compile(
+    r"\[[^\[\]]*\[(?:Name|Description|Timeframe|Date)\]|\[(?:Name|Description|Timeframe|Date)\][^\[\]]*\]"
+)
+
+# Characters that could form a new placeholder once substituted into the text
+_PLACEHOLDER_CHARS = re.compile(r"[\[\]{}]")
+
+_BRACKET = 0
+_CURLY = 1
+
+
+@dataclass(frozen=True)
+class CompiledTemplate:
+    """
+    A template split into literal parts and placeholder slots.
+
+    Attributes:
+        source: Original template text
+        parts: Literal text, with ``""`` at each placeholder position
+        slots: ``(index, kind, key)`` for each placeholder, where ``key`` is the
+            mapping key (bracket placeholders) or the token name (curly tokens)
+        placeholders: Every placeholder as written in the template
+        nested: True if substituted values could combine with surrounding text
+            into new placeholders (e.g. ``{{[Name]}}``, ``[[Name]]`` or ``{{{{KEY}}}}``)
+    """
+
+    source: str
+    parts: tuple[str, ...]
+    slots: tuple[tuple[int, int, str], ...]
+    placeholders: frozenset[str]
+    nested: bool
+
+
+@dataclass(frozen=True)
+class RenderResult:
+    """
+    Output of ``render_template``.
+
+    Attributes:
+        text: Rendered document
+        missing: Placeholders that had no value in the mapping
+            (curly tokens are left as-is, bracket placeholders become empty)
+        unused: Mapping keys not referenced by the template
+    """
+
+    text: str
+    missing: frozenset[str]
+    unused: frozenset[str]
+
+
+@lru_cache(maxsize=256)
+def compile_template(text: str) -> CompiledTemplate:
+    """Tokenise ``text`` once into literal parts and placeholder slots (cached)."""
+    parts: list[str] = []
+    slots: list[tuple[int, int, str]] = []
+    placeholders: set[str] = set()
+    pos = 0
+    for match in _TOKEN_RE.finditer(text):
+        if match.start() > pos:
+            parts.append(text[pos : match.start()])
+        token = match.group(0)
+        placeholders.add(token)
+        if match.group(1) is None:
+            slots.append((len(parts), _BRACKET, BRACKET_PLACEHOLDERS[token]))
+        else:
+            slots.append((len(parts), _CURLY, match.group(1)))
+        parts.append("")
+        pos = match.end()
+    if pos < len(text):
+        parts.append(text[pos:])
+    return CompiledTemplate(
+        source=text,
+        parts=tuple(parts),
+        slots=tuple(slots),
+        placeholders=frozenset(placeholders),
+        nested=bool(_NESTED_RE.search(text) or _BRACKETED_RE.search(text)) or "{{{" in text or "}}}" in text,
+    )
+
+
+def _apply_sequential(text: str, mapping: Mapping[str, str], today: str) -> str:
+    """Original replace-per-placeholder algorithm, kept for cascading inputs."""
+    out = text
+    for placeholder, key in BRACKET_PLACEHOLDERS.items():
+        out = out.replace(placeholder, mapping.get(key, today if key == "DATE" else ""))
+    for k, v in mapping.items():
+        out = out.replace(f"{{{{{k}}}}}", v)
+    return out
+
+
+def render_template(template: "str | CompiledTemplate", mapping: Mapping[str, str]) -> RenderResult:
+    """
+    Fill placeholders in a template in a single pass.
+
+    Output is identical to replacing bracket placeholders and then each
+    ``{{KEY}}`` in mapping order. When a value itself contains placeholder
+    characters (so that a sequential replace would cascade), the sequential
+    algorithm is used to keep that behaviour.
+
+    Args:
+        template: Template text or a ``CompiledTemplate``
+        mapping: Placeholder values keyed by token name (e.g. ``PROGRAM_NAME``)
+
+    Returns:
+        RenderResult with the rendered text and missing/unused placeholders
+    """
+    compiled = compile_template(template) if isinstance(template, str) else template
+
+    today = mapping.get("DATE") or datetime.now().strftime("%Y-%m-%d")
+    parts = list(compiled.parts)
+    missing: set[str] = set()
+    used: set[str] = set()
+    for index, kind, key in compiled.slots:
+        if key in mapping:
+            parts[index] = mapping[key]
+            used.add(key)
+        elif kind == _BRACKET:
+            if key == "DATE":
+                parts[index] = today
+            else:
+                missing.add(_BRACKET_BY_KEY[key])
+        else:
+            parts[index] = f"{{{{{key}}}}}"
+            missing.add(f"{{{{{key}}}}}")
+
+    cascades = compiled.nested or any(
+        _PLACEHOLDER_CHARS.search(k) or _PLACEHOLDER_CHARS.search(v) for k, v in mapping.items()
+    )
+    if cascades:
+        text = _apply_sequential(compiled.source, mapping, today)
+    else:
+        text = "".join(parts)
+
+    return RenderResult(
+        text=text,
+        missing=frozenset(missing),
+        unused=frozenset(k for k in mapping if k not in used),
+    )
@@ -0,0 +1,192 @@
+"""
+Process-wide template registry for NUAA CLI.
+
+Resolving the templates directory walks the working directory and all of its
+parents, and every scaffold used to re-read the template from disk. Commands
+with several outputs and the long-running web API paid that cost on every
+document.
+
+``TemplateRegistry`` memoises the resolved templates root per search origin
+and keeps template text in a bounded LRU cache. Cached entries are validated
+with a single ``stat()`` and reloaded when the file's mtime or size changes.
+
+Example:
+    >>> registry = get_template_registry()
+    >>> text = registry.load("program-design.md")
+    >>> registry.stats()["hits"]
+    0
+"""
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+from .template_engine import CompiledTemplate, compile_template
+
+DEFAULT_MAX_ENTRIES = 128
+
+
+@dataclass
+class CachedTemplate:
+    """
+    A template held in the registry cache.
+
+    Attributes:
+        path: Resolved template file path
+        mtime_ns: Modification time when the text was read
+        size: File size when the text was read
+        text: Template contents
+    """
+
+    path: Path
+    mtime_ns: int
+    size: int
+    text: str
+    _compiled: Optional[CompiledTemplate] = field(default=None, repr=False, compare=False)
+
+    @property
+    def compiled(self) -> CompiledTemplate:
+        """Placeholder-compiled form, built on first use and kept with the entry."""
+        if self._compiled is None:
+            self._compiled = compile_template(self.text)
+        return self._compiled
+
+
+class TemplateRegistry:
+    """
+    Cache of resolved template roots and template contents.
+
+    Thread-safe; a single instance is shared by the CLI and the web API
+    (see ``get_template_registry()``).
+
+    Args:
+        root_finder: Callable resolving the templates directory from a start path
+        max_entries: Maximum number of templates kept in memory (LRU eviction)
+    """
+
+    def __init__(
+        self,
+        root_finder: Callable[[Optional[Path]], Path],
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ):
+        self._root_finder = root_finder
+        self.max_entries = max_entries
+        self._roots: Dict[Path, Path] = {}
+        self._entries: "OrderedDict[Tuple[Path, str], CachedTemplate]" = OrderedDict()
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.root_hits = 0
+        self.root_misses = 0
+
+    def templates_root(self, start: Optional[Path] = None) -> Path:
+        """
+        Return the templates directory for ``start`` (default: current directory).
+
+        The walk up the directory tree happens once per origin; later calls
+        only check that the remembered directory still exists.
+
+        Raises:
+            FileNotFoundError: If no templates directory can be located
+        """
+        origin = start or Path.cwd()
+        with self._lock:
+            root = self._roots.get(origin)
+            if root is not None and root.is_dir():
+                self.root_hits += 1
+                return root
+            self.root_misses += 1
+        root = self._root_finder(origin)
+        with self._lock:
+            self._roots[origin] = root
+        return root
+
+    def get(self, name: str, start: Optional[Path] = None) -> CachedTemplate:
+        """
+        Return the cached entry for template ``name``, reading it if needed.
+
+        Raises:
+            FileNotFoundError: If the templates directory or the template is missing
+        """
+        root = self.templates_root(start)
+        path = root / name
+        key = (root, name)
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            with self._lock:
+                self._entries.pop(key, None)
+            raise FileNotFoundError(f"Template not found: {name}") from None
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.mtime_ns == stat.st_mtime_ns and entry.size == stat.st_size:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            self.misses += 1
+
+        entry = CachedTemplate(
+            path=path,
+            mtime_ns=stat.st_mtime_ns,
+            size=stat.st_size,
+            text=path.read_text(encoding="utf-8"),
+        )
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return entry
+
+    def load(self, name: str, start: Optional[Path] = None) -> str:
+        """Return the text of template ``name``."""
+        return self.get(name, start).text
+
+    def invalidate(self, name: Optional[str] = None) -> None:
+        """
+        Drop cached templates (all of them, or every entry named ``name``).
+
+        Remembered template roots are forgotten as well when clearing everything.
+        """
+        with self._lock:
+            if name is None:
+                self._entries.clear()
+                self._roots.clear()
+                return
+            for key in [k for k in self._entries if k[1] == name]:
+                del self._entries[key]
+
+    def stats(self) -> Dict[str, int]:
+        """Return cache counters and current size."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "root_hits": self.root_hits,
+                "root_misses": self.root_misses,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+            }
+
+
+_registry: Optional[TemplateRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_template_registry() -> TemplateRegistry:
+    """Return the process-wide template registry."""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                # Imported here to avoid a cycle: scaffold uses this module
+                from .scaffold import _find_templates_root
+
+                _registry = TemplateRegistry(_find_templates_root)
+    return _registry
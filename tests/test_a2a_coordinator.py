@@ -0,0 +1,636 @@
+"""
+Tests for the A2A coordinator.
+
+Tests cover:
+- Agent registration and discovery
+- Message delivery and broadcast
+- The capability index
+- Asyncio mode (mailboxes, correlation, timeouts, backpressure)
+- Message history
+- Cross-process transports
+"""
+
+import asyncio
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+import pytest
+from unittest.mock import Mock
+
+from nuaa_cli.a2a import (
+    A2AAgent,
+    A2ACoordinator,
+    A2AMessage,
+    AgentNotFoundError,
+    MailboxFullError,
+    MessageDeliveryError,
+    MessageTimeoutError,
+    QueueTransport,
+    RemoteAgentError,
+    SocketTransport,
+)
+from nuaa_cli.a2a.exceptions import AgentRegistrationError, InvalidMessageError
+
+
+def _agent(agent_id, capabilities, handler=None):
+    return A2AAgent(
+        id=agent_id,
+        name=agent_id.title(),
+        capabilities=list(capabilities),
+        message_handler=handler or Mock(return_value=f"{agent_id} ok"),
+    )
+
+
+# Worker processes are spawned, so their handlers must be module-level functions
+def _remote_echo(message):
+    return {"pid": os.getpid(), "content": message.content}
+
+
+def _remote_fail(message):
+    raise ValueError(f"cannot handle {message.content}")
+
+
+def _remote_exit(message):
+    os._exit(1)
+
+
+def _remote_slow(message):
+    time.sleep(message.content)
+    return "done"
+
+
+class TestA2ACoordinator:
+    """Tests for registration, delivery and broadcast."""
+
+    def test_register_and_send(self):
+        """Test a message reaches its recipient's handler."""
+        coordinator = A2ACoordinator()
+        agent = _agent("design", ["design_program"])
+        coordinator.register(agent)
+
+        message = A2AMessage(from_agent="user", to_agent="design", content={"action": "design_program"})
+
+        assert coordinator.send(message) == "design ok"
+        agent.message_handler.assert_called_once_with(message)
+        assert coordinator.get_history() == [message]
+
+    def test_register_duplicate_rejected(self):
+        """Test agent IDs must be unique and non-empty."""
+        coordinator = A2ACoordinator()
+        coordinator.register(_agent("design", []))
+
+        with pytest.raises(AgentRegistrationError):
+            coordinator.register(_agent("design", []))
+        with pytest.raises(AgentRegistrationError):
+            coordinator.register(_agent(" ", []))
+
+    def test_send_errors(self):
+        """Test unknown recipients and failing handlers raise A2A errors."""
+        coordinator = A2ACoordinator()
+        coordinator.register(_agent("broken", [], handler=Mock(side_effect=RuntimeError("down"))))
+
+        with pytest.raises(AgentNotFoundError):
+            coordinator.send(A2AMessage(from_agent="user", to_agent="missing", content=None))
+        with pytest.raises(MessageDeliveryError, match="down"):
+            coordinator.send(A2AMessage(from_agent="user", to_agent="broken", content=None))
+
+    def test_broadcast_by_capability(self):
+        """Test broadcast reaches capable agents other than the sender."""
+        coordinator = A2ACoordinator()
+        coordinator.register(_agent("a", ["review"]))
+        coordinator.register(_agent("b", ["review"]))
+        coordinator.register(_agent("c", ["design"]))
+        coordinator.register(_agent("d", [], handler=Mock(side_effect=ValueError("nope"))))
+
+        message = A2AMessage(from_agent="a", to_agent="*", content="hi", message_type="notification")
+
+        assert coordinator.broadcast(message, capability="review") == {"b": "b ok"}
+        assert coordinator.broadcast(message) == {"b": "b ok", "c": "c ok", "d": {"error": "nope"}}
+
+
+class TestA2ACapabilityIndex:
+    """Tests for capability lookups."""
+
+    def test_find_agents_in_registration_order(self):
+        """Test find_agents returns capable agents in registration order."""
+        coordinator = A2ACoordinator()
+        a = _agent("a", ["review", "design"])
+        b = _agent("b", ["review"])
+        c = _agent("c", ["design"])
+        for agent in (a, b, c):
+            coordinator.register(agent)
+
+        assert coordinator.find_agents("review") == [a, b]
+        assert coordinator.find_agents("design") == [a, c]
+        assert coordinator.find_agents("design", exclude=["a"]) == [c]
+        assert coordinator.find_agents("unknown") == []
+
+    def test_index_follows_unregister_and_clear(self):
+        """Test unregistered agents drop out of the index."""
+        coordinator = A2ACoordinator()
+        a = _agent("a", ["review", "review"])
+        b = _agent("b", ["review"])
+        coordinator.register(a)
+        coordinator.register(b)
+
+        coordinator.unregister("a")
+        assert coordinator.find_agents("review") == [b]
+
+        coordinator.unregister("b")
+        assert coordinator.find_agents("review") == []
+        assert "review" not in coordinator._capability_index
+
+        coordinator.register(a)
+        coordinator.clear()
+        assert coordinator.find_agents("review") == []
+
+    def test_returned_list_is_independent(self):
+        """Test callers can modify the returned list without affecting the index."""
+        coordinator = A2ACoordinator()
+        coordinator.register(_agent("a", ["review"]))
+
+        coordinator.find_agents("review").clear()
+        assert len(coordinator.find_agents("review")) == 1
+
+    def test_broadcast_tolerates_registration_in_handler(self):
+        """Test a handler may register agents during a broadcast."""
+        coordinator = A2ACoordinator()
+        coordinator.register(
+            _agent("a", ["review"], handler=lambda message: coordinator.register(_agent("late", ["review"])))
+        )
+
+        responses = coordinator.broadcast(A2AMessage(from_agent="user", to_agent="*", content=None), "review")
+
+        assert list(responses) == ["a"]
+        assert len(coordinator.find_agents("review")) == 2
+
+
+def _request(to_agent, content=None, **kwargs):
+    return A2AMessage(from_agent="user", to_agent=to_agent, content=content, **kwargs)
+
+
+class TestA2AAsyncMode:
+    """Tests for the coroutine API."""
+
+    def test_asend_async_and_sync_handlers(self):
+        """Test async handlers are awaited and sync handlers run off the loop thread."""
+        coordinator = A2ACoordinator()
+
+        async def echo(message):
+            return message.content
+
+        coordinator.register(_agent("echo", [], handler=echo))
+        coordinator.register(_agent("where", [], handler=lambda message: threading.current_thread().name))
+
+        async def main():
+            first = await coordinator.asend(_request("echo", "hi"))
+            second = await coordinator.asend(_request("where"))
+            await coordinator.aclose()
+            return first, second
+
+        first, second = asyncio.run(main())
+        assert first == "hi"
+        assert second != threading.current_thread().name
+        assert len(coordinator.get_history()) == 2
+
+    def test_arequest_correlates_response(self):
+        """Test the response refers to the request's message_id."""
+        coordinator = A2ACoordinator()
+        coordinator.register(_agent("design", []))
+        request = _request("design")
+
+        response = asyncio.run(coordinator.arequest(request))
+
+        assert response.message_type == "response"
+        assert response.reply_to == request.message_id
+        assert (response.from_agent, response.to_agent) == ("design", "user")
+        assert response.content == "design ok"
+
+    def test_posted_response_completes_request(self):
+        """Test an agent can answer later by posting a response message."""
+        coordinator = A2ACoordinator()
+
+        async def deferred(message):
+            async def answer_later():
+                await asyncio.sleep(0.01)
+                reply = A2AMessage(
+                    from_agent="slow",
+                    to_agent=message.from_agent,
+                    content="done",
+                    message_type="response",
+                    reply_to=message.message_id,
+                )
+                await coordinator.apost(reply)
+
+            asyncio.get_running_loop().create_task(answer_later())
+            await asyncio.sleep(1)  # The posted response arrives first
+
+        coordinator.register(_agent("slow", [], handler=deferred))
+
+        async def main():
+            try:
+                return await coordinator.asend(_request("slow"), timeout=0.5)
+            finally:
+                await coordinator.aclose()
+
+        assert asyncio.run(main()) == "done"
+
+    def test_posted_response_must_come_from_recipient(self):
+        """Test only the agent a request went to can answer it with apost()."""
+        coordinator = A2ACoordinator()
+        received = []
+
+        async def deferred(message):
+            await asyncio.sleep(0.05)
+            return "real"
+
+        coordinator.register(_agent("target", [], handler=deferred))
+        coordinator.register(_agent("user", [], handler=received.append))
+        coordinator.register(_agent("intruder", []))
+
+        async def main():
+            request = _request("target")
+            waiting = asyncio.ensure_future(coordinator.arequest(request, timeout=1))
+            await asyncio.sleep(0)
+            forged = A2AMessage(
+                from_agent="intruder",
+                to_agent="user",
+                content="forged",
+                message_type="response",
+                reply_to=request.message_id,
+            )
+            await coordinator.apost(forged)
+            response = await waiting
+            await coordinator.aclose()
+            return response
+
+        response = asyncio.run(main())
+        assert (response.from_agent, response.content) == ("target", "real")
+
+    def test_abroadcast_is_concurrent(self):
+        """Test broadcast latency follows the slowest agent, not the sum."""
+        coordinator = A2ACoordinator()
+
+        def slow(message):
+            time.sleep(0.2)
+            return "slow"
+
+        async def fast(message):
+            await asyncio.sleep(0.2)
+            return "fast"
+
+        for i in range(4):
+            coordinator.register(_agent(f"async-{i}", ["review"], handler=fast))
+        coordinator.register(_agent("sync", ["review"], handler=slow))
+        coordinator.register(_agent("other", ["design"]))
+
+        async def main():
+            start = time.monotonic()
+            responses = await coordinator.abroadcast(_request("*"), capability="review")
+            elapsed = time.monotonic() - start
+            await coordinator.aclose()
+            return responses, elapsed
+
+        responses, elapsed = asyncio.run(main())
+        assert responses == {"async-0": "fast", "async-1": "fast", "async-2": "fast", "async-3": "fast", "sync": "slow"}
+        assert elapsed < 0.6
+
+    def test_abroadcast_to_many_sync_agents_is_concurrent(self):
+        """Test sync handlers do not queue up behind a shared thread pool."""
+        coordinator = A2ACoordinator()
+
+        def slow(message):
+            time.sleep(0.2)
+            return threading.current_thread().name
+
+        for i in range(20):
+            coordinator.register(_agent(f"sync-{i}", ["review"], handler=slow))
+
+        async def main():
+            start = time.monotonic()
+            responses = await coordinator.abroadcast(_request("*"), capability="review")
+            elapsed = time.monotonic() - start
+            await coordinator.aclose()
+            return responses, elapsed
+
+        responses, elapsed = asyncio.run(main())
+        assert len(set(responses.values())) == 20
+        assert elapsed < 0.6
+
+    def test_handler_threads_limits_sync_concurrency(self):
+        """Test handler_threads bounds the threads shared by sync handlers."""
+        coordinator = A2ACoordinator(handler_threads=1)
+        for i in range(3):
+            coordinator.register(_agent(f"sync-{i}", [], handler=lambda message: threading.current_thread().name))
+
+        async def main():
+            responses = await coordinator.abroadcast(_request("*"))
+            await coordinator.aclose()
+            return responses
+
+        assert len(set(asyncio.run(main()).values())) == 1
+        with pytest.raises(ValueError):
+            A2ACoordinator(handler_threads=0)
+
+    def test_abroadcast_reports_errors_and_timeouts(self):
+        """Test failing and slow recipients are reported without failing the broadcast."""
+        coordinator = A2ACoordinator()
+
+        async def hang(message):
+            await asyncio.sleep(10)
+
+        coordinator.register(_agent("ok", []))
+        coordinator.register(_agent("broken", [], handler=Mock(side_effect=ValueError("nope"))))
+        coordinator.register(_agent("hang", [], handler=hang))
+
+        async def main():
+            responses = await coordinator.abroadcast(_request("*"), timeout=0.1)
+            await coordinator.aclose()
+            return responses
+
+        responses = asyncio.run(main())
+        assert responses["ok"] == "ok ok"
+        assert responses["broken"] == {"error": "nope"}
+        assert "did not answer" in responses["hang"]["error"]
+
+    def test_errors(self):
+        """Test unknown recipients, handler failures and timeouts raise A2A errors."""
+        coordinator = A2ACoordinator(timeout=0.05)
+
+        async def hang(message):
+            await asyncio.sleep(10)
+
+        coordinator.register(_agent("broken", [], handler=Mock(side_effect=RuntimeError("down"))))
+        coordinator.register(_agent("hang", [], handler=hang))
+
+        async def main():
+            with pytest.raises(AgentNotFoundError):
+                await coordinator.asend(_request("missing"))
+            with pytest.raises(MessageDeliveryError, match="down"):
+                await coordinator.asend(_request("broken"))
+            with pytest.raises(MessageTimeoutError):
+                await coordinator.asend(_request("hang"))
+            await coordinator.aclose()
+
+        asyncio.run(main())
+
+    def test_mailbox_backpressure(self):
+        """Test a full mailbox holds senders back and then fails after the timeout."""
+        coordinator = A2ACoordinator(mailbox_size=1)
+
+        async def main():
+            gate = asyncio.Event()
+
+            async def blocked(message):
+                await gate.wait()
+
+            coordinator.register(_agent("busy", [], handler=blocked))
+            await coordinator.apost(_request("busy"))  # Taken by the worker
+            await asyncio.sleep(0)
+            await coordinator.apost(_request("busy"))  # Fills the mailbox
+            with pytest.raises(MailboxFullError):
+                await coordinator.apost(_request("busy"), timeout=0)
+            with pytest.raises(MailboxFullError):
+                await coordinator.apost(_request("busy"), timeout=0.05)
+
+            waiting = asyncio.ensure_future(coordinator.apost(_request("busy")))
+            await asyncio.sleep(0.05)
+            assert not waiting.done()  # Backpressure: waits for room
+            gate.set()
+            await asyncio.wait_for(waiting, 1)
+            await coordinator.aclose()
+
+        asyncio.run(main())
+
+    def test_agent_handles_messages_in_order(self):
+        """Test one agent processes its mailbox sequentially."""
+        coordinator = A2ACoordinator()
+        seen = []
+
+        async def record(message):
+            seen.append(message.content)
+            await asyncio.sleep(0.001)
+            return message.content
+
+        coordinator.register(_agent("ordered", [], handler=record))
+
+        async def main():
+            results = await asyncio.gather(*(coordinator.asend(_request("ordered", i)) for i in range(20)))
+            await coordinator.aclose()
+            return results
+
+        assert asyncio.run(main()) == list(range(20))
+        assert seen == list(range(20))
+
+    def test_unregister_fails_waiting_requests(self):
+        """Test requests to an agent that is unregistered do not hang."""
+        coordinator = A2ACoordinator()
+
+        async def hang(message):
+            await asyncio.sleep(10)
+
+        coordinator.register(_agent("hang", [], handler=hang))
+
+        async def main():
+            waiting = asyncio.ensure_future(coordinator.asend(_request("hang")))
+            await asyncio.sleep(0.01)
+            coordinator.unregister("hang")
+            with pytest.raises(MessageDeliveryError, match="unregistered"):
+                await asyncio.wait_for(waiting, 1)
+
+        asyncio.run(main())
+
+    def test_reusable_across_event_loops(self):
+        """Test the coordinator works again from a new event loop."""
+        coordinator = A2ACoordinator()
+        coordinator.register(_agent("a", []))
+
+        assert asyncio.run(coordinator.asend(_request("a"))) == "a ok"
+        assert asyncio.run(coordinator.asend(_request("a"))) == "a ok"
+
+
+class TestA2AHistory:
+    """Tests for the ring-buffer history and its JSONL sink."""
+
+    @staticmethod
+    def _coordinator(**kwargs):
+        coordinator = A2ACoordinator(**kwargs)
+        coordinator.register(_agent("design", []))
+        coordinator.register(_agent("review", []))
+        return coordinator
+
+    def test_history_keeps_newest(self):
+        """Test the oldest messages drop out beyond max_history."""
+        coordinator = self._coordinator(max_history=3)
+        for i in range(5):
+            coordinator.send(_request("design", i))
+
+        assert [message.content for message in coordinator.get_history()] == [4, 3, 2]
+        assert [message.content for message in coordinator.get_history(limit=2)] == [4, 3]
+
+    def test_filter_by_agent_and_type(self):
+        """Test history filters by participant and message type."""
+        coordinator = self._coordinator()
+        coordinator.send(_request("design", 1))
+        coordinator.send(_request("review", 2, message_type="notification"))
+        coordinator.send(A2AMessage(from_agent="design", to_agent="review", content=3))
+
+        assert [m.content for m in coordinator.get_history(agent="design")] == [3, 1]
+        assert [m.content for m in coordinator.get_history(agent="review", message_type="request")] == [3]
+        assert [m.content for m in coordinator.get_history(message_type="notification")] == [2]
+        assert coordinator.get_history(agent="nobody") == []
+
+    def test_filter_by_time_window(self):
+        """Test since is inclusive and until exclusive, as datetimes or ISO strings."""
+        coordinator = self._coordinator()
+        for day in (1, 2, 3):
+            coordinator.send(_request("design", day, timestamp=datetime(2025, 1, day, 12).isoformat()))
+
+        assert [m.content for m in coordinator.get_history(since=datetime(2025, 1, 2, 12))] == [3, 2]
+        assert [m.content for m in coordinator.get_history(until="2025-01-02T12:00:00")] == [1]
+        assert [m.content for m in coordinator.get_history(since=datetime(2025, 1, 2), until=datetime(2025, 1, 3))] == [
+            2
+        ]
+
+    def test_iter_history_is_lazy(self):
+        """Test iter_history yields matches newest first."""
+        coordinator = self._coordinator()
+        for i in range(3):
+            coordinator.send(_request("design", i))
+
+        history = coordinator.iter_history(agent="design")
+        assert next(history).content == 2
+        assert [m.content for m in history] == [1, 0]
+
+    def test_sink_keeps_full_trace(self, tmp_path):
+        """Test every message reaches the JSONL sink while memory stays bounded."""
+        sink = tmp_path / "trace" / "a2a.jsonl"
+        coordinator = self._coordinator(max_history=2, history_sink=sink)
+        for i in range(5):
+            coordinator.send(_request("design", {"step": i}))
+        coordinator.close()
+
+        records = [json.loads(line) for line in sink.read_text(encoding="utf-8").splitlines()]
+        assert [record["content"] for record in records] == [{"step": i} for i in range(5)]
+        assert records[0]["to_agent"] == "design"
+        assert len(coordinator.get_history()) == 2
+
+        coordinator.clear_history()
+        coordinator.send(_request("design", "after"))
+        coordinator.close()
+        assert len(sink.read_text(encoding="utf-8").splitlines()) == 6
+
+    def test_sink_failure_does_not_stop_delivery(self, tmp_path):
+        """Test an unwritable sink is logged and messages are still delivered."""
+        blocker = tmp_path / "file"
+        blocker.write_text("")
+        coordinator = self._coordinator(history_sink=blocker / "a2a.jsonl")
+
+        assert coordinator.send(_request("design")) == "design ok"
+        assert len(coordinator.get_history()) == 1
+
+    def test_unserialisable_content_does_not_stop_delivery(self, tmp_path):
+        """Test content json cannot encode is skipped by the sink, not fatal to delivery."""
+        sink = tmp_path / "a2a.jsonl"
+        coordinator = self._coordinator(history_sink=sink)
+        circular = {}
+        circular["self"] = circular
+
+        assert coordinator.send(_request("design", circular)) == "design ok"
+        assert coordinator.send(_request("design", {(1, 2): "tuple key"})) == "design ok"
+        assert asyncio.run(coordinator.asend(_request("review", circular))) == "review ok"
+        coordinator.send(_request("design", "plain"))
+        coordinator.close()
+
+        records = [json.loads(line) for line in sink.read_text(encoding="utf-8").splitlines()]
+        assert [record["content"] for record in records] == ["plain"]
+        assert len(coordinator.get_history()) == 4
+
+
+@pytest.mark.parametrize("transport_class", [SocketTransport, QueueTransport])
+class TestA2ATransport:
+    """Tests for agents running in worker processes."""
+
+    def test_send_runs_in_worker(self, transport_class):
+        """Test send() reaches a handler in another process."""
+        with transport_class(timeout=30) as transport:
+            coordinator = A2ACoordinator()
+            agent = transport.spawn(_agent("design", ["design_program"], _remote_echo))
+            coordinator.register(agent)
+
+            result = coordinator.send(_request("design", {"step": 1}))
+
+            assert result["content"] == {"step": 1}
+            assert result["pid"] == agent.metadata["process_id"]
+            assert result["pid"] != os.getpid()
+
+    def test_broadcast_and_async_send(self, transport_class):
+        """Test broadcast() and asend() work unchanged with remote agents."""
+        with transport_class(timeout=30) as transport:
+            coordinator = A2ACoordinator()
+            coordinator.register(transport.spawn(_agent("a", ["review"], _remote_echo)))
+            coordinator.register(transport.spawn(_agent("b", ["review"], _remote_fail)))
+            coordinator.register(_agent("local", ["review"]))
+
+            responses = coordinator.broadcast(_request("*", "draft"), capability="review")
+            assert list(responses) == ["a", "b", "local"]
+            assert responses["a"]["content"] == "draft"
+            assert "ValueError: cannot handle draft" in responses["b"]["error"]
+            assert responses["local"] == "local ok"
+
+            async def main():
+                try:
+                    return await coordinator.asend(_request("a", [1, 2]), timeout=30)
+                finally:
+                    await coordinator.aclose()
+
+            assert asyncio.run(main())["content"] == [1, 2]
+
+    def test_errors(self, transport_class):
+        """Test handler failures, unserialisable content and dead workers."""
+        with transport_class(timeout=30) as transport:
+            coordinator = A2ACoordinator()
+            coordinator.register(transport.spawn(_agent("fail", ["x"], _remote_fail)))
+            coordinator.register(transport.spawn(_agent("exit", ["x"], _remote_exit)))
+
+            with pytest.raises(MessageDeliveryError, match="cannot handle 1"):
+                coordinator.send(_request("fail", 1))
+            with pytest.raises(InvalidMessageError):
+                coordinator.get_agent("fail").message_handler(_request("fail", object()))
+            with pytest.raises(RemoteAgentError, match="exited"):
+                coordinator.get_agent("exit").message_handler(_request("exit", 1))
+            with pytest.raises(RemoteAgentError, match="not running"):
+                coordinator.get_agent("exit").message_handler(_request("exit", 1))
+
+    def test_spawn_rejects_unpicklable_handler(self, transport_class):
+        """Test a handler that cannot be sent to a worker is rejected at spawn."""
+        with transport_class() as transport:
+            with pytest.raises(AgentRegistrationError, match="module-level function"):
+                transport.spawn(_agent("lambda", ["x"], lambda message: None))
+
+    def test_timeout(self, transport_class):
+        """Test a slow remote handler times out."""
+        with transport_class(timeout=0.2) as transport:
+            agent = transport.spawn(_agent("slow", ["x"], _remote_slow))
+
+            with pytest.raises(MessageTimeoutError):
+                agent.message_handler(_request("slow", 2))
+
+    def test_broadcast_timeout(self, transport_class):
+        """Test broadcast() reports slow remote agents after one shared timeout."""
+        with transport_class(timeout=0.3) as transport:
+            coordinator = A2ACoordinator()
+            for i in range(3):
+                coordinator.register(transport.spawn(_agent(f"slow-{i}", ["x"], _remote_slow)))
+            coordinator.register(transport.spawn(_agent("fast", ["x"], _remote_echo)))
+
+            start = time.monotonic()
+            responses = coordinator.broadcast(_request("*", 1.5))
+            elapsed = time.monotonic() - start
+
+            assert elapsed < 0.8  # Not 0.3s per slow agent
+            assert all("did not answer" in responses[f"slow-{i}"]["error"] for i in range(3))
+            assert responses["fast"]["content"] == 1.5
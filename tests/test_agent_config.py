@@ -0,0 +1,116 @@
+"""Tests for the shared agents.json loader."""
+
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from nuaa_cli import agent_config as agent_config_mod
+from nuaa_cli.agent_config import AgentConfig, clear_agent_config_cache, load_agent_config
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache():
+    clear_agent_config_cache()
+    yield
+    clear_agent_config_cache()
+
+
+def _write_agents(path: Path, data: dict) -> Path:
+    path.write_text(json.dumps(data), encoding="utf-8")
+    return path
+
+
+SAMPLE = {
+    "alpha": {"name": "Alpha", "cli_tool": "alpha", "supports_mcp": True, "protocol": "mcp"},
+    "beta": {"name": "Beta", "cli_tool": None, "supports_mcp": False, "protocol": "native"},
+    "gamma": {"name": "Gamma", "cli_tool": "gm", "supports_mcp": True, "protocol": "native"},
+}
+
+
+def test_packaged_config_loads():
+    """The packaged agents.json parses into an AgentConfig."""
+    agents = load_agent_config()
+
+    assert isinstance(agents, AgentConfig)
+    assert agents["claude"]["name"] == "Claude Code"
+    assert agents.by_cli_tool("claude") == "claude"
+
+
+def test_parsed_once_per_process(tmp_path, monkeypatch):
+    """Repeated calls return the same object without re-reading the file."""
+    path = _write_agents(tmp_path / "agents.json", SAMPLE)
+    first = load_agent_config(path)
+
+    def _fail(*args, **kwargs):
+        raise AssertionError("agents.json re-parsed")
+
+    monkeypatch.setattr(agent_config_mod.json, "load", _fail)
+    assert load_agent_config(path) is first
+
+
+def test_reloads_when_file_changes(tmp_path):
+    """A modified file is parsed again."""
+    path = _write_agents(tmp_path / "agents.json", SAMPLE)
+    first = load_agent_config(path)
+
+    _write_agents(path, {"delta": {"name": "Delta"}})
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    second = load_agent_config(path)
+    assert second is not first
+    assert list(second) == ["delta"]
+
+
+def test_indexes(tmp_path):
+    """cli_tool, supports_mcp and protocol indexes are available."""
+    agents = load_agent_config(_write_agents(tmp_path / "agents.json", SAMPLE))
+
+    assert agents.by_cli_tool("gm") == "gamma"
+    assert agents.by_cli_tool("missing") is None
+    assert agents.mcp_capable() == ("alpha", "gamma")
+    assert agents.by_protocol("native") == ("beta", "gamma")
+    assert agents.by_protocol("a2a") == ()
+
+
+def test_view_is_immutable(tmp_path):
+    """Neither the mapping nor the per-agent configs can be modified."""
+    agents = load_agent_config(_write_agents(tmp_path / "agents.json", SAMPLE))
+
+    with pytest.raises(TypeError):
+        agents["alpha"] = {}  # type: ignore[index]
+    with pytest.raises(TypeError):
+        agents["alpha"]["name"] = "Changed"  # type: ignore[index]
+
+    copy = agents.to_dict()
+    copy["alpha"]["name"] = "Changed"
+    assert agents["alpha"]["name"] == "Alpha"
+
+
+def test_disk_cache_round_trip(tmp_path, monkeypatch):
+    """The on-disk cache is written and then used instead of parsing JSON."""
+    monkeypatch.setattr(agent_config_mod, "user_cache_dir", lambda *args: str(tmp_path / "cache"))
+    path = _write_agents(tmp_path / "agents.json", SAMPLE)
+
+    load_agent_config(path, disk_cache=True)
+    assert list((tmp_path / "cache").glob("agents-*.marshal"))
+
+    clear_agent_config_cache()
+
+    def _fail(*args, **kwargs):
+        raise AssertionError("agents.json parsed despite disk cache")
+
+    monkeypatch.setattr(agent_config_mod.json, "load", _fail)
+    agents = load_agent_config(path, disk_cache=True)
+    assert agents["alpha"]["name"] == "Alpha"
+
+
+def test_commands_use_shared_view():
+    """The CLI entry point and `nuaa init` use the shared AgentConfig view."""
+    import nuaa_cli
+    from nuaa_cli.commands import init
+
+    assert isinstance(nuaa_cli.AGENT_CONFIG, AgentConfig)
+    assert isinstance(init.AGENT_CONFIG, AgentConfig)
@@ -4,11 +4,13 @@ Tests for audit logging module.
 Tests audit event creation, logging, querying, and compliance features.
 """
 
+import copy
 import json
 import tempfile
 from datetime import datetime, timedelta
 from pathlib import Path
 
+import pytest
 
 from nuaa_cli.audit import (
     AuditLogger,
@@ -117,6 +119,115 @@ class TestAuditEvents:
         assert auth_failure.requires_immediate_alert()
         assert not regular_event.requires_immediate_alert()
 
+    def test_audit_event_is_slotted(self):
+        """Events carry no per-instance __dict__."""
+        event = AuditEvent()
+
+        assert not hasattr(event, "__dict__")
+        with pytest.raises(AttributeError):
+            event.unknown_field = 1
+
+    def test_to_dict_round_trip(self):
+        """to_dict output rebuilds an equal event, with every field in order."""
+        event = AuditEvent(
+            event_type=EventType.AUTH_FAILURE,
+            severity=Severity.WARNING,
+            username="alice",
+            metadata={"attempts": 3},
+            contains_pii=True,
+        )
+
+        data = event.to_dict()
+
+        assert list(data) == list(AuditEvent.__dataclass_fields__)
+        assert AuditEvent.from_dict(json.loads(json.dumps(data))) == event
+
+    def test_to_dict_copies_metadata(self):
+        """Mutating the serialised metadata does not touch the event."""
+        event = AuditEvent(metadata={"key": "value"})
+
+        event.to_dict()["metadata"]["key"] = "changed"
+
+        assert event.metadata == {"key": "value"}
+
+    def test_from_dict_rejects_unknown_enum_values(self):
+        """Unknown event types and severities still raise ValueError."""
+        with pytest.raises(ValueError):
+            AuditEvent.from_dict({"event_type": "no.such.type"})
+        with pytest.raises(ValueError):
+            AuditEvent.from_dict({"severity": "loud"})
+
+    def test_security_event_types(self):
+        """is_security_event agrees with SECURITY_EVENT_TYPES."""
+        from nuaa_cli.audit.events import SECURITY_EVENT_TYPES
+
+        for event_type in EventType:
+            assert AuditEvent(event_type=event_type).is_security_event() == (event_type in SECURITY_EVENT_TYPES)
+
+    def test_codec_backend_selection(self):
+        """The json backend is always available; unknown names are rejected."""
+        from nuaa_cli.audit import codec
+
+        original = codec.backend
+        try:
+            assert codec.set_backend("json") == "json"
+            assert codec.loads(b'{"a": [1, 2]}') == {"a": [1, 2]}
+            with pytest.raises(codec.DecodeError):
+                codec.loads(b"{not json")
+            assert codec.set_backend("orjson") in codec.BACKENDS
+            with pytest.raises(ValueError):
+                codec.set_backend("yaml")
+        finally:
+            codec.set_backend(original)
+
+    def test_codec_fast_backend_falls_back_for_non_strict_json(self):
+        """NaN and integers beyond 64 bits decode exactly even where a fast backend cannot."""
+        import math
+
+        from nuaa_cli.audit import codec
+
+        def strict(data):
+            # Behaves like orjson: rejects NaN/Infinity, turns huge integers into floats
+            def reject(constant):
+                raise ValueError(f"invalid constant {constant}")
+
+            return json.loads(data, parse_constant=reject, parse_int=lambda x: float(x) if len(x) >= 20 else int(x))
+
+        loads = codec._with_fallback(strict)
+        assert math.isnan(loads(b'{"score": NaN}')["score"])
+        assert loads('{"big": %d}' % 2**70)["big"] == 2**70
+        assert loads(b'{"a": 1}') == {"a": 1}
+        with pytest.raises(codec.DecodeError):
+            loads(b"{not json")
+
+    @pytest.mark.parametrize("backend", ["json", "orjson", "msgspec"])
+    def test_non_strict_metadata_survives_queries(self, tmp_path, backend):
+        """Events whose metadata holds NaN or huge integers are not dropped by queries."""
+        import math
+
+        from nuaa_cli.audit import codec
+        from nuaa_cli.audit.config import reset_config, set_config
+        from nuaa_cli.audit.query import query_all_logs
+
+        original = codec.backend
+        config = AuditConfig(audit_dir=tmp_path)
+        set_config(config)
+        try:
+            codec.set_backend(backend)
+            logger = AuditLogger(config)
+            logger.log(AuditEvent(action="nan", metadata={"score": float("nan")}))
+            logger.log(AuditEvent(action="big", metadata={"count": 2**70}))
+            logger.log(AuditEvent(action="plain"))
+
+            events = {e.action: e for e in query_all_logs()}
+            assert set(events) == {"nan", "big", "plain"}
+            assert math.isnan(events["nan"].metadata["score"])
+            assert events["big"].metadata["count"] == 2**70
+            assert logger.verify_integrity() is True
+        finally:
+            codec.set_backend(original)
+            reset_config()
+
 
 class TestAuditConfig:
     """Tests for AuditConfig class."""
@@ -270,6 +381,332 @@ class TestAuditLogger:
             assert config.log_path.exists()
 
 
+class TestBufferedAuditLogger:
+    """Tests for the buffered (background writer) logging mode."""
+
+    @staticmethod
+    def _events(path):
+        with open(path, "r", encoding="utf-8") as f:
+            records = [json.loads(line) for line in f]
+        return [r for r in records if r.get("type") not in ("audit_log_header", "audit_segment_footer")]
+
+    def test_events_written_on_flush(self):
+        """Buffered events reach the file on flush() and keep their checksum chain."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            config = AuditConfig(audit_dir=Path(tmpdir), buffered=True, flush_interval=60)
+            logger = AuditLogger(config)
+            try:
+                for i in range(10):
+                    assert logger.log(AuditEvent(action=f"test_{i}")) is True
+
+                assert self._events(config.log_path) == []
+                assert logger.flush(timeout=5) is True
+
+                entries = self._events(config.log_path)
+                assert [e["action"] for e in entries] == [f"test_{i}" for i in range(10)]
+                assert entries[1]["_prev_checksum"] == entries[0]["_checksum"]
+                assert logger.verify_integrity() is True
+            finally:
+                logger.close()
+
+    def test_flush_reports_write_failures(self, tmp_path):
+        """flush() returns False when queued events could not be written."""
+        from nuaa_cli.audit.writer import BufferedAuditWriter
+
+        config = AuditConfig(audit_dir=tmp_path, buffered=True, flush_interval=60)
+        config.log_path.mkdir()  # Opening the log for append fails
+        writer = BufferedAuditWriter(config, rotate_files=lambda: None)
+        try:
+            for i in range(3):
+                writer.submit(f'{{"action": "lost_{i}"}}\n')
+            assert writer.flush(timeout=5) is False
+            assert writer.failed == 3
+
+            config.log_path.rmdir()
+            writer.submit('{"action": "kept"}\n')
+            assert writer.flush(timeout=5) is True
+            assert config.log_path.read_text(encoding="utf-8") == '{"action": "kept"}\n'
+        finally:
+            writer.close()
+
+    def test_flush_interval(self):
+        """The background thread flushes on its own after flush_interval."""
+        import time
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            config = AuditConfig(audit_dir=Path(tmpdir), buffered=True, flush_interval=0.05)
+            logger = AuditLogger(config)
+            try:
+                logger.log(AuditEvent(action="timed"))
+                deadline = time.monotonic() + 5
+                while not self._events(config.log_path) and time.monotonic() < deadline:
+                    time.sleep(0.01)
+                assert [e["action"] for e in self._events(config.log_path)] == ["timed"]
+            finally:
+                logger.close()
+
+    def test_checksum_matches_unbuffered_format(self):
+        """Sealed lines verify the same way as unbuffered entries."""
+        import hashlib
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            config = AuditConfig(audit_dir=Path(tmpdir), buffered=True)
+            logger = AuditLogger(config)
+            logger.log(AuditEvent(action="sealed", metadata={"nested": {"b": 1, "a": [1, 2]}}))
+            logger.close()
+
+            entry = self._events(config.log_path)[0]
+            checksum = entry.pop("_checksum")
+            assert entry.pop("_prev_checksum") is None
+            entry.pop("_hash")
+            assert hashlib.sha256(json.dumps(entry, sort_keys=True).encode()).hexdigest() == checksum
+
+    def test_rotation_matches_unbuffered(self):
+        """Buffered rotation splits events across the same files as direct writes."""
+        layouts = []
+        for buffered in (False, True):
+            with tempfile.TemporaryDirectory() as tmpdir:
+                config = AuditConfig(audit_dir=Path(tmpdir), max_file_size=2048, buffered=buffered)
+                logger = AuditLogger(config)
+                for i in range(40):
+                    event = AuditEvent(
+                        event_id=f"id-{i}",
+                        timestamp=datetime(2025, 1, 1),
+                        action=f"test_{i}",
+                        metadata={"data": "x" * 100},
+                    )
+                    logger.log(event)
+                logger.close()
+
+                files = sorted(Path(tmpdir).glob("audit.log*"))
+                layouts.append({f.name: [e["action"] for e in self._events(f)] for f in files})
+                assert all(logger.verify_integrity(f) for f in files)
+
+        assert len(layouts[0]) > 1
+        assert layouts[0] == layouts[1]
+
+    def test_close_then_log_writes_directly(self):
+        """After close() the logger falls back to direct writes."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            config = AuditConfig(audit_dir=Path(tmpdir), buffered=True, flush_interval=60)
+            logger = AuditLogger(config)
+            logger.log(AuditEvent(action="buffered"))
+            logger.close()
+            logger.log(AuditEvent(action="direct"))
+
+            assert [e["action"] for e in self._events(config.log_path)] == ["buffered", "direct"]
+            assert logger.verify_integrity() is True
+
+    def test_concurrent_logging(self):
+        """Events from many threads are all written exactly once."""
+        import threading
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            config = AuditConfig(audit_dir=Path(tmpdir), buffered=True, flush_max_events=16)
+            logger = AuditLogger(config)
+
+            def worker(n):
+                for i in range(50):
+                    logger.log(AuditEvent(action=f"{n}-{i}"))
+
+            threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            logger.close()
+
+            actions = [e["action"] for e in self._events(config.log_path)]
+            assert sorted(actions) == sorted(f"{n}-{i}" for n in range(4) for i in range(50))
+            assert logger.verify_integrity() is True
+
+    def test_invalid_fsync_policy(self):
+        """Unknown fsync policies are rejected."""
+        import pytest
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with pytest.raises(ValueError):
+                AuditConfig(audit_dir=Path(tmpdir), fsync_policy="sometimes")
+
+
+class TestIntegrityChain:
+    """Tests for the hash chain, checkpoints and incremental verification."""
+
+    @staticmethod
+    def _logger(tmpdir, **kwargs):
+        return AuditLogger(AuditConfig(audit_dir=Path(tmpdir), checkpoint_key="test-key", **kwargs))
+
+    def test_entries_are_hash_chained(self):
+        """Each entry's _hash covers the previous entry's _hash."""
+        from nuaa_cli.audit.integrity import chain_hash
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            logger = self._logger(tmpdir)
+            for i in range(3):
+                logger.log(AuditEvent(action=f"test_{i}"))
+
+            lines = logger.config.log_path.read_text().splitlines()[1:]
+            entries = [json.loads(line) for line in lines]
+            assert entries[0]["_hash"] == chain_hash(None, entries[0]["_checksum"])
+            assert entries[2]["_hash"] == chain_hash(entries[1]["_hash"], entries[2]["_checksum"])
+
+    def test_checkpoints_are_written_and_verified(self):
+        """Signed checkpoints appear every checkpoint_interval events."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            logger = self._logger(tmpdir, checkpoint_interval=5)
+            for i in range(12):
+                logger.log(AuditEvent(action=f"test_{i}"))
+
+            records = [json.loads(line) for line in logger.config.log_path.read_text().splitlines()]
+            checkpoints = [r for r in records if r.get("type") == "audit_checkpoint"]
+            assert len(checkpoints) == 2
+            assert logger.verify_integrity(full=True) is True
+            assert len(query_audit_logs(log_file=logger.config.log_path)) == 12
+
+    def test_forged_checkpoint_signature_is_detected(self):
+        """A checkpoint signed with another key fails verification."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            logger = self._logger(tmpdir, checkpoint_interval=2)
+            for i in range(2):
+                logger.log(AuditEvent(action=f"test_{i}"))
+
+            other = AuditConfig(audit_dir=Path(tmpdir), checkpoint_key="other-key")
+            assert AuditLogger(other).verify_integrity(full=True) is False
+
+    def test_stripped_and_resealed_log_is_detected(self):
+        """Dropping checkpoints and chain hashes and recomputing checksums is caught."""
+        import hashlib
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            logger = self._logger(tmpdir, checkpoint_interval=2)
+            for i in range(5):
+                logger.log(AuditEvent(action=f"test_{i}"))
+            assert logger.verify_integrity(full=True) is True
+
+            lines = logger.config.log_path.read_text().splitlines()
+            forged = [lines[0]]
+            prev = None
+            for line in lines[1:]:
+                entry = json.loads(line)
+                if entry.get("type") == "audit_checkpoint":
+                    continue
+                for name in ("_checksum", "_prev_checksum", "_hash"):
+                    entry.pop(name)
+                if entry["action"] == "test_2":
+                    entry["action"] = "forged"
+                checksum = hashlib.sha256(json.dumps(entry, sort_keys=True).encode()).hexdigest()
+                entry.update(_checksum=checksum, _prev_checksum=prev)
+                forged.append(json.dumps(entry))
+                prev = checksum
+            logger.config.log_path.write_text("\n".join(forged) + "\n")
+
+            assert logger.verify_integrity(full=True) is False
+
+    def test_entry_without_hash_after_chained_entries_is_detected(self):
+        """Once the chain has started, an entry lacking _hash fails verification."""
+        import hashlib
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            logger = self._logger(tmpdir, checkpoint_interval=0)
+            for i in range(2):
+                logger.log(AuditEvent(action=f"test_{i}"))
+
+            lines = logger.config.log_path.read_text().splitlines()
+            entry = json.loads(lines[-1])
+            for name in ("_checksum", "_prev_checksum", "_hash"):
+                entry.pop(name)
+            entry["action"] = "forged"
+            checksum = hashlib.sha256(json.dumps(entry, sort_keys=True).encode()).hexdigest()
+            entry.update(_checksum=checksum, _prev_checksum=json.loads(lines[-2])["_checksum"])
+            lines[-1] = json.dumps(entry)
+            logger.config.log_path.write_text("\n".join(lines) + "\n")
+
+            assert logger.verify_integrity(full=True) is False
+
+    def test_checkpoint_count_continues_across_logger_instances(self):
+        """A restarted logger writes its next checkpoint on the original schedule."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            first = self._logger(tmpdir, checkpoint_interval=5)
+            for i in range(3):
+                first.log(AuditEvent(action=f"first_{i}"))
+            logger = self._logger(tmpdir, checkpoint_interval=5)
+            for i in range(4):
+                logger.log(AuditEvent(action=f"second_{i}"))
+
+            records = [json.loads(line) for line in logger.config.log_path.read_text().splitlines()]
+            assert [r.get("type") for r in records].index("audit_checkpoint") == 6
+            assert logger.verify_integrity(full=True) is True
+
+    def test_chain_continues_across_logger_instances(self):
+        """A new logger appending to an existing file extends the same chain."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            self._logger(tmpdir).log(AuditEvent(action="first run"))
+            logger = self._logger(tmpdir)
+            logger.log(AuditEvent(action="second run"))
+
+            assert logger.verify_integrity(full=True) is True
+
+    def test_incremental_verification_only_reads_new_lines(self, monkeypatch):
+        """A second verify resumes at the saved offset."""
+        from nuaa_cli.audit import integrity
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            logger = self._logger(tmpdir)
+            for i in range(50):
+                logger.log(AuditEvent(action=f"old_{i}"))
+            assert logger.verify_integrity() is True
+
+            logger.log(AuditEvent(action="new"))
+            parsed = []
+            real_loads = integrity.json.loads
+
+            def counting_loads(raw, **kwargs):
+                if isinstance(raw, bytes):
+                    parsed.append(raw)
+                return real_loads(raw, **kwargs)
+
+            monkeypatch.setattr(integrity.json, "loads", counting_loads)
+
+            assert logger.verify_integrity() is True
+            assert len(parsed) == 1
+
+    def test_tampering_after_checkpoint_is_detected(self):
+        """Changing a line after verification is caught by the next verification."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            logger = self._logger(tmpdir)
+            for i in range(5):
+                logger.log(AuditEvent(action=f"test_{i}"))
+            assert logger.verify_integrity() is True
+
+            path = logger.config.log_path
+            path.write_text(path.read_text().replace("test_4", "evil_4"))
+
+            assert logger.verify_integrity() is False
+
+    def test_full_mode_finds_tampering_behind_saved_offset(self):
+        """full=True re-checks lines the incremental mode would skip."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            logger = self._logger(tmpdir)
+            for i in range(5):
+                logger.log(AuditEvent(action=f"test_{i}"))
+            assert logger.verify_integrity() is True
+
+            path = logger.config.log_path
+            path.write_text(path.read_text().replace("test_1", "evil_1"))
+
+            assert logger.verify_integrity() is True
+            assert logger.verify_integrity(full=True) is False
+
+    def test_rotated_file_gets_fresh_state(self):
+        """Verification state is reset when the log file is replaced by rotation."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            logger = self._logger(tmpdir, max_file_size=2048)
+            for i in range(10):
+                logger.log(AuditEvent(action=f"test_{i}", metadata={"data": "x" * 100}))
+                assert logger.verify_integrity() is True
+            assert (Path(tmpdir) / "audit.log.1").exists()
+
+
 class TestAuditQuery:
     """Tests for audit querying."""
 
@@ -365,6 +802,896 @@ class TestAuditQuery:
             assert len(events) == 3
 
 
+class TestAuditIndex:
+    """Tests for the SQLite query index."""
+
+    @pytest.fixture
+    def indexed_logger(self, tmp_path):
+        from nuaa_cli.audit.config import reset_config, set_config
+
+        config = AuditConfig(audit_dir=tmp_path, index_enabled=True)
+        set_config(config)
+        yield AuditLogger(config)
+        reset_config()
+
+    def test_filters_match_linear_scan(self, indexed_logger):
+        """Indexed queries return the same events as scanning the log."""
+        from dataclasses import replace
+
+        from nuaa_cli.audit.config import set_config
+
+        base = datetime(2025, 1, 1)
+        for i in range(30):
+            indexed_logger.log(
+                AuditEvent(
+                    timestamp=base + timedelta(minutes=i),
+                    event_type=EventType.DOCUMENT_CREATED if i % 3 else EventType.AUTH_FAILURE,
+                    severity=Severity.WARNING if i % 5 == 0 else Severity.INFO,
+                    username="alice" if i % 2 else "bob",
+                    status="failure" if i % 4 == 0 else "success",
+                    resource_path=f"/docs/{i % 3}/file.md",
+                    contains_pii=i % 6 == 0,
+                )
+            )
+
+        queries = [
+            AuditQuery(),
+            AuditQuery(username="alice", limit=4, offset=2),
+            AuditQuery(event_types=[EventType.AUTH_FAILURE], sort_desc=False),
+            AuditQuery(severities=[Severity.WARNING], status="failure"),
+            AuditQuery(start_time=base + timedelta(minutes=5), end_time=base + timedelta(minutes=12)),
+            AuditQuery(contains_pii=True),
+            AuditQuery(resource_path="/docs/1/*", limit=3, offset=1),
+        ]
+        log_path = indexed_logger.config.log_path
+        indexed = [[e.event_id for e in query_audit_logs(q, log_file=log_path)] for q in queries]
+        set_config(replace(indexed_logger.config, index_enabled=False))
+        scanned = [[e.event_id for e in query_audit_logs(q, log_file=log_path)] for q in queries]
+
+        assert indexed == scanned
+        assert (indexed_logger.config.audit_dir / "audit-index.sqlite3").exists()
+
+    def test_index_picks_up_appended_events(self, indexed_logger):
+        """Events logged after the first query are indexed on the next one."""
+        from nuaa_cli.audit import AuditIndex
+
+        indexed_logger.log(AuditEvent(username="alice"))
+        assert len(query_audit_logs(AuditQuery(username="alice"))) == 1
+
+        indexed_logger.log(AuditEvent(username="alice"))
+        indexed_logger.log(AuditEvent(username="bob"))
+        assert len(query_audit_logs(AuditQuery(username="alice"))) == 2
+        assert AuditIndex(indexed_logger.config).sync() == 0
+
+    def test_query_all_logs_spans_rotated_files(self, indexed_logger):
+        """query_all_logs searches rotated logs and drops files removed by rotation."""
+        from nuaa_cli.audit import query_all_logs
+
+        indexed_logger.config.max_file_size = 2048
+        indexed_logger.config.max_files = 2
+        for i in range(40):
+            indexed_logger.log(AuditEvent(action=f"test_{i}", metadata={"data": "x" * 100}))
+            if i % 10 == 0:
+                query_all_logs()
+
+        files = list(indexed_logger.config.audit_dir.glob("audit.log*"))
+        expected = sum(len(query_audit_logs(log_file=f)) for f in files)
+        events = query_all_logs()
+        assert len(events) == expected < 40
+        assert events == sorted(events, key=lambda e: e.timestamp, reverse=True)
+        assert [e.action for e in query_all_logs(AuditQuery(action="test_39"))] == ["test_39"]
+
+    def test_falls_back_to_scan_when_index_unusable(self, indexed_logger):
+        """A broken index file does not break queries."""
+        indexed_logger.log(AuditEvent(action="test"))
+        (indexed_logger.config.audit_dir / "audit-index.sqlite3").write_text("not a database")
+
+        assert len(query_audit_logs()) == 1
+
+
+class TestStreamingQueries:
+    """Tests for iter_audit_events and the streaming exporters."""
+
+    @pytest.fixture
+    def logger(self, tmp_path):
+        from nuaa_cli.audit.config import reset_config, set_config
+
+        config = AuditConfig(audit_dir=tmp_path, max_file_size=4096, max_files=5)
+        set_config(config)
+        logger = AuditLogger(config)
+        for i in range(30):
+            logger.log(AuditEvent(action=f"test_{i}", username="alice" if i % 2 else "bob", metadata={"n": i}))
+        yield logger
+        reset_config()
+
+    def test_iterates_all_logs_newest_first(self, logger):
+        """Events from the current and rotated logs are yielded newest first."""
+        from nuaa_cli.audit import iter_audit_events
+
+        assert (logger.config.audit_dir / "audit.log.1").exists()
+        actions = [e.action for e in iter_audit_events()]
+        assert actions == [f"test_{i}" for i in reversed(range(30))]
+
+        ascending = [e.action for e in iter_audit_events(AuditQuery(sort_desc=False, username="bob"))]
+        assert ascending == [f"test_{i}" for i in range(0, 30, 2)]
+
+    def test_limit_and_offset_page_through_results(self, logger):
+        """Advancing offset by limit visits every event exactly once."""
+        from nuaa_cli.audit import iter_audit_events
+
+        pages = []
+        offset = 0
+        while True:
+            page = [e.action for e in iter_audit_events(AuditQuery(limit=7, offset=offset))]
+            if not page:
+                break
+            pages.extend(page)
+            offset += 7
+        assert pages == [e.action for e in iter_audit_events()]
+
+    def test_iteration_is_lazy(self, logger, monkeypatch):
+        """Taking the newest event does not parse the rest of the logs."""
+        from nuaa_cli.audit import iter_audit_events, query
+
+        parsed = []
+        real_parse = query._parse_line
+        monkeypatch.setattr(query, "_parse_line", lambda line: parsed.append(line) or real_parse(line))
+
+        assert next(iter_audit_events()).action == "test_29"
+        assert len(parsed) == 1
+
+    def test_indexed_iteration_matches_scan(self, logger):
+        """With the index enabled the same events are streamed from SQLite."""
+        from nuaa_cli.audit import iter_audit_events
+
+        query = AuditQuery(username="alice", limit=5, offset=3)
+        scanned = [e.event_id for e in iter_audit_events(query)]
+        logger.config.index_enabled = True
+        assert [e.event_id for e in iter_audit_events(query)] == scanned
+
+    def test_export_to_json_matches_json_dump(self, logger, tmp_path):
+        """The streaming JSON writer produces the same array as json.dump."""
+        from nuaa_cli.audit import export_to_json, iter_audit_events
+
+        output = tmp_path / "export.json"
+        assert export_to_json(iter_audit_events(), output) == 30
+        expected = json.dumps([e.to_dict() for e in iter_audit_events()], indent=2)
+        assert output.read_text() == expected
+
+        assert export_to_json(iter([]), output) == 0
+        assert json.loads(output.read_text()) == []
+
+    def test_export_to_jsonl_and_csv_accept_generators(self, logger, tmp_path):
+        """JSONL and CSV exports stream from an iterator or into an open stream."""
+        import csv
+        import io
+
+        from nuaa_cli.audit import export_to_csv, export_to_jsonl, iter_audit_events
+
+        buffer = io.StringIO()
+        assert export_to_jsonl(iter_audit_events(AuditQuery(limit=4)), buffer) == 4
+        lines = buffer.getvalue().splitlines()
+        assert [json.loads(line)["action"] for line in lines] == ["test_29", "test_28", "test_27", "test_26"]
+
+        output = tmp_path / "export.csv"
+        assert export_to_csv(iter_audit_events(AuditQuery(username="bob")), output) == 15
+        with open(output, newline="", encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+        assert len(rows) == 15
+        assert json.loads(rows[0]["metadata"]) == {"n": 28}
+
+
+class TestComplianceReport:
+    """Tests for the single-pass compliance report aggregator."""
+
+    @staticmethod
+    def _events(count, start=datetime(2025, 3, 1)):
+        return [
+            AuditEvent(
+                timestamp=start + timedelta(minutes=i),
+                event_type=EventType.AUTH_FAILURE if i % 4 == 0 else EventType.DOCUMENT_READ,
+                severity=Severity.WARNING if i % 4 == 0 else Severity.INFO,
+                username=f"user-{i % 3}",
+                action=f"action_{i}",
+                status="failure" if i % 4 == 0 else "success",
+                contains_pii=i % 5 == 0,
+                is_sensitive=i % 7 == 0,
+            )
+            for i in range(count)
+        ]
+
+    def test_single_pass_metrics(self):
+        """Every report metric is computed from one pass over the events."""
+        from nuaa_cli.audit import ComplianceAggregator
+
+        events = self._events(20)
+        report = ComplianceAggregator().update(iter(events)).to_report(datetime(2025, 3, 1), datetime(2025, 3, 2))
+
+        assert report["summary"] == {"total_events": 20, "unique_users": 3, "failed_actions": 5}
+        assert report["event_counts"] == {"auth.failure": 5, "document.read": 15}
+        assert report["severity_counts"] == {"warning": 5, "info": 15}
+        assert report["user_activity"]["user-0"] == {"total": 7, "failed": 2}
+        assert report["compliance_flags"] == {"pii_access_count": 4, "sensitive_operations": 3, "security_events": 5}
+        assert [f["action"] for f in report["failed_actions"]] == [f"action_{i}" for i in (16, 12, 8, 4, 0)]
+
+    def test_failed_actions_keep_most_recent(self):
+        """Only the 100 most recent failures are listed; all are counted."""
+        from nuaa_cli.audit import ComplianceAggregator
+
+        events = self._events(1000)
+        report = ComplianceAggregator().update(reversed(events)).to_report(datetime.min, datetime.max)
+
+        assert report["summary"]["failed_actions"] == 250
+        assert len(report["failed_actions"]) == 100
+        assert report["failed_actions"][0]["action"] == "action_996"
+        assert report["failed_actions"][-1]["action"] == "action_600"
+
+    def test_merged_partials_match_single_pass(self):
+        """Merging per-chunk aggregates gives the same report as one pass."""
+        import pickle
+
+        from nuaa_cli.audit import ComplianceAggregator
+
+        events = self._events(500)
+        single = ComplianceAggregator().update(events).to_report(datetime.min, datetime.max)
+
+        merged = ComplianceAggregator()
+        for chunk in (events[:120], events[120:121], events[121:400], events[400:]):
+            # Partials must survive the trip to and from a worker process
+            merged.merge(pickle.loads(pickle.dumps(ComplianceAggregator().update(chunk))))
+
+        assert merged.to_report(datetime.min, datetime.max) == single
+
+    def test_report_over_rotated_logs(self, tmp_path):
+        """include_rotated aggregates each log file and merges the results."""
+        from nuaa_cli.audit import generate_compliance_report
+        from nuaa_cli.audit.config import reset_config, set_config
+
+        config = AuditConfig(audit_dir=tmp_path, max_file_size=4096, max_files=20)
+        set_config(config)
+        try:
+            logger = AuditLogger(config)
+            for event in self._events(60):
+                logger.log(event)
+            assert (tmp_path / "audit.log.1").exists()
+
+            start, end = datetime(2025, 3, 1), datetime(2025, 3, 2)
+            current_only = generate_compliance_report(start, end)
+            everything = generate_compliance_report(start, end, include_rotated=True)
+        finally:
+            reset_config()
+
+        assert current_only["summary"]["total_events"] < 60
+        assert everything["summary"]["total_events"] == 60
+        assert everything["failed_actions"][0]["action"] == "action_56"
+
+
+class TestParallelScan:
+    """Tests for scanning rotated logs in a process pool."""
+
+    @pytest.fixture
+    def config(self, tmp_path):
+        from nuaa_cli.audit.config import reset_config, set_config
+
+        config = AuditConfig(audit_dir=tmp_path, max_file_size=4096, max_files=20, parallel_min_bytes=0)
+        set_config(config)
+        logger = AuditLogger(config)
+        base = datetime(2025, 6, 1)
+        for i in range(80):
+            # Out-of-order timestamps: merged results must still be sorted
+            logger.log(
+                AuditEvent(
+                    timestamp=base + timedelta(seconds=(i * 37) % 80),
+                    username=f"user-{i % 4}",
+                    action=f"test_{i}",
+                    status="failure" if i % 3 == 0 else "success",
+                )
+            )
+        yield config
+        reset_config()
+
+    def test_parallel_results_match_serial(self, config):
+        """The process pool returns the same events in the same order."""
+        from nuaa_cli.audit import query_all_logs
+
+        assert len(list(config.audit_dir.glob("audit.log.*"))) > 1
+        for query in (AuditQuery(), AuditQuery(username="user-1", limit=5, offset=3), AuditQuery(sort_desc=False)):
+            serial = [e.event_id for e in query_all_logs(query, workers=1)]
+            parallel = [e.event_id for e in query_all_logs(query, workers=3)]
+            assert parallel == serial
+        events = query_all_logs(workers=3)
+        assert len(events) == 80
+        assert events == sorted(events, key=lambda e: e.timestamp, reverse=True)
+
+    def test_parallel_report_matches_serial(self, config):
+        """Per-file aggregates computed in worker processes merge to the serial report."""
+        from nuaa_cli.audit import generate_compliance_report
+
+        start, end = datetime(2025, 6, 1), datetime(2025, 6, 2)
+        serial = generate_compliance_report(start, end, include_rotated=True, workers=1)
+        parallel = generate_compliance_report(start, end, include_rotated=True, workers=3)
+        assert parallel == serial
+        assert serial["summary"]["total_events"] == 80
+
+    def test_small_inputs_stay_serial(self, config, monkeypatch):
+        """Below parallel_min_bytes no pool is started."""
+        from nuaa_cli.audit import parallel, query_all_logs
+
+        def no_pool(*args, **kwargs):
+            raise AssertionError("process pool started")
+
+        monkeypatch.setattr(parallel, "ProcessPoolExecutor", no_pool)
+        config.parallel_min_bytes = 10 * 1024 * 1024
+        assert len(query_all_logs(workers=4)) == 80
+
+    def test_workers_are_spawned(self, config, monkeypatch):
+        """The pool never forks a process that may hold background-thread locks."""
+        from concurrent.futures import ProcessPoolExecutor
+
+        from nuaa_cli.audit import parallel, query_all_logs
+
+        contexts = []
+
+        def recording_pool(*args, **kwargs):
+            contexts.append(kwargs.get("mp_context"))
+            return ProcessPoolExecutor(*args, **kwargs)
+
+        monkeypatch.setattr(parallel, "ProcessPoolExecutor", recording_pool)
+        assert len(query_all_logs(workers=2)) == 80
+        assert [ctx.get_start_method() for ctx in contexts] == ["spawn"]
+
+    def test_falls_back_to_serial_when_pool_fails(self, config, monkeypatch):
+        """If worker processes cannot be started the scan runs in-process."""
+        from nuaa_cli.audit import parallel, query_all_logs
+
+        def broken_pool(*args, **kwargs):
+            raise OSError("no semaphores")
+
+        monkeypatch.setattr(parallel, "ProcessPoolExecutor", broken_pool)
+        assert len(query_all_logs(workers=4)) == 80
+
+
+class TestSegments:
+    """Tests for segment footers, compressed rotation and transparent reading."""
+
+    BASE = datetime(2025, 5, 1)
+
+    @pytest.fixture
+    def make_logger(self, tmp_path):
+        from nuaa_cli.audit.config import reset_config, set_config
+
+        loggers = []
+
+        def make(**kwargs):
+            config = AuditConfig(
+                audit_dir=tmp_path, max_file_size=2048, max_files=20, checkpoint_key="test-key", **kwargs
+            )
+            set_config(config)
+            logger = AuditLogger(config)
+            loggers.append(logger)
+            return logger
+
+        yield make
+        for logger in loggers:
+            logger.close()
+        reset_config()
+
+    def _log(self, logger, count=40):
+        for i in range(count):
+            logger.log(
+                AuditEvent(
+                    timestamp=self.BASE + timedelta(hours=i), action=f"test_{i}", metadata={"data": "x" * 100}
+                )
+            )
+        logger.flush()
+
+    def test_rotated_segments_get_signed_footer(self, make_logger):
+        """Each rotated segment ends with a footer holding its timestamp range."""
+        from nuaa_cli.audit.segments import read_footer
+
+        logger = make_logger()
+        self._log(logger)
+
+        rotated = logger.config.audit_dir / "audit.log.1"
+        footer = read_footer(rotated)
+        events = [e for e in query_audit_logs(log_file=rotated)]
+        assert footer["events"] == len(events) > 0
+        assert footer["min_timestamp"] == min(e.timestamp for e in events).isoformat(timespec="microseconds")
+        assert footer["max_timestamp"] == max(e.timestamp for e in events).isoformat(timespec="microseconds")
+        assert read_footer(logger.config.log_path) is None
+        assert logger.verify_integrity(rotated, full=True) is True
+
+        rotated.write_text(rotated.read_text().replace('"events": ', '"events": 1'))
+        assert logger.verify_integrity(rotated, full=True) is False
+
+    def test_gzip_segments_are_read_transparently(self, make_logger):
+        """Compressed segments replace raw ones and stay queryable and verifiable."""
+        import gzip
+
+        from nuaa_cli.audit import query_all_logs
+
+        logger = make_logger(compression="gzip")
+        self._log(logger)
+
+        audit_dir = logger.config.audit_dir
+        assert not (audit_dir / "audit.log.1").exists()
+        compressed = sorted(audit_dir.glob("audit.log.*.gz"))
+        assert len(compressed) > 1
+        with gzip.open(compressed[0], "rt", encoding="utf-8") as f:
+            assert '"audit_segment_footer"' in f.read().splitlines()[-1]
+
+        events = query_all_logs(workers=1)
+        assert sorted(e.action for e in events) == sorted(f"test_{i}" for i in range(40))
+        assert all(logger.verify_integrity(path, full=True) for path in compressed)
+
+    def test_date_range_queries_skip_segments(self, make_logger, monkeypatch):
+        """Segments whose footer lies outside the range are never opened."""
+        from nuaa_cli.audit import iter_audit_events, query, query_all_logs
+
+        logger = make_logger(compression="gzip")
+        self._log(logger)
+
+        opened = []
+        real_iter = query.iter_segment_lines
+
+        def tracking_iter(path):
+            opened.append(path.name)
+            return real_iter(path)
+
+        monkeypatch.setattr(query, "iter_segment_lines", tracking_iter)
+        window = AuditQuery(start_time=self.BASE + timedelta(hours=3), end_time=self.BASE + timedelta(hours=4))
+
+        # The current log has no footer yet and is always read
+        assert [e.action for e in query_all_logs(window, workers=1)] == ["test_4", "test_3"]
+        assert len([name for name in opened if name.endswith(".gz")]) == 1
+        opened.clear()
+        assert [e.action for e in iter_audit_events(window)] == ["test_4", "test_3"]
+        assert len([name for name in opened if name.endswith(".gz")]) == 1
+
+    def test_zstd_falls_back_to_gzip(self, make_logger):
+        """Without the zstandard package, zstd compression writes gzip segments."""
+        from nuaa_cli.audit import segments
+
+        logger = make_logger(compression="zstd")
+        self._log(logger, count=20)
+
+        suffix = "*.zst" if segments.zstandard is not None else "*.gz"
+        assert list(logger.config.audit_dir.glob(f"audit.log.1{suffix[1:]}"))
+
+    def test_unfinished_segments_are_finalized_by_next_logger(self, make_logger, monkeypatch):
+        """Segments left raw by a process that exited early are compressed later."""
+        monkeypatch.setattr(AuditLogger, "_finalize_segment", lambda self, segment: None)
+        logger = make_logger(compression="gzip")
+        self._log(logger, count=20)
+        assert (logger.config.audit_dir / "audit.log.1").exists()
+        monkeypatch.undo()
+
+        make_logger(compression="gzip").flush()
+        assert not (logger.config.audit_dir / "audit.log.1").exists()
+        assert (logger.config.audit_dir / "audit.log.1.gz").exists()
+
+    def test_index_reads_compressed_segments(self, make_logger):
+        """The query index covers segments compressed before or after indexing."""
+        from nuaa_cli.audit import query_all_logs
+
+        logger = make_logger(compression="gzip", index_enabled=True)
+        for i in range(40):
+            event = AuditEvent(timestamp=self.BASE + timedelta(hours=i), action=f"test_{i}", metadata={"d": "x" * 100})
+            logger.log(event)
+            if i == 25:
+                # Index some segments while they are still raw
+                query_all_logs()
+        logger.flush()
+
+        assert len(query_all_logs()) == 40
+
+    def test_invalid_compression_rejected(self, tmp_path):
+        """Unknown compression names fail fast."""
+        with pytest.raises(ValueError):
+            AuditConfig(audit_dir=tmp_path, compression="lzma")
+
+
+class TestRetention:
+    """Tests for retention compaction of rotated segments."""
+
+    BASE = datetime(2024, 1, 1)
+    # 365-day retention expires the first 20 hourly events
+    NOW = BASE + timedelta(days=365, hours=20)
+
+    @pytest.fixture
+    def make_logger(self, tmp_path):
+        from nuaa_cli.audit.config import reset_config, set_config
+
+        loggers = []
+
+        def make(**kwargs):
+            config = AuditConfig(
+                audit_dir=tmp_path,
+                max_file_size=2048,
+                max_files=30,
+                checkpoint_key="test-key",
+                checkpoint_interval=2,
+                **kwargs,
+            )
+            set_config(config)
+            logger = AuditLogger(config)
+            loggers.append(logger)
+            return logger
+
+        yield make
+        for logger in loggers:
+            logger.close()
+        reset_config()
+
+    def _log(self, logger, count=40, **kwargs):
+        for i in range(count):
+            logger.log(
+                AuditEvent(
+                    timestamp=self.BASE + timedelta(hours=i),
+                    action=f"test_{i}",
+                    metadata={"data": "x" * 100},
+                    **kwargs,
+                )
+            )
+        logger.flush()
+
+    @staticmethod
+    def _actions(config):
+        from nuaa_cli.audit import query_all_logs
+
+        return sorted((e.action for e in query_all_logs(workers=1)), key=lambda a: int(a.split("_")[1]))
+
+    @pytest.mark.parametrize("compression", ["none", "gzip"])
+    def test_expired_events_are_removed(self, make_logger, compression):
+        """Expired events disappear and every rewritten segment still verifies."""
+        from nuaa_cli.audit.retention import REMOVED, REWRITTEN
+        from nuaa_cli.audit.segments import log_files
+
+        logger = make_logger(compression=compression)
+        self._log(logger)
+        rotated_before = sum(p.stat().st_size for p in log_files(logger.config)[1:])
+
+        report = logger.compact(now=self.NOW)
+
+        assert report.events_removed == 20
+        assert not report.failed
+        assert {s.action for s in report.segments} >= {REMOVED, REWRITTEN}
+        rotated_after = sum(p.stat().st_size for p in log_files(logger.config)[1:])
+        assert report.bytes_reclaimed == rotated_before - rotated_after > 0
+        assert self._actions(logger.config) == [f"test_{i}" for i in range(20, 40)]
+        assert all(logger.verify_integrity(p, full=True) for p in log_files(logger.config))
+
+    def test_second_run_skips_by_footer(self, make_logger, monkeypatch):
+        """Once compacted, segments are not read again until events age."""
+        from nuaa_cli.audit import retention
+
+        logger = make_logger()
+        self._log(logger)
+        logger.compact(now=self.NOW)
+
+        opened = []
+        real_iter = retention.iter_segment_lines
+        monkeypatch.setattr(retention, "iter_segment_lines", lambda path: opened.append(path) or real_iter(path))
+        report = logger.compact(now=self.NOW)
+
+        assert opened == []
+        assert report.bytes_reclaimed == 0
+        assert {s.action for s in report.segments} == {retention.SKIPPED}
+
+    def test_configured_retention_applies_to_every_event(self, make_logger):
+        """The configured period wins over the retention_days events carry."""
+        logger = make_logger()
+        self._log(logger, retention_days=3650)
+
+        report = logger.compact(now=self.NOW)
+
+        assert report.events_removed == 20
+        assert self._actions(logger.config) == [f"test_{i}" for i in range(20, 40)]
+
+    def test_shorter_retention_override_expires_default_events(self, make_logger, monkeypatch):
+        """A shorter period removes events with the default retention_days, reading only old segments."""
+        from nuaa_cli.audit import retention
+        from nuaa_cli.audit.retention import compact_logs
+
+        logger = make_logger()
+        self._log(logger)
+        config = copy.copy(logger.config)
+        config.retention_days = 90
+
+        report = compact_logs(config, now=self.BASE + timedelta(days=90, hours=10), lock=logger._rotation_lock)
+
+        assert report.events_removed == 10
+        assert self._actions(logger.config) == [f"test_{i}" for i in range(10, 40)]
+
+        opened = []
+        real_iter = retention.iter_segment_lines
+        monkeypatch.setattr(retention, "iter_segment_lines", lambda path: opened.append(path) or real_iter(path))
+        again = compact_logs(config, now=self.BASE + timedelta(days=90, hours=10), lock=logger._rotation_lock)
+
+        assert opened == []
+        assert again.events_removed == 0
+
+    def test_dry_run_changes_nothing(self, make_logger):
+        """A dry run reports the same savings without touching files."""
+        from nuaa_cli.audit.segments import log_files
+
+        logger = make_logger()
+        self._log(logger)
+        before = {p: p.read_bytes() for p in log_files(logger.config)}
+
+        dry = logger.compact(now=self.NOW, dry_run=True)
+
+        assert {p: p.read_bytes() for p in log_files(logger.config)} == before
+        assert dry.bytes_reclaimed == logger.compact(now=self.NOW).bytes_reclaimed > 0
+
+    def test_tampered_segment_is_not_rewritten(self, make_logger):
+        """A segment failing verification is reported and left as is."""
+        from nuaa_cli.audit.retention import FAILED
+
+        logger = make_logger()
+        self._log(logger)
+        oldest = logger.config.audit_dir / f"audit.log.{len(list(logger.config.audit_dir.glob('audit.log.*')))}"
+        tampered = oldest.read_text().replace('"action": "test_0"', '"action": "test_x"')
+        oldest.write_text(tampered)
+
+        report = logger.compact(now=self.NOW)
+
+        assert [s.path for s in report.failed] == [oldest]
+        assert report.failed[0].action == FAILED
+        assert oldest.read_text() == tampered
+
+    def test_replacement_waits_for_rotation_lock(self, make_logger):
+        """Compaction and rotation wait while another holder has the directory's rotation lock."""
+        import threading
+
+        from nuaa_cli.audit.segments import log_files, rotation_lock
+
+        logger = make_logger()
+        self._log(logger)
+        reports = []
+
+        for job in (lambda: reports.append(logger.compact(now=self.NOW)), logger._rotate_logs):
+            thread = threading.Thread(target=job)
+            # Held through a separate open file, as another process would
+            with rotation_lock(logger.config):
+                thread.start()
+                thread.join(0.3)
+                assert thread.is_alive()
+            thread.join(10)
+            assert not thread.is_alive()
+
+        assert reports[0].events_removed == 20
+        assert self._actions(logger.config) == [f"test_{i}" for i in range(20, 40)]
+        assert all(logger.verify_integrity(p, full=True) for p in log_files(logger.config))
+
+    def test_index_drops_compacted_events(self, make_logger):
+        """The SQLite index forgets events removed by compaction."""
+        logger = make_logger(index_enabled=True)
+        self._log(logger)
+        assert len(self._actions(logger.config)) == 40
+
+        logger.compact(now=self.NOW)
+
+        assert self._actions(logger.config) == [f"test_{i}" for i in range(20, 40)]
+
+
+class TestDelivery:
+    """Tests for background syslog and alert delivery."""
+
+    @pytest.fixture
+    def closed_port(self):
+        """A local TCP port with nothing listening on it."""
+        import socket
+
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            return sock.getsockname()[1]
+
+    @pytest.fixture
+    def slow_retry(self, monkeypatch):
+        from nuaa_cli.audit import delivery
+
+        monkeypatch.setattr(delivery, "RETRY_DELAY", 60.0)
+
+    @staticmethod
+    def _wait_for(predicate, timeout=5.0):
+        import time
+
+        deadline = time.monotonic() + timeout
+        while not predicate():
+            assert time.monotonic() < deadline, "timed out"
+            time.sleep(0.01)
+
+    def test_udp_batch_over_one_socket(self, tmp_path):
+        """Syslog messages reach a UDP server through one reused socket."""
+        import socket
+
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as server:
+            server.bind(("127.0.0.1", 0))
+            server.settimeout(5)
+            config = AuditConfig(
+                audit_dir=tmp_path, syslog_enabled=True, syslog_host="127.0.0.1", syslog_port=server.getsockname()[1]
+            )
+            logger = AuditLogger(config)
+            for i in range(5):
+                assert logger.log(AuditEvent(action=f"test_{i}"))
+            assert logger.flush(timeout=5)
+            messages = [server.recv(4096) for _ in range(5)]
+            stats = logger.delivery_stats()
+            logger.close()
+
+        assert messages[0] == b"<14>NUAA_AUDIT: user.action - test_0\x00"
+        assert [m.split(b" - ")[1] for m in messages] == [f"test_{i}\x00".encode() for i in range(5)]
+        assert stats["sent"] == 5
+        assert stats["connects"] == 1
+
+    def test_tcp_newline_framing(self, tmp_path):
+        """Over TCP, batches share one connection and messages are newline-framed."""
+        import socket
+        import threading
+
+        received = []
+        with socket.socket() as server:
+            server.bind(("127.0.0.1", 0))
+            server.listen()
+            server.settimeout(5)
+
+            def serve():
+                conn, _ = server.accept()
+                with conn:
+                    data = b""
+                    while data.count(b"\n") < 5:
+                        chunk = conn.recv(4096)
+                        if not chunk:
+                            break
+                        data += chunk
+                    received.extend(data.splitlines())
+
+            thread = threading.Thread(target=serve)
+            thread.start()
+            config = AuditConfig(
+                audit_dir=tmp_path,
+                syslog_enabled=True,
+                syslog_host="127.0.0.1",
+                syslog_port=server.getsockname()[1],
+                syslog_protocol="tcp",
+            )
+            logger = AuditLogger(config)
+            for i in range(5):
+                logger.log(AuditEvent(action=f"test_{i}"))
+            logger.flush(timeout=5)
+            thread.join(5)
+            stats = logger.delivery_stats()
+            logger.close()
+
+        assert received == [f"<14>NUAA_AUDIT: user.action - test_{i}".encode() for i in range(5)]
+        assert stats["connects"] == 1
+
+    def test_alerts_delivered_in_background(self, tmp_path, capsys):
+        """Alerts are printed by the sender thread."""
+        logger = AuditLogger(AuditConfig(audit_dir=tmp_path))
+        logger.log(AuditEvent(event_type=EventType.SYSTEM_ERROR, severity=Severity.CRITICAL))
+        logger.flush(timeout=5)
+        logger.close()
+
+        assert "[AUDIT ALERT] CRITICAL: system.error" in capsys.readouterr().err
+
+    def test_unreachable_host_drops_oldest(self, tmp_path, closed_port, slow_retry):
+        """An unreachable syslog host neither blocks logging nor grows the queue."""
+        import time
+
+        config = AuditConfig(
+            audit_dir=tmp_path,
+            syslog_enabled=True,
+            syslog_host="127.0.0.1",
+            syslog_port=closed_port,
+            syslog_protocol="tcp",
+            delivery_queue_size=10,
+        )
+        logger = AuditLogger(config)
+        started = time.monotonic()
+        assert all(logger.log(AuditEvent(action=f"test_{i}")) for i in range(50))
+        assert time.monotonic() - started < 5
+        self._wait_for(lambda: logger.delivery_stats()["failed"] >= 1)
+        assert logger.delivery_stats()["queue_depth"] <= 10
+        delivery = logger._delivery
+        logger.close()
+
+        stats = delivery.stats()
+        assert stats["sent"] == 0
+        assert stats["dropped"] > 0
+        assert stats["failed"] + stats["dropped"] == 50
+        # The log file itself is complete
+        assert len(query_audit_logs(AuditQuery(), log_file=config.log_path)) == 50
+
+    def test_spill_and_resend(self, tmp_path, closed_port, slow_retry):
+        """With the spill policy, undeliverable messages are sent by a later sender."""
+        import socket
+
+        from nuaa_cli.audit.delivery import SPILL_FILENAME, AuditDelivery
+
+        config = AuditConfig(
+            audit_dir=tmp_path,
+            syslog_enabled=True,
+            syslog_host="127.0.0.1",
+            syslog_port=closed_port,
+            syslog_protocol="tcp",
+            delivery_queue_size=2,
+            delivery_policy="spill",
+        )
+        logger = AuditLogger(config)
+        for i in range(10):
+            logger.log(AuditEvent(action=f"test_{i}"))
+        self._wait_for(lambda: logger.delivery_stats()["spilled"] >= 1)
+        logger.close()
+        spill_path = tmp_path / SPILL_FILENAME
+        assert len(spill_path.read_text(encoding="utf-8").splitlines()) == 10
+
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as server:
+            server.bind(("127.0.0.1", 0))
+            server.settimeout(5)
+            config.syslog_protocol = "udp"
+            config.syslog_port = server.getsockname()[1]
+            delivery = AuditDelivery(config)
+            messages = sorted(server.recv(4096) for _ in range(10))
+            self._wait_for(lambda: not spill_path.exists())
+            delivery.close()
+
+        assert messages == sorted(f"<14>NUAA_AUDIT: user.action - test_{i}\x00".encode() for i in range(10))
+
+    def test_block_policy_waits_for_room(self, tmp_path, closed_port, slow_retry):
+        """With the block policy, a full queue makes callers wait."""
+        import threading
+
+        from nuaa_cli.audit.delivery import KIND_SYSLOG, AuditDelivery
+
+        config = AuditConfig(
+            audit_dir=tmp_path,
+            syslog_host="127.0.0.1",
+            syslog_port=closed_port,
+            syslog_protocol="tcp",
+            delivery_queue_size=1,
+            delivery_policy="block",
+        )
+        delivery = AuditDelivery(config)
+        delivery.submit(KIND_SYSLOG, "first")
+        self._wait_for(lambda: delivery.stats()["failed"] == 1)
+        assert delivery.submit(KIND_SYSLOG, "queued")
+
+        results = []
+        blocked = threading.Thread(target=lambda: results.append(delivery.submit(KIND_SYSLOG, "blocked")))
+        blocked.start()
+        blocked.join(0.2)
+        assert blocked.is_alive()
+
+        delivery.close()
+        blocked.join(5)
+        assert results == [False]
+
+    def test_invalid_delivery_settings(self, tmp_path):
+        """Unknown policies and protocols are rejected."""
+        with pytest.raises(ValueError):
+            AuditConfig(audit_dir=tmp_path, delivery_policy="retry_forever")
+        with pytest.raises(ValueError):
+            AuditConfig(audit_dir=tmp_path, syslog_protocol="http")
+
+    def test_invalid_environment_values_are_ignored(self, tmp_path, monkeypatch, caplog):
+        """Bad string settings from the environment keep the defaults instead of raising."""
+        monkeypatch.setenv("NUAA_AUDIT_FSYNC", "sometimes")
+        monkeypatch.setenv("NUAA_AUDIT_COMPRESSION", "lzma")
+        monkeypatch.setenv("NUAA_AUDIT_SYSLOG_PROTOCOL", "http")
+        monkeypatch.setenv("NUAA_AUDIT_DELIVERY_POLICY", "retry_forever")
+
+        config = AuditConfig(audit_dir=tmp_path)
+
+        assert (config.fsync_policy, config.compression) == ("never", "none")
+        assert (config.syslog_protocol, config.delivery_policy) == ("udp", "drop_oldest")
+        assert "NUAA_AUDIT_DELIVERY_POLICY" in caplog.text
+
+        monkeypatch.setenv("NUAA_AUDIT_FSYNC", "BATCH")
+        assert AuditConfig(audit_dir=tmp_path).fsync_policy == "batch"
+
+
 class TestHelperFunctions:
     """Tests for helper functions."""
 
@@ -0,0 +1,56 @@
+"""Tests for the audit maintenance command."""
+
+import json
+from datetime import datetime, timedelta
+
+import pytest
+from typer.testing import CliRunner
+
+from nuaa_cli import app
+from nuaa_cli.audit import AuditConfig, AuditEvent, AuditLogger
+from nuaa_cli.audit.config import reset_config, set_config
+
+runner = CliRunner()
+
+
+@pytest.fixture
+def audit_config(tmp_path):
+    """Global audit configuration with small rotated segments."""
+    config = AuditConfig(audit_dir=tmp_path, max_file_size=2048, max_files=30)
+    set_config(config)
+    yield config
+    reset_config()
+
+
+def _log_old_and_new(config):
+    logger = AuditLogger(config)
+    start = datetime.utcnow() - timedelta(days=800)
+    for i in range(30):
+        # The first half is two years old, the rest recent
+        timestamp = start + timedelta(hours=i) if i < 15 else datetime.utcnow()
+        logger.log(AuditEvent(timestamp=timestamp, action=f"test_{i}", metadata={"data": "x" * 100}))
+    logger.close()
+
+
+def test_compact_reports_reclaimed_bytes(audit_config):
+    """`nuaa audit compact --json` drops expired events and reports the savings."""
+    _log_old_and_new(audit_config)
+
+    result = runner.invoke(app, ["audit", "compact", "--json"])
+
+    assert result.exit_code == 0, result.output
+    report = json.loads(result.output)
+    assert report["events_removed"] == 15
+    assert report["bytes_reclaimed"] > 0
+    assert report["dry_run"] is False
+
+
+def test_compact_dry_run_table(audit_config):
+    """The default output is a table followed by a summary line."""
+    _log_old_and_new(audit_config)
+
+    result = runner.invoke(app, ["audit", "compact", "--dry-run"])
+
+    assert result.exit_code == 0, result.output
+    assert "Would reclaim" in result.output
+    assert "15 expired events" in result.output
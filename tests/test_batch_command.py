@@ -0,0 +1,110 @@
+"""Tests for the batch scaffolding command."""
+
+import json
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from nuaa_cli import app
+from nuaa_cli.commands.batch import read_manifest, run_batch
+
+runner = CliRunner()
+
+
+@pytest.fixture
+def workspace(tmp_path: Path, monkeypatch) -> Path:
+    """Project directory with minimal templates, used as the working directory."""
+    templates = tmp_path / "nuaa-kit" / "templates"
+    templates.mkdir(parents=True)
+    (templates / "program-design.md").write_text("# [Name]\n\nFor {{TARGET_POPULATION}} over [Timeframe]\n")
+    (templates / "logic-model.md").write_text("# Logic model for [Name]\n")
+    (templates / "impact-framework.md").write_text("# Impact framework for [Name]\n")
+    (templates / "proposal.md").write_text("# [Name] proposal to {{FUNDER}} for {{AMOUNT}}\n")
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def test_csv_manifest_scaffolds_every_row(workspace: Path):
+    """Each CSV row is scaffolded, numbered in manifest order."""
+    manifest = workspace / "programs.csv"
+    manifest.write_text(
+        "command,program_name,target_population,duration,funder,amount\n"
+        "design,Peer Support,People who use drugs,12 months,,\n"
+        "propose,Naloxone Access,,6 months,Health Fund,$5000\n"
+    )
+
+    result = runner.invoke(app, ["batch", str(manifest)])
+
+    assert result.exit_code == 0, result.output
+    assert "2 succeeded" in result.output
+    assert "rows/s" in result.output
+    design_dir = workspace / "nuaa" / "001-peer-support"
+    assert "For People who use drugs over 12 months" in (design_dir / "program-design.md").read_text()
+    assert (design_dir / "logic-model.md").exists()
+    assert (design_dir / "CHANGELOG.md").exists()
+    proposal = (workspace / "nuaa" / "002-naloxone-access" / "proposal.md").read_text()
+    assert "proposal to Health Fund for $5000" in proposal
+
+
+def test_failed_rows_are_reported_without_stopping_the_batch(workspace: Path):
+    """Bad rows are listed as failed; the remaining rows are still written."""
+    manifest = workspace / "programs.jsonl"
+    lines = [
+        json.dumps({"command": "design", "program_name": "Outreach", "fields": {"target_population": "PWUD"}}),
+        json.dumps({"command": "unknown", "program_name": "X"}),
+        json.dumps({"command": "report", "program_name": "X"}),
+        "{not json",
+        json.dumps({"command": "design", "program_name": "Drop In", "target_population": "PWUD", "duration": "1y"}),
+    ]
+    manifest.write_text("\n".join(lines) + "\n")
+
+    result = runner.invoke(app, ["batch", str(manifest)])
+
+    assert result.exit_code == 1
+    assert "1 succeeded" in result.output
+    assert "4 failed" in result.output
+    assert "Missing field 'duration'" in result.output
+    assert "Unknown command 'unknown'" in result.output
+    assert "not a template command" in result.output
+    assert "Invalid JSON" in result.output
+    assert (workspace / "nuaa" / "001-drop-in" / "program-design.md").exists()
+
+
+def test_parallel_writes_keep_manifest_numbering(workspace: Path):
+    """Feature numbers follow manifest order regardless of the worker count."""
+    manifest = workspace / "many.jsonl"
+    manifest.write_text(
+        "".join(
+            json.dumps(
+                {"command": "propose", "program_name": f"Program {i}", "funder": "F", "amount": "1", "duration": "d"}
+            )
+            + "\n"
+            for i in range(20)
+        )
+    )
+
+    results = run_batch(read_manifest(manifest), workers=4)
+
+    assert all(r.ok for r in results), [r.message for r in results if not r.ok]
+    assert [r.feature_dir.name for r in results] == [f"{i + 1:03d}-program-{i}" for i in range(20)]
+    assert all((r.feature_dir / "proposal.md").exists() for r in results)
+
+
+def test_unknown_manifest_format(tmp_path: Path):
+    """Manifests with an unrecognised extension need an explicit format."""
+    manifest = tmp_path / "programs.txt"
+    manifest.write_text("command,program_name\n")
+
+    with pytest.raises(ValueError):
+        read_manifest(manifest)
+    assert read_manifest(manifest, "csv") == []
+
+
+def test_csv_manifest_requires_command_columns(tmp_path: Path):
+    """CSV manifests without command/program_name columns are rejected."""
+    manifest = tmp_path / "programs.csv"
+    manifest.write_text("program,funder\nX,Y\n")
+
+    with pytest.raises(ValueError, match="command"):
+        read_manifest(manifest)
@@ -1,8 +1,10 @@
 """Tests for command factory pattern."""
 
+import io
 import os
 
 import pytest
+from rich.console import Console
 from typer.testing import CliRunner
 
 from nuaa_cli import app
@@ -137,6 +139,107 @@ class TestTemplateCommandHandler:
             )
 
 
+class TestParallelOutputs:
+    """Tests for concurrent rendering of a command's documents."""
+
+    @staticmethod
+    def _context(tmp_path):
+        from nuaa_cli.command_factory import FeatureContext
+
+        feature_dir = tmp_path / "nuaa" / "001-test"
+        feature_dir.mkdir(parents=True)
+        return FeatureContext("Test", {"PROGRAM_NAME": "Test", "DATE": "2025-01-01"}, feature_dir, "001", "test")
+
+    @staticmethod
+    def _config(outputs):
+        return TemplateCommandConfig(
+            command_name="test",
+            template_name="main.md",
+            output_filename="main.md",
+            help_text="Test",
+            fields=[],
+            additional_outputs=[(name, name) for name in outputs],
+        )
+
+    def test_outputs_render_concurrently(self, tmp_path, monkeypatch):
+        """Several slow templates finish in about the time of one."""
+        import time
+
+        from nuaa_cli import command_factory
+        from nuaa_cli.template_engine import RenderResult
+
+        def slow_render(name, mapping):
+            time.sleep(0.3)
+            return RenderResult(f"# {name}", frozenset(), frozenset())
+
+        monkeypatch.setattr(command_factory, "_render_template", slow_render)
+        handler = TemplateCommandHandler(self._config(["a.md", "b.md", "c.md"]))
+        context = self._context(tmp_path)
+
+        start = time.perf_counter()
+        handler.write_outputs(context, console=Console(file=io.StringIO()))
+
+        assert time.perf_counter() - start < 0.8
+        assert (context.feature_dir / "c.md").read_text(encoding="utf-8").endswith("---\n# c.md")
+
+    def test_console_output_follows_plan_order(self, tmp_path, monkeypatch):
+        """Messages are printed in config order whatever order the threads finish in."""
+        import random
+        import time
+
+        from nuaa_cli import command_factory
+        from nuaa_cli.template_engine import RenderResult
+
+        def jittery_render(name, mapping):
+            time.sleep(random.uniform(0, 0.05))
+            if name == "missing.md":
+                raise FileNotFoundError(name)
+            return RenderResult(name, frozenset(), frozenset())
+
+        monkeypatch.setattr(command_factory, "_render_template", jittery_render)
+        outputs = ["d.md", "missing.md", "b.md", "a.md"]
+        handler = TemplateCommandHandler(self._config(outputs))
+        context = self._context(tmp_path)
+        (context.feature_dir / "a.md").write_text("keep")
+        console = Console(file=io.StringIO(), width=500)
+
+        handler.write_outputs(context, console=console)
+
+        lines = console.file.getvalue().splitlines()
+        assert [line.split(":", 1)[0] for line in lines] == [
+            "Created",
+            "Created",
+            "Optional template not found",
+            "Created",
+            "File exists, skipping",
+        ]
+        assert [line.rsplit("/", 1)[-1].split(":")[-1].strip() for line in lines] == [
+            "main.md",
+            "d.md",
+            "missing.md",
+            "b.md",
+            "a.md",
+        ]
+        assert (context.feature_dir / "a.md").read_text() == "keep"
+
+    def test_missing_main_template_writes_nothing(self, tmp_path, monkeypatch):
+        """A missing main template aborts before any document is written."""
+        import typer
+
+        from nuaa_cli import command_factory
+
+        def render(name, mapping):
+            raise FileNotFoundError(name)
+
+        monkeypatch.setattr(command_factory, "_render_template", render)
+        handler = TemplateCommandHandler(self._config(["extra.md"]))
+        context = self._context(tmp_path)
+
+        with pytest.raises(typer.Exit):
+            handler.write_outputs(context, console=Console(file=io.StringIO()))
+        assert list(context.feature_dir.iterdir()) == []
+
+
 class TestProposeCommandRefactored:
     """Test the refactored propose command using factory pattern."""
 
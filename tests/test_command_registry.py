@@ -0,0 +1,129 @@
+"""Tests for lazy command registration."""
+
+import json
+import subprocess
+import sys
+import textwrap
+
+import click
+import typer
+from typer.testing import CliRunner
+
+from nuaa_cli.command_registry import COMMAND_MANIFEST, CommandRegistry, CommandSpec, lazy_group
+
+_OFFLINE_HTTPX = textwrap.dedent("""
+    import httpx
+
+
+    class _OfflineClient:
+        def __init__(self, *args, **kwargs):
+            pass
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return None
+
+        def get(self, *args, **kwargs):
+            raise httpx.ConnectError("offline")
+
+
+    httpx.Client = _OfflineClient
+    """)
+
+
+def _modules_after(argv: list[str], offline_httpx: bool = False) -> set[str]:
+    """Run the CLI in a fresh interpreter and return the loaded module names."""
+    script = (_OFFLINE_HTTPX if offline_httpx else "") + textwrap.dedent(f"""
+        import json
+        import sys
+
+        from nuaa_cli import app
+
+        try:
+            app({argv!r}, prog_name="nuaa")
+        except SystemExit:
+            pass
+        print(json.dumps(sorted(sys.modules)))
+        """)
+    result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True)
+    return set(json.loads(result.stdout.strip().splitlines()[-1]))
+
+
+def test_version_loads_only_version_command():
+    """`nuaa version` must not import other commands or interactive dependencies."""
+    # httpx itself pulls in rich.progress/rich.live, so those are not checked here.
+    modules = _modules_after(["version"], offline_httpx=True)
+
+    assert "nuaa_cli.commands.version" in modules
+    loaded_commands = {m for m in modules if m.startswith("nuaa_cli.commands.")}
+    assert loaded_commands == {"nuaa_cli.commands.version"}
+    for heavy in (
+        "readchar",
+        "rich.tree",
+        "nuaa_cli.ui",
+        "nuaa_cli.download",
+        "nuaa_cli.scaffold",
+        "nuaa_cli.command_factory",
+    ):
+        assert heavy not in modules, f"{heavy} imported by `nuaa version`"
+
+
+def test_help_is_served_from_manifest():
+    """`nuaa --help` lists every command without importing any command module."""
+    modules = _modules_after(["--help"])
+
+    assert not any(m.startswith("nuaa_cli.commands.") for m in modules)
+    assert "httpx" not in modules
+    assert "truststore" not in modules
+    assert "readchar" not in modules
+    assert "rich.live" not in modules
+
+
+def test_help_lists_manifest_commands():
+    """All manifest commands appear in `nuaa --help`."""
+    from nuaa_cli import app
+
+    result = CliRunner().invoke(app, ["--help"])
+
+    assert result.exit_code == 0
+    for spec in COMMAND_MANIFEST:
+        assert spec.name in result.output
+
+
+def test_manifest_matches_command_help():
+    """Manifest help text stays in sync with the registered command docstrings."""
+    from nuaa_cli import _command_registry
+
+    for spec in COMMAND_MANIFEST:
+        command = _command_registry.load(spec.name)
+        assert command is not None, f"{spec.name} failed to load"
+        first_paragraph = (command.help or "").strip().split("\n\n")[0]
+        assert " ".join(first_paragraph.split()) == spec.help
+
+
+def test_unknown_module_is_skipped():
+    """A command whose module cannot be imported is reported as missing."""
+    registry = CommandRegistry([CommandSpec("ghost", "nuaa_cli.commands.does_not_exist", "Ghost.", ())])
+    app = typer.Typer(cls=lazy_group(registry))
+
+    @app.command()
+    def hello():
+        """Say hello."""
+
+    result = CliRunner().invoke(app, ["ghost"])
+
+    assert result.exit_code != 0
+    assert registry.load("ghost") is None
+
+
+def test_placeholder_does_not_import_module():
+    """Placeholders used for help carry the manifest text only."""
+    registry = CommandRegistry([CommandSpec("ghost", "nuaa_cli.commands.does_not_exist", "Ghost.", ())])
+
+    placeholder = registry.placeholder("ghost")
+
+    assert isinstance(placeholder, click.Command)
+    assert placeholder.help == "Ghost."
+    assert not registry.is_loaded("ghost")
@@ -29,6 +29,7 @@ from nuaa_cli.github_client import (
     parse_rate_limit_headers,
     format_rate_limit_error,
 )
+from nuaa_cli.download.release_cache import ReleaseCache, file_sha256
 from nuaa_cli.download.zip_handler import safe_extract_zip
 from nuaa_cli.utils import StepTracker
 
@@ -1191,3 +1192,236 @@ class TestDownloadAndExtractTemplate:
 
         # Console should have been used for output
         assert console.print.called
+
+
+def _zip_file(path, payload=b"template"):
+    with zipfile.ZipFile(path, "w") as zf:
+        zf.writestr("project/file.txt", payload)
+    return path
+
+
+class TestReleaseCache:
+    """Tests for the local template release cache."""
+
+    def test_put_and_get_asset(self, tmp_path):
+        """Test assets are stored by content hash and found by tag and name."""
+        cache = ReleaseCache(tmp_path / "cache")
+        source = _zip_file(tmp_path / "a.zip")
+
+        blob = cache.put_asset("v1.0.0", "a.zip", source)
+
+        assert blob.name == f"{file_sha256(source)}.zip"
+        assert source.exists()
+        assert cache.get_asset("v1.0.0", "a.zip") == blob
+        assert cache.get_asset("v1.0.1", "a.zip") is None
+
+    def test_identical_assets_share_a_blob(self, tmp_path):
+        """Test the same content under two tags is stored once."""
+        cache = ReleaseCache(tmp_path / "cache")
+        source = _zip_file(tmp_path / "a.zip")
+
+        first = cache.put_asset("v1.0.0", "a.zip", source)
+        second = cache.put_asset("v1.0.1", "a.zip", source)
+
+        assert first == second
+        assert cache.size() == source.stat().st_size
+
+    def test_corrupt_asset_is_dropped(self, tmp_path):
+        """Test a blob that no longer matches its SHA-256 is not returned."""
+        cache = ReleaseCache(tmp_path / "cache")
+        blob = cache.put_asset("v1.0.0", "a.zip", _zip_file(tmp_path / "a.zip"))
+        blob.write_bytes(b"truncated")
+
+        assert cache.get_asset("v1.0.0", "a.zip") is None
+        assert not blob.exists()
+
+    def test_expected_digest_is_checked(self, tmp_path):
+        """Test put_asset rejects a file that does not match the published digest."""
+        cache = ReleaseCache(tmp_path / "cache")
+
+        with pytest.raises(ValueError, match="SHA-256 mismatch"):
+            cache.put_asset("v1.0.0", "a.zip", _zip_file(tmp_path / "a.zip"), sha256="0" * 64)
+
+    def test_lru_eviction(self, tmp_path):
+        """Test the least recently used asset is evicted beyond max_bytes."""
+        first = _zip_file(tmp_path / "1.zip", b"1" * 100)
+        cache = ReleaseCache(tmp_path / "cache", max_bytes=first.stat().st_size * 2)
+        cache.put_asset("v1", "a.zip", first)
+        cache.put_asset("v2", "a.zip", _zip_file(tmp_path / "2.zip", b"2" * 100))
+        cache.get_asset("v1", "a.zip")  # v2 is now least recently used
+
+        cache.put_asset("v3", "a.zip", _zip_file(tmp_path / "3.zip", b"3" * 100))
+
+        assert cache.get_asset("v1", "a.zip") is not None
+        assert cache.get_asset("v2", "a.zip") is None
+        assert cache.get_asset("v3", "a.zip") is not None
+
+    def test_orphaned_blobs_count_toward_max_bytes(self, tmp_path):
+        """Test blobs missing from the index (lost updates) are sized and evicted."""
+        first = _zip_file(tmp_path / "1.zip", b"1" * 100)
+        size = first.stat().st_size
+        cache = ReleaseCache(tmp_path / "cache", max_bytes=size * 2)
+        blob = cache.put_asset("v1", "a.zip", first)
+        orphan = blob.with_name(f"{'0' * 64}.zip")
+        orphan.write_bytes(b"x" * size)
+        os.utime(orphan, (0, 0))
+
+        assert cache.size() == size * 2
+
+        cache.put_asset("v2", "a.zip", _zip_file(tmp_path / "2.zip", b"2" * 100))
+
+        assert not orphan.exists()
+        assert cache.get_asset("v1", "a.zip") is not None
+        assert cache.get_asset("v2", "a.zip") is not None
+
+    def test_release_metadata(self, tmp_path):
+        """Test release metadata is kept with its ETag."""
+        cache = ReleaseCache(tmp_path / "cache")
+        assert cache.get_release("https://api/latest") is None
+
+        cache.put_release("https://api/latest", 'W/"abc"', {"tag_name": "v1.0.0"})
+
+        assert ReleaseCache(tmp_path / "cache").get_release("https://api/latest") == (
+            'W/"abc"',
+            {"tag_name": "v1.0.0"},
+        )
+
+    def test_default_dir_from_environment(self, tmp_path, monkeypatch):
+        """Test NUAA_TEMPLATE_CACHE_DIR and NUAA_TEMPLATE_CACHE_MAX_MB are honoured."""
+        monkeypatch.setenv("NUAA_TEMPLATE_CACHE_DIR", str(tmp_path / "env-cache"))
+        monkeypatch.setenv("NUAA_TEMPLATE_CACHE_MAX_MB", "2")
+
+        cache = ReleaseCache()
+
+        assert cache.root == tmp_path / "env-cache"
+        assert cache.max_bytes == 2 * 1024 * 1024
+
+
+class TestDownloadTemplateCache:
+    """Tests for download_template_from_github with a release cache."""
+
+    def _client(self, content, etag='"v1"'):
+        release = {
+            "tag_name": "v1.0.0",
+            "assets": [
+                {
+                    "name": "nuaa-template-claude-sh-v1.0.0.zip",
+                    "browser_download_url": "https://github.com/test/download.zip",
+                    "size": len(content),
+                }
+            ],
+        }
+        release_response = Mock(spec=httpx.Response)
+        release_response.status_code = 200
+        release_response.headers = httpx.Headers({"etag": etag})
+        release_response.json.return_value = release
+
+        download_response = Mock(spec=httpx.Response)
+        download_response.status_code = 200
+        download_response.headers = httpx.Headers({"content-length": str(len(content))})
+        download_response.iter_bytes = Mock(return_value=[content])
+
+        client = Mock()
+        client.get.return_value = release_response
+        stream_context = MagicMock()
+        stream_context.__enter__.return_value = download_response
+        client.stream.return_value = stream_context
+        return client
+
+    def test_second_download_uses_cache(self, tmp_path):
+        """Test the asset is downloaded once and release metadata is revalidated."""
+        cache = ReleaseCache(tmp_path / "cache")
+        content = _zip_file(tmp_path / "src.zip").read_bytes()
+        client = self._client(content)
+        first_dir = tmp_path / "first"
+        second_dir = tmp_path / "second"
+        first_dir.mkdir()
+        second_dir.mkdir()
+
+        _, first = download_template_from_github(
+            "claude", first_dir, verbose=False, show_progress=False, client=client, cache=cache
+        )
+        client.get.return_value.status_code = 304
+        zip_path, second = download_template_from_github(
+            "claude", second_dir, verbose=False, show_progress=False, client=client, cache=cache
+        )
+
+        assert first["cached"] is False
+        assert second["cached"] is True
+        assert client.stream.call_count == 1
+        assert client.get.call_args[1]["headers"]["If-None-Match"] == '"v1"'
+        assert zip_path.read_bytes() == content
+
+    def test_blob_evicted_after_lookup_is_downloaded(self, tmp_path, monkeypatch):
+        """Test a blob removed by another process between lookup and copy is downloaded again."""
+        cache = ReleaseCache(tmp_path / "cache")
+        content = _zip_file(tmp_path / "src.zip").read_bytes()
+        client = self._client(content)
+        download_template_from_github(
+            "claude", tmp_path, verbose=False, show_progress=False, client=client, cache=cache
+        )
+        work_dir = tmp_path / "work"
+        work_dir.mkdir()
+        get_asset = cache.get_asset
+
+        def evicted_meanwhile(tag, name):
+            blob = get_asset(tag, name)
+            blob.unlink()
+            return blob
+
+        monkeypatch.setattr(cache, "get_asset", evicted_meanwhile)
+
+        zip_path, metadata = download_template_from_github(
+            "claude", work_dir, verbose=False, show_progress=False, client=client, cache=cache
+        )
+
+        assert metadata["cached"] is False
+        assert client.stream.call_count == 2
+        assert zip_path.read_bytes() == content
+        with pytest.raises(typer.Exit):
+            download_template_from_github(
+                "claude", work_dir, verbose=False, client=Mock(), cache=cache, offline=True
+            )
+
+    def test_digest_mismatch_fails_download(self, tmp_path):
+        """Test a download that does not match the release's digest is rejected."""
+        cache = ReleaseCache(tmp_path / "cache")
+        client = self._client(_zip_file(tmp_path / "src.zip").read_bytes())
+        client.get.return_value.json.return_value["assets"][0]["digest"] = "sha256:" + "0" * 64
+
+        with pytest.raises(typer.Exit):
+            download_template_from_github(
+                "claude", tmp_path, verbose=False, show_progress=False, client=client, cache=cache
+            )
+
+        assert not (tmp_path / "nuaa-template-claude-sh-v1.0.0.zip").exists()
+        assert cache.get_asset("v1.0.0", "nuaa-template-claude-sh-v1.0.0.zip") is None
+
+    def test_offline(self, tmp_path):
+        """Test offline mode uses the cache only and fails when it is empty."""
+        cache = ReleaseCache(tmp_path / "cache")
+        work_dir = tmp_path / "work"
+        work_dir.mkdir()
+
+        with pytest.raises(typer.Exit):
+            download_template_from_github(
+                "claude", work_dir, verbose=False, cache=cache, offline=True
+            )
+
+        content = _zip_file(tmp_path / "src.zip").read_bytes()
+        download_template_from_github(
+            "claude",
+            tmp_path,
+            verbose=False,
+            show_progress=False,
+            client=self._client(content),
+            cache=cache,
+        )
+        client = Mock()
+        zip_path, metadata = download_template_from_github(
+            "claude", work_dir, verbose=False, client=client, cache=cache, offline=True
+        )
+
+        assert metadata["cached"] is True
+        assert zip_path.read_bytes() == content
+        assert not client.get.called
@@ -0,0 +1,150 @@
+"""Tests for the on-disk feature directory index."""
+
+import multiprocessing
+import os
+import sqlite3
+import stat
+from contextlib import closing
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+
+from nuaa_cli import scaffold
+from nuaa_cli.feature_index import FeatureIndex
+from nuaa_cli.scaffold import _ensure_nuaa_root, _find_feature_dir_by_program, _next_feature_dir
+
+
+def _allocate_in_process(root: str, program: str, count: int, queue) -> None:
+    names = [_next_feature_dir(program, Path(root))[0].name for _ in range(count)]
+    queue.put(names)
+
+
+def test_allocate_and_find(tmp_path: Path):
+    """Allocated directories are numbered sequentially and found by slug."""
+    index = FeatureIndex(_ensure_nuaa_root(tmp_path))
+
+    first, num1 = index.allocate("peer-support")
+    second, num2 = index.allocate("outreach")
+
+    assert (num1, num2) == ("001", "002")
+    assert first.is_dir() and second.is_dir()
+    assert index.find("peer-support") == first
+    assert index.find("missing") is None
+
+
+def test_index_lives_outside_nuaa_dir(tmp_path: Path):
+    """The index does not add entries to nuaa/ itself."""
+    _next_feature_dir("Program", tmp_path)
+
+    assert [p.name for p in (tmp_path / "nuaa").iterdir()] == ["001-program"]
+    assert (tmp_path / ".nuaa" / "feature-index.sqlite3").is_file()
+
+
+def test_rebuilds_after_manual_changes(tmp_path: Path):
+    """Directories created or removed outside the index are picked up."""
+    nuaa_root = _ensure_nuaa_root(tmp_path)
+    _next_feature_dir("alpha", tmp_path)
+
+    (nuaa_root / "007-manual").mkdir()
+    assert _find_feature_dir_by_program("manual", tmp_path) == nuaa_root / "007-manual"
+    assert _next_feature_dir("beta", tmp_path)[1] == "008"
+
+    (nuaa_root / "007-manual").rmdir()
+    assert _find_feature_dir_by_program("manual", tmp_path) is None
+
+
+@pytest.mark.parametrize("use_index", [True, False])
+def test_find_prefers_exact_slug_then_scan_semantics(tmp_path: Path, monkeypatch, use_index: bool):
+    """An NNN-<slug> directory wins; otherwise the first sorted -<slug> match on word boundaries."""
+    nuaa_root = _ensure_nuaa_root(tmp_path)
+    for name in ["003-peer", "001-peer-support", "002-peers", "custom-outreach"]:
+        (nuaa_root / name).mkdir()
+    if not use_index:
+        monkeypatch.setattr(scaffold.FeatureIndex, "find", Mock(side_effect=sqlite3.OperationalError("locked")))
+
+    assert _find_feature_dir_by_program("peer", tmp_path) == nuaa_root / "003-peer"
+    assert _find_feature_dir_by_program("support", tmp_path) == nuaa_root / "001-peer-support"
+    assert _find_feature_dir_by_program("outreach", tmp_path) == nuaa_root / "custom-outreach"
+    assert _find_feature_dir_by_program("eer", tmp_path) is None
+
+
+def test_exact_lookup_uses_slug_index(tmp_path: Path):
+    """The slug lookup is answered from the features_slug index, not a table scan."""
+    index = FeatureIndex(_ensure_nuaa_root(tmp_path))
+    index.allocate("peer-support")
+
+    with closing(index._connect()) as conn:
+        plan = conn.execute(
+            "EXPLAIN QUERY PLAN SELECT name FROM features WHERE slug = ? ORDER BY name", ("peer-support",)
+        ).fetchall()
+
+    assert any("features_slug" in row[-1] for row in plan)
+
+
+def test_numbers_beyond_999(tmp_path: Path):
+    """Four-digit feature numbers keep incrementing."""
+    nuaa_root = _ensure_nuaa_root(tmp_path)
+    (nuaa_root / "999-last").mkdir()
+
+    assert _next_feature_dir("next", tmp_path)[1] == "1000"
+    assert _next_feature_dir("after", tmp_path)[1] == "1001"
+
+
+def test_falls_back_to_scan_when_index_unavailable(tmp_path: Path, monkeypatch):
+    """Database errors fall back to scanning nuaa/."""
+
+    def _broken(*args, **kwargs):
+        raise sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr(scaffold.FeatureIndex, "allocate", _broken)
+    monkeypatch.setattr(scaffold.FeatureIndex, "find", _broken)
+
+    feature_dir, num_str, _ = _next_feature_dir("fallback", tmp_path)
+    assert num_str == "001"
+    assert _find_feature_dir_by_program("fallback", tmp_path) == feature_dir
+
+
+def test_falls_back_to_scan_when_index_dir_is_not_writable(tmp_path: Path):
+    """A .nuaa path that cannot be created falls back to scanning nuaa/."""
+    nuaa_root = _ensure_nuaa_root(tmp_path)
+    (tmp_path / ".nuaa").write_text("not a directory")
+
+    feature_dir, num_str, _ = _next_feature_dir("fallback", tmp_path)
+    assert (feature_dir, num_str) == (nuaa_root / "001-fallback", "001")
+    assert _find_feature_dir_by_program("fallback", tmp_path) == feature_dir
+
+
+@pytest.mark.skipif(os.name == "nt" or os.geteuid() == 0, reason="needs POSIX permissions as a non-root user")
+def test_falls_back_to_scan_in_read_only_project(tmp_path: Path):
+    """A read-only .nuaa directory falls back to scanning nuaa/."""
+    nuaa_root = _ensure_nuaa_root(tmp_path)
+    (nuaa_root / "001-existing").mkdir()
+    index_dir = tmp_path / ".nuaa"
+    index_dir.mkdir()
+    index_dir.chmod(stat.S_IRUSR | stat.S_IXUSR)
+    try:
+        assert _find_feature_dir_by_program("existing", tmp_path) == nuaa_root / "001-existing"
+        assert _next_feature_dir("fallback", tmp_path)[1] == "002"
+    finally:
+        index_dir.chmod(stat.S_IRWXU)
+
+
+@pytest.mark.parametrize("workers", [4])
+def test_concurrent_processes_get_unique_numbers(tmp_path: Path, workers: int):
+    """Several processes allocating at once never share a number."""
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    per_worker = 5
+    procs = [
+        ctx.Process(target=_allocate_in_process, args=(str(tmp_path), f"program {i}", per_worker, queue))
+        for i in range(workers)
+    ]
+    for proc in procs:
+        proc.start()
+    names = [name for _ in procs for name in queue.get(timeout=60)]
+    for proc in procs:
+        proc.join(timeout=60)
+
+    numbers = sorted(name.split("-", 1)[0] for name in names)
+    assert numbers == [f"{i:03d}" for i in range(1, workers * per_worker + 1)]
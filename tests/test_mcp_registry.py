@@ -9,10 +9,17 @@ Tests cover:
 - Edge cases and error conditions
 """
 
+import asyncio
+import json
+import threading
+import time
+from pathlib import Path
+
 import pytest
 from unittest.mock import Mock
 
 from nuaa_cli.mcp import (
+    CachePolicy,
     MCPRegistry,
     MCPTool,
     MCPToolDescriptor,
@@ -21,6 +28,7 @@ from nuaa_cli.mcp import (
     ToolValidationError,
     ToolExecutionError,
     ToolRegistrationError,
+    ToolTimeoutError,
 )
 
 
@@ -650,6 +658,678 @@ class TestMCPRegistryIntegration:
         assert not registry.has_tool("unsafe_tool")
 
 
+class TestMCPConcurrency:
+    """Tests for async invocation, concurrency limits and timeouts."""
+
+    @staticmethod
+    def _descriptor(name, handler, **kwargs):
+        return MCPToolDescriptor(name=name, description=name, input_schema={"x": int}, handler=handler, **kwargs)
+
+    def test_acall_awaits_async_handler(self):
+        """Test async handlers run on the caller's event loop."""
+        registry = MCPRegistry()
+        seen = {}
+
+        async def handler(inputs):
+            seen["thread"] = threading.current_thread()
+            await asyncio.sleep(0)
+            return inputs["x"] * 2
+
+        registry.register(self._descriptor("double", handler))
+
+        assert asyncio.run(registry.acall("double", {"x": 21})) == 42
+        assert seen["thread"] is threading.current_thread()
+
+    def test_acall_offloads_sync_handler(self):
+        """Test sync handlers run on the registry's thread pool."""
+        registry = MCPRegistry()
+        registry.register(self._descriptor("where", lambda inputs: threading.current_thread().name))
+
+        assert asyncio.run(registry.acall("where", {"x": 1})).startswith("nuaa-mcp")
+        registry.shutdown()
+
+    def test_call_runs_async_handler(self):
+        """Test the sync API also accepts async handlers."""
+        registry = MCPRegistry()
+
+        async def handler(inputs):
+            return inputs["x"] + 1
+
+        registry.register(self._descriptor("inc", handler))
+
+        assert registry.call("inc", {"x": 1}) == 2
+
+    def test_acall_validates_and_wraps_errors(self):
+        """Test acall raises the same errors as call."""
+        registry = MCPRegistry()
+
+        async def failing(inputs):
+            raise ValueError("boom")
+
+        registry.register(self._descriptor("fail", failing))
+
+        with pytest.raises(ToolNotFoundError):
+            asyncio.run(registry.acall("missing", {}))
+        with pytest.raises(ToolValidationError):
+            asyncio.run(registry.acall("fail", {"x": "1"}))
+        with pytest.raises(ToolExecutionError, match="boom"):
+            asyncio.run(registry.acall("fail", {"x": 1}))
+
+    def test_call_many_runs_concurrently_in_order(self):
+        """Test call_many overlaps calls and keeps result order."""
+        registry = MCPRegistry()
+
+        async def slow(inputs):
+            await asyncio.sleep(0.2)
+            return inputs["x"]
+
+        registry.register(self._descriptor("slow", slow))
+
+        start = time.monotonic()
+        results = asyncio.run(registry.call_many([("slow", {"x": i}) for i in range(5)]))
+
+        assert results == [0, 1, 2, 3, 4]
+        assert time.monotonic() - start < 0.8
+
+    def test_call_many_return_exceptions(self):
+        """Test call_many can collect failures instead of raising."""
+        registry = MCPRegistry()
+        registry.register(self._descriptor("echo", lambda inputs: inputs["x"]))
+
+        results = asyncio.run(registry.call_many([("echo", {"x": 1}), ("missing", {})], return_exceptions=True))
+
+        assert results[0] == 1
+        assert isinstance(results[1], ToolNotFoundError)
+        registry.shutdown()
+
+    def test_max_concurrency_limits_async_calls(self):
+        """Test a tool never runs more than max_concurrency calls at once."""
+        registry = MCPRegistry()
+        active = peak = 0
+
+        async def handler(inputs):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return inputs["x"]
+
+        registry.register(self._descriptor("limited", handler, max_concurrency=2))
+
+        results = asyncio.run(registry.call_many([("limited", {"x": i}) for i in range(10)]))
+
+        assert results == list(range(10))
+        assert peak == 2
+
+    def test_max_concurrency_limits_threads(self):
+        """Test the limit also holds across threads using the sync API."""
+        registry = MCPRegistry()
+        lock = threading.Lock()
+        active = peak = 0
+
+        def handler(inputs):
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.01)
+            with lock:
+                active -= 1
+
+        registry.register(self._descriptor("limited", handler, max_concurrency=1))
+        threads = [threading.Thread(target=registry.call, args=("limited", {"x": 1})) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert peak == 1
+
+    def test_acall_timeout(self):
+        """Test a slow async tool raises ToolTimeoutError."""
+        registry = MCPRegistry()
+
+        async def hang(inputs):
+            await asyncio.sleep(10)
+
+        registry.register(self._descriptor("hang", hang, timeout=0.05))
+
+        with pytest.raises(ToolTimeoutError, match="timed out"):
+            asyncio.run(registry.acall("hang", {"x": 1}))
+
+    def test_call_timeout_keeps_slot_until_handler_returns(self):
+        """Test a timed-out sync handler holds its slot until it finishes."""
+        registry = MCPRegistry()
+        release = threading.Event()
+        registry.register(self._descriptor("block", lambda inputs: release.wait(5), max_concurrency=1))
+
+        with pytest.raises(ToolTimeoutError):
+            registry.call("block", {"x": 1}, timeout=0.05)
+        with pytest.raises(ToolTimeoutError, match="free slot"):
+            registry.call("block", {"x": 1}, timeout=0.05)
+
+        release.set()
+        assert registry.call("block", {"x": 1}, timeout=5) is True
+        registry.shutdown()
+
+    def test_timeout_is_tool_execution_error(self):
+        """Test existing ToolExecutionError handlers also catch timeouts."""
+        assert issubclass(ToolTimeoutError, ToolExecutionError)
+
+    def test_invalid_limits_rejected(self):
+        """Test non-positive concurrency limits and timeouts are rejected."""
+        registry = MCPRegistry()
+
+        with pytest.raises(ToolRegistrationError, match="max_concurrency"):
+            registry.register(self._descriptor("a", Mock(), max_concurrency=0))
+        with pytest.raises(ToolRegistrationError, match="timeout"):
+            registry.register(self._descriptor("b", Mock(), timeout=0))
+        assert registry.count() == 0
+
+    def test_concurrent_registration(self):
+        """Test registering from many threads loses no tools."""
+        registry = MCPRegistry()
+        threads = [
+            threading.Thread(target=registry.register, args=(self._descriptor(f"tool_{i}", Mock()),)) for i in range(50)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert registry.count() == 50
+
+
+class TestMCPResultCache:
+    """Tests for result caching of idempotent tools."""
+
+    @staticmethod
+    def _register(registry, name="search", cache=None, **kwargs):
+        handler = Mock(side_effect=lambda inputs: f"result:{inputs['query']}")
+        registry.register(
+            MCPToolDescriptor(
+                name=name,
+                description="Search",
+                input_schema={"query": str},
+                handler=handler,
+                cache=cache if cache is not None else CachePolicy(),
+                **kwargs,
+            )
+        )
+        return handler
+
+    def test_repeated_call_served_from_cache(self):
+        """Test identical inputs run the handler once."""
+        registry = MCPRegistry()
+        handler = self._register(registry)
+
+        assert registry.call("search", {"query": "naloxone"}) == "result:naloxone"
+        assert registry.call("search", {"query": "naloxone"}) == "result:naloxone"
+        assert registry.call("search", {"query": "peer"}) == "result:peer"
+
+        assert handler.call_count == 2
+        stats = registry.get_tool_info("search").cache_stats
+        assert stats["hits"] == 1
+        assert stats["misses"] == 2
+        assert stats["size"] == 2
+
+    def test_bools_and_numbers_get_separate_entries(self):
+        """Test equal-comparing True, 1 and 1.0 are not served each other's results."""
+        registry = MCPRegistry()
+        handler = Mock(side_effect=lambda inputs: repr(inputs["x"]))
+        registry.register(
+            MCPToolDescriptor(
+                name="echo",
+                description="Echo",
+                input_schema={"x": object},
+                handler=handler,
+                cache=CachePolicy(),
+            )
+        )
+
+        assert [registry.call("echo", {"x": x}) for x in (True, 1, 1.0, [1], [True])] == [
+            "True",
+            "1",
+            "1.0",
+            "[1]",
+            "[True]",
+        ]
+        assert registry.call("echo", {"x": 1}) == "1"
+        assert handler.call_count == 5
+
+    def test_uncached_tool_has_no_stats(self):
+        """Test tools without a cache policy always run and report no stats."""
+        registry = MCPRegistry()
+        handler = Mock(return_value="ok")
+        registry.register(MCPToolDescriptor(name="plain", description="", input_schema={}, handler=handler))
+
+        registry.call("plain", {})
+        registry.call("plain", {})
+
+        assert handler.call_count == 2
+        assert registry.get_tool_info("plain").cache_stats is None
+
+    def test_acall_shares_cache(self):
+        """Test async calls hit results cached by sync calls."""
+        registry = MCPRegistry()
+        handler = self._register(registry)
+
+        registry.call("search", {"query": "a"})
+        assert asyncio.run(registry.acall("search", {"query": "a"})) == "result:a"
+        assert handler.call_count == 1
+
+    def test_key_ignores_dict_order(self):
+        """Test nested inputs are canonicalised."""
+        registry = MCPRegistry()
+        handler = Mock(return_value="ok")
+        registry.register(
+            MCPToolDescriptor(
+                name="filter", description="", input_schema={"where": dict}, handler=handler, cache=CachePolicy()
+            )
+        )
+
+        registry.call("filter", {"where": {"a": 1, "b": [1, 2]}})
+        registry.call("filter", {"where": {"b": [1, 2], "a": 1}})
+
+        assert handler.call_count == 1
+
+    def test_custom_key_function(self):
+        """Test a policy key function decides which inputs share a result."""
+        registry = MCPRegistry()
+        handler = self._register(registry, cache=CachePolicy(key=lambda inputs: inputs["query"].lower()))
+
+        registry.call("search", {"query": "Naloxone"})
+        assert registry.call("search", {"query": "NALOXONE"}) == "result:Naloxone"
+        assert handler.call_count == 1
+
+    def test_unhashable_key_bypasses_cache(self):
+        """Test a key function returning an unhashable value disables caching for that call."""
+        registry = MCPRegistry()
+        handler = self._register(registry, cache=CachePolicy(key=lambda inputs: [inputs["query"]]))
+
+        registry.call("search", {"query": "a"})
+        registry.call("search", {"query": "a"})
+
+        assert handler.call_count == 2
+        assert registry.get_tool_info("search").cache_stats["bypassed"] == 2
+
+    def test_ttl_expiry(self):
+        """Test results expire after the TTL."""
+        registry = MCPRegistry()
+        handler = self._register(registry, cache=CachePolicy(ttl=0.05))
+
+        registry.call("search", {"query": "a"})
+        time.sleep(0.1)
+        registry.call("search", {"query": "a"})
+
+        assert handler.call_count == 2
+        assert registry.get_tool_info("search").cache_stats["expirations"] == 1
+
+    def test_lru_eviction(self):
+        """Test the least recently used result is evicted beyond max_entries."""
+        registry = MCPRegistry()
+        handler = self._register(registry, cache=CachePolicy(max_entries=2))
+
+        registry.call("search", {"query": "a"})
+        registry.call("search", {"query": "b"})
+        registry.call("search", {"query": "a"})  # a is now most recent
+        registry.call("search", {"query": "c"})  # evicts b
+        registry.call("search", {"query": "a"})
+        registry.call("search", {"query": "b"})
+
+        assert handler.call_count == 4
+        assert registry.get_tool_info("search").cache_stats["evictions"] == 2
+
+    def test_errors_not_cached(self):
+        """Test failed calls are retried rather than cached."""
+        registry = MCPRegistry()
+        handler = Mock(side_effect=[ValueError("down"), "ok"])
+        registry.register(
+            MCPToolDescriptor(name="flaky", description="", input_schema={}, handler=handler, cache=CachePolicy())
+        )
+
+        with pytest.raises(ToolExecutionError):
+            registry.call("flaky", {})
+        assert registry.call("flaky", {}) == "ok"
+        assert registry.call("flaky", {}) == "ok"
+        assert handler.call_count == 2
+
+    def test_invalidate(self):
+        """Test explicit invalidation of one result, one tool and every tool."""
+        registry = MCPRegistry()
+        search = self._register(registry)
+        lookup = self._register(registry, name="lookup")
+
+        for name in ("search", "lookup"):
+            registry.call(name, {"query": "a"})
+            registry.call(name, {"query": "b"})
+
+        assert registry.invalidate("search", {"query": "a"}) == 1
+        assert registry.invalidate("search", {"query": "a"}) == 0
+        registry.call("search", {"query": "a"})
+        registry.call("search", {"query": "b"})
+        assert search.call_count == 3
+
+        assert registry.invalidate("lookup") == 2
+        assert registry.invalidate() == 2
+        assert registry.get_tool_info("lookup").cache_stats["size"] == 0
+        assert lookup.call_count == 2
+
+        with pytest.raises(ToolNotFoundError):
+            registry.invalidate("missing")
+
+    def test_invalidates_hook(self):
+        """Test a mutating tool clears the caches it declares."""
+        registry = MCPRegistry()
+        search = self._register(registry)
+        registry.register(
+            MCPToolDescriptor(
+                name="add_term",
+                description="Add a glossary term",
+                input_schema={"term": str},
+                handler=Mock(return_value=True),
+                invalidates=["search", "not_registered"],
+            )
+        )
+
+        registry.call("search", {"query": "a"})
+        registry.call("add_term", {"term": "a"})
+        registry.call("search", {"query": "a"})
+
+        assert search.call_count == 2
+
+    def test_invalidation_during_call_discards_result(self):
+        """Test a result computed before an invalidation is not stored after it."""
+        registry = MCPRegistry()
+
+        def handler(inputs):
+            registry.invalidate("slow")
+            return "stale"
+
+        registry.register(
+            MCPToolDescriptor(name="slow", description="", input_schema={}, handler=handler, cache=CachePolicy())
+        )
+
+        assert registry.call("slow", {}) == "stale"
+        assert registry.get_tool_info("slow").cache_stats["size"] == 0
+
+    def test_reregister_starts_empty(self):
+        """Test unregistering a tool drops its cache."""
+        registry = MCPRegistry()
+        self._register(registry)
+        registry.call("search", {"query": "a"})
+
+        registry.unregister("search")
+        handler = self._register(registry)
+        registry.call("search", {"query": "a"})
+
+        assert handler.call_count == 1
+
+    def test_invalid_policy(self):
+        """Test cache policies reject non-positive limits."""
+        with pytest.raises(ValueError):
+            CachePolicy(ttl=0)
+        with pytest.raises(ValueError):
+            CachePolicy(max_entries=0)
+
+
+class TestMCPSchemaValidation:
+    """Tests for compiled validators and JSON-Schema-style input schemas."""
+
+    SCHEMA = {
+        "type": "object",
+        "properties": {
+            "query": {"type": "string", "minLength": 1, "maxLength": 20},
+            "limit": {"type": "integer", "minimum": 1, "maximum": 50},
+            "score": {"type": "number", "exclusiveMinimum": 0},
+            "format": {"enum": ["professional", "peer-friendly"]},
+            "slug": {"type": "string", "pattern": "^[a-z-]+$"},
+            "tags": {"type": "array", "items": {"type": "string"}, "maxItems": 3, "uniqueItems": True},
+            "filters": {
+                "type": "object",
+                "properties": {"since": {"type": ["string", "null"]}, "ids": {"type": "array"}},
+                "required": ["since"],
+                "additionalProperties": False,
+            },
+        },
+        "required": ["query"],
+        "additionalProperties": False,
+    }
+
+    @staticmethod
+    def _descriptor(schema, name="tool"):
+        return MCPToolDescriptor(name=name, description="", input_schema=schema, handler=Mock(return_value="ok"))
+
+    def _error(self, inputs):
+        with pytest.raises(ToolValidationError) as excinfo:
+            self._descriptor(self.SCHEMA).validate_inputs(inputs)
+        return str(excinfo.value)
+
+    def test_valid_nested_inputs(self):
+        """Test inputs matching a nested schema pass, optional properties may be omitted."""
+        descriptor = self._descriptor(self.SCHEMA)
+
+        descriptor.validate_inputs({"query": "naloxone"})
+        descriptor.validate_inputs(
+            {
+                "query": "naloxone",
+                "limit": 10,
+                "score": 0.5,
+                "format": "peer-friendly",
+                "slug": "harm-reduction",
+                "tags": ["a", "b"],
+                "filters": {"since": None, "ids": [1, 2]},
+            }
+        )
+
+    @pytest.mark.parametrize(
+        "inputs, message",
+        [
+            ({}, "Missing required parameters for tool 'tool': query"),
+            ({"query": "a", "page": 2}, "Unexpected parameters for tool 'tool': page"),
+            ({"query": 1}, "Parameter 'query' for tool 'tool' expected string, got int"),
+            ({"query": ""}, "Parameter 'query' for tool 'tool' must be at least 1 characters"),
+            ({"query": "a", "limit": 0}, "Parameter 'limit' for tool 'tool' must be >= 1"),
+            ({"query": "a", "limit": 51}, "Parameter 'limit' for tool 'tool' must be <= 50"),
+            ({"query": "a", "limit": True}, "Parameter 'limit' for tool 'tool' expected integer, got bool"),
+            ({"query": "a", "score": 0}, "Parameter 'score' for tool 'tool' must be > 0"),
+            ({"query": "a", "format": "casual"}, "must be one of: professional, peer-friendly"),
+            ({"query": "a", "slug": "Harm Reduction"}, "must match pattern"),
+            ({"query": "a", "tags": ["a", 2]}, "Parameter 'tags[1]' for tool 'tool' expected string, got int"),
+            ({"query": "a", "tags": ["a", "a"]}, "must not contain duplicate items"),
+            ({"query": "a", "tags": ["a", "b", "c", "d"]}, "must have at most 3 items"),
+            ({"query": "a", "filters": {}}, "Missing required parameters for tool 'tool': filters.since"),
+            ({"query": "a", "filters": {"since": None, "x": 1}}, "Unexpected parameters for tool 'tool': filters.x"),
+            (
+                {"query": "a", "filters": {"since": 3}},
+                "Parameter 'filters.since' for tool 'tool' expected string or null",
+            ),
+        ],
+    )
+    def test_invalid_inputs(self, inputs, message):
+        """Test each constraint reports the offending parameter path."""
+        assert message in self._error(inputs)
+
+    def test_flat_schema_behaviour_unchanged(self):
+        """Test flat Python-type schemas keep their checks and messages."""
+        descriptor = self._descriptor({"name": str, "count": int})
+
+        descriptor.validate_inputs({"name": "a", "count": 1})
+        descriptor.validate_inputs({"name": "a", "count": True})  # isinstance semantics
+        with pytest.raises(ToolValidationError, match="Missing required parameters for tool 'tool': count"):
+            descriptor.validate_inputs({"name": "a"})
+        with pytest.raises(ToolValidationError, match="Unexpected parameters for tool 'tool': extra"):
+            descriptor.validate_inputs({"name": "a", "count": 1, "extra": 0})
+        with pytest.raises(ToolValidationError, match="Parameter 'count' for tool 'tool' expected int, got str"):
+            descriptor.validate_inputs({"name": "a", "count": "1"})
+
+    def test_flat_schema_with_nested_parameter(self):
+        """Test a flat schema can describe one parameter in JSON-Schema style."""
+        descriptor = self._descriptor({"name": str, "depth": {"enum": ["light", "standard"]}})
+
+        descriptor.validate_inputs({"name": "a", "depth": "light"})
+        with pytest.raises(ToolValidationError, match="Parameter 'depth'"):
+            descriptor.validate_inputs({"name": "a", "depth": "deep"})
+
+    def test_non_dict_inputs_rejected(self):
+        """Test inputs must be a dict."""
+        with pytest.raises(ToolValidationError, match="must be a dict"):
+            self._descriptor({"name": str}).validate_inputs(["name"])
+
+    def test_registry_validates_with_nested_schema(self):
+        """Test call() rejects invalid nested inputs before running the handler."""
+        registry = MCPRegistry()
+        descriptor = self._descriptor(self.SCHEMA)
+        registry.register(descriptor)
+
+        with pytest.raises(ToolValidationError):
+            registry.call("tool", {"query": "a", "limit": 0})
+        descriptor.handler.assert_not_called()
+        assert registry.call("tool", {"query": "a", "limit": 5}) == "ok"
+
+    @pytest.mark.parametrize(
+        "schema",
+        [
+            {"type": "array"},
+            {"type": "object", "properties": {"a": {"type": "date"}}},
+            {"type": "object", "properties": {"a": {"enum": []}}},
+            {"type": "object", "properties": {"a": {"type": "string", "pattern": "("}}},
+            {"type": "object", "properties": {"a": {"minimum": "1"}}},
+            {"type": "object", "required": "a"},
+            {"name": "not a type"},
+        ],
+    )
+    def test_malformed_schema_rejected_at_register(self, schema):
+        """Test schema errors surface when the tool is registered, not when it is called."""
+        registry = MCPRegistry()
+
+        with pytest.raises(ToolRegistrationError, match="invalid"):
+            registry.register(self._descriptor(schema))
+        assert registry.count() == 0
+
+    def test_command_flags_schema(self):
+        """Test the nuaa-kit command flags schema compiles and validates its own flags."""
+        path = Path(__file__).resolve().parents[1] / "nuaa-kit" / "commands" / "schema.json"
+        schema = json.loads(path.read_text(encoding="utf-8"))
+        descriptor = self._descriptor(schema, name="flags")
+        descriptor.compile_validator()
+
+        descriptor.validate_inputs(schema)
+
+        schema["flags"][0]["appliesTo"].append("dance")
+        with pytest.raises(ToolValidationError, match=r"flags\[0\]\.appliesTo\[\d+\]"):
+            descriptor.validate_inputs(schema)
+
+
+class TestMCPDiscoveryIndex:
+    """Tests for the tag index and cached tool views."""
+
+    @staticmethod
+    def _register(registry, name, tags):
+        registry.register(
+            MCPToolDescriptor(name=name, description=name, input_schema={}, handler=Mock(), tags=list(tags))
+        )
+
+    def test_tag_index_follows_register_and_unregister(self):
+        """Test list_tools(tag) reflects registrations in registration order."""
+        registry = MCPRegistry()
+        self._register(registry, "a", ["search", "docs"])
+        self._register(registry, "b", ["search"])
+        self._register(registry, "c", ["docs"])
+
+        assert [tool.name for tool in registry.list_tools(tag="search")] == ["a", "b"]
+        assert [tool.name for tool in registry.list_tools(tag="docs")] == ["a", "c"]
+
+        registry.unregister("a")
+        assert [tool.name for tool in registry.list_tools(tag="search")] == ["b"]
+        assert [tool.name for tool in registry.list_tools(tag="docs")] == ["c"]
+
+        registry.unregister("b")
+        assert registry.list_tools(tag="search") == []
+        assert "search" not in registry._tag_index
+
+        registry.clear()
+        assert registry.list_tools(tag="docs") == []
+
+    def test_views_are_cached(self):
+        """Test repeated discovery returns the same view objects."""
+        registry = MCPRegistry()
+        self._register(registry, "a", ["x"])
+
+        first = registry.list_tools()[0]
+        assert registry.list_tools(tag="x")[0] is first
+        assert registry.get_tool_info("a") is first
+
+    def test_returned_list_is_independent(self):
+        """Test callers can modify the returned list without affecting the registry."""
+        registry = MCPRegistry()
+        self._register(registry, "a", ["x"])
+
+        registry.list_tools(tag="x").clear()
+        assert len(registry.list_tools(tag="x")) == 1
+
+    def test_views_are_immutable(self):
+        """Test shared views cannot be modified."""
+        registry = MCPRegistry()
+        registry.register(
+            MCPToolDescriptor(
+                name="a", description="", input_schema={"q": str}, handler=Mock(), output_schema={"r": str}, tags=["x"]
+            )
+        )
+        view = registry.get_tool_info("a")
+
+        with pytest.raises(AttributeError):
+            view.name = "b"
+        with pytest.raises(TypeError):
+            view.tags.append("y")
+        with pytest.raises(TypeError):
+            view.input_schema["extra"] = int
+        with pytest.raises(TypeError):
+            view.output_schema["extra"] = int
+        assert view.tags == ["x"]
+        assert view.input_schema == {"q": str}
+
+    def test_views_serialise_and_copy(self):
+        """Test read-only views still work with json, asdict, copy and pickle."""
+        import copy
+        import dataclasses
+        import pickle
+
+        registry = MCPRegistry()
+        schema = {"type": "object", "properties": {"q": {"type": "string"}}, "required": ["q"]}
+        registry.register(
+            MCPToolDescriptor(name="a", description="Search", input_schema=schema, handler=Mock(), tags=["x"])
+        )
+        view = registry.list_tools()[0]
+
+        assert json.loads(json.dumps(view.input_schema)) == schema
+        assert json.loads(json.dumps(view.tags)) == ["x"]
+        as_dict = dataclasses.asdict(view)
+        assert as_dict["input_schema"] == schema
+        assert json.loads(json.dumps(as_dict))["tags"] == ["x"]
+        assert copy.deepcopy(view) == view
+        assert pickle.loads(pickle.dumps(view)) == view
+
+        tags = copy.copy(view.tags)
+        tags.append("y")
+        schema_copy = copy.deepcopy(view.input_schema)
+        schema_copy["extra"] = True
+        assert type(tags) is list and type(schema_copy) is dict
+        assert view.tags == ["x"] and "extra" not in view.input_schema
+
+    def test_cache_stats_only_from_get_tool_info(self):
+        """Test cacheable tools report fresh stats without changing the shared view."""
+        registry = MCPRegistry()
+        registry.register(
+            MCPToolDescriptor(name="a", description="", input_schema={}, handler=Mock(), cache=CachePolicy())
+        )
+        registry.call("a", {})
+
+        assert registry.get_tool_info("a").cache_stats["misses"] == 1
+        assert registry.list_tools()[0].cache_stats is None
+
+
 class TestMCPExceptions:
     """Tests for MCP exception hierarchy."""
 
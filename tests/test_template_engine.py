@@ -0,0 +1,92 @@
+"""Tests for the compiled placeholder engine."""
+
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from nuaa_cli.template_engine import compile_template, render_template
+
+TEMPLATES_DIR = Path(__file__).resolve().parents[1] / "nuaa-kit" / "templates"
+
+MAPPING = {
+    "PROGRAM_NAME": "Peer Naloxone Distribution",
+    "TARGET_POPULATION": "people at risk of overdose",
+    "DURATION": "12 months",
+    "DATE": "2025-01-31",
+    "FUNDER": "Local Health District",
+    "AMOUNT": "$75000",
+    "FEATURE_ID": "001",
+    "SLUG": "peer-naloxone-distribution",
+}
+
+
+def _sequential(text: str, mapping: dict[str, str]) -> str:
+    """Reference implementation: one str.replace per placeholder."""
+    out = text
+    bracket_map = {
+        "[Name]": mapping.get("PROGRAM_NAME", ""),
+        "[Description]": mapping.get("TARGET_POPULATION", ""),
+        "[Timeframe]": mapping.get("DURATION", ""),
+        "[Date]": mapping.get("DATE", datetime.now().strftime("%Y-%m-%d")),
+    }
+    for k, v in bracket_map.items():
+        out = out.replace(k, v)
+    for k, v in mapping.items():
+        out = out.replace(f"{{{{{k}}}}}", v)
+    return out
+
+
+@pytest.mark.parametrize("template_path", sorted(TEMPLATES_DIR.glob("*.md")), ids=lambda p: p.name)
+def test_matches_sequential_replace_on_shipped_templates(template_path: Path):
+    """Rendering every shipped template matches the original algorithm."""
+    text = template_path.read_text(encoding="utf-8")
+    assert render_template(text, MAPPING).text == _sequential(text, MAPPING)
+
+
+@pytest.mark.parametrize(
+    "text, mapping",
+    [
+        ("[Name] {{FUNDER}} [Name]", {"PROGRAM_NAME": "{{FUNDER}}", "FUNDER": "Funder"}),
+        ("{{[Name]}}", {"PROGRAM_NAME": "FUNDER", "FUNDER": "x"}),
+        ("{{{{A}}}}", {"A": "B", "B": "x"}),
+        ("{{{A}}}", {"A": "v"}),
+        ("[Date] [Name]", {"PROGRAM_NAME": "[Date]"}),
+        ("[[Name]]", {"PROGRAM_NAME": "Date"}),
+        ("[Da[Name]]", {"PROGRAM_NAME": "te"}),
+        ("[[Name]ption]", {"PROGRAM_NAME": "Descri", "TARGET_POPULATION": "people"}),
+        ("{{ SPACED }} {{MISSING}}", {" SPACED ": "ok"}),
+        ("", {}),
+        ("plain text", {"PROGRAM_NAME": "x"}),
+    ],
+)
+def test_matches_sequential_replace_on_edge_cases(text: str, mapping: dict[str, str]):
+    """Cascading and unusual inputs keep the original output."""
+    assert render_template(text, mapping).text == _sequential(text, mapping)
+
+
+def test_reports_missing_and_unused():
+    """Missing placeholders and unused mapping keys are reported."""
+    result = render_template("[Name] [Description] {{FUNDER}} {{SLUG}}", {"PROGRAM_NAME": "P", "SLUG": "p", "X": "1"})
+
+    assert result.text == "P  {{FUNDER}} p"
+    assert result.missing == {"[Description]", "{{FUNDER}}"}
+    assert result.unused == {"X"}
+
+
+def test_date_defaults_to_today():
+    """[Date] falls back to today's date and is not reported as missing."""
+    result = render_template("[Date]", {})
+
+    assert result.text == datetime.now().strftime("%Y-%m-%d")
+    assert not result.missing
+
+
+def test_compiled_template_is_cached_and_reusable():
+    """compile_template returns the same compiled object for the same text."""
+    text = "Hello [Name], funded by {{FUNDER}}."
+    compiled = compile_template(text)
+
+    assert compile_template(text) is compiled
+    assert compiled.placeholders == {"[Name]", "{{FUNDER}}"}
+    assert render_template(compiled, MAPPING).text == _sequential(text, MAPPING)
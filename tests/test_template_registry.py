@@ -0,0 +1,118 @@
+"""Tests for the template registry cache."""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from nuaa_cli.scaffold import _find_templates_root, _load_template
+from nuaa_cli.template_registry import TemplateRegistry, get_template_registry
+
+
+def _make_templates(root: Path, **files: str) -> Path:
+    templates = root / "nuaa-kit" / "templates"
+    templates.mkdir(parents=True)
+    for name, text in files.items():
+        (templates / f"{name}.md").write_text(text, encoding="utf-8")
+    return templates
+
+
+def _bump_mtime(path: Path) -> None:
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+
+def test_root_is_resolved_once_per_origin(tmp_path: Path):
+    """The directory walk runs once; later lookups reuse the remembered root."""
+    _make_templates(tmp_path, a="A")
+    calls = []
+
+    def finder(start):
+        calls.append(start)
+        return _find_templates_root(start)
+
+    registry = TemplateRegistry(finder)
+    registry.load("a.md", start=tmp_path)
+    registry.load("a.md", start=tmp_path)
+
+    assert calls == [tmp_path]
+    assert registry.stats()["root_hits"] == 1
+
+
+def test_template_text_is_cached(tmp_path: Path):
+    """A template is read from disk once and then served from memory."""
+    _make_templates(tmp_path, a="A")
+    registry = TemplateRegistry(_find_templates_root)
+
+    assert registry.load("a.md", start=tmp_path) == "A"
+    assert registry.load("a.md", start=tmp_path) == "A"
+
+    stats = registry.stats()
+    assert stats["misses"] == 1
+    assert stats["hits"] == 1
+
+
+def test_modified_template_is_reloaded(tmp_path: Path):
+    """Changing a template's mtime or size invalidates the cached copy."""
+    templates = _make_templates(tmp_path, a="A")
+    registry = TemplateRegistry(_find_templates_root)
+    registry.load("a.md", start=tmp_path)
+
+    (templates / "a.md").write_text("Updated", encoding="utf-8")
+    _bump_mtime(templates / "a.md")
+
+    assert registry.load("a.md", start=tmp_path) == "Updated"
+    assert registry.stats()["misses"] == 2
+
+
+def test_lru_eviction(tmp_path: Path):
+    """The least recently used template is evicted when the cache is full."""
+    _make_templates(tmp_path, a="A", b="B", c="C")
+    registry = TemplateRegistry(_find_templates_root, max_entries=2)
+
+    registry.load("a.md", start=tmp_path)
+    registry.load("b.md", start=tmp_path)
+    registry.load("a.md", start=tmp_path)  # a is now most recent
+    registry.load("c.md", start=tmp_path)  # evicts b
+
+    assert registry.stats()["evictions"] == 1
+    registry.load("a.md", start=tmp_path)
+    assert registry.stats()["hits"] == 2
+    registry.load("b.md", start=tmp_path)
+    assert registry.stats()["misses"] == 4
+
+
+def test_missing_template_raises(tmp_path: Path):
+    """Unknown templates raise FileNotFoundError with the template name."""
+    _make_templates(tmp_path, a="A")
+    registry = TemplateRegistry(_find_templates_root)
+
+    with pytest.raises(FileNotFoundError, match="Template not found: missing.md"):
+        registry.load("missing.md", start=tmp_path)
+
+
+def test_invalidate_clears_entries(tmp_path: Path):
+    """invalidate() drops cached text so the next load reads from disk."""
+    _make_templates(tmp_path, a="A")
+    registry = TemplateRegistry(_find_templates_root)
+    registry.load("a.md", start=tmp_path)
+
+    registry.invalidate("a.md")
+    registry.load("a.md", start=tmp_path)
+
+    assert registry.stats()["misses"] == 2
+
+
+def test_load_template_uses_shared_registry(tmp_path: Path, monkeypatch):
+    """scaffold._load_template goes through the process-wide registry."""
+    _make_templates(tmp_path, shared="Shared [Name]")
+    monkeypatch.chdir(tmp_path)
+    registry = get_template_registry()
+    before = registry.stats()
+
+    assert _load_template("shared.md") == "Shared [Name]"
+    assert _load_template("shared.md") == "Shared [Name]"
+
+    after = registry.stats()
+    assert after["misses"] - before["misses"] == 1
+    assert after["hits"] - before["hits"] == 1